@@ -0,0 +1 @@
+"""Benchmark the numenc library against the standard library."""
@@ -0,0 +1,35 @@
+"""Describe the types supported by numenc for the benchmarks."""
+from typing import NamedTuple, Tuple, Union
+
+Number = Union[int, float]
+
+TypeInfo = NamedTuple('TypeInfo', [('name', str), ('width', int),
+                                   ('signed', bool), ('is_float', bool),
+                                   ('struct_code', str), ('array_code', str)])
+
+# yapf: disable
+TYPES = (
+    TypeInfo('int8', 1, True, False, 'b', 'b'),
+    TypeInfo('uint8', 1, False, False, 'B', 'B'),
+    TypeInfo('int16', 2, True, False, 'h', 'h'),
+    TypeInfo('uint16', 2, False, False, 'H', 'H'),
+    TypeInfo('int32', 4, True, False, 'i', 'i'),
+    TypeInfo('uint32', 4, False, False, 'I', 'I'),
+    TypeInfo('int64', 8, True, False, 'q', 'q'),
+    TypeInfo('uint64', 8, False, False, 'Q', 'Q'),
+    TypeInfo('float32', 4, True, True, 'f', 'f'),
+    TypeInfo('float64', 8, True, True, 'd', 'd'),
+)
+# yapf: enable
+
+TYPES_BY_NAME = {tajp.name: tajp for tajp in TYPES}
+
+
+def int_range(tajp: TypeInfo) -> Tuple[int, int]:
+    """Return the minimum and the maximum value of an integer type."""
+    assert not tajp.is_float
+    bits = 8 * tajp.width
+    if tajp.signed:
+        return -2**(bits - 1), 2**(bits - 1) - 1
+
+    return 0, 2**bits - 1
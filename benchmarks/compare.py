@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+Compare two JSON reports produced by ``benchmarks.run``.
+
+For example, to check a change against the previous release:
+
+    python3 -m benchmarks.compare before.json after.json --threshold 10
+"""
+import argparse
+import json
+import sys
+from typing import Any, Dict, Tuple
+
+Key = Tuple[str, str, str, str, str]
+
+
+def load(path: str) -> Dict[Key, Dict[str, Any]]:
+    """Load the results of a report indexed by their benchmark case."""
+    with open(path, 'rt') as fid:
+        report = json.load(fid)
+
+    return {(result['type'], result['distribution'], result['shape'],
+             result['direction'], result['implementation']): result
+            for result in report['results']}
+
+
+def main() -> int:
+    """Execute the main routine."""
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument("before", help="path to the baseline report")
+    parser.add_argument("after", help="path to the report to compare")
+    parser.add_argument(
+        "--threshold",
+        help="if set, exit with 1 if any numenc case slowed down "
+        "by more than the given percentage",
+        type=float)
+
+    args = parser.parse_args()
+
+    before = load(args.before)
+    after = load(args.after)
+
+    regressions = 0
+    print("{:<8} {:<11} {:<7} {:<7} {:<15} {:>10} {:>10} {:>8} {:>9}".format(
+        'type', 'dist.', 'shape', 'dir.', 'impl.', 'before', 'after', 'change',
+        'allocs'))
+
+    for key in sorted(set(before) & set(after)):
+        old = before[key]
+        new = after[key]
+        change = 100.0 * (new['ns_per_op'] / old['ns_per_op'] - 1.0)
+
+        flag = ''
+        if (args.threshold is not None and key[4] == 'numenc'
+                and change > args.threshold):
+            flag = ' !'
+            regressions += 1
+
+        tajp, distribution, shape, direction, implementation = key
+        print("{:<8} {:<11} {:<7} {:<7} {:<15} {:>10.1f} {:>10.1f} "
+              "{:>+7.1f}% {:>4.2f}>{:<4.2f}{}".format(
+                  tajp, distribution, shape, direction, implementation,
+                  old['ns_per_op'], new['ns_per_op'], change,
+                  old['allocations_per_op'], new['allocations_per_op'], flag))
+
+    missing = sorted(set(before) ^ set(after))
+    if missing:
+        print("\n{} case(s) are present in only one of the reports.".format(
+            len(missing)))
+
+    if regressions > 0:
+        print(
+            "\n{} numenc case(s) regressed by more than {}%.".format(
+                regressions, args.threshold),
+            file=sys.stderr)
+        return 1
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
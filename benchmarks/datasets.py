@@ -0,0 +1,92 @@
+"""Generate reproducible distributions of numbers for the benchmarks."""
+import random
+from typing import List, Optional  # pylint: disable=unused-import
+
+from benchmarks.catalog import Number, TypeInfo, int_range
+
+DISTRIBUTIONS = ('uniform', 'small', 'sequential', 'timestamps', 'gaussian')
+
+# 2024-01-01T00:00:00Z in seconds since the epoch
+EPOCH_2024 = 1704067200
+
+
+def _clamp(value: int, tajp: TypeInfo) -> int:
+    min_value, max_value = int_range(tajp)
+    return max(min_value, min(max_value, value))
+
+
+def generate(tajp: TypeInfo, distribution: str, size: int,
+             seed: int) -> Optional[List[Number]]:
+    """
+    Generate the numbers of a distribution.
+
+    The distributions mimic the keys we usually store:
+
+    * uniform: numbers drawn uniformly from the whole range of the type
+      (for floats, from [-1e9, 1e9]),
+    * small: counters and small deltas (geometric distribution),
+    * sequential: monotonically increasing identifiers,
+    * timestamps: microseconds (or seconds for floats) since the epoch,
+      sorted and with jitter,
+    * gaussian: measurements centered around zero.
+
+    :param tajp: type of the numbers
+    :param distribution: name of the distribution
+    :param size: number of the generated numbers
+    :param seed: seed of the random generator
+    :return: generated numbers, or None if the distribution does not apply
+        to the type
+    """
+    # pylint: disable=too-many-return-statements,too-many-branches
+    rng = random.Random('{}-{}-{}'.format(seed, tajp.name, distribution))
+
+    if distribution == 'uniform':
+        if tajp.is_float:
+            return [rng.uniform(-1e9, 1e9) for _ in range(size)]
+
+        min_value, max_value = int_range(tajp)
+        return [rng.randint(min_value, max_value) for _ in range(size)]
+
+    if distribution == 'small':
+        if tajp.is_float:
+            return [round(rng.expovariate(1 / 100), 2) for _ in range(size)]
+
+        return [
+            _clamp(int(rng.expovariate(1 / 100)), tajp) for _ in range(size)
+        ]
+
+    if distribution == 'sequential':
+        if tajp.is_float:
+            return [float(i) for i in range(size)]
+
+        min_value, max_value = int_range(tajp)
+        span = max_value - max(min_value, 0) + 1
+        return [max(min_value, 0) + i % span for i in range(size)]
+
+    if distribution == 'timestamps':
+        if tajp.name == 'float64':
+            values = [EPOCH_2024 + rng.uniform(0, 86400)
+                      for _ in range(size)]  # type: List[Number]
+        elif tajp.name in ['int64', 'uint64']:
+            values = [
+                EPOCH_2024 * 10**6 + rng.randint(0, 86400 * 10**6)
+                for _ in range(size)
+            ]
+        else:
+            return None
+
+        values.sort()
+        return values
+
+    if distribution == 'gaussian':
+        if tajp.is_float:
+            return [rng.gauss(0.0, 1000.0) for _ in range(size)]
+
+        min_value, max_value = int_range(tajp)
+        sigma = (max_value - min_value) / 16
+        center = (max_value + min_value) / 2
+        return [
+            _clamp(int(rng.gauss(center, sigma)), tajp) for _ in range(size)
+        ]
+
+    raise ValueError("Unknown distribution: {}".format(distribution))
@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+Count the allocations of the scalar conversions of the small-domain types.
+
+The keys and the numbers of the 8-bit types and of the hot range of
+the 16-bit types are interned, so their conversions allocate no objects.
+
+Build the extension in place and run the benchmark from the repository root:
+
+    python3 setup.py build_ext --inplace
+    python3 -m benchmarks.intern
+"""
+import argparse
+import sys
+import time
+from typing import Any, Callable, List, Tuple
+
+import numenc
+
+from benchmarks.run import measure_allocations
+
+
+def measure(func: Callable[[Any], Any],
+            inputs: List[Any]) -> Tuple[float, float]:
+    """
+    Convert all the inputs and keep the results.
+
+    :return: allocated memory blocks per call and nanoseconds per call
+    """
+    results = [None] * len(inputs)  # type: List[Any]
+
+    def convert_all() -> List[Any]:
+        """Convert the inputs into the preallocated results."""
+        for i, item in enumerate(inputs):
+            results[i] = func(item)
+        return results
+
+    start = time.perf_counter_ns()
+    convert_all()
+    duration = time.perf_counter_ns() - start
+
+    # the results of the first pass are released by the second one
+    results = [None] * len(inputs)
+    allocated = measure_allocations(convert_all)
+
+    return allocated / len(inputs), duration / len(inputs)
+
+
+def main() -> int:
+    """Execute the main routine."""
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument(
+        "--size",
+        help="number of conversions per case",
+        type=int,
+        default=1000 * 1000)
+
+    args = parser.parse_args()
+
+    hot_range = numenc.get_hot_range('int16')
+    int8_values = [value % 256 - 128 for value in range(args.size)]
+    int16_values = [
+        value % (hot_range[1] - hot_range[0]) + hot_range[0]
+        for value in range(args.size)
+    ]
+    cases = [
+        ('from_int8', numenc.from_int8, int8_values),
+        ('to_int8', numenc.to_int8, [numenc.from_int8(v) for v in int8_values]),
+        ('from_int16', numenc.from_int16, int16_values),
+        ('to_int16', numenc.to_int16,
+         [numenc.from_int16(v) for v in int16_values]),
+    ]  # type: List[Tuple[str, Callable[[Any], Any], List[Any]]]
+
+    print("{:<12} {:<10} {:>12} {:>8}".format('function', 'hot range',
+                                              'allocs/call', 'ns/call'))
+    try:
+        for name, func, inputs in cases:
+            ranges = [('on', hot_range)]
+            if '16' in name:
+                ranges.append(('off', (0, 0)))
+
+            for label, (start, stop) in ranges:
+                numenc.set_hot_range('int16', start, stop)
+                # copy the keys so that they are not interned themselves
+                copied = [
+                    bytes(bytearray(item)) if isinstance(item, bytes) else item
+                    for item in inputs
+                ]
+                allocs, duration = measure(func, copied)
+                print("{:<12} {:<10} {:>12.2f} {:>8.1f}".format(
+                    name, label, allocs, duration))
+    finally:
+        numenc.set_hot_range('int16', *hot_range)
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+"""
+Measure the compression and the seek latency of front-coded key blocks.
+
+Build the extension in place and run the benchmark from the repository root:
+
+    python3 setup.py build_ext --inplace
+    python3 -m benchmarks.key_block
+"""
+import argparse
+import functools
+import random
+import sys
+from typing import Iterator, List, Tuple
+
+import numenc
+
+from benchmarks import datasets
+from benchmarks.catalog import TYPES, TYPES_BY_NAME
+from benchmarks.run import measure_time
+
+
+def keys_of_datasets(size: int, seed: int) -> Iterator[Tuple[str, bytes, int]]:
+    """
+    Generate the sorted keys of the benchmark datasets.
+
+    Besides the keys of single numbers, composite keys of a small tenant
+    (uint16) followed by a timestamp (int64) are generated.
+
+    :return: name of the dataset, concatenated sorted keys and their width
+    """
+    for tajp in TYPES:
+        for distribution in datasets.DISTRIBUTIONS:
+            values = datasets.generate(
+                tajp=tajp, distribution=distribution, size=size, seed=seed)
+            if values is None:
+                continue
+
+            keys = bytearray(
+                getattr(numenc, 'from_{}_many'.format(tajp.name))(values))
+            numenc.sort_packed(keys, tajp.width)
+            yield '{} {}'.format(tajp.name,
+                                 distribution), bytes(keys), tajp.width
+
+    tenants = datasets.generate(
+        tajp=TYPES_BY_NAME['uint16'],
+        distribution='small',
+        size=size,
+        seed=seed)
+    timestamps = datasets.generate(
+        tajp=TYPES_BY_NAME['int64'],
+        distribution='timestamps',
+        size=size,
+        seed=seed)
+    assert tenants is not None and timestamps is not None
+
+    struct = numenc.Struct('uint16,int64')
+    assert struct.size is not None
+    keys = bytearray(struct.pack_many(zip(tenants, timestamps)))
+    numenc.sort_packed(keys, struct.size)
+    yield 'uint16,int64', bytes(keys), struct.size
+
+
+def seek_all(block: numenc.KeyBlock, probes: List[bytes]) -> None:
+    """Seek the first key not less than each probe."""
+    for probe in probes:
+        next(block.seek(probe), None)
+
+
+def search_all(keys: bytes, probes: List[bytes]) -> None:
+    """Search the insertion point of each probe in the packed keys."""
+    for probe in probes:
+        numenc.searchsorted(keys, probe)
+
+
+def main() -> int:
+    """Execute the main routine."""
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument(
+        "--size", help="number of keys per dataset", type=int, default=100000)
+    parser.add_argument(
+        "--restart-interval",
+        help="number of keys between two restart points",
+        type=int,
+        nargs='+',
+        default=[4, 16, 64])
+    parser.add_argument(
+        "--probes", help="number of random seeks", type=int, default=10000)
+    parser.add_argument(
+        "--repeat",
+        help="number of repetitions; the best time is reported",
+        type=int,
+        default=5)
+    parser.add_argument(
+        "--seed", help="seed of the random generator", type=int, default=0)
+
+    args = parser.parse_args()
+
+    print("{:<24} {:>8} {:>7} {:>7} {:>8} {:>12} {:>12}".format(
+        'dataset', 'interval', 'width', 'B/key', 'ratio', 'seek ns',
+        'bisect ns'))
+
+    rng = random.Random(args.seed)
+    for name, keys, width in keys_of_datasets(args.size, args.seed):
+        count = len(keys) // width
+        probes = [
+            keys[i * width:(i + 1) * width]
+            for i in (rng.randrange(count) for _ in range(args.probes))
+        ]
+        bisect_ns = measure_time(
+            functools.partial(search_all, keys, probes), repeat=args.repeat)
+
+        for interval in args.restart_interval:
+            data = numenc.encode_block(keys, interval, width)
+            block = numenc.KeyBlock(data)
+            assert len(block) == count
+
+            seek_ns = measure_time(
+                functools.partial(seek_all, block, probes), repeat=args.repeat)
+
+            print("{:<24} {:>8} {:>7} {:>7.2f} {:>7.2f}x {:>12.1f} "
+                  "{:>12.1f}".format(name, interval, width,
+                                     len(data) / count,
+                                     len(keys) / len(data),
+                                     seek_ns / len(probes),
+                                     bisect_ns / len(probes)))
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
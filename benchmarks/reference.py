@@ -0,0 +1,59 @@
+"""Provide a pure-Python reference implementation of the numenc encoding."""
+import struct
+from typing import Callable, Tuple
+
+from benchmarks.catalog import Number, TypeInfo
+
+
+def codec(tajp: TypeInfo
+          ) -> Tuple[Callable[[Number], bytes], Callable[[bytes], Number]]:
+    """
+    Create the pure-Python encoder and decoder for the given type.
+
+    :param tajp: type of the numbers
+    :return: encoder and decoder
+    """
+    width = tajp.width
+    bits = 8 * width
+    sign_bit = 1 << (bits - 1)
+    mask = (1 << bits) - 1
+
+    if tajp.is_float:
+        float_struct = struct.Struct('>' + tajp.struct_code)
+        uint_struct = struct.Struct('>' + ('I' if width == 4 else 'Q'))
+
+        def encode_float(value: Number) -> bytes:
+            (raw, ) = uint_struct.unpack(float_struct.pack(value))
+            if value >= 0:
+                raw |= sign_bit
+            else:
+                raw = ~raw & mask
+            return uint_struct.pack(raw)
+
+        def decode_float(key: bytes) -> Number:
+            (raw, ) = uint_struct.unpack(key)
+            if raw & sign_bit:
+                raw ^= sign_bit
+            else:
+                raw = ~raw & mask
+            return float_struct.unpack(uint_struct.pack(raw))[0]
+
+        return encode_float, decode_float
+
+    if tajp.signed:
+
+        def encode_signed(value: Number) -> bytes:
+            return (int(value) + sign_bit).to_bytes(width, 'big')
+
+        def decode_signed(key: bytes) -> Number:
+            return int.from_bytes(key, 'big') - sign_bit
+
+        return encode_signed, decode_signed
+
+    def encode_unsigned(value: Number) -> bytes:
+        return int(value).to_bytes(width, 'big')
+
+    def decode_unsigned(key: bytes) -> Number:
+        return int.from_bytes(key, 'big')
+
+    return encode_unsigned, decode_unsigned
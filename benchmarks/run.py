@@ -0,0 +1,340 @@
+#!/usr/bin/env python3
+"""
+Benchmark numenc against struct, int.to_bytes and a pure-Python reference.
+
+Build the extension in place and run the benchmarks from the repository root:
+
+    python3 setup.py build_ext --inplace
+    python3 -m benchmarks.run --output results.json
+
+Compare two runs (e.g., of two versions) with ``benchmarks.compare``.
+"""
+import argparse
+import array
+import datetime
+import gc
+import json
+import platform
+import struct
+import sys
+import time
+from typing import Any, Callable, Dict, List, NamedTuple
+
+import numenc
+import pynumenc_meta
+
+from benchmarks import datasets, reference
+from benchmarks.catalog import TYPES, TYPES_BY_NAME, Number, TypeInfo
+
+SHAPES = ('scalar', 'batch', 'array', 'into')
+
+Case = NamedTuple('Case', [('shape', str), ('direction', str),
+                           ('implementation', str),
+                           ('func', Callable[[], Any])])
+
+
+def scalar_cases(tajp: TypeInfo, values: List[Number]) -> List[Case]:
+    """Create the cases converting one number per call."""
+    encode = getattr(numenc, 'from_{}'.format(tajp.name))
+    decode = getattr(numenc, 'to_{}'.format(tajp.name))
+    keys = [encode(value) for value in values]
+
+    packer = struct.Struct('>' + tajp.struct_code)
+    pack = packer.pack
+    unpack = packer.unpack
+    packed = [pack(value) for value in values]
+
+    ref_encode, ref_decode = reference.codec(tajp)
+
+    # yapf: disable
+    cases = [
+        Case('scalar', 'encode', 'numenc',
+             lambda: [encode(value) for value in values]),
+        Case('scalar', 'encode', 'struct',
+             lambda: [pack(value) for value in values]),
+        Case('scalar', 'encode', 'reference',
+             lambda: [ref_encode(value) for value in values]),
+        Case('scalar', 'decode', 'numenc',
+             lambda: [decode(key) for key in keys]),
+        Case('scalar', 'decode', 'struct',
+             lambda: [unpack(key)[0] for key in packed]),
+        Case('scalar', 'decode', 'reference',
+             lambda: [ref_decode(key) for key in keys]),
+    ]
+    # yapf: enable
+
+    if not tajp.is_float:
+        width = tajp.width
+        signed = tajp.signed
+        ints = [int(value) for value in values]
+        int_keys = [
+            value.to_bytes(width, 'big', signed=signed) for value in ints
+        ]
+
+        # yapf: disable
+        cases.extend([
+            Case('scalar', 'encode', 'int.to_bytes',
+                 lambda: [value.to_bytes(width, 'big', signed=signed)
+                          for value in ints]),
+            Case('scalar', 'decode', 'int.from_bytes',
+                 lambda: [int.from_bytes(key, 'big', signed=signed)
+                          for key in int_keys]),
+        ])
+        # yapf: enable
+
+    return cases
+
+
+def batch_cases(tajp: TypeInfo, values: List[Number]) -> List[Case]:
+    """Create the cases converting all the numbers in a single call."""
+    encode_many = getattr(numenc, 'from_{}_many'.format(tajp.name))
+    decode_many = getattr(numenc, 'to_{}_many'.format(tajp.name))
+    keys = encode_many(values)
+
+    packer = struct.Struct('>{}{}'.format(len(values), tajp.struct_code))
+    packed = packer.pack(*values)
+
+    ref_encode, _ = reference.codec(tajp)
+
+    # yapf: disable
+    return [
+        Case('batch', 'encode', 'numenc', lambda: encode_many(values)),
+        Case('batch', 'encode', 'struct', lambda: packer.pack(*values)),
+        Case('batch', 'encode', 'reference',
+             lambda: b''.join([ref_encode(value) for value in values])),
+        Case('batch', 'decode', 'numenc', lambda: decode_many(keys)),
+        Case('batch', 'decode', 'struct', lambda: packer.unpack(packed)),
+    ]
+    # yapf: enable
+
+
+def array_cases(tajp: TypeInfo, values: List[Number]) -> List[Case]:
+    """Create the cases converting typed arrays."""
+    arr = array.array(tajp.array_code, values)
+    keys = numenc.encode_array(arr)
+
+    def dump_big_endian() -> bytes:
+        copy = array.array(tajp.array_code, arr)
+        copy.byteswap()
+        return copy.tobytes()
+
+    swapped = dump_big_endian()
+
+    def load_big_endian() -> array.array:
+        loaded = array.array(tajp.array_code)
+        loaded.frombytes(swapped)
+        loaded.byteswap()
+        return loaded
+
+    # yapf: disable
+    return [
+        Case('array', 'encode', 'numenc', lambda: numenc.encode_array(arr)),
+        Case('array', 'encode', 'array.byteswap', dump_big_endian),
+        Case('array', 'decode', 'numenc',
+             lambda: numenc.decode_array(keys, tajp.name)),
+        Case('array', 'decode', 'array.byteswap', load_big_endian),
+    ]
+    # yapf: enable
+
+
+def into_cases(tajp: TypeInfo, values: List[Number]) -> List[Case]:
+    """Create the cases writing into and reading from a preallocated page."""
+    encode_into = getattr(numenc, 'from_{}_into'.format(tajp.name))
+    decode_from = getattr(numenc, 'to_{}_from'.format(tajp.name))
+
+    width = tajp.width
+    offsets = range(0, width * len(values), width)
+    page = bytearray(width * len(values))
+
+    packer = struct.Struct('>' + tajp.struct_code)
+    pack_into = packer.pack_into
+    unpack_from = packer.unpack_from
+
+    def numenc_encode() -> bytearray:
+        for offset, value in zip(offsets, values):
+            encode_into(value, page, offset)
+        return page
+
+    def struct_encode() -> bytearray:
+        for offset, value in zip(offsets, values):
+            pack_into(page, offset, value)
+        return page
+
+    # yapf: disable
+    return [
+        Case('into', 'encode', 'numenc', numenc_encode),
+        Case('into', 'encode', 'struct', struct_encode),
+        Case('into', 'decode', 'numenc',
+             lambda: [decode_from(page, offset) for offset in offsets]),
+        Case('into', 'decode', 'struct',
+             lambda: [unpack_from(page, offset)[0] for offset in offsets]),
+    ]
+    # yapf: enable
+
+
+CASE_FACTORIES = {
+    'scalar': scalar_cases,
+    'batch': batch_cases,
+    'array': array_cases,
+    'into': into_cases
+}
+
+
+def measure_time(func: Callable[[], Any], repeat: int) -> int:
+    """Return the best wall time of the repeated calls in nanoseconds."""
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter_ns()
+        func()
+        duration = time.perf_counter_ns() - start
+
+        if best is None or duration < best:
+            best = duration
+
+    assert best is not None
+    return best
+
+
+def measure_allocations(func: Callable[[], Any]) -> int:
+    """
+    Count the memory blocks allocated by a call whose result is kept alive.
+
+    The count reflects the objects (e.g., bytes or int objects) created by
+    the call. Temporary allocations freed before the call returns are
+    not included.
+    """
+    gc.collect()
+    gc.disable()
+    try:
+        before = sys.getallocatedblocks()
+        result = func()
+        after = sys.getallocatedblocks()
+    finally:
+        gc.enable()
+
+    del result
+    return after - before
+
+
+def check_reference(tajp: TypeInfo, values: List[Number]) -> None:
+    """Assert that numenc and the reference implementation agree."""
+    ref_encode, _ = reference.codec(tajp)
+    encode_many = getattr(numenc, 'from_{}_many'.format(tajp.name))
+
+    sample = values[:1000]
+    if encode_many(sample) != b''.join(ref_encode(value) for value in sample):
+        raise AssertionError(
+            "numenc and the reference implementation disagree on {}".format(
+                tajp.name))
+
+
+def run(types: List[TypeInfo], distributions: List[str], shapes: List[str],
+        size: int, repeat: int, seed: int) -> List[Dict[str, Any]]:
+    """Run the benchmarks and return the results."""
+    # pylint: disable=too-many-arguments,too-many-locals
+    results = []  # type: List[Dict[str, Any]]
+
+    for tajp in types:
+        for distribution in distributions:
+            values = datasets.generate(
+                tajp=tajp, distribution=distribution, size=size, seed=seed)
+            if values is None:
+                continue
+
+            check_reference(tajp=tajp, values=values)
+
+            for shape in shapes:
+                for case in CASE_FACTORIES[shape](tajp, values):
+                    duration = measure_time(case.func, repeat=repeat)
+                    allocations = measure_allocations(case.func)
+
+                    result = {  # type: Dict[str, Any]
+                        'type': tajp.name,
+                        'distribution': distribution,
+                        'shape': case.shape,
+                        'direction': case.direction,
+                        'implementation': case.implementation,
+                        'count': len(values),
+                        'ns_per_op': duration / len(values),
+                        'keys_per_s': len(values) * 1e9 / max(duration, 1),
+                        'allocations_per_op': allocations / len(values)
+                    }
+                    results.append(result)
+
+                    print(
+                        "{type:<8} {distribution:<11} {shape:<7} "
+                        "{direction:<7} {implementation:<15} "
+                        "{ns_per_op:>9.1f} ns/op {keys_per_s:>14,.0f} keys/s "
+                        "{allocations_per_op:>6.2f} allocs/op".format(**result),
+                        flush=True)
+
+    return results
+
+
+def main() -> int:
+    """Execute the main routine."""
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument(
+        "--size", help="number of keys per dataset", type=int, default=100000)
+    parser.add_argument(
+        "--repeat",
+        help="number of repetitions; the best time is reported",
+        type=int,
+        default=5)
+    parser.add_argument(
+        "--seed", help="seed of the random generator", type=int, default=0)
+    parser.add_argument(
+        "--types",
+        help="types to benchmark",
+        nargs='+',
+        choices=[tajp.name for tajp in TYPES],
+        default=[tajp.name for tajp in TYPES])
+    parser.add_argument(
+        "--distributions",
+        help="distributions of the numbers to benchmark",
+        nargs='+',
+        choices=datasets.DISTRIBUTIONS,
+        default=list(datasets.DISTRIBUTIONS))
+    parser.add_argument(
+        "--shapes",
+        help="call shapes to benchmark",
+        nargs='+',
+        choices=SHAPES,
+        default=list(SHAPES))
+    parser.add_argument(
+        "--output", help="path to the JSON file to store the results to")
+
+    args = parser.parse_args()
+
+    results = run(
+        types=[TYPES_BY_NAME[name] for name in args.types],
+        distributions=args.distributions,
+        shapes=args.shapes,
+        size=args.size,
+        repeat=args.repeat,
+        seed=args.seed)
+
+    if args.output:
+        report = {
+            'meta': {
+                'numenc_version': pynumenc_meta.__version__,
+                'python': platform.python_version(),
+                'implementation': platform.python_implementation(),
+                'platform': platform.platform(),
+                'machine': platform.machine(),
+                'timestamp': datetime.datetime.utcnow().isoformat() + 'Z',
+                'size': args.size,
+                'repeat': args.repeat,
+                'seed': args.seed
+            },
+            'results': results
+        }
+
+        with open(args.output, 'wt') as fid:
+            json.dump(report, fid, indent=2, sort_keys=True)
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
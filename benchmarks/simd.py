@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+Compare the vector kernels of the typed-buffer conversions.
+
+Build the extension in place and run the benchmark from the repository root:
+
+    python3 setup.py build_ext --inplace
+    python3 -m benchmarks.simd
+"""
+import argparse
+import array
+import functools
+import random
+import sys
+
+import numenc
+
+from benchmarks.run import measure_time
+
+TYPES = [('h', 'int16'), ('i', 'int32'), ('q', 'int64'), ('f', 'float32'),
+         ('d', 'float64')]
+
+
+def main() -> int:
+    """Execute the main routine."""
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument(
+        "--size",
+        help="number of numbers per array; the default fits in the cache "
+        "so that the kernels rather than the memory are measured",
+        type=int,
+        default=20 * 1000)
+    parser.add_argument(
+        "--repeat",
+        help="number of repetitions; the best time is reported",
+        type=int,
+        default=200)
+    parser.add_argument(
+        "--seed", help="seed of the random generator", type=int, default=0)
+
+    args = parser.parse_args()
+
+    generator = random.Random(args.seed)
+    kernels = numenc.simd_kernels()
+    fastest = numenc.get_simd()
+
+    print("{:<8} {:<7} {:<8} {:>8} {:>8}".format('type', 'dir.', 'kernels',
+                                                 'ns/num', 'speedup'))
+    try:
+        for typecode, tajp in TYPES:
+            values = array.array(typecode, [
+                generator.uniform(-1e6, 1e6)
+                if typecode in 'fd' else generator.randint(-10000, 10000)
+                for _ in range(args.size)
+            ])
+            keys = numenc.encode_array(values)
+
+            cases = (('encode', functools.partial(numenc.encode_array, values)),
+                     ('decode',
+                      functools.partial(numenc.decode_array, keys, tajp)))
+            for direction, func in cases:
+                baseline = None
+                for name in kernels:
+                    numenc.set_simd(name)
+                    duration = measure_time(func, repeat=args.repeat)
+                    if baseline is None:
+                        baseline = duration
+
+                    print("{:<8} {:<7} {:<8} {:>8.2f} {:>7.2f}x".format(
+                        tajp, direction, name, duration / args.size,
+                        baseline / duration))
+    finally:
+        numenc.set_simd(fastest)
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
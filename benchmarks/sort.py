@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""
+Compare the radix sorts of numenc with sorted() and numpy.
+
+Build the extension in place and run the benchmark from the repository root:
+
+    python3 setup.py build_ext --inplace
+    python3 -m benchmarks.sort
+
+The sorts in place are measured on a fresh copy of the input, so the times
+include the copy.
+"""
+import argparse
+import array
+import functools
+import sys
+from typing import Any, Callable, List, Optional
+
+import numenc
+
+from benchmarks import datasets
+from benchmarks.catalog import TYPES_BY_NAME
+from benchmarks.run import measure_time
+
+try:
+    import numpy
+except ImportError:
+    numpy = None  # type: ignore
+
+TYPES = ('int32', 'int64', 'float64')
+
+
+def sort_packed(keys: bytes, width: int) -> None:
+    """Radix-sort a copy of the concatenated keys."""
+    numenc.sort_packed(bytearray(keys), width)
+
+
+def sort_key_list(keys: bytes, width: int) -> None:
+    """Sort the keys as a list of bytes objects."""
+    sorted(keys[i:i + width] for i in range(0, len(keys), width))
+
+
+def sort_array(values: array.array) -> None:
+    """Radix-sort a copy of the typed buffer."""
+    numenc.sort_array(array.array(values.typecode, values))
+
+
+def main() -> int:
+    """Execute the main routine."""
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument(
+        "--size", help="number of keys per dataset", type=int, default=100000)
+    parser.add_argument(
+        "--repeat",
+        help="number of repetitions; the best time is reported",
+        type=int,
+        default=5)
+    parser.add_argument(
+        "--seed", help="seed of the random generator", type=int, default=0)
+
+    args = parser.parse_args()
+
+    columns = [
+        'sort_packed', 'sorted()', 'argsort_packed', 'np.argsort', 'sort_array',
+        'np.sort'
+    ]
+    print("{:<8} {:<11} ".format('type', 'dist.') + ' '.join(
+        '{:>14}'.format(column) for column in columns))
+    print("{:<20} ".format('') + ' '.join('{:>14}'.format('ms')
+                                          for _ in columns))
+
+    for name in TYPES:
+        tajp = TYPES_BY_NAME[name]
+        for distribution in datasets.DISTRIBUTIONS:
+            numbers = datasets.generate(
+                tajp=tajp,
+                distribution=distribution,
+                size=args.size,
+                seed=args.seed)
+            if numbers is None:
+                continue
+
+            values = array.array(tajp.array_code, numbers)
+            keys = numenc.encode_array(values)
+
+            funcs = [
+                functools.partial(sort_packed, keys, tajp.width),
+                functools.partial(sort_key_list, keys, tajp.width),
+                functools.partial(numenc.argsort_packed, keys, tajp.width),
+                None,
+                functools.partial(sort_array, values),
+                None,
+            ]  # type: List[Optional[Callable[[], Any]]]
+            if numpy is not None:
+                ndarray = numpy.array(values)
+                funcs[3] = functools.partial(
+                    numpy.argsort, ndarray, kind='stable')
+                funcs[5] = functools.partial(numpy.sort, ndarray)
+
+            cells = []  # type: List[str]
+            for func in funcs:
+                if func is None:
+                    cells.append('{:>14}'.format('-'))
+                else:
+                    duration = measure_time(func, repeat=args.repeat)
+                    cells.append('{:>14.2f}'.format(duration / 1e6))
+
+            print("{:<8} {:<11} ".format(name, distribution) + ' '.join(cells))
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
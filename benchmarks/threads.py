@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+Measure the speedup of the typed-buffer conversions and the search over
+the threads.
+
+Build the extension in place and run the benchmark from the repository root:
+
+    python3 setup.py build_ext --inplace
+    python3 -m benchmarks.threads --max-threads 8
+"""
+import argparse
+import array
+import functools
+import os
+import random
+import sys
+
+import numenc
+
+from benchmarks.run import measure_time
+
+
+def main() -> int:
+    """Execute the main routine."""
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument(
+        "--size",
+        help="number of keys per array",
+        type=int,
+        default=10 * 1000 * 1000)
+    parser.add_argument(
+        "--max-threads",
+        help="largest number of threads to measure; "
+        "defaults to the number of CPUs",
+        type=int,
+        default=os.cpu_count() or 1)
+    parser.add_argument(
+        "--repeat",
+        help="number of repetitions; the best time is reported",
+        type=int,
+        default=5)
+    parser.add_argument(
+        "--seed", help="seed of the random generator", type=int, default=0)
+
+    args = parser.parse_args()
+
+    values = array.array('q')
+    values.frombytes(
+        random.Random(args.seed).getrandbits(64 * args.size).to_bytes(
+            8 * args.size, 'little'))
+    keys = numenc.encode_array(values)
+    sorted_keys = bytearray(keys)
+    numenc.sort_packed(sorted_keys, 8)
+
+    print("{:<17} {:>7} {:>10} {:>8}".format('function', 'threads', 'ns/key',
+                                             'speedup'))
+
+    cases = (('encode_array', functools.partial(numenc.encode_array, values)),
+             ('decode_array',
+              functools.partial(numenc.decode_array, keys, 'int64')),
+             ('searchsorted_many',
+              functools.partial(numenc.searchsorted_many, sorted_keys, keys,
+                                8)))
+    for name, func in cases:
+        baseline = None
+        for threads in range(1, args.max_threads + 1):
+            duration = measure_time(
+                functools.partial(func, threads=threads), repeat=args.repeat)
+            if baseline is None:
+                baseline = duration
+
+            print("{:<17} {:>7} {:>10.2f} {:>7.2f}x".format(
+                name, threads, duration / args.size, baseline / duration))
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
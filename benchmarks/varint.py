@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""
+Compare the storage and the throughput of varints and fixed-width keys.
+
+Build the extension in place and run the benchmark from the repository root:
+
+    python3 setup.py build_ext --inplace
+    python3 -m benchmarks.varint
+"""
+import argparse
+import functools
+import sys
+
+import numenc
+
+from benchmarks import datasets
+from benchmarks.catalog import TYPES_BY_NAME
+from benchmarks.run import measure_time
+
+# fixed-width type and the corresponding variable-length type
+PAIRS = (('int64', 'varint'), ('uint64', 'varuint'))
+
+
+def main() -> int:
+    """Execute the main routine."""
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument(
+        "--size", help="number of keys per dataset", type=int, default=100000)
+    parser.add_argument(
+        "--repeat",
+        help="number of repetitions; the best time is reported",
+        type=int,
+        default=5)
+    parser.add_argument(
+        "--seed", help="seed of the random generator", type=int, default=0)
+
+    args = parser.parse_args()
+
+    print("{:<8} {:<11} {:>7} {:>9} {:>14} {:>14}".format(
+        'type', 'dist.', 'B/key', 'vs fixed', 'encode ns/key', 'decode ns/key'))
+
+    for fixed, variable in PAIRS:
+        for distribution in datasets.DISTRIBUTIONS:
+            values = datasets.generate(
+                tajp=TYPES_BY_NAME[fixed],
+                distribution=distribution,
+                size=args.size,
+                seed=args.seed)
+            if values is None:
+                continue
+
+            fixed_size = len(values) * TYPES_BY_NAME[fixed].width
+            for name in [fixed, variable]:
+                encode = getattr(numenc, 'from_{}_many'.format(name))
+                decode = getattr(numenc, 'to_{}_many'.format(name))
+
+                keys = encode(values)
+                assert decode(keys) == values
+
+                encode_ns = measure_time(
+                    functools.partial(encode, values), repeat=args.repeat)
+                decode_ns = measure_time(
+                    functools.partial(decode, keys), repeat=args.repeat)
+
+                print("{:<8} {:<11} {:>7.2f} {:>8.2f}x {:>14.1f} "
+                      "{:>14.1f}".format(name, distribution,
+                                         len(keys) / len(values),
+                                         fixed_size / max(len(keys), 1),
+                                         encode_ns / len(values),
+                                         decode_ns / len(values)))
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
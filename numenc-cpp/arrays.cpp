@@ -0,0 +1,454 @@
+#include "numenc.h"
+
+// Copy width bytes of a native value from in to out, reversing their
+// order if the value is stored in the non-native byte order.
+static inline void load_native(
+        void* out, const unsigned char* in, size_t width, int swap) {
+    if (!swap) {
+        memcpy(out, in, width);
+    } else {
+        unsigned char* bytes = (unsigned char* ) out;
+        for (size_t i = 0; i < width; i++) {
+            bytes[i] = in[width - 1 - i];
+        }
+    }
+}
+
+#define NUMENC_ENCODE_NATIVE_LOOP(ctype, encode_raw) \
+    for (Py_ssize_t i = 0; i < count; i++) { \
+        ctype value; \
+        load_native(& value, in + i * sizeof(ctype), sizeof(ctype), swap); \
+        encode_raw(value, out + i * sizeof(ctype)); \
+    }
+
+#define NUMENC_DECODE_NATIVE_LOOP(ctype, decode_raw) \
+    for (Py_ssize_t i = 0; i < count; i++) { \
+        ctype value = decode_raw(in + i * sizeof(ctype)); \
+        memcpy(out + i * sizeof(ctype), & value, sizeof(ctype)); \
+    }
+
+void numenc_encode_native(int type, const unsigned char* in,
+        unsigned char* out, Py_ssize_t count, int swap) {
+    const struct numenc_simd* simd = numenc_simd_kernels;
+    if (simd->encode != NULL) {
+        const Py_ssize_t done = simd->encode(type, in, out, count, swap);
+        in += done * NUMENC_CODECS[type].width;
+        out += done * NUMENC_CODECS[type].width;
+        count -= done;
+    }
+
+    switch (type) {
+        case NUMENC_INT8:
+            NUMENC_ENCODE_NATIVE_LOOP(int8_t, numenc_encode_int8_raw)
+            break;
+        case NUMENC_UINT8:
+            NUMENC_ENCODE_NATIVE_LOOP(uint8_t, numenc_encode_uint8_raw)
+            break;
+        case NUMENC_INT16:
+            NUMENC_ENCODE_NATIVE_LOOP(int16_t, numenc_encode_int16_raw)
+            break;
+        case NUMENC_UINT16:
+            NUMENC_ENCODE_NATIVE_LOOP(uint16_t, numenc_encode_uint16_raw)
+            break;
+        case NUMENC_INT32:
+            NUMENC_ENCODE_NATIVE_LOOP(int32_t, numenc_encode_int32_raw)
+            break;
+        case NUMENC_UINT32:
+            NUMENC_ENCODE_NATIVE_LOOP(uint32_t, numenc_encode_uint32_raw)
+            break;
+        case NUMENC_INT64:
+            NUMENC_ENCODE_NATIVE_LOOP(int64_t, numenc_encode_int64_raw)
+            break;
+        case NUMENC_UINT64:
+            NUMENC_ENCODE_NATIVE_LOOP(uint64_t, numenc_encode_uint64_raw)
+            break;
+        case NUMENC_FLOAT32:
+            NUMENC_ENCODE_NATIVE_LOOP(float, numenc_encode_float32_raw)
+            break;
+        case NUMENC_FLOAT64:
+            NUMENC_ENCODE_NATIVE_LOOP(double, numenc_encode_float64_raw)
+            break;
+    }
+}
+
+void numenc_decode_native(int type, const unsigned char* in,
+        unsigned char* out, Py_ssize_t count) {
+    const struct numenc_simd* simd = numenc_simd_kernels;
+    if (simd->decode != NULL) {
+        const Py_ssize_t done = simd->decode(type, in, out, count);
+        in += done * NUMENC_CODECS[type].width;
+        out += done * NUMENC_CODECS[type].width;
+        count -= done;
+    }
+
+    switch (type) {
+        case NUMENC_INT8:
+            NUMENC_DECODE_NATIVE_LOOP(int8_t, numenc_decode_int8_raw)
+            break;
+        case NUMENC_UINT8:
+            NUMENC_DECODE_NATIVE_LOOP(uint8_t, numenc_decode_uint8_raw)
+            break;
+        case NUMENC_INT16:
+            NUMENC_DECODE_NATIVE_LOOP(int16_t, numenc_decode_int16_raw)
+            break;
+        case NUMENC_UINT16:
+            NUMENC_DECODE_NATIVE_LOOP(uint16_t, numenc_decode_uint16_raw)
+            break;
+        case NUMENC_INT32:
+            NUMENC_DECODE_NATIVE_LOOP(int32_t, numenc_decode_int32_raw)
+            break;
+        case NUMENC_UINT32:
+            NUMENC_DECODE_NATIVE_LOOP(uint32_t, numenc_decode_uint32_raw)
+            break;
+        case NUMENC_INT64:
+            NUMENC_DECODE_NATIVE_LOOP(int64_t, numenc_decode_int64_raw)
+            break;
+        case NUMENC_UINT64:
+            NUMENC_DECODE_NATIVE_LOOP(uint64_t, numenc_decode_uint64_raw)
+            break;
+        case NUMENC_FLOAT32:
+            NUMENC_DECODE_NATIVE_LOOP(float, numenc_decode_float32_raw)
+            break;
+        case NUMENC_FLOAT64:
+            NUMENC_DECODE_NATIVE_LOOP(double, numenc_decode_float64_raw)
+            break;
+    }
+}
+
+// Arguments of the conversion kernels
+struct conversion {
+    int type;
+    const unsigned char* in;
+    unsigned char* out;
+    Py_ssize_t width;
+    int swap;
+};
+
+static Py_ssize_t encode_kernel(
+        void* arg, Py_ssize_t start, Py_ssize_t stop) {
+    const struct conversion* conversion = (const struct conversion* ) arg;
+    const Py_ssize_t offset = start * conversion->width;
+    numenc_encode_native(conversion->type, conversion->in + offset,
+        conversion->out + offset, stop - start, conversion->swap);
+    return stop;
+}
+
+static Py_ssize_t decode_kernel(
+        void* arg, Py_ssize_t start, Py_ssize_t stop) {
+    const struct conversion* conversion = (const struct conversion* ) arg;
+    const Py_ssize_t offset = start * conversion->width;
+    numenc_decode_native(conversion->type, conversion->in + offset,
+        conversion->out + offset, stop - start);
+    return stop;
+}
+
+void numenc_encode_native_parallel(int type, const unsigned char* in,
+        unsigned char* out, Py_ssize_t count, int swap, int threads) {
+    struct conversion conversion = {
+        type, in, out, NUMENC_CODECS[type].width, swap
+    };
+    Py_BEGIN_ALLOW_THREADS
+    numenc_run_parallel(encode_kernel, & conversion, count,
+        NUMENC_PARALLEL_GRAIN, threads);
+    Py_END_ALLOW_THREADS
+}
+
+void numenc_decode_native_parallel(int type, const unsigned char* in,
+        unsigned char* out, Py_ssize_t count, int threads) {
+    struct conversion conversion = {
+        type, in, out, NUMENC_CODECS[type].width, 0
+    };
+    Py_BEGIN_ALLOW_THREADS
+    numenc_run_parallel(decode_kernel, & conversion, count,
+        NUMENC_PARALLEL_GRAIN, threads);
+    Py_END_ALLOW_THREADS
+}
+
+int numenc_type_from_format(
+        const char* format, Py_ssize_t itemsize, int* swap) {
+    const char* code = (format == NULL) ? "B" : format;
+
+    // byte order, see the struct module
+    *swap = 0;
+    switch (code[0]) {
+        case '@':
+        case '=':
+            code++;
+            break;
+        case '<':
+            *swap = !numenc_is_little_endian();
+            code++;
+            break;
+        case '>':
+        case '!':
+            *swap = numenc_is_little_endian();
+            code++;
+            break;
+    }
+
+    if (code[0] != '\0' && code[1] == '\0') {
+        switch (code[0]) {
+            case 'b':
+            case 'h':
+            case 'i':
+            case 'l':
+            case 'q':
+            case 'n':
+                switch (itemsize) {
+                    case 1: return NUMENC_INT8;
+                    case 2: return NUMENC_INT16;
+                    case 4: return NUMENC_INT32;
+                    case 8: return NUMENC_INT64;
+                }
+                break;
+            case 'B':
+            case 'H':
+            case 'I':
+            case 'L':
+            case 'Q':
+            case 'N':
+                switch (itemsize) {
+                    case 1: return NUMENC_UINT8;
+                    case 2: return NUMENC_UINT16;
+                    case 4: return NUMENC_UINT32;
+                    case 8: return NUMENC_UINT64;
+                }
+                break;
+            case 'f':
+                if (itemsize == 4) {
+                    return NUMENC_FLOAT32;
+                }
+                break;
+            case 'd':
+                if (itemsize == 8) {
+                    return NUMENC_FLOAT64;
+                }
+                break;
+        }
+    }
+
+    PyErr_Format(PyExc_TypeError,
+        "Wrong input: unsupported buffer format %s with item size %zd.",
+        (format == NULL) ? "B" : format, itemsize);
+    return -1;
+}
+
+PyObject* numenc_new_array(
+        int type, Py_ssize_t count, const char* output, Py_buffer* view) {
+    const struct numenc_codec* codec = & NUMENC_CODECS[type];
+    PyObject* result = NULL;
+
+    if (strcmp(output, "array") == 0) {
+        static const char* const typecodes[NUMENC_TYPE_COUNT] = {
+            "b", "B", "h", "H",
+            sizeof(int) == 4 ? "i" : "l", sizeof(int) == 4 ? "I" : "L",
+            "q", "Q", "f", "d"
+        };
+        PyObject* array_module = PyImport_ImportModule("array");
+        if (array_module == NULL) {
+            return NULL;
+        }
+        PyObject* single = PyObject_CallMethod(
+            array_module, "array", "s[i]", typecodes[type], 0);
+        Py_DECREF(array_module);
+        if (single == NULL) {
+            return NULL;
+        }
+        result = PySequence_Repeat(single, count);
+        Py_DECREF(single);
+    } else {
+        PyObject* numpy = PyImport_ImportModule("numpy");
+        if (numpy == NULL) {
+            return NULL;
+        }
+        if (strcmp(output, "ndarray") == 0) {
+            result = PyObject_CallMethod(
+                numpy, "empty", "(n)s", count, codec->name);
+        } else if (strcmp(output, "uint8") == 0) {
+            result = PyObject_CallMethod(
+                numpy, "empty", "(nn)s", count, codec->width, "uint8");
+        } else if (strcmp(output, "S") == 0) {
+            PyObject* dtype = PyUnicode_FromFormat("S%zd", codec->width);
+            if (dtype != NULL) {
+                result = PyObject_CallMethod(
+                    numpy, "empty", "(n)O", count, dtype);
+                Py_DECREF(dtype);
+            }
+        }
+        Py_DECREF(numpy);
+    }
+
+    if (result == NULL) {
+        return NULL;
+    }
+
+    if (PyObject_GetBuffer(result, view, PyBUF_WRITABLE) != 0) {
+        Py_DECREF(result);
+        return NULL;
+    }
+    return result;
+}
+
+static PyObject* encode_array(
+        PyObject* self, PyObject* args, PyObject* kwargs) {
+    static const char* kwlist[] = {"values", "output", "threads", NULL};
+    PyObject* values;
+    const char* output = "bytes";
+    int threads = 1;
+
+    if (!PyArg_ParseTupleAndKeywords(args, kwargs, "O|si",
+            (char** ) kwlist, & values, & output, & threads)) {
+        return NULL;
+    }
+    if (numenc_check_threads(threads) != 0) {
+        return NULL;
+    }
+
+    if (strcmp(output, "bytes") != 0 && strcmp(output, "uint8") != 0 &&
+            strcmp(output, "S") != 0) {
+        return PyErr_Format(PyExc_ValueError,
+            "Illegal output: expected 'bytes', 'uint8' or 'S', got '%s'.",
+            output);
+    }
+
+    if (!PyObject_CheckBuffer(values)) {
+        return PyErr_Format(PyExc_TypeError,
+            "Wrong input: expected an object supporting "
+            "the buffer protocol.");
+    }
+
+    Py_buffer input;
+    if (PyObject_GetBuffer(values, & input,
+            PyBUF_FORMAT | PyBUF_C_CONTIGUOUS) != 0) {
+        return NULL;
+    }
+
+    int swap;
+    int type = numenc_type_from_format(
+        input.format, input.itemsize, & swap);
+    if (type < 0) {
+        PyBuffer_Release(& input);
+        return NULL;
+    }
+    const Py_ssize_t count = input.len / input.itemsize;
+
+    PyObject* result;
+    Py_buffer view;
+    if (strcmp(output, "bytes") == 0) {
+        result = PyBytes_FromStringAndSize(NULL, input.len);
+        if (result == NULL) {
+            PyBuffer_Release(& input);
+            return NULL;
+        }
+        numenc_encode_native_parallel(type,
+            (const unsigned char* ) input.buf,
+            (unsigned char* ) PyBytes_AS_STRING(result), count, swap,
+            threads);
+    } else {
+        result = numenc_new_array(type, count, output, & view);
+        if (result == NULL) {
+            PyBuffer_Release(& input);
+            return NULL;
+        }
+        numenc_encode_native_parallel(type,
+            (const unsigned char* ) input.buf, (unsigned char* ) view.buf,
+            count, swap, threads);
+        PyBuffer_Release(& view);
+    }
+
+    PyBuffer_Release(& input);
+    return result;
+}
+
+static PyObject* decode_array(
+        PyObject* self, PyObject* args, PyObject* kwargs) {
+    static const char* kwlist[] = {
+        "keys", "type", "output", "threads", NULL
+    };
+    PyObject* keys;
+    const char* type_name;
+    const char* output = "array";
+    int threads = 1;
+
+    if (!PyArg_ParseTupleAndKeywords(args, kwargs, "Os|si",
+            (char** ) kwlist, & keys, & type_name, & output, & threads)) {
+        return NULL;
+    }
+    if (numenc_check_threads(threads) != 0) {
+        return NULL;
+    }
+
+    int type = numenc_type_from_name(type_name);
+    if (type < 0) {
+        return NULL;
+    }
+
+    if (strcmp(output, "array") != 0 && strcmp(output, "ndarray") != 0) {
+        return PyErr_Format(PyExc_ValueError,
+            "Illegal output: expected 'array' or 'ndarray', got '%s'.",
+            output);
+    }
+
+    Py_buffer input;
+    if (numenc_get_buffer(keys, & input) != 0) {
+        return NULL;
+    }
+
+    const Py_ssize_t width = NUMENC_CODECS[type].width;
+    if (input.len % width != 0) {
+        PyErr_Format(PyExc_ValueError,
+            "Illegal input: expected a buffer whose length is a multiple "
+            "of %zd, got %zd.", width, input.len);
+        PyBuffer_Release(& input);
+        return NULL;
+    }
+    const Py_ssize_t count = input.len / width;
+
+    Py_buffer view;
+    PyObject* result = numenc_new_array(type, count, output, & view);
+    if (result == NULL) {
+        PyBuffer_Release(& input);
+        return NULL;
+    }
+
+    numenc_decode_native_parallel(type, (const unsigned char* ) input.buf,
+        (unsigned char* ) view.buf, count, threads);
+
+    PyBuffer_Release(& view);
+    PyBuffer_Release(& input);
+    return result;
+}
+
+static PyMethodDef ArrayMethods[] = {
+    {
+        "encode_array",
+        (PyCFunction)(void(*)(void)) encode_array,
+        METH_VARARGS | METH_KEYWORDS,
+        "Convert a typed buffer of numbers (e.g., array.array or "
+        "numpy.ndarray) to sortable bytes.\n\n"
+        "The type is determined by the buffer format. The output is either "
+        "'bytes' for concatenated keys, 'uint8' for a numpy.ndarray of shape "
+        "(N, width) or 'S' for a numpy.ndarray of fixed-width byte strings. "
+        "Large buffers are split among up to the given number of threads."
+    },
+    {
+        "decode_array",
+        (PyCFunction)(void(*)(void)) decode_array,
+        METH_VARARGS | METH_KEYWORDS,
+        "Convert concatenated sortable bytes back to a typed array of "
+        "the given type.\n\n"
+        "The output is either 'array' for an array.array or 'ndarray' for "
+        "a numpy.ndarray. Large buffers are split among up to the given "
+        "number of threads."
+    },
+    {
+        NULL,
+        NULL,
+        0,
+        NULL
+    }
+};
+
+int numenc_add_array_functions(PyObject* module) {
+    return PyModule_AddFunctions(module, ArrayMethods);
+}
@@ -0,0 +1,323 @@
+#include "numenc.h"
+
+// Encode every number of a list or a tuple into the preallocated output.
+static int encode_sequence(const struct numenc_codec* codec,
+        PyObject* values, Py_ssize_t count, unsigned char* out) {
+    for (Py_ssize_t i = 0; i < count; i++) {
+        // the item might run arbitrary code on conversion which could
+        // in turn mutate the list, so we re-check its size every time.
+        if (PySequence_Fast_GET_SIZE(values) != count) {
+            PyErr_SetString(PyExc_RuntimeError,
+                "The input changed size during iteration.");
+            return -1;
+        }
+        PyObject* item = PySequence_Fast_GET_ITEM(values, i);
+        Py_INCREF(item);
+        int result = codec->encode(item, out + i * codec->width);
+        Py_DECREF(item);
+        if (result != 0) {
+            numenc_annotate_index(i);
+            return -1;
+        }
+    }
+    return 0;
+}
+
+PyObject* numenc_encode_many(
+        const struct numenc_codec* codec, PyObject* values) {
+    const Py_ssize_t width = codec->width;
+
+    if (PyList_CheckExact(values) || PyTuple_CheckExact(values)) {
+        Py_ssize_t count = PySequence_Fast_GET_SIZE(values);
+        if (count > PY_SSIZE_T_MAX / width) {
+            return PyErr_NoMemory();
+        }
+        PyObject* output = PyBytes_FromStringAndSize(NULL, count * width);
+        if (output == NULL) {
+            return NULL;
+        }
+        unsigned char* out = (unsigned char* ) PyBytes_AS_STRING(output);
+        if (encode_sequence(codec, values, count, out) != 0) {
+            Py_DECREF(output);
+            return NULL;
+        }
+        return output;
+    }
+
+    PyObject* iterator = PyObject_GetIter(values);
+    if (iterator == NULL) {
+        PyErr_Clear();
+        return PyErr_Format(PyExc_TypeError,
+            "Wrong input: expected an iterable of numbers.");
+    }
+
+    Py_ssize_t capacity = PyObject_LengthHint(values, 64);
+    if (capacity < 0) {
+        Py_DECREF(iterator);
+        return NULL;
+    }
+    if (capacity == 0) {
+        capacity = 64;
+    }
+    if (capacity > PY_SSIZE_T_MAX / width) {
+        Py_DECREF(iterator);
+        return PyErr_NoMemory();
+    }
+
+    PyObject* output = PyBytes_FromStringAndSize(NULL, capacity * width);
+    if (output == NULL) {
+        Py_DECREF(iterator);
+        return NULL;
+    }
+
+    Py_ssize_t count = 0;
+    PyObject* item;
+    while ((item = PyIter_Next(iterator)) != NULL) {
+        if (count == capacity) {
+            if (capacity > PY_SSIZE_T_MAX / 2 / width) {
+                Py_DECREF(item);
+                Py_DECREF(iterator);
+                Py_DECREF(output);
+                return PyErr_NoMemory();
+            }
+            capacity *= 2;
+            if (_PyBytes_Resize(& output, capacity * width) != 0) {
+                Py_DECREF(item);
+                Py_DECREF(iterator);
+                return NULL;
+            }
+        }
+
+        unsigned char* out = (unsigned char* ) PyBytes_AS_STRING(output);
+        int result = codec->encode(item, out + count * width);
+        Py_DECREF(item);
+        if (result != 0) {
+            numenc_annotate_index(count);
+            Py_DECREF(iterator);
+            Py_DECREF(output);
+            return NULL;
+        }
+        count++;
+    }
+    Py_DECREF(iterator);
+
+    if (PyErr_Occurred()) {
+        Py_DECREF(output);
+        return NULL;
+    }
+
+    if (count != capacity && _PyBytes_Resize(& output, count * width) != 0) {
+        return NULL;
+    }
+    return output;
+}
+
+PyObject* numenc_decode_many(
+        const struct numenc_codec* codec, PyObject* keys) {
+    Py_buffer view;
+    if (numenc_get_buffer(keys, & view) != 0) {
+        return NULL;
+    }
+
+    if (view.len % codec->width != 0) {
+        PyErr_Format(PyExc_ValueError,
+            "Illegal input: expected a buffer whose length is a multiple "
+            "of %zd, got %zd.", codec->width, view.len);
+        PyBuffer_Release(& view);
+        return NULL;
+    }
+
+    const Py_ssize_t count = view.len / codec->width;
+    const unsigned char* in = (const unsigned char* ) view.buf;
+
+    PyObject* output = PyList_New(count);
+    if (output == NULL) {
+        PyBuffer_Release(& view);
+        return NULL;
+    }
+
+    for (Py_ssize_t i = 0; i < count; i++) {
+        PyObject* item = codec->decode(in + i * codec->width);
+        if (item == NULL) {
+            Py_DECREF(output);
+            PyBuffer_Release(& view);
+            return NULL;
+        }
+        PyList_SET_ITEM(output, i, item);
+    }
+
+    PyBuffer_Release(& view);
+    return output;
+}
+
+#define NUMENC_BATCH_FUNCTIONS(type, code) \
+    static PyObject* from_##type##_many(PyObject* self, PyObject* values) { \
+        return numenc_encode_many(& NUMENC_CODECS[code], values); \
+    } \
+    static PyObject* to_##type##_many(PyObject* self, PyObject* keys) { \
+        return numenc_decode_many(& NUMENC_CODECS[code], keys); \
+    }
+
+NUMENC_BATCH_FUNCTIONS(int8, NUMENC_INT8)
+NUMENC_BATCH_FUNCTIONS(uint8, NUMENC_UINT8)
+NUMENC_BATCH_FUNCTIONS(int16, NUMENC_INT16)
+NUMENC_BATCH_FUNCTIONS(uint16, NUMENC_UINT16)
+NUMENC_BATCH_FUNCTIONS(int32, NUMENC_INT32)
+NUMENC_BATCH_FUNCTIONS(uint32, NUMENC_UINT32)
+NUMENC_BATCH_FUNCTIONS(int64, NUMENC_INT64)
+NUMENC_BATCH_FUNCTIONS(uint64, NUMENC_UINT64)
+NUMENC_BATCH_FUNCTIONS(float32, NUMENC_FLOAT32)
+NUMENC_BATCH_FUNCTIONS(float64, NUMENC_FLOAT64)
+
+static PyMethodDef BatchMethods[] = {
+    {
+        "from_int8_many",
+        from_int8_many,
+        METH_O,
+        "Convert an iterable of 8-bit signed integers to "
+        "concatenated sortable bytes"
+    },
+    {
+        "to_int8_many",
+        to_int8_many,
+        METH_O,
+        "Convert concatenated sortable bytes back to a list of "
+        "8-bit signed integers"
+    },
+    {
+        "from_uint8_many",
+        from_uint8_many,
+        METH_O,
+        "Convert an iterable of 8-bit unsigned integers to "
+        "concatenated sortable bytes"
+    },
+    {
+        "to_uint8_many",
+        to_uint8_many,
+        METH_O,
+        "Convert concatenated sortable bytes back to a list of "
+        "8-bit unsigned integers"
+    },
+    {
+        "from_int16_many",
+        from_int16_many,
+        METH_O,
+        "Convert an iterable of 16-bit signed integers to "
+        "concatenated sortable bytes"
+    },
+    {
+        "to_int16_many",
+        to_int16_many,
+        METH_O,
+        "Convert concatenated sortable bytes back to a list of "
+        "16-bit signed integers"
+    },
+    {
+        "from_uint16_many",
+        from_uint16_many,
+        METH_O,
+        "Convert an iterable of 16-bit unsigned integers to "
+        "concatenated sortable bytes"
+    },
+    {
+        "to_uint16_many",
+        to_uint16_many,
+        METH_O,
+        "Convert concatenated sortable bytes back to a list of "
+        "16-bit unsigned integers"
+    },
+    {
+        "from_int32_many",
+        from_int32_many,
+        METH_O,
+        "Convert an iterable of 32-bit signed integers to "
+        "concatenated sortable bytes"
+    },
+    {
+        "to_int32_many",
+        to_int32_many,
+        METH_O,
+        "Convert concatenated sortable bytes back to a list of "
+        "32-bit signed integers"
+    },
+    {
+        "from_uint32_many",
+        from_uint32_many,
+        METH_O,
+        "Convert an iterable of 32-bit unsigned integers to "
+        "concatenated sortable bytes"
+    },
+    {
+        "to_uint32_many",
+        to_uint32_many,
+        METH_O,
+        "Convert concatenated sortable bytes back to a list of "
+        "32-bit unsigned integers"
+    },
+    {
+        "from_int64_many",
+        from_int64_many,
+        METH_O,
+        "Convert an iterable of signed 64-bit integers to "
+        "concatenated sortable bytes"
+    },
+    {
+        "to_int64_many",
+        to_int64_many,
+        METH_O,
+        "Convert concatenated sortable bytes back to a list of "
+        "signed 64-bit integers"
+    },
+    {
+        "from_uint64_many",
+        from_uint64_many,
+        METH_O,
+        "Convert an iterable of unsigned 64-bit integers to "
+        "concatenated sortable bytes"
+    },
+    {
+        "to_uint64_many",
+        to_uint64_many,
+        METH_O,
+        "Convert concatenated sortable bytes back to a list of "
+        "unsigned 64-bit integers"
+    },
+    {
+        "from_float32_many",
+        from_float32_many,
+        METH_O,
+        "Convert an iterable of 32-bit floats to "
+        "concatenated sortable bytes"
+    },
+    {
+        "to_float32_many",
+        to_float32_many,
+        METH_O,
+        "Convert concatenated sortable bytes back to a list of "
+        "32-bit floats"
+    },
+    {
+        "from_float64_many",
+        from_float64_many,
+        METH_O,
+        "Convert an iterable of 64-bit floats to "
+        "concatenated sortable bytes"
+    },
+    {
+        "to_float64_many",
+        to_float64_many,
+        METH_O,
+        "Convert concatenated sortable bytes back to a list of "
+        "64-bit floats"
+    },
+    {
+        NULL,
+        NULL,
+        0,
+        NULL
+    }
+};
+
+int numenc_add_batch_functions(PyObject* module) {
+    return PyModule_AddFunctions(module, BatchMethods);
+}
@@ -0,0 +1,339 @@
+#include "numenc.h"
+
+#include <limits.h>
+
+// The converters below accept the same inputs and raise the same errors
+// as the corresponding from_TYPE functions.
+
+static int encode_int8(PyObject* value, unsigned char* out) {
+    long input = PyLong_AsLong(value);
+    if ((input == -1 && PyErr_Occurred()) ||
+            input < INT_MIN || input > INT_MAX) {
+        PyErr_Clear();
+        PyErr_SetString(PyExc_TypeError,
+            "Wrong input type: expected integer.");
+        return -1;
+    }
+    if (input < -128 || input > 127) {
+        PyErr_Format(PyExc_ValueError,
+            "expected 8-bit signed integer (range [-128, 127]), "
+            "got %d.", (int) input);
+        return -1;
+    }
+    numenc_encode_int8_raw((int8_t) input, out);
+    return 0;
+}
+
+static int encode_uint8(PyObject* value, unsigned char* out) {
+    long input = PyLong_AsLong(value);
+    if ((input == -1 && PyErr_Occurred()) ||
+            input < INT_MIN || input > INT_MAX) {
+        PyErr_Clear();
+        PyErr_SetString(PyExc_TypeError,
+            "Wrong input type: expected integer.");
+        return -1;
+    }
+    if (input < 0 || input > 255) {
+        PyErr_Format(PyExc_ValueError,
+            "expected 8-bit unsigned integer (range [0, 255]), "
+            "got %d.", (int) input);
+        return -1;
+    }
+    numenc_encode_uint8_raw((uint8_t) input, out);
+    return 0;
+}
+
+static int encode_int16(PyObject* value, unsigned char* out) {
+    long input = PyLong_AsLong(value);
+    if ((input == -1 && PyErr_Occurred()) ||
+            input < INT16_MIN || input > INT16_MAX) {
+        PyErr_Clear();
+        PyErr_SetString(PyExc_TypeError,
+            "Wrong input: expected signed 16-bit integer.");
+        return -1;
+    }
+    numenc_encode_int16_raw((int16_t) input, out);
+    return 0;
+}
+
+static int encode_uint16(PyObject* value, unsigned char* out) {
+    long input = PyLong_AsLong(value);
+    if ((input == -1 && PyErr_Occurred()) ||
+            input < INT_MIN || input > INT_MAX) {
+        PyErr_Clear();
+        PyErr_SetString(PyExc_TypeError,
+            "Wrong input type: expected integer.");
+        return -1;
+    }
+    if (input < 0 || input > 65535) {
+        PyErr_Format(PyExc_ValueError,
+            "expected 16-bit unsigned integer (range [0, 65535]), "
+            "got %d.", (int) input);
+        return -1;
+    }
+    numenc_encode_uint16_raw((uint16_t) input, out);
+    return 0;
+}
+
+static int encode_int32(PyObject* value, unsigned char* out) {
+    long input = PyLong_AsLong(value);
+    if ((input == -1 && PyErr_Occurred()) ||
+            input < INT32_MIN || input > INT32_MAX) {
+        PyErr_Clear();
+        PyErr_SetString(PyExc_TypeError,
+            "Wrong input: expected signed 32-bit integer.");
+        return -1;
+    }
+    numenc_encode_int32_raw((int32_t) input, out);
+    return 0;
+}
+
+static int encode_uint32(PyObject* value, unsigned char* out) {
+    long long input = PyLong_AsLongLong(value);
+    if (input == -1 && PyErr_Occurred()) {
+        PyErr_Clear();
+        PyErr_SetString(PyExc_TypeError,
+            "Wrong input type: expected integer.");
+        return -1;
+    }
+    if (input < 0 || input > 4294967295) {
+        PyErr_Format(PyExc_ValueError,
+            "expected 32-bit unsigned integer (range [0, 4294967295]),"
+            " got %lld.", input);
+        return -1;
+    }
+    numenc_encode_uint32_raw((uint32_t) input, out);
+    return 0;
+}
+
+static int encode_int64(PyObject* value, unsigned char* out) {
+    long long input = PyLong_AsLongLong(value);
+    if (input == -1 && PyErr_Occurred()) {
+        PyErr_Clear();
+        PyErr_SetString(PyExc_TypeError,
+            "Wrong input: expected signed 64-bit integer.");
+        return -1;
+    }
+    numenc_encode_int64_raw((int64_t) input, out);
+    return 0;
+}
+
+static int encode_uint64(PyObject* value, unsigned char* out) {
+    unsigned long long input = PyLong_AsUnsignedLongLong(value);
+    if (input == (unsigned long long) -1 && PyErr_Occurred()) {
+        PyErr_Clear();
+        PyErr_SetString(PyExc_TypeError,
+            "Wrong input: expected unsigned 64-bit integer.");
+        return -1;
+    }
+    numenc_encode_uint64_raw((uint64_t) input, out);
+    return 0;
+}
+
+static int encode_float32(PyObject* value, unsigned char* out) {
+    double input;
+    if (PyFloat_CheckExact(value)) {
+        input = PyFloat_AS_DOUBLE(value);
+    } else {
+        input = PyFloat_AsDouble(value);
+        if (input == -1.0 && PyErr_Occurred()) {
+            PyErr_Clear();
+            PyErr_SetString(PyExc_TypeError,
+                "Wrong input: expected 32-bit float.");
+            return -1;
+        }
+    }
+    numenc_encode_float32_raw((float) input, out);
+    return 0;
+}
+
+static int encode_float64(PyObject* value, unsigned char* out) {
+    double input;
+    if (PyFloat_CheckExact(value)) {
+        input = PyFloat_AS_DOUBLE(value);
+    } else {
+        input = PyFloat_AsDouble(value);
+        if (input == -1.0 && PyErr_Occurred()) {
+            PyErr_Clear();
+            PyErr_SetString(PyExc_TypeError,
+                "Wrong input: expected 64-bit float.");
+            return -1;
+        }
+    }
+    numenc_encode_float64_raw(input, out);
+    return 0;
+}
+
+static PyObject* decode_int8(const unsigned char* in) {
+    return numenc_number_object(NUMENC_INT8, numenc_decode_int8_raw(in));
+}
+
+static PyObject* decode_uint8(const unsigned char* in) {
+    return numenc_number_object(NUMENC_UINT8, numenc_decode_uint8_raw(in));
+}
+
+static PyObject* decode_int16(const unsigned char* in) {
+    return numenc_number_object(NUMENC_INT16, numenc_decode_int16_raw(in));
+}
+
+static PyObject* decode_uint16(const unsigned char* in) {
+    return numenc_number_object(NUMENC_UINT16, numenc_decode_uint16_raw(in));
+}
+
+static PyObject* decode_int32(const unsigned char* in) {
+    return PyLong_FromLong(numenc_decode_int32_raw(in));
+}
+
+static PyObject* decode_uint32(const unsigned char* in) {
+    return PyLong_FromUnsignedLong(numenc_decode_uint32_raw(in));
+}
+
+static PyObject* decode_int64(const unsigned char* in) {
+    return PyLong_FromLongLong(numenc_decode_int64_raw(in));
+}
+
+static PyObject* decode_uint64(const unsigned char* in) {
+    return PyLong_FromUnsignedLongLong(numenc_decode_uint64_raw(in));
+}
+
+static PyObject* decode_float32(const unsigned char* in) {
+    return PyFloat_FromDouble(numenc_decode_float32_raw(in));
+}
+
+static PyObject* decode_float64(const unsigned char* in) {
+    return PyFloat_FromDouble(numenc_decode_float64_raw(in));
+}
+
+const struct numenc_codec NUMENC_CODECS[NUMENC_TYPE_COUNT] = {
+    {"int8", 1, encode_int8, decode_int8},
+    {"uint8", 1, encode_uint8, decode_uint8},
+    {"int16", 2, encode_int16, decode_int16},
+    {"uint16", 2, encode_uint16, decode_uint16},
+    {"int32", 4, encode_int32, decode_int32},
+    {"uint32", 4, encode_uint32, decode_uint32},
+    {"int64", 8, encode_int64, decode_int64},
+    {"uint64", 8, encode_uint64, decode_uint64},
+    {"float32", 4, encode_float32, decode_float32},
+    {"float64", 8, encode_float64, decode_float64}
+};
+
+// The descending codecs complement the key right after it has been written,
+// so that the keys sort in the reverse order of the numbers.
+#define NUMENC_DESC_CODEC(type, width) \
+    static int encode_##type##_desc(PyObject* value, unsigned char* out) { \
+        if (encode_##type(value, out) != 0) { \
+            return -1; \
+        } \
+        numenc_complement(out, out, width); \
+        return 0; \
+    } \
+    static PyObject* decode_##type##_desc(const unsigned char* in) { \
+        unsigned char key[width]; \
+        numenc_complement(in, key, width); \
+        return decode_##type(key); \
+    }
+
+NUMENC_DESC_CODEC(int8, 1)
+NUMENC_DESC_CODEC(uint8, 1)
+NUMENC_DESC_CODEC(int16, 2)
+NUMENC_DESC_CODEC(uint16, 2)
+NUMENC_DESC_CODEC(int32, 4)
+NUMENC_DESC_CODEC(uint32, 4)
+NUMENC_DESC_CODEC(int64, 8)
+NUMENC_DESC_CODEC(uint64, 8)
+NUMENC_DESC_CODEC(float32, 4)
+NUMENC_DESC_CODEC(float64, 8)
+
+const struct numenc_codec NUMENC_DESC_CODECS[NUMENC_TYPE_COUNT] = {
+    {"int8_desc", 1, encode_int8_desc, decode_int8_desc},
+    {"uint8_desc", 1, encode_uint8_desc, decode_uint8_desc},
+    {"int16_desc", 2, encode_int16_desc, decode_int16_desc},
+    {"uint16_desc", 2, encode_uint16_desc, decode_uint16_desc},
+    {"int32_desc", 4, encode_int32_desc, decode_int32_desc},
+    {"uint32_desc", 4, encode_uint32_desc, decode_uint32_desc},
+    {"int64_desc", 8, encode_int64_desc, decode_int64_desc},
+    {"uint64_desc", 8, encode_uint64_desc, decode_uint64_desc},
+    {"float32_desc", 4, encode_float32_desc, decode_float32_desc},
+    {"float64_desc", 8, encode_float64_desc, decode_float64_desc}
+};
+
+int numenc_type_from_name(const char* name) {
+    for (int i = 0; i < NUMENC_TYPE_COUNT; i++) {
+        if (strcmp(NUMENC_CODECS[i].name, name) == 0) {
+            return i;
+        }
+    }
+    PyErr_Format(PyExc_ValueError,
+        "Unsupported type: %s. The supported types are: int8, uint8, "
+        "int16, uint16, int32, uint32, int64, uint64, float32, float64.",
+        name);
+    return -1;
+}
+
+// Re-raise the pending exception with its message prefixed by
+// "at LABEL INDEX: ".
+static void annotate(const char* label, Py_ssize_t index) {
+    PyObject* type;
+    PyObject* value;
+    PyObject* traceback;
+
+    PyErr_Fetch(& type, & value, & traceback);
+    PyErr_NormalizeException(& type, & value, & traceback);
+    if (value == NULL) {
+        PyErr_Restore(type, value, traceback);
+        return;
+    }
+    PyErr_Format(type, "at %s %zd: %S", label, index, value);
+    Py_XDECREF(type);
+    Py_XDECREF(value);
+    Py_XDECREF(traceback);
+}
+
+void numenc_annotate_index(Py_ssize_t index) {
+    annotate("index", index);
+}
+
+void numenc_annotate_field(Py_ssize_t index) {
+    annotate("field", index);
+}
+
+int numenc_get_buffer(PyObject* obj, Py_buffer* view) {
+    if (!PyObject_CheckBuffer(obj)) {
+        PyErr_SetString(PyExc_TypeError,
+            "Wrong input: expected a bytes-like object.");
+        return -1;
+    }
+    return PyObject_GetBuffer(obj, view, PyBUF_SIMPLE);
+}
+
+int numenc_get_writable_buffer(PyObject* obj, Py_buffer* view) {
+    if (!PyObject_CheckBuffer(obj) ||
+            PyObject_GetBuffer(obj, view, PyBUF_WRITABLE) != 0) {
+        PyErr_Clear();
+        PyErr_SetString(PyExc_TypeError,
+            "Wrong input: expected a writable bytes-like object.");
+        return -1;
+    }
+    return 0;
+}
+
+Py_ssize_t numenc_resolve_offset(
+        Py_ssize_t offset, Py_ssize_t size, Py_ssize_t length) {
+    if (offset < 0) {
+        if (offset < -length) {
+            PyErr_Format(PyExc_ValueError,
+                "Illegal offset: %zd is out of range for a buffer "
+                "of %zd bytes.", offset, length);
+            return -1;
+        }
+        offset += length;
+    }
+    if (length - offset < size) {
+        PyErr_Format(PyExc_ValueError,
+            "Illegal offset: expected a buffer of at least %zd bytes to "
+            "access %zd bytes at offset %zd, got %zd.",
+            offset + size, size, offset, length);
+        return -1;
+    }
+    return offset;
+}
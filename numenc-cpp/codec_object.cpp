@@ -0,0 +1,416 @@
+#include "numenc.h"
+
+#include <structmember.h>
+
+struct numenc_codec_object {
+    PyObject_HEAD
+
+    const struct numenc_codec* codec;
+    PyObject* name;
+    Py_ssize_t width;
+};
+
+static PyTypeObject* CodecType = NULL;
+
+// The codec objects are immutable, so we create one per type when
+// the module is initialized and hand out the same object on every lookup.
+static PyObject* CODEC_OBJECTS[NUMENC_TYPE_COUNT];
+
+static PyObject* Codec_new(
+        PyTypeObject* type, PyObject* args, PyObject* kwargs) {
+    return PyErr_Format(PyExc_TypeError,
+        "cannot create 'numenc.Codec' instances; use numenc.codec(type).");
+}
+
+static void Codec_dealloc(struct numenc_codec_object* self) {
+    PyTypeObject* type = Py_TYPE(self);
+    Py_XDECREF(self->name);
+    type->tp_free((PyObject* ) self);
+#if PY_VERSION_HEX >= 0x03080000
+    // instances of heap types hold a reference to their type since 3.8
+    Py_DECREF(type);
+#endif
+}
+
+static PyObject* Codec_repr(struct numenc_codec_object* self) {
+    return PyUnicode_FromFormat("numenc.codec(%R)", self->name);
+}
+
+static PyObject* Codec_encode(
+        struct numenc_codec_object* self, PyObject* value) {
+    return numenc_encode_scalar(self->codec, value);
+}
+
+static PyObject* Codec_decode(
+        struct numenc_codec_object* self, PyObject* key) {
+    return numenc_decode_scalar(self->codec, key);
+}
+
+static PyObject* Codec_encode_many(
+        struct numenc_codec_object* self, PyObject* values) {
+    return numenc_encode_many(self->codec, values);
+}
+
+static PyObject* Codec_decode_many(
+        struct numenc_codec_object* self, PyObject* keys) {
+    return numenc_decode_many(self->codec, keys);
+}
+
+static PyObject* Codec_encode_into(struct numenc_codec_object* self,
+        PyObject* const* args, Py_ssize_t nargs) {
+    if (nargs < 2 || nargs > 3) {
+        return PyErr_Format(PyExc_TypeError,
+            "encode_into() takes 2 or 3 arguments (%zd given)", nargs);
+    }
+
+    Py_ssize_t offset;
+    if (numenc_parse_offset(args, nargs, 2, & offset) != 0) {
+        return NULL;
+    }
+    return numenc_encode_into(self->codec, args[0], args[1], offset);
+}
+
+static PyObject* Codec_decode_from(struct numenc_codec_object* self,
+        PyObject* const* args, Py_ssize_t nargs) {
+    if (nargs < 1 || nargs > 2) {
+        return PyErr_Format(PyExc_TypeError,
+            "decode_from() takes 1 or 2 arguments (%zd given)", nargs);
+    }
+
+    Py_ssize_t offset;
+    if (numenc_parse_offset(args, nargs, 1, & offset) != 0) {
+        return NULL;
+    }
+    return numenc_decode_from(self->codec, args[0], offset);
+}
+
+static PyObject* Codec_searchsorted(struct numenc_codec_object* self,
+        PyObject* args, PyObject* kwargs) {
+    static const char* kwlist[] = {"keys", "value", "side", NULL};
+    PyObject* keys;
+    PyObject* value;
+    const char* side = "left";
+
+    if (!PyArg_ParseTupleAndKeywords(args, kwargs, "OO|s",
+            (char** ) kwlist, & keys, & value, & side)) {
+        return NULL;
+    }
+
+    const int right = numenc_parse_side(side);
+    if (right < 0) {
+        return NULL;
+    }
+
+    unsigned char probe[8];
+    if (self->codec->encode(value, probe) != 0) {
+        return NULL;
+    }
+    return numenc_searchsorted(keys, probe, self->width, right);
+}
+
+static PyObject* Codec_searchsorted_many(struct numenc_codec_object* self,
+        PyObject* args, PyObject* kwargs) {
+    static const char* kwlist[] = {
+        "keys", "values", "side", "threads", NULL
+    };
+    PyObject* keys;
+    PyObject* values;
+    const char* side = "left";
+    int threads = 1;
+
+    if (!PyArg_ParseTupleAndKeywords(args, kwargs, "OO|si",
+            (char** ) kwlist, & keys, & values, & side, & threads)) {
+        return NULL;
+    }
+    if (numenc_check_threads(threads) != 0) {
+        return NULL;
+    }
+
+    const int right = numenc_parse_side(side);
+    if (right < 0) {
+        return NULL;
+    }
+
+    PyObject* probes = numenc_encode_many(self->codec, values);
+    if (probes == NULL) {
+        return NULL;
+    }
+    PyObject* result = numenc_searchsorted_many(keys,
+        (const unsigned char* ) PyBytes_AS_STRING(probes),
+        PyBytes_GET_SIZE(probes) / self->width, self->width, right,
+        threads);
+    Py_DECREF(probes);
+    return result;
+}
+
+static int type_of(const struct numenc_codec_object* self) {
+    return (int)(self->codec - NUMENC_CODECS);
+}
+
+static PyObject* Codec_key_range(struct numenc_codec_object* self,
+        PyObject* args, PyObject* kwargs) {
+    static const char* kwlist[] = {"low", "high", "low_inclusive",
+        "high_inclusive", "prefix", NULL};
+    PyObject* low = Py_None;
+    PyObject* high = Py_None;
+    int low_inclusive = 1;
+    int high_inclusive = 0;
+    PyObject* prefix = NULL;
+
+    if (!PyArg_ParseTupleAndKeywords(args, kwargs, "|OOppO",
+            (char** ) kwlist, & low, & high, & low_inclusive,
+            & high_inclusive, & prefix)) {
+        return NULL;
+    }
+    return numenc_key_range(type_of(self), low, high, low_inclusive,
+        high_inclusive, prefix);
+}
+
+static PyObject* Codec_key_ranges(struct numenc_codec_object* self,
+        PyObject* args, PyObject* kwargs) {
+    static const char* kwlist[] = {"bounds", "low_inclusive",
+        "high_inclusive", "prefix", NULL};
+    PyObject* bounds;
+    int low_inclusive = 1;
+    int high_inclusive = 0;
+    PyObject* prefix = NULL;
+
+    if (!PyArg_ParseTupleAndKeywords(args, kwargs, "O|ppO",
+            (char** ) kwlist, & bounds, & low_inclusive, & high_inclusive,
+            & prefix)) {
+        return NULL;
+    }
+    return numenc_key_ranges(type_of(self), bounds, low_inclusive,
+        high_inclusive, prefix);
+}
+
+static PyObject* Codec_next_value(
+        struct numenc_codec_object* self, PyObject* value) {
+    return numenc_step_value(type_of(self), value, 1);
+}
+
+static PyObject* Codec_previous_value(
+        struct numenc_codec_object* self, PyObject* value) {
+    return numenc_step_value(type_of(self), value, -1);
+}
+
+static PyMethodDef CodecMethods[] = {
+    {
+        "encode",
+        (PyCFunction) Codec_encode,
+        METH_O,
+        "Convert a number to sortable bytes"
+    },
+    {
+        "decode",
+        (PyCFunction) Codec_decode,
+        METH_O,
+        "Convert sortable bytes back to a number"
+    },
+    {
+        "encode_many",
+        (PyCFunction) Codec_encode_many,
+        METH_O,
+        "Convert an iterable of numbers to concatenated sortable bytes"
+    },
+    {
+        "decode_many",
+        (PyCFunction) Codec_decode_many,
+        METH_O,
+        "Convert concatenated sortable bytes back to a list of numbers"
+    },
+    {
+        "encode_into",
+        (PyCFunction)(void(*)(void)) Codec_encode_into,
+        METH_FASTCALL,
+        "Write a number as sortable bytes into a writable buffer "
+        "at the given offset"
+    },
+    {
+        "decode_from",
+        (PyCFunction)(void(*)(void)) Codec_decode_from,
+        METH_FASTCALL,
+        "Read a number from the sortable bytes of a buffer "
+        "at the given offset"
+    },
+    {
+        "searchsorted",
+        (PyCFunction)(void(*)(void)) Codec_searchsorted,
+        METH_VARARGS | METH_KEYWORDS,
+        "Find the index at which the number would be inserted into "
+        "the sorted concatenated keys without decoding them"
+    },
+    {
+        "searchsorted_many",
+        (PyCFunction)(void(*)(void)) Codec_searchsorted_many,
+        METH_VARARGS | METH_KEYWORDS,
+        "Find the insertion points of an iterable of numbers in the sorted "
+        "concatenated keys without decoding them. Large batches of numbers "
+        "are split among up to the given number of threads."
+    },
+    {
+        "key_range",
+        (PyCFunction)(void(*)(void)) Codec_key_range,
+        METH_VARARGS | METH_KEYWORDS,
+        "Compute the tightest start key and exclusive stop key (None if "
+        "unbounded) of a scan over the numbers between low and high "
+        "following the prefix; return None if no number qualifies"
+    },
+    {
+        "key_ranges",
+        (PyCFunction)(void(*)(void)) Codec_key_ranges,
+        METH_VARARGS | METH_KEYWORDS,
+        "Compute the key ranges of an iterable of (low, high) or "
+        "(low, high, prefix) tuples as a list"
+    },
+    {
+        "next_value",
+        (PyCFunction) Codec_next_value,
+        METH_O,
+        "Return the smallest representable number greater than the number"
+    },
+    {
+        "previous_value",
+        (PyCFunction) Codec_previous_value,
+        METH_O,
+        "Return the largest representable number less than the number"
+    },
+    {
+        NULL,
+        NULL,
+        0,
+        NULL
+    }
+};
+
+static PyMemberDef CodecMembers[] = {
+    {
+        (char* ) "name",
+        T_OBJECT,
+        offsetof(struct numenc_codec_object, name),
+        READONLY,
+        (char* ) "Name of the type, e.g., 'int32'"
+    },
+    {
+        (char* ) "width",
+        T_PYSSIZET,
+        offsetof(struct numenc_codec_object, width),
+        READONLY,
+        (char* ) "Length of a key in bytes"
+    },
+    {
+        NULL,
+        0,
+        0,
+        0,
+        NULL
+    }
+};
+
+static PyType_Slot CodecSlots[] = {
+    {
+        Py_tp_doc,
+        (void* ) "Conversions of a single type bound to its kernels; "
+        "obtain one with numenc.codec(type)"
+    },
+    {Py_tp_new, (void* ) Codec_new},
+    {Py_tp_dealloc, (void* ) Codec_dealloc},
+    {Py_tp_repr, (void* ) Codec_repr},
+    {Py_tp_methods, (void* ) CodecMethods},
+    {Py_tp_members, (void* ) CodecMembers},
+    {0, NULL}
+};
+
+static PyType_Spec CodecSpec = {
+    "numenc.Codec",
+    sizeof(struct numenc_codec_object),
+    0,
+    Py_TPFLAGS_DEFAULT,
+    CodecSlots
+};
+
+static PyObject* codec(PyObject* self, PyObject* name) {
+    if (!PyUnicode_Check(name)) {
+        return PyErr_Format(PyExc_TypeError,
+            "Wrong input: expected the name of a type as str.");
+    }
+
+    const char* type_name = PyUnicode_AsUTF8(name);
+    if (type_name == NULL) {
+        return NULL;
+    }
+
+    int type = numenc_type_from_name(type_name);
+    if (type < 0) {
+        return NULL;
+    }
+
+    Py_INCREF(CODEC_OBJECTS[type]);
+    return CODEC_OBJECTS[type];
+}
+
+static PyMethodDef CodecFunctions[] = {
+    {
+        "codec",
+        codec,
+        METH_O,
+        "Return the codec of the given type (e.g., 'int32')"
+    },
+    {
+        NULL,
+        NULL,
+        0,
+        NULL
+    }
+};
+
+static PyObject* new_codec_object(PyTypeObject* codec_type, int type) {
+    struct numenc_codec_object* self =
+        (struct numenc_codec_object* ) codec_type->tp_alloc(codec_type, 0);
+    if (self == NULL) {
+        return NULL;
+    }
+
+    self->codec = & NUMENC_CODECS[type];
+    self->width = NUMENC_CODECS[type].width;
+    self->name = PyUnicode_InternFromString(NUMENC_CODECS[type].name);
+    if (self->name == NULL) {
+        Py_DECREF(self);
+        return NULL;
+    }
+    return (PyObject* ) self;
+}
+
+int numenc_add_codec_type(PyObject* module) {
+    if (CodecType == NULL) {
+        PyTypeObject* codec_type =
+            (PyTypeObject* ) PyType_FromSpec(& CodecSpec);
+        if (codec_type == NULL) {
+            return -1;
+        }
+
+        // publish the type only once all the codec objects exist so that
+        // a failed import does not leave them half-initialized
+        PyObject* objects[NUMENC_TYPE_COUNT];
+        for (int i = 0; i < NUMENC_TYPE_COUNT; i++) {
+            objects[i] = new_codec_object(codec_type, i);
+            if (objects[i] == NULL) {
+                for (int j = 0; j < i; j++) {
+                    Py_DECREF(objects[j]);
+                }
+                Py_DECREF(codec_type);
+                return -1;
+            }
+        }
+
+        memcpy(CODEC_OBJECTS, objects, sizeof(objects));
+        CodecType = codec_type;
+    }
+
+    Py_INCREF(CodecType);
+    if (PyModule_AddObject(module, "Codec", (PyObject* ) CodecType) != 0) {
+        Py_DECREF(CodecType);
+        return -1;
+    }
+    return PyModule_AddFunctions(module, CodecFunctions);
+}
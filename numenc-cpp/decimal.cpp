@@ -0,0 +1,727 @@
+#include "numenc.h"
+
+#include <structmember.h>
+
+// A fixed-point number is stored as its unscaled integer, e.g., 12.34 at
+// the scale 2 as 1234, in a signed 64-bit or 128-bit integer which is
+// encoded like the other signed integers.
+//
+// We compute on 32-bit limbs so that the 128-bit arithmetic does not
+// depend on the compiler support for __int128.
+#define NUMENC_LIMB_COUNT 4
+
+// Magnitude of the unscaled integer; the limbs are little-endian.
+struct magnitude {
+    uint32_t limbs[NUMENC_LIMB_COUNT];
+};
+
+// Maximum number of digits of a 128-bit integer
+#define NUMENC_DECIMAL_MAX_DIGITS 39
+
+enum parse_result {
+    PARSE_OK = 0,
+    PARSE_MALFORMED,
+    PARSE_NOT_FINITE,
+    PARSE_INEXACT,
+    PARSE_OUT_OF_RANGE
+};
+
+struct numenc_fixed_point {
+    PyObject_HEAD
+
+    int scale;
+
+    // length of a key in bytes, 8 or 16
+    Py_ssize_t width;
+
+    // number of the 32-bit limbs of the unscaled integer
+    int limb_count;
+};
+
+// decimal.Decimal, imported on the first decoding
+static PyObject* DecimalType = NULL;
+
+static PyObject* get_decimal_type(void) {
+    if (DecimalType == NULL) {
+        PyObject* module = PyImport_ImportModule("decimal");
+        if (module == NULL) {
+            return NULL;
+        }
+        DecimalType = PyObject_GetAttrString(module, "Decimal");
+        Py_DECREF(module);
+    }
+    return DecimalType;
+}
+
+// Multiply the magnitude by factor and add addend.
+// Return 0 on success or -1 if the result does not fit in limb_count limbs.
+static int magnitude_mul_add(struct magnitude* m, int limb_count,
+        uint32_t factor, uint32_t addend) {
+    uint64_t carry = addend;
+    for (int i = 0; i < limb_count; i++) {
+        uint64_t product = (uint64_t) m->limbs[i] * factor + carry;
+        m->limbs[i] = (uint32_t) product;
+        carry = product >> 32;
+    }
+    return carry == 0 ? 0 : -1;
+}
+
+// Multiply the magnitude by 10^exponent.
+// Return 0 on success or -1 if the result does not fit in limb_count limbs.
+static int magnitude_scale(struct magnitude* m, int limb_count,
+        long exponent) {
+    for (; exponent >= 9; exponent -= 9) {
+        if (magnitude_mul_add(m, limb_count, 1000000000U, 0) != 0) {
+            return -1;
+        }
+    }
+    uint32_t factor = 1;
+    for (; exponent > 0; exponent--) {
+        factor *= 10;
+    }
+    return magnitude_mul_add(m, limb_count, factor, 0);
+}
+
+// Divide the magnitude by divisor and return the remainder.
+static uint32_t magnitude_div(struct magnitude* m, int limb_count,
+        uint32_t divisor) {
+    uint64_t remainder = 0;
+    for (int i = limb_count - 1; i >= 0; i--) {
+        uint64_t current = (remainder << 32) | m->limbs[i];
+        m->limbs[i] = (uint32_t)(current / divisor);
+        remainder = current % divisor;
+    }
+    return (uint32_t) remainder;
+}
+
+static int magnitude_is_zero(const struct magnitude* m, int limb_count) {
+    for (int i = 0; i < limb_count; i++) {
+        if (m->limbs[i] != 0) {
+            return 0;
+        }
+    }
+    return 1;
+}
+
+// Check that the signed magnitude fits in the signed integer of
+// limb_count limbs, i.e., that it is at most 2^(bits - 1) - 1 if positive
+// and at most 2^(bits - 1) if negative.
+static int magnitude_fits(const struct magnitude* m, int limb_count,
+        int negative) {
+    const uint32_t top = m->limbs[limb_count - 1];
+    if ((top & 0x80000000U) == 0) {
+        return 1;
+    }
+    if (!negative || top != 0x80000000U) {
+        return 0;
+    }
+    return magnitude_is_zero(m, limb_count - 1);
+}
+
+// Two's complement of the magnitude in place.
+static void magnitude_negate(struct magnitude* m, int limb_count) {
+    uint64_t carry = 1;
+    for (int i = 0; i < limb_count; i++) {
+        uint64_t sum = (uint64_t)(uint32_t) ~m->limbs[i] + carry;
+        m->limbs[i] = (uint32_t) sum;
+        carry = sum >> 32;
+    }
+}
+
+static int is_space(char c) {
+    return c == ' ' || c == '\t' || c == '\n' || c == '\r';
+}
+
+static int equals_ignore_case(const char* start, const char* end,
+        const char* word) {
+    for (; start < end && *word != '\0'; start++, word++) {
+        char c = *start;
+        if (c >= 'A' && c <= 'Z') {
+            c = (char)(c - 'A' + 'a');
+        }
+        if (c != *word) {
+            return 0;
+        }
+    }
+    return start == end && *word == '\0';
+}
+
+// Parse a decimal number such as "-12.5" or "1.25E+3" into the signed
+// magnitude of its unscaled integer at the given scale.
+static enum parse_result parse_decimal(const char* start, const char* end,
+        int scale, int limb_count, struct magnitude* m, int* negative) {
+    while (start < end && is_space(*start)) {
+        start++;
+    }
+    while (end > start && is_space(end[-1])) {
+        end--;
+    }
+
+    *negative = 0;
+    if (start < end && (*start == '+' || *start == '-')) {
+        *negative = (*start == '-');
+        start++;
+    }
+
+    if (equals_ignore_case(start, end, "inf") ||
+            equals_ignore_case(start, end, "infinity") ||
+            equals_ignore_case(start, end, "nan") ||
+            equals_ignore_case(start, end, "snan")) {
+        return PARSE_NOT_FINITE;
+    }
+
+    // the digits of the integer and the fractional part
+    const char* digits = start;
+    const char* point = NULL;
+    Py_ssize_t digit_count = 0;
+    for (; start < end; start++) {
+        if (*start >= '0' && *start <= '9') {
+            digit_count++;
+        } else if (*start == '.' && point == NULL) {
+            point = start;
+        } else {
+            break;
+        }
+    }
+    const char* digits_end = start;
+    if (digit_count == 0) {
+        return PARSE_MALFORMED;
+    }
+    const Py_ssize_t fraction_count =
+        (point == NULL) ? 0 : digits_end - point - 1;
+
+    // the exponent is clamped as any larger one overflows or drops
+    // all the digits anyway.
+    long exponent = 0;
+    if (start < end && (*start == 'e' || *start == 'E')) {
+        start++;
+        int exponent_negative = 0;
+        if (start < end && (*start == '+' || *start == '-')) {
+            exponent_negative = (*start == '-');
+            start++;
+        }
+        if (start == end) {
+            return PARSE_MALFORMED;
+        }
+        for (; start < end && *start >= '0' && *start <= '9'; start++) {
+            if (exponent < 1000000) {
+                exponent = exponent * 10 + (*start - '0');
+            }
+        }
+        if (exponent_negative) {
+            exponent = -exponent;
+        }
+    }
+    if (start != end) {
+        return PARSE_MALFORMED;
+    }
+
+    // value = digits * 10^shift
+    long shift = exponent - (long) fraction_count + scale;
+
+    // digits beyond the scale are allowed only if they are zeros
+    Py_ssize_t kept = digit_count;
+    if (shift < 0) {
+        kept = (-shift >= digit_count) ? 0 : digit_count + shift;
+    }
+
+    memset(m->limbs, 0, sizeof(m->limbs));
+    Py_ssize_t index = 0;
+    for (const char* c = digits; c < digits_end; c++) {
+        if (*c == '.') {
+            continue;
+        }
+        if (index < kept) {
+            if (magnitude_mul_add(m, limb_count, 10,
+                    (uint32_t)(*c - '0')) != 0) {
+                return PARSE_OUT_OF_RANGE;
+            }
+        } else if (*c != '0') {
+            return PARSE_INEXACT;
+        }
+        index++;
+    }
+
+    if (shift > 0 && !magnitude_is_zero(m, limb_count) &&
+            magnitude_scale(m, limb_count, shift) != 0) {
+        return PARSE_OUT_OF_RANGE;
+    }
+    if (!magnitude_fits(m, limb_count, *negative)) {
+        return PARSE_OUT_OF_RANGE;
+    }
+    return PARSE_OK;
+}
+
+// Convert the value to the signed magnitude of its unscaled integer.
+// Return 0 on success; otherwise set a Python exception and return -1.
+static int to_magnitude(const struct numenc_fixed_point* self,
+        PyObject* value, struct magnitude* m, int* negative) {
+    PyObject* text = NULL;
+    const char* start;
+    Py_ssize_t length;
+
+    if (PyLong_Check(value)) {
+        int overflow;
+        long long input = PyLong_AsLongLongAndOverflow(value, & overflow);
+        if (input == -1 && PyErr_Occurred()) {
+            return -1;
+        }
+        if (overflow == 0) {
+            // small integers are scaled directly without the detour over
+            // their decimal representation.
+            unsigned long long absolute = (input < 0) ?
+                0ULL - (unsigned long long) input :
+                (unsigned long long) input;
+            memset(m->limbs, 0, sizeof(m->limbs));
+            m->limbs[0] = (uint32_t) absolute;
+            m->limbs[1] = (uint32_t)(absolute >> 32);
+            *negative = (input < 0);
+            if (magnitude_scale(m, self->limb_count, self->scale) == 0 &&
+                    magnitude_fits(m, self->limb_count, *negative)) {
+                return 0;
+            }
+            PyErr_Format(PyExc_ValueError,
+                "Illegal input: expected a number in the range of "
+                "a %zd-bit fixed-point number of scale %d, got %R.",
+                self->width * 8, self->scale, value);
+            return -1;
+        }
+        text = PyObject_Str(value);
+    } else if (PyUnicode_Check(value)) {
+        Py_INCREF(value);
+        text = value;
+    } else {
+        PyObject* decimal_type = get_decimal_type();
+        if (decimal_type == NULL) {
+            return -1;
+        }
+        int is_decimal = PyObject_IsInstance(value, decimal_type);
+        if (is_decimal < 0) {
+            return -1;
+        }
+        if (!is_decimal) {
+            PyErr_SetString(PyExc_TypeError,
+                "Wrong input: expected a Decimal, int or str.");
+            return -1;
+        }
+        text = PyObject_Str(value);
+    }
+    if (text == NULL) {
+        return -1;
+    }
+
+    start = PyUnicode_AsUTF8AndSize(text, & length);
+    if (start == NULL) {
+        Py_DECREF(text);
+        return -1;
+    }
+
+    enum parse_result result = parse_decimal(start, start + length,
+        self->scale, self->limb_count, m, negative);
+    Py_DECREF(text);
+
+    switch (result) {
+        case PARSE_OK:
+            return 0;
+        case PARSE_MALFORMED:
+            PyErr_Format(PyExc_ValueError,
+                "Illegal input: expected a decimal number, got %R.", value);
+            break;
+        case PARSE_NOT_FINITE:
+            PyErr_Format(PyExc_ValueError,
+                "Illegal input: expected a finite number, got %R.", value);
+            break;
+        case PARSE_INEXACT:
+            PyErr_Format(PyExc_ValueError,
+                "Illegal input: expected a number with at most %d "
+                "fractional digits, got %R.", self->scale, value);
+            break;
+        case PARSE_OUT_OF_RANGE:
+            PyErr_Format(PyExc_ValueError,
+                "Illegal input: expected a number in the range of "
+                "a %zd-bit fixed-point number of scale %d, got %R.",
+                self->width * 8, self->scale, value);
+            break;
+    }
+    return -1;
+}
+
+// Encode the value as the key at out.
+// Return 0 on success; otherwise set a Python exception and return -1.
+static int encode(const struct numenc_fixed_point* self, PyObject* value,
+        unsigned char* out) {
+    struct magnitude m;
+    int negative;
+    if (to_magnitude(self, value, & m, & negative) != 0) {
+        return -1;
+    }
+
+    // like the other signed integers, we store the two's complement with
+    // the sign bit flipped in big-endian byte order.
+    const int limb_count = self->limb_count;
+    if (negative) {
+        magnitude_negate(& m, limb_count);
+    }
+    m.limbs[limb_count - 1] ^= 0x80000000U;
+
+    for (int i = 0; i < limb_count; i++) {
+        numenc_store_be(m.limbs[limb_count - 1 - i], 4, out + 4 * i);
+    }
+    return 0;
+}
+
+// Decode the key at in to a new Decimal.
+static PyObject* decode(const struct numenc_fixed_point* self,
+        const unsigned char* in) {
+    PyObject* decimal_type = get_decimal_type();
+    if (decimal_type == NULL) {
+        return NULL;
+    }
+
+    const int limb_count = self->limb_count;
+    struct magnitude m = {{0}};
+    for (int i = 0; i < limb_count; i++) {
+        m.limbs[limb_count - 1 - i] = (uint32_t) numenc_load_be(in + 4 * i, 4);
+    }
+    m.limbs[limb_count - 1] ^= 0x80000000U;
+    const int negative = (m.limbs[limb_count - 1] & 0x80000000U) != 0;
+    if (negative) {
+        magnitude_negate(& m, limb_count);
+    }
+
+    // the digits are written backwards from the end of the buffer
+    char buffer[NUMENC_DECIMAL_MAX_DIGITS + 3];
+    char* end = buffer + sizeof(buffer);
+    char* position = end;
+    int digit_count = 0;
+    while (!magnitude_is_zero(& m, limb_count) || digit_count <= self->scale) {
+        if (digit_count == self->scale && self->scale > 0) {
+            *--position = '.';
+        }
+        *--position = (char)('0' + magnitude_div(& m, limb_count, 10));
+        digit_count++;
+    }
+    if (negative) {
+        *--position = '-';
+    }
+
+    return PyObject_CallFunction(
+        decimal_type, "s#", position, (Py_ssize_t)(end - position));
+}
+
+static PyObject* FixedPoint_new(
+        PyTypeObject* type, PyObject* args, PyObject* kwargs) {
+    static const char* kwlist[] = {"scale", "width", NULL};
+    int scale;
+    Py_ssize_t width = 8;
+
+    if (!PyArg_ParseTupleAndKeywords(args, kwargs, "i|n:FixedPoint",
+            (char** ) kwlist, & scale, & width)) {
+        return NULL;
+    }
+
+    if (width != 8 && width != 16) {
+        return PyErr_Format(PyExc_ValueError,
+            "Illegal width: expected 8 or 16, got %zd.", width);
+    }
+    const int max_scale = (width == 8) ? 18 : 38;
+    if (scale < 0 || scale > max_scale) {
+        return PyErr_Format(PyExc_ValueError,
+            "Illegal scale: expected a scale in [0, %d] for the width %zd, "
+            "got %d.", max_scale, width, scale);
+    }
+
+    struct numenc_fixed_point* self =
+        (struct numenc_fixed_point* ) type->tp_alloc(type, 0);
+    if (self == NULL) {
+        return NULL;
+    }
+    self->scale = scale;
+    self->width = width;
+    self->limb_count = (int)(width / 4);
+    return (PyObject* ) self;
+}
+
+static void FixedPoint_dealloc(struct numenc_fixed_point* self) {
+    PyTypeObject* type = Py_TYPE(self);
+    type->tp_free((PyObject* ) self);
+#if PY_VERSION_HEX >= 0x03080000
+    // instances of heap types hold a reference to their type since 3.8
+    Py_DECREF(type);
+#endif
+}
+
+static PyObject* FixedPoint_repr(struct numenc_fixed_point* self) {
+    return PyUnicode_FromFormat("numenc.FixedPoint(%d, width=%zd)",
+        self->scale, self->width);
+}
+
+static PyObject* FixedPoint_encode(
+        struct numenc_fixed_point* self, PyObject* value) {
+    unsigned char buffer[4 * NUMENC_LIMB_COUNT];
+    if (encode(self, value, buffer) != 0) {
+        return NULL;
+    }
+    return PyBytes_FromStringAndSize((const char* ) buffer, self->width);
+}
+
+static PyObject* FixedPoint_decode(
+        struct numenc_fixed_point* self, PyObject* key) {
+    if (!PyBytes_Check(key)) {
+        return PyErr_Format(PyExc_TypeError,
+            "Wrong input: expected bytes.");
+    }
+
+    Py_ssize_t count = PyBytes_GET_SIZE(key);
+    if (count != self->width) {
+        return PyErr_Format(PyExc_ValueError,
+            "Illegal input: expected bytes of length %zd, got %zd.",
+            self->width, count);
+    }
+    return decode(self, (const unsigned char* ) PyBytes_AS_STRING(key));
+}
+
+static PyObject* FixedPoint_encode_many(
+        struct numenc_fixed_point* self, PyObject* values) {
+    PyObject* sequence = PySequence_Fast(values,
+        "Wrong input: expected an iterable of numbers.");
+    if (sequence == NULL) {
+        return NULL;
+    }
+
+    const Py_ssize_t count = PySequence_Fast_GET_SIZE(sequence);
+    if (count > PY_SSIZE_T_MAX / self->width) {
+        Py_DECREF(sequence);
+        return PyErr_NoMemory();
+    }
+    PyObject* output = PyBytes_FromStringAndSize(NULL, count * self->width);
+    if (output == NULL) {
+        Py_DECREF(sequence);
+        return NULL;
+    }
+    unsigned char* out = (unsigned char* ) PyBytes_AS_STRING(output);
+
+    for (Py_ssize_t i = 0; i < count; i++) {
+        // the item might run arbitrary code on conversion which could
+        // in turn mutate the list, so we re-check its size every time.
+        if (PySequence_Fast_GET_SIZE(sequence) != count) {
+            PyErr_SetString(PyExc_RuntimeError,
+                "The input changed size during iteration.");
+            Py_DECREF(sequence);
+            Py_DECREF(output);
+            return NULL;
+        }
+        PyObject* item = PySequence_Fast_GET_ITEM(sequence, i);
+        Py_INCREF(item);
+        int result = encode(self, item, out + i * self->width);
+        Py_DECREF(item);
+        if (result != 0) {
+            numenc_annotate_index(i);
+            Py_DECREF(sequence);
+            Py_DECREF(output);
+            return NULL;
+        }
+    }
+
+    Py_DECREF(sequence);
+    return output;
+}
+
+static PyObject* FixedPoint_decode_many(
+        struct numenc_fixed_point* self, PyObject* keys) {
+    Py_buffer view;
+    if (numenc_get_buffer(keys, & view) != 0) {
+        return NULL;
+    }
+
+    if (view.len % self->width != 0) {
+        PyErr_Format(PyExc_ValueError,
+            "Illegal input: expected a buffer whose length is a multiple "
+            "of %zd, got %zd.", self->width, view.len);
+        PyBuffer_Release(& view);
+        return NULL;
+    }
+
+    const Py_ssize_t count = view.len / self->width;
+    const unsigned char* in = (const unsigned char* ) view.buf;
+
+    PyObject* output = PyList_New(count);
+    for (Py_ssize_t i = 0; output != NULL && i < count; i++) {
+        PyObject* item = decode(self, in + i * self->width);
+        if (item == NULL) {
+            Py_CLEAR(output);
+            break;
+        }
+        PyList_SET_ITEM(output, i, item);
+    }
+
+    PyBuffer_Release(& view);
+    return output;
+}
+
+static PyObject* FixedPoint_encode_into(struct numenc_fixed_point* self,
+        PyObject* const* args, Py_ssize_t nargs) {
+    if (nargs < 2 || nargs > 3) {
+        return PyErr_Format(PyExc_TypeError,
+            "encode_into() takes 2 or 3 arguments (%zd given)", nargs);
+    }
+
+    Py_ssize_t offset;
+    if (numenc_parse_offset(args, nargs, 2, & offset) != 0) {
+        return NULL;
+    }
+
+    // we encode the key aside first so that the buffer is left untouched
+    // if the value is invalid.
+    unsigned char key[4 * NUMENC_LIMB_COUNT];
+    if (encode(self, args[0], key) != 0) {
+        return NULL;
+    }
+
+    Py_buffer view;
+    if (numenc_get_writable_buffer(args[1], & view) != 0) {
+        return NULL;
+    }
+    offset = numenc_resolve_offset(offset, self->width, view.len);
+    if (offset >= 0) {
+        memcpy((unsigned char* ) view.buf + offset, key, self->width);
+    }
+    PyBuffer_Release(& view);
+
+    if (offset < 0) {
+        return NULL;
+    }
+    Py_RETURN_NONE;
+}
+
+static PyObject* FixedPoint_decode_from(struct numenc_fixed_point* self,
+        PyObject* const* args, Py_ssize_t nargs) {
+    if (nargs < 1 || nargs > 2) {
+        return PyErr_Format(PyExc_TypeError,
+            "decode_from() takes 1 or 2 arguments (%zd given)", nargs);
+    }
+
+    Py_ssize_t offset;
+    if (numenc_parse_offset(args, nargs, 1, & offset) != 0) {
+        return NULL;
+    }
+
+    Py_buffer view;
+    if (numenc_get_buffer(args[0], & view) != 0) {
+        return NULL;
+    }
+
+    offset = numenc_resolve_offset(offset, self->width, view.len);
+    PyObject* output = NULL;
+    if (offset >= 0) {
+        output = decode(self, (const unsigned char* ) view.buf + offset);
+    }
+    PyBuffer_Release(& view);
+    return output;
+}
+
+static PyMethodDef FixedPointMethods[] = {
+    {
+        "encode",
+        (PyCFunction) FixedPoint_encode,
+        METH_O,
+        "Convert a Decimal, an int or a decimal str to sortable bytes"
+    },
+    {
+        "decode",
+        (PyCFunction) FixedPoint_decode,
+        METH_O,
+        "Convert sortable bytes back to a Decimal"
+    },
+    {
+        "encode_many",
+        (PyCFunction) FixedPoint_encode_many,
+        METH_O,
+        "Convert an iterable of numbers to concatenated sortable bytes"
+    },
+    {
+        "decode_many",
+        (PyCFunction) FixedPoint_decode_many,
+        METH_O,
+        "Convert concatenated sortable bytes back to a list of Decimals"
+    },
+    {
+        "encode_into",
+        (PyCFunction)(void(*)(void)) FixedPoint_encode_into,
+        METH_FASTCALL,
+        "Write a number as sortable bytes into a writable buffer "
+        "at the given offset"
+    },
+    {
+        "decode_from",
+        (PyCFunction)(void(*)(void)) FixedPoint_decode_from,
+        METH_FASTCALL,
+        "Read a Decimal from the sortable bytes of a buffer "
+        "at the given offset"
+    },
+    {
+        NULL,
+        NULL,
+        0,
+        NULL
+    }
+};
+
+static PyMemberDef FixedPointMembers[] = {
+    {
+        (char* ) "scale",
+        T_INT,
+        offsetof(struct numenc_fixed_point, scale),
+        READONLY,
+        (char* ) "Number of the fractional digits"
+    },
+    {
+        (char* ) "width",
+        T_PYSSIZET,
+        offsetof(struct numenc_fixed_point, width),
+        READONLY,
+        (char* ) "Length of a key in bytes"
+    },
+    {
+        NULL,
+        0,
+        0,
+        0,
+        NULL
+    }
+};
+
+static PyType_Slot FixedPointSlots[] = {
+    {
+        Py_tp_doc,
+        (void* ) "Codec of decimal numbers with a fixed number of "
+        "fractional digits stored in 8 or 16 bytes, "
+        "e.g., FixedPoint(2, width=8)"
+    },
+    {Py_tp_new, (void* ) FixedPoint_new},
+    {Py_tp_dealloc, (void* ) FixedPoint_dealloc},
+    {Py_tp_repr, (void* ) FixedPoint_repr},
+    {Py_tp_methods, (void* ) FixedPointMethods},
+    {Py_tp_members, (void* ) FixedPointMembers},
+    {0, NULL}
+};
+
+static PyType_Spec FixedPointSpec = {
+    "numenc.FixedPoint",
+    sizeof(struct numenc_fixed_point),
+    0,
+    Py_TPFLAGS_DEFAULT,
+    FixedPointSlots
+};
+
+int numenc_add_fixed_point_type(PyObject* module) {
+    PyObject* type = PyType_FromSpec(& FixedPointSpec);
+    if (type == NULL) {
+        return -1;
+    }
+    if (PyModule_AddObject(module, "FixedPoint", type) != 0) {
+        Py_DECREF(type);
+        return -1;
+    }
+    return 0;
+}
@@ -0,0 +1,311 @@
+#include "numenc.h"
+
+// The functions below mirror the scalar and the batch functions, but
+// the keys sort in the descending order of the numbers.
+
+#define NUMENC_DESC_FUNCTIONS(type, code) \
+    static PyObject* from_##type##_desc(PyObject* self, PyObject* value) { \
+        return numenc_encode_scalar(& NUMENC_DESC_CODECS[code], value); \
+    } \
+    static PyObject* to_##type##_desc(PyObject* self, PyObject* key) { \
+        return numenc_decode_scalar(& NUMENC_DESC_CODECS[code], key); \
+    } \
+    static PyObject* from_##type##_desc_many( \
+            PyObject* self, PyObject* values) { \
+        return numenc_encode_many(& NUMENC_DESC_CODECS[code], values); \
+    } \
+    static PyObject* to_##type##_desc_many(PyObject* self, PyObject* keys) { \
+        return numenc_decode_many(& NUMENC_DESC_CODECS[code], keys); \
+    }
+
+NUMENC_DESC_FUNCTIONS(int8, NUMENC_INT8)
+NUMENC_DESC_FUNCTIONS(uint8, NUMENC_UINT8)
+NUMENC_DESC_FUNCTIONS(int16, NUMENC_INT16)
+NUMENC_DESC_FUNCTIONS(uint16, NUMENC_UINT16)
+NUMENC_DESC_FUNCTIONS(int32, NUMENC_INT32)
+NUMENC_DESC_FUNCTIONS(uint32, NUMENC_UINT32)
+NUMENC_DESC_FUNCTIONS(int64, NUMENC_INT64)
+NUMENC_DESC_FUNCTIONS(uint64, NUMENC_UINT64)
+NUMENC_DESC_FUNCTIONS(float32, NUMENC_FLOAT32)
+NUMENC_DESC_FUNCTIONS(float64, NUMENC_FLOAT64)
+
+static PyMethodDef DescMethods[] = {
+    {
+        "from_int8_desc",
+        from_int8_desc,
+        METH_O,
+        "Convert an 8-bit signed integer to bytes sorting in "
+        "descending order"
+    },
+    {
+        "to_int8_desc",
+        to_int8_desc,
+        METH_O,
+        "Convert descending bytes back to a signed 8-bit integer"
+    },
+    {
+        "from_int8_desc_many",
+        from_int8_desc_many,
+        METH_O,
+        "Convert an iterable of 8-bit signed integers to concatenated "
+        "bytes sorting in descending order"
+    },
+    {
+        "to_int8_desc_many",
+        to_int8_desc_many,
+        METH_O,
+        "Convert concatenated descending bytes back to a list of "
+        "signed 8-bit integers"
+    },
+    {
+        "from_uint8_desc",
+        from_uint8_desc,
+        METH_O,
+        "Convert an 8-bit unsigned integer to bytes sorting in "
+        "descending order"
+    },
+    {
+        "to_uint8_desc",
+        to_uint8_desc,
+        METH_O,
+        "Convert descending bytes back to an unsigned 8-bit integer"
+    },
+    {
+        "from_uint8_desc_many",
+        from_uint8_desc_many,
+        METH_O,
+        "Convert an iterable of 8-bit unsigned integers to "
+        "concatenated bytes sorting in descending order"
+    },
+    {
+        "to_uint8_desc_many",
+        to_uint8_desc_many,
+        METH_O,
+        "Convert concatenated descending bytes back to a list of "
+        "unsigned 8-bit integers"
+    },
+    {
+        "from_int16_desc",
+        from_int16_desc,
+        METH_O,
+        "Convert a 16-bit signed integer to bytes sorting in "
+        "descending order"
+    },
+    {
+        "to_int16_desc",
+        to_int16_desc,
+        METH_O,
+        "Convert descending bytes back to a signed 16-bit integer"
+    },
+    {
+        "from_int16_desc_many",
+        from_int16_desc_many,
+        METH_O,
+        "Convert an iterable of 16-bit signed integers to "
+        "concatenated bytes sorting in descending order"
+    },
+    {
+        "to_int16_desc_many",
+        to_int16_desc_many,
+        METH_O,
+        "Convert concatenated descending bytes back to a list of "
+        "signed 16-bit integers"
+    },
+    {
+        "from_uint16_desc",
+        from_uint16_desc,
+        METH_O,
+        "Convert a 16-bit unsigned integer to bytes sorting in "
+        "descending order"
+    },
+    {
+        "to_uint16_desc",
+        to_uint16_desc,
+        METH_O,
+        "Convert descending bytes back to an unsigned 16-bit integer"
+    },
+    {
+        "from_uint16_desc_many",
+        from_uint16_desc_many,
+        METH_O,
+        "Convert an iterable of 16-bit unsigned integers to "
+        "concatenated bytes sorting in descending order"
+    },
+    {
+        "to_uint16_desc_many",
+        to_uint16_desc_many,
+        METH_O,
+        "Convert concatenated descending bytes back to a list of "
+        "unsigned 16-bit integers"
+    },
+    {
+        "from_int32_desc",
+        from_int32_desc,
+        METH_O,
+        "Convert a 32-bit signed integer to bytes sorting in "
+        "descending order"
+    },
+    {
+        "to_int32_desc",
+        to_int32_desc,
+        METH_O,
+        "Convert descending bytes back to a signed 32-bit integer"
+    },
+    {
+        "from_int32_desc_many",
+        from_int32_desc_many,
+        METH_O,
+        "Convert an iterable of 32-bit signed integers to "
+        "concatenated bytes sorting in descending order"
+    },
+    {
+        "to_int32_desc_many",
+        to_int32_desc_many,
+        METH_O,
+        "Convert concatenated descending bytes back to a list of "
+        "signed 32-bit integers"
+    },
+    {
+        "from_uint32_desc",
+        from_uint32_desc,
+        METH_O,
+        "Convert a 32-bit unsigned integer to bytes sorting in "
+        "descending order"
+    },
+    {
+        "to_uint32_desc",
+        to_uint32_desc,
+        METH_O,
+        "Convert descending bytes back to an unsigned 32-bit integer"
+    },
+    {
+        "from_uint32_desc_many",
+        from_uint32_desc_many,
+        METH_O,
+        "Convert an iterable of 32-bit unsigned integers to "
+        "concatenated bytes sorting in descending order"
+    },
+    {
+        "to_uint32_desc_many",
+        to_uint32_desc_many,
+        METH_O,
+        "Convert concatenated descending bytes back to a list of "
+        "unsigned 32-bit integers"
+    },
+    {
+        "from_int64_desc",
+        from_int64_desc,
+        METH_O,
+        "Convert a signed 64-bit integer to bytes sorting in "
+        "descending order"
+    },
+    {
+        "to_int64_desc",
+        to_int64_desc,
+        METH_O,
+        "Convert descending bytes back to a signed 64-bit integer"
+    },
+    {
+        "from_int64_desc_many",
+        from_int64_desc_many,
+        METH_O,
+        "Convert an iterable of signed 64-bit integers to "
+        "concatenated bytes sorting in descending order"
+    },
+    {
+        "to_int64_desc_many",
+        to_int64_desc_many,
+        METH_O,
+        "Convert concatenated descending bytes back to a list of "
+        "signed 64-bit integers"
+    },
+    {
+        "from_uint64_desc",
+        from_uint64_desc,
+        METH_O,
+        "Convert an unsigned 64-bit integer to bytes sorting in "
+        "descending order"
+    },
+    {
+        "to_uint64_desc",
+        to_uint64_desc,
+        METH_O,
+        "Convert descending bytes back to an unsigned 64-bit integer"
+    },
+    {
+        "from_uint64_desc_many",
+        from_uint64_desc_many,
+        METH_O,
+        "Convert an iterable of unsigned 64-bit integers to "
+        "concatenated bytes sorting in descending order"
+    },
+    {
+        "to_uint64_desc_many",
+        to_uint64_desc_many,
+        METH_O,
+        "Convert concatenated descending bytes back to a list of "
+        "unsigned 64-bit integers"
+    },
+    {
+        "from_float32_desc",
+        from_float32_desc,
+        METH_O,
+        "Convert a 32-bit float to bytes sorting in descending order"
+    },
+    {
+        "to_float32_desc",
+        to_float32_desc,
+        METH_O,
+        "Convert descending bytes back to a 32-bit float"
+    },
+    {
+        "from_float32_desc_many",
+        from_float32_desc_many,
+        METH_O,
+        "Convert an iterable of 32-bit floats to concatenated bytes "
+        "sorting in descending order"
+    },
+    {
+        "to_float32_desc_many",
+        to_float32_desc_many,
+        METH_O,
+        "Convert concatenated descending bytes back to a list of "
+        "32-bit floats"
+    },
+    {
+        "from_float64_desc",
+        from_float64_desc,
+        METH_O,
+        "Convert a 64-bit float to bytes sorting in descending order"
+    },
+    {
+        "to_float64_desc",
+        to_float64_desc,
+        METH_O,
+        "Convert descending bytes back to a 64-bit float"
+    },
+    {
+        "from_float64_desc_many",
+        from_float64_desc_many,
+        METH_O,
+        "Convert an iterable of 64-bit floats to concatenated bytes "
+        "sorting in descending order"
+    },
+    {
+        "to_float64_desc_many",
+        to_float64_desc_many,
+        METH_O,
+        "Convert concatenated descending bytes back to a list of "
+        "64-bit floats"
+    },
+    {
+        NULL,
+        NULL,
+        0,
+        NULL
+    }
+};
+
+int numenc_add_desc_functions(PyObject* module) {
+    return PyModule_AddFunctions(module, DescMethods);
+}
@@ -0,0 +1,592 @@
+#include "numenc.h"
+
+#include <errno.h>
+#include <stdio.h>
+
+// External merge sort of a file of fixed-width keys. The input is read in
+// runs that fit the memory budget; the runs are sorted by the workers and
+// spilled to a single temporary file, and finally merged in one pass with
+// a binary heap. If the whole input fits into the budget, the runs are
+// merged straight from memory.
+
+#ifdef _WIN32
+#define numenc_fseek _fseeki64
+#define numenc_ftell _ftelli64
+typedef long long numenc_off_t;
+#else
+#define numenc_fseek fseeko
+#define numenc_ftell ftello
+typedef off_t numenc_off_t;
+#endif
+
+// Default memory budget in bytes
+#define NUMENC_SORT_MEMORY (64 * 1024 * 1024)
+
+// Upper bound on the output buffer of the merge in bytes
+#define NUMENC_SORT_OUTPUT_BUFFER (1024 * 1024)
+
+enum sort_status {
+    SORT_OK = 0,
+    SORT_NO_MEMORY,
+    SORT_INPUT_ERROR,
+    SORT_OUTPUT_ERROR,
+    SORT_TEMP_ERROR,
+    SORT_TRUNCATED
+};
+
+// A sorted run in the temporary file or in memory.
+struct run {
+    // keys buffered from the run and the position of the next one
+    unsigned char* keys;
+    Py_ssize_t position;
+    Py_ssize_t count;
+
+    // capacity of the buffer in keys
+    Py_ssize_t capacity;
+
+    // offset of the keys not yet buffered in the temporary file and
+    // their number
+    numenc_off_t offset;
+    long long remaining;
+};
+
+struct sort_job {
+    unsigned char* keys;
+    Py_ssize_t count;
+    Py_ssize_t width;
+};
+
+struct external_sort {
+    Py_ssize_t width;
+    Py_ssize_t memory;
+    int workers;
+
+    FILE* input;
+    FILE* output;
+    FILE* temp;
+
+    // size of the input in bytes or -1 if it can not be determined
+    long long input_size;
+
+    // number of keys of a run
+    Py_ssize_t run_keys;
+
+    struct run* runs;
+    Py_ssize_t run_count;
+    Py_ssize_t run_capacity;
+
+    long long key_count;
+
+    // errno of the failed I/O operation
+    int error_number;
+};
+
+// Sort the runs of the jobs in [start, stop).
+static Py_ssize_t sort_jobs(void* arg, Py_ssize_t start, Py_ssize_t stop) {
+    struct sort_job* jobs = (struct sort_job* ) arg;
+    for (Py_ssize_t i = start; i < stop; i++) {
+        if (numenc_sort_keys(jobs[i].keys, jobs[i].count, jobs[i].width) !=
+                0) {
+            return i;
+        }
+    }
+    return stop;
+}
+
+static int add_run(struct external_sort* sort, unsigned char* keys,
+        Py_ssize_t count, numenc_off_t offset, long long remaining) {
+    if (sort->run_count == sort->run_capacity) {
+        const Py_ssize_t capacity = 2 * sort->run_capacity + 16;
+        struct run* runs = (struct run* ) PyMem_RawRealloc(
+            sort->runs, (size_t) capacity * sizeof(struct run));
+        if (runs == NULL) {
+            return SORT_NO_MEMORY;
+        }
+        sort->runs = runs;
+        sort->run_capacity = capacity;
+    }
+
+    struct run* run = & sort->runs[sort->run_count++];
+    run->keys = keys;
+    run->position = 0;
+    run->count = count;
+    run->capacity = count;
+    run->offset = offset;
+    run->remaining = remaining;
+    return SORT_OK;
+}
+
+// Read up to count keys; set read to the number of the whole keys read.
+static int read_keys(struct external_sort* sort, unsigned char* out,
+        Py_ssize_t count, Py_ssize_t* read) {
+    const size_t size = (size_t)(count * sort->width);
+    const size_t got = fread(out, 1, size, sort->input);
+    if (got < size && ferror(sort->input)) {
+        sort->error_number = errno;
+        return SORT_INPUT_ERROR;
+    }
+    if (got % (size_t) sort->width != 0) {
+        return SORT_TRUNCATED;
+    }
+    *read = (Py_ssize_t)(got / (size_t) sort->width);
+    return SORT_OK;
+}
+
+// Read the input in rounds of one run per worker, sort the runs and,
+// unless the whole input fits into the first round, spill them to the
+// temporary file. The runs kept in memory point into chunks.
+static int make_runs(struct external_sort* sort, unsigned char* chunks) {
+    const Py_ssize_t width = sort->width;
+    const Py_ssize_t run_bytes = sort->run_keys * width;
+
+    struct sort_job* jobs = (struct sort_job* ) PyMem_RawMalloc(
+        (size_t) sort->workers * sizeof(struct sort_job));
+    if (jobs == NULL) {
+        return SORT_NO_MEMORY;
+    }
+    int status = SORT_OK;
+    int end = 0;
+    while (status == SORT_OK && !end) {
+        int count = 0;
+        while (count < sort->workers) {
+            Py_ssize_t read;
+            status = read_keys(
+                sort, chunks + count * run_bytes, sort->run_keys, & read);
+            if (status != SORT_OK) {
+                break;
+            }
+            if (read > 0) {
+                jobs[count].keys = chunks + count * run_bytes;
+                jobs[count].count = read;
+                jobs[count].width = width;
+                count++;
+                sort->key_count += read;
+            }
+            if (read < sort->run_keys) {
+                end = 1;
+                break;
+            }
+        }
+        if (status != SORT_OK || count == 0) {
+            break;
+        }
+
+        // a worker per run
+        if (numenc_run_parallel(sort_jobs, jobs, count, 1, count) < count) {
+            status = SORT_NO_MEMORY;
+        }
+        for (int i = 0; i < count && status == SORT_OK; i++) {
+            if (sort->temp == NULL) {
+                status = add_run(sort, jobs[i].keys, jobs[i].count, 0, 0);
+                continue;
+            }
+
+            const numenc_off_t offset = numenc_ftell(sort->temp);
+            const size_t size = (size_t)(jobs[i].count * width);
+            if (offset < 0 ||
+                    fwrite(jobs[i].keys, 1, size, sort->temp) != size) {
+                sort->error_number = errno;
+                status = SORT_TEMP_ERROR;
+                break;
+            }
+            status = add_run(sort, NULL, 0, offset, jobs[i].count);
+        }
+    }
+
+    PyMem_RawFree(jobs);
+    return status;
+}
+
+// Buffer the next keys of a run from the temporary file.
+static int refill(struct external_sort* sort, struct run* run) {
+    const Py_ssize_t count = (run->remaining < run->capacity) ?
+        (Py_ssize_t) run->remaining : run->capacity;
+    const size_t size = (size_t)(count * sort->width);
+    if (numenc_fseek(sort->temp, run->offset, SEEK_SET) != 0 ||
+            fread(run->keys, 1, size, sort->temp) != size) {
+        sort->error_number = errno;
+        return SORT_TEMP_ERROR;
+    }
+    run->offset += (numenc_off_t) size;
+    run->remaining -= count;
+    run->position = 0;
+    run->count = count;
+    return SORT_OK;
+}
+
+static inline int run_less(const struct external_sort* sort,
+        const struct run* a, const struct run* b) {
+    const int cmp = memcmp(a->keys + a->position * sort->width,
+        b->keys + b->position * sort->width, (size_t) sort->width);
+    return cmp < 0 || (cmp == 0 && a < b);
+}
+
+static void sift_down(const struct external_sort* sort, struct run** heap,
+        Py_ssize_t size, Py_ssize_t index) {
+    struct run* item = heap[index];
+    while (1) {
+        Py_ssize_t child = 2 * index + 1;
+        if (child >= size) {
+            break;
+        }
+        if (child + 1 < size && run_less(sort, heap[child + 1], heap[child])) {
+            child++;
+        }
+        if (!run_less(sort, heap[child], item)) {
+            break;
+        }
+        heap[index] = heap[child];
+        index = child;
+    }
+    heap[index] = item;
+}
+
+static int flush(struct external_sort* sort, const unsigned char* buffer,
+        size_t size) {
+    if (size > 0 && fwrite(buffer, 1, size, sort->output) != size) {
+        sort->error_number = errno;
+        return SORT_OUTPUT_ERROR;
+    }
+    return SORT_OK;
+}
+
+// Merge the runs into the output with a binary min-heap of the runs
+// ordered by their next key.
+static int merge_runs(struct external_sort* sort) {
+    const Py_ssize_t width = sort->width;
+    const Py_ssize_t run_count = sort->run_count;
+
+    Py_ssize_t output_keys = NUMENC_SORT_OUTPUT_BUFFER / width;
+    if (output_keys > sort->memory / 2 / width) {
+        output_keys = sort->memory / 2 / width;
+    }
+    if (output_keys < 1) {
+        output_keys = 1;
+    }
+
+    // split the rest of the budget among the buffers of the spilled runs
+    Py_ssize_t input_keys = 1;
+    if (sort->temp != NULL && run_count > 0) {
+        input_keys = (sort->memory - output_keys * width) / width /
+            run_count;
+        if (input_keys < 1) {
+            input_keys = 1;
+        }
+    }
+
+    unsigned char* output = (unsigned char* ) PyMem_RawMalloc(
+        (size_t)(output_keys * width));
+    struct run** heap = (struct run** ) PyMem_RawMalloc(
+        (size_t)(run_count + 1) * sizeof(struct run* ));
+    unsigned char* inputs = NULL;
+    if (sort->temp != NULL) {
+        inputs = (unsigned char* ) PyMem_RawMalloc(
+            (size_t)(run_count * input_keys * width + 1));
+    }
+    int status = SORT_OK;
+    if (output == NULL || heap == NULL ||
+            (sort->temp != NULL && inputs == NULL)) {
+        status = SORT_NO_MEMORY;
+    }
+
+    Py_ssize_t size = 0;
+    for (Py_ssize_t i = 0; i < run_count && status == SORT_OK; i++) {
+        struct run* run = & sort->runs[i];
+        if (sort->temp != NULL) {
+            run->keys = inputs + i * input_keys * width;
+            run->capacity = input_keys;
+            status = refill(sort, run);
+        }
+        if (run->count > 0) {
+            heap[size++] = run;
+        }
+    }
+    for (Py_ssize_t i = size / 2 - 1; i >= 0 && status == SORT_OK; i--) {
+        sift_down(sort, heap, size, i);
+    }
+
+    Py_ssize_t buffered = 0;
+    while (size > 0 && status == SORT_OK) {
+        struct run* run = heap[0];
+        memcpy(output + buffered * width, run->keys + run->position * width,
+            (size_t) width);
+        buffered++;
+        if (buffered == output_keys) {
+            status = flush(sort, output, (size_t)(buffered * width));
+            buffered = 0;
+        }
+
+        run->position++;
+        if (run->position == run->count) {
+            if (run->remaining > 0) {
+                status = refill(sort, run);
+            } else {
+                heap[0] = heap[--size];
+            }
+        }
+        if (size > 1) {
+            sift_down(sort, heap, size, 0);
+        }
+    }
+    if (status == SORT_OK) {
+        status = flush(sort, output, (size_t)(buffered * width));
+    }
+
+    PyMem_RawFree(inputs);
+    PyMem_RawFree(heap);
+    PyMem_RawFree(output);
+    return status;
+}
+
+// Set an OSError from errno for the file at the encoded path.
+static void set_io_error(PyObject* path) {
+    PyErr_SetFromErrnoWithFilename(PyExc_OSError, PyBytes_AS_STRING(path));
+}
+
+// Create the temporary file for the runs in the given directory.
+// Return its path on success; otherwise set a Python exception and
+// return NULL.
+static PyObject* create_temp(PyObject* tmp_dir, FILE** temp) {
+    PyObject* tempfile = PyImport_ImportModule("tempfile");
+    if (tempfile == NULL) {
+        return NULL;
+    }
+    PyObject* mkstemp = PyObject_GetAttrString(tempfile, "mkstemp");
+    Py_DECREF(tempfile);
+    if (mkstemp == NULL) {
+        return NULL;
+    }
+
+    PyObject* kwargs = Py_BuildValue(
+        "{s:s,s:s,s:O}", "prefix", "numenc-", "suffix", ".runs", "dir",
+        tmp_dir);
+    PyObject* result = NULL;
+    if (kwargs != NULL) {
+        PyObject* empty = PyTuple_New(0);
+        if (empty != NULL) {
+            result = PyObject_Call(mkstemp, empty, kwargs);
+            Py_DECREF(empty);
+        }
+        Py_DECREF(kwargs);
+    }
+    Py_DECREF(mkstemp);
+    if (result == NULL) {
+        return NULL;
+    }
+
+    // reopen the file with stdio; the descriptor is closed right away
+    PyObject* os = PyImport_ImportModule("os");
+    PyObject* closed = NULL;
+    if (os != NULL) {
+        closed = PyObject_CallMethod(
+            os, "close", "O", PyTuple_GET_ITEM(result, 0));
+        Py_DECREF(os);
+    }
+    PyObject* path = NULL;
+    if (closed != NULL) {
+        Py_DECREF(closed);
+        PyUnicode_FSConverter(PyTuple_GET_ITEM(result, 1), & path);
+    }
+    Py_DECREF(result);
+    if (path == NULL) {
+        return NULL;
+    }
+
+    *temp = fopen(PyBytes_AS_STRING(path), "w+b");
+    if (*temp == NULL) {
+        set_io_error(path);
+        remove(PyBytes_AS_STRING(path));
+        Py_DECREF(path);
+        return NULL;
+    }
+    return path;
+}
+
+static void set_error(const struct external_sort* sort, int status,
+        PyObject* input, PyObject* output, PyObject* temp) {
+    switch (status) {
+        case SORT_NO_MEMORY:
+            PyErr_NoMemory();
+            break;
+        case SORT_INPUT_ERROR:
+            errno = sort->error_number;
+            set_io_error(input);
+            break;
+        case SORT_OUTPUT_ERROR:
+            errno = sort->error_number;
+            set_io_error(output);
+            break;
+        case SORT_TEMP_ERROR:
+            errno = sort->error_number;
+            set_io_error(temp);
+            break;
+        default:
+            PyErr_Format(PyExc_ValueError,
+                "Illegal input: expected a file whose size is a multiple "
+                "of %zd, got a trailing partial key.", sort->width);
+            break;
+    }
+}
+
+static PyObject* sort_file(PyObject* self, PyObject* args, PyObject* kwargs) {
+    static const char* kwlist[] = {
+        "input", "output", "width", "memory", "tmp_dir", "workers", NULL
+    };
+    PyObject* input_path = NULL;
+    PyObject* output_path = NULL;
+    Py_ssize_t width;
+    Py_ssize_t memory = NUMENC_SORT_MEMORY;
+    PyObject* tmp_dir = Py_None;
+    int workers = 1;
+
+    if (!PyArg_ParseTupleAndKeywords(args, kwargs, "O&O&n|nOi",
+            (char** ) kwlist, PyUnicode_FSConverter, & input_path,
+            PyUnicode_FSConverter, & output_path, & width, & memory,
+            & tmp_dir, & workers)) {
+        return NULL;
+    }
+
+    struct external_sort sort;
+    memset(& sort, 0, sizeof(sort));
+    sort.width = width;
+    sort.memory = memory;
+    sort.workers = workers;
+
+    PyObject* temp_path = NULL;
+    unsigned char* chunks = NULL;
+    PyObject* result = NULL;
+    int status = SORT_OK;
+
+    if (width <= 0) {
+        PyErr_Format(PyExc_ValueError,
+            "Illegal width: expected a positive width, got %zd.", width);
+        goto done;
+    }
+    if (workers < 1) {
+        PyErr_Format(PyExc_ValueError,
+            "Illegal workers: expected at least 1 worker, got %d.", workers);
+        goto done;
+    }
+
+    // the radix sort of the runs needs 16 bytes per key of up to 8 bytes,
+    // the merge sort of longer keys needs their width.
+    {
+        const Py_ssize_t key_memory = width + ((width <= 8) ? 16 : width);
+        sort.run_keys = memory / workers / key_memory;
+        if (sort.run_keys < 1) {
+            PyErr_Format(PyExc_ValueError,
+                "Illegal memory: expected at least %zd bytes for %d workers "
+                "and keys of %zd bytes, got %zd.",
+                key_memory * workers, workers, width, memory);
+            goto done;
+        }
+    }
+
+    sort.input = fopen(PyBytes_AS_STRING(input_path), "rb");
+    if (sort.input == NULL) {
+        set_io_error(input_path);
+        goto done;
+    }
+
+    sort.input_size = -1;
+    if (numenc_fseek(sort.input, 0, SEEK_END) == 0) {
+        sort.input_size = (long long) numenc_ftell(sort.input);
+        if (numenc_fseek(sort.input, 0, SEEK_SET) != 0) {
+            set_io_error(input_path);
+            goto done;
+        }
+    }
+    clearerr(sort.input);
+    if (sort.input_size >= 0 && sort.input_size % width != 0) {
+        set_error(& sort, SORT_TRUNCATED, input_path, output_path, NULL);
+        goto done;
+    }
+
+    // spill the runs only if the input does not fit into the first round
+    if (sort.input_size < 0 ||
+            sort.input_size > (long long) sort.run_keys * width * workers) {
+        temp_path = create_temp(tmp_dir, & sort.temp);
+        if (temp_path == NULL) {
+            goto done;
+        }
+    }
+
+    chunks = (unsigned char* ) PyMem_RawMalloc(
+        (size_t)(sort.run_keys * width * workers));
+    if (chunks == NULL) {
+        PyErr_NoMemory();
+        goto done;
+    }
+
+    Py_BEGIN_ALLOW_THREADS
+    status = make_runs(& sort, chunks);
+    fclose(sort.input);
+    sort.input = NULL;
+
+    if (status == SORT_OK && sort.temp != NULL) {
+        PyMem_RawFree(chunks);
+        chunks = NULL;
+    }
+    if (status == SORT_OK) {
+        sort.output = fopen(PyBytes_AS_STRING(output_path), "wb");
+        if (sort.output == NULL) {
+            sort.error_number = errno;
+            status = SORT_OUTPUT_ERROR;
+        }
+    }
+    if (status == SORT_OK) {
+        status = merge_runs(& sort);
+    }
+    if (sort.output != NULL && fclose(sort.output) != 0 &&
+            status == SORT_OK) {
+        sort.error_number = errno;
+        status = SORT_OUTPUT_ERROR;
+    }
+    sort.output = NULL;
+    Py_END_ALLOW_THREADS
+
+    if (status != SORT_OK) {
+        set_error(& sort, status, input_path, output_path, temp_path);
+        goto done;
+    }
+    result = PyLong_FromLongLong(sort.key_count);
+
+done:
+    if (sort.input != NULL) {
+        fclose(sort.input);
+    }
+    if (sort.temp != NULL) {
+        fclose(sort.temp);
+    }
+    if (temp_path != NULL) {
+        remove(PyBytes_AS_STRING(temp_path));
+        Py_DECREF(temp_path);
+    }
+    PyMem_RawFree(chunks);
+    PyMem_RawFree(sort.runs);
+    Py_XDECREF(input_path);
+    Py_XDECREF(output_path);
+    return result;
+}
+
+static PyMethodDef ExternalSortMethods[] = {
+    {
+        "sort_file",
+        (PyCFunction)(void(*)(void)) sort_file,
+        METH_VARARGS | METH_KEYWORDS,
+        "Sort a file of fixed-width keys into the output file within "
+        "the memory budget in bytes by spilling sorted runs to a temporary "
+        "file in tmp_dir and merging them; the runs are sorted by "
+        "the given number of workers. Return the number of keys."
+    },
+    {
+        NULL,
+        NULL,
+        0,
+        NULL
+    }
+};
+
+int numenc_add_external_sort_functions(PyObject* module) {
+    return PyModule_AddFunctions(module, ExternalSortMethods);
+}
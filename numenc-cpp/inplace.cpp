@@ -0,0 +1,259 @@
+#include "numenc.h"
+
+int numenc_parse_offset(PyObject* const* args, Py_ssize_t nargs,
+        Py_ssize_t index, Py_ssize_t* offset) {
+    *offset = 0;
+    if (nargs > index) {
+        *offset = PyNumber_AsSsize_t(args[index], PyExc_OverflowError);
+        if (*offset == -1 && PyErr_Occurred()) {
+            return -1;
+        }
+    }
+    return 0;
+}
+
+PyObject* numenc_encode_into(const struct numenc_codec* codec,
+        PyObject* value, PyObject* buffer, Py_ssize_t offset) {
+    Py_buffer view;
+    if (numenc_get_writable_buffer(buffer, & view) != 0) {
+        return NULL;
+    }
+
+    offset = numenc_resolve_offset(offset, codec->width, view.len);
+    if (offset < 0) {
+        PyBuffer_Release(& view);
+        return NULL;
+    }
+
+    // the codec writes the key only once the value has been validated,
+    // so the buffer is left untouched on error.
+    int result = codec->encode(value, (unsigned char* ) view.buf + offset);
+    PyBuffer_Release(& view);
+    if (result != 0) {
+        return NULL;
+    }
+    Py_RETURN_NONE;
+}
+
+PyObject* numenc_decode_from(const struct numenc_codec* codec,
+        PyObject* buffer, Py_ssize_t offset) {
+    Py_buffer view;
+    if (numenc_get_buffer(buffer, & view) != 0) {
+        return NULL;
+    }
+
+    offset = numenc_resolve_offset(offset, codec->width, view.len);
+    if (offset < 0) {
+        PyBuffer_Release(& view);
+        return NULL;
+    }
+
+    PyObject* output = codec->decode(
+        (const unsigned char* ) view.buf + offset);
+    PyBuffer_Release(& view);
+    return output;
+}
+
+static PyObject* encode_into(const struct numenc_codec* codec,
+        PyObject* const* args, Py_ssize_t nargs) {
+    if (nargs < 2 || nargs > 3) {
+        return PyErr_Format(PyExc_TypeError,
+            "from_%s_into() takes 2 or 3 arguments (%zd given)",
+            codec->name, nargs);
+    }
+
+    Py_ssize_t offset;
+    if (numenc_parse_offset(args, nargs, 2, & offset) != 0) {
+        return NULL;
+    }
+    return numenc_encode_into(codec, args[0], args[1], offset);
+}
+
+static PyObject* decode_from(const struct numenc_codec* codec,
+        PyObject* const* args, Py_ssize_t nargs) {
+    if (nargs < 1 || nargs > 2) {
+        return PyErr_Format(PyExc_TypeError,
+            "to_%s_from() takes 1 or 2 arguments (%zd given)",
+            codec->name, nargs);
+    }
+
+    Py_ssize_t offset;
+    if (numenc_parse_offset(args, nargs, 1, & offset) != 0) {
+        return NULL;
+    }
+    return numenc_decode_from(codec, args[0], offset);
+}
+
+#define NUMENC_INPLACE_FUNCTIONS(type, code) \
+    static PyObject* from_##type##_into( \
+            PyObject* self, PyObject* const* args, Py_ssize_t nargs) { \
+        return encode_into(& NUMENC_CODECS[code], args, nargs); \
+    } \
+    static PyObject* to_##type##_from( \
+            PyObject* self, PyObject* const* args, Py_ssize_t nargs) { \
+        return decode_from(& NUMENC_CODECS[code], args, nargs); \
+    }
+
+NUMENC_INPLACE_FUNCTIONS(int8, NUMENC_INT8)
+NUMENC_INPLACE_FUNCTIONS(uint8, NUMENC_UINT8)
+NUMENC_INPLACE_FUNCTIONS(int16, NUMENC_INT16)
+NUMENC_INPLACE_FUNCTIONS(uint16, NUMENC_UINT16)
+NUMENC_INPLACE_FUNCTIONS(int32, NUMENC_INT32)
+NUMENC_INPLACE_FUNCTIONS(uint32, NUMENC_UINT32)
+NUMENC_INPLACE_FUNCTIONS(int64, NUMENC_INT64)
+NUMENC_INPLACE_FUNCTIONS(uint64, NUMENC_UINT64)
+NUMENC_INPLACE_FUNCTIONS(float32, NUMENC_FLOAT32)
+NUMENC_INPLACE_FUNCTIONS(float64, NUMENC_FLOAT64)
+
+static PyMethodDef InplaceMethods[] = {
+    {
+        "from_int8_into",
+        (PyCFunction)(void(*)(void)) from_int8_into,
+        METH_FASTCALL,
+        "Write an 8-bit signed integer as sortable bytes into a writable "
+        "buffer at the given offset"
+    },
+    {
+        "to_int8_from",
+        (PyCFunction)(void(*)(void)) to_int8_from,
+        METH_FASTCALL,
+        "Read a signed 8-bit integer from the sortable bytes of a buffer "
+        "at the given offset"
+    },
+    {
+        "from_uint8_into",
+        (PyCFunction)(void(*)(void)) from_uint8_into,
+        METH_FASTCALL,
+        "Write an 8-bit unsigned integer as sortable bytes into a writable "
+        "buffer at the given offset"
+    },
+    {
+        "to_uint8_from",
+        (PyCFunction)(void(*)(void)) to_uint8_from,
+        METH_FASTCALL,
+        "Read an unsigned 8-bit integer from the sortable bytes of a buffer "
+        "at the given offset"
+    },
+    {
+        "from_int16_into",
+        (PyCFunction)(void(*)(void)) from_int16_into,
+        METH_FASTCALL,
+        "Write a 16-bit signed integer as sortable bytes into a writable "
+        "buffer at the given offset"
+    },
+    {
+        "to_int16_from",
+        (PyCFunction)(void(*)(void)) to_int16_from,
+        METH_FASTCALL,
+        "Read a signed 16-bit integer from the sortable bytes of a buffer "
+        "at the given offset"
+    },
+    {
+        "from_uint16_into",
+        (PyCFunction)(void(*)(void)) from_uint16_into,
+        METH_FASTCALL,
+        "Write a 16-bit unsigned integer as sortable bytes into a writable "
+        "buffer at the given offset"
+    },
+    {
+        "to_uint16_from",
+        (PyCFunction)(void(*)(void)) to_uint16_from,
+        METH_FASTCALL,
+        "Read an unsigned 16-bit integer from the sortable bytes of a buffer "
+        "at the given offset"
+    },
+    {
+        "from_int32_into",
+        (PyCFunction)(void(*)(void)) from_int32_into,
+        METH_FASTCALL,
+        "Write a 32-bit signed integer as sortable bytes into a writable "
+        "buffer at the given offset"
+    },
+    {
+        "to_int32_from",
+        (PyCFunction)(void(*)(void)) to_int32_from,
+        METH_FASTCALL,
+        "Read a signed 32-bit integer from the sortable bytes of a buffer "
+        "at the given offset"
+    },
+    {
+        "from_uint32_into",
+        (PyCFunction)(void(*)(void)) from_uint32_into,
+        METH_FASTCALL,
+        "Write a 32-bit unsigned integer as sortable bytes into a writable "
+        "buffer at the given offset"
+    },
+    {
+        "to_uint32_from",
+        (PyCFunction)(void(*)(void)) to_uint32_from,
+        METH_FASTCALL,
+        "Read an unsigned 32-bit integer from the sortable bytes of a buffer "
+        "at the given offset"
+    },
+    {
+        "from_int64_into",
+        (PyCFunction)(void(*)(void)) from_int64_into,
+        METH_FASTCALL,
+        "Write a signed 64-bit integer as sortable bytes into a writable "
+        "buffer at the given offset"
+    },
+    {
+        "to_int64_from",
+        (PyCFunction)(void(*)(void)) to_int64_from,
+        METH_FASTCALL,
+        "Read a signed 64-bit integer from the sortable bytes of a buffer "
+        "at the given offset"
+    },
+    {
+        "from_uint64_into",
+        (PyCFunction)(void(*)(void)) from_uint64_into,
+        METH_FASTCALL,
+        "Write an unsigned 64-bit integer as sortable bytes into a writable "
+        "buffer at the given offset"
+    },
+    {
+        "to_uint64_from",
+        (PyCFunction)(void(*)(void)) to_uint64_from,
+        METH_FASTCALL,
+        "Read an unsigned 64-bit integer from the sortable bytes of a buffer "
+        "at the given offset"
+    },
+    {
+        "from_float32_into",
+        (PyCFunction)(void(*)(void)) from_float32_into,
+        METH_FASTCALL,
+        "Write a 32-bit float as sortable bytes into a writable buffer "
+        "at the given offset"
+    },
+    {
+        "to_float32_from",
+        (PyCFunction)(void(*)(void)) to_float32_from,
+        METH_FASTCALL,
+        "Read a 32-bit float from the sortable bytes of a buffer "
+        "at the given offset"
+    },
+    {
+        "from_float64_into",
+        (PyCFunction)(void(*)(void)) from_float64_into,
+        METH_FASTCALL,
+        "Write a 64-bit float as sortable bytes into a writable buffer "
+        "at the given offset"
+    },
+    {
+        "to_float64_from",
+        (PyCFunction)(void(*)(void)) to_float64_from,
+        METH_FASTCALL,
+        "Read a 64-bit float from the sortable bytes of a buffer "
+        "at the given offset"
+    },
+    {
+        NULL,
+        NULL,
+        0,
+        NULL
+    }
+};
+
+int numenc_add_inplace_functions(PyObject* module) {
+    return PyModule_AddFunctions(module, InplaceMethods);
+}
@@ -0,0 +1,243 @@
+#include "numenc.h"
+
+// The scalar results of the small-domain types are interned. The keys of
+// one byte and the numbers of the 8-bit types are looked up in tables of
+// all their 256 values; the 16-bit types in tables of a configurable hot
+// range of values. The tables hold strong references to the objects, so
+// a lookup only increments a reference count instead of allocating.
+
+#define INT16_HOT_START -1024
+#define INT16_HOT_STOP 1024
+#define UINT16_HOT_START 0
+#define UINT16_HOT_STOP 2048
+
+static PyObject* byte_keys[256];
+
+// indexed by the value + 128 and by the value, respectively
+static PyObject* int8_numbers[256];
+static PyObject* uint8_numbers[256];
+
+// The keys and the numbers of the 16-bit values in [start, stop)
+struct hot_range {
+    long start;
+    long stop;
+    PyObject** keys;
+    PyObject** numbers;
+};
+
+// int16 and uint16
+static struct hot_range hot_ranges[2] = {
+    {0, 0, NULL, NULL},
+    {0, 0, NULL, NULL}
+};
+
+static struct hot_range* get_hot_range(int type) {
+    return (type == NUMENC_INT16 || type == NUMENC_UINT16) ?
+        & hot_ranges[type - NUMENC_INT16] : NULL;
+}
+
+static void clear_objects(PyObject** objects, Py_ssize_t count) {
+    if (objects == NULL) {
+        return;
+    }
+    for (Py_ssize_t i = 0; i < count; i++) {
+        Py_XDECREF(objects[i]);
+    }
+    PyMem_Free(objects);
+}
+
+// Build the keys and the numbers of the hot range of a 16-bit type and
+// replace the previous ones. Return 0 on success; otherwise set a Python
+// exception, keep the previous range and return -1.
+static int build_hot_range(int type, long start, long stop) {
+    const Py_ssize_t count = stop - start;
+    PyObject** keys = PyMem_New(PyObject*, count + 1);
+    PyObject** numbers = PyMem_New(PyObject*, count + 1);
+    if (keys == NULL || numbers == NULL) {
+        PyMem_Free(keys);
+        PyMem_Free(numbers);
+        PyErr_NoMemory();
+        return -1;
+    }
+    memset(keys, 0, (size_t) count * sizeof(PyObject*));
+    memset(numbers, 0, (size_t) count * sizeof(PyObject*));
+
+    for (Py_ssize_t i = 0; i < count; i++) {
+        const long value = start + (long) i;
+        unsigned char key[2];
+        if (type == NUMENC_INT16) {
+            numenc_encode_int16_raw((int16_t) value, key);
+        } else {
+            numenc_encode_uint16_raw((uint16_t) value, key);
+        }
+        keys[i] = PyBytes_FromStringAndSize((const char* ) key, 2);
+        numbers[i] = PyLong_FromLong(value);
+        if (keys[i] == NULL || numbers[i] == NULL) {
+            clear_objects(keys, count);
+            clear_objects(numbers, count);
+            return -1;
+        }
+    }
+
+    struct hot_range* range = get_hot_range(type);
+    clear_objects(range->keys, range->stop - range->start);
+    clear_objects(range->numbers, range->stop - range->start);
+    range->start = start;
+    range->stop = stop;
+    range->keys = keys;
+    range->numbers = numbers;
+    return 0;
+}
+
+PyObject* numenc_key_object(const unsigned char* key, Py_ssize_t width) {
+    PyObject* result = NULL;
+    if (width == 1) {
+        result = byte_keys[key[0]];
+    } else if (width == 2) {
+        const long code = numenc_load_u16(key);
+        const long value = (int16_t)(code ^ 0x8000);
+        const struct hot_range* signed_range = & hot_ranges[0];
+        const struct hot_range* unsigned_range = & hot_ranges[1];
+        if (value >= signed_range->start && value < signed_range->stop) {
+            result = signed_range->keys[value - signed_range->start];
+        } else if (code >= unsigned_range->start &&
+                code < unsigned_range->stop) {
+            result = unsigned_range->keys[code - unsigned_range->start];
+        }
+    }
+
+    if (result == NULL) {
+        return PyBytes_FromStringAndSize((const char* ) key, width);
+    }
+    Py_INCREF(result);
+    return result;
+}
+
+PyObject* numenc_number_object(int type, long value) {
+    PyObject* result = NULL;
+    if (type == NUMENC_INT8) {
+        result = int8_numbers[value + 128];
+    } else if (type == NUMENC_UINT8) {
+        result = uint8_numbers[value];
+    } else {
+        const struct hot_range* range = get_hot_range(type);
+        if (range != NULL && value >= range->start && value < range->stop) {
+            result = range->numbers[value - range->start];
+        }
+    }
+
+    if (result == NULL) {
+        return PyLong_FromLong(value);
+    }
+    Py_INCREF(result);
+    return result;
+}
+
+// Parse the name of a 16-bit type.
+// Return the type on success; otherwise set a ValueError and return -1.
+static int parse_hot_type(const char* name) {
+    if (strcmp(name, "int16") == 0) {
+        return NUMENC_INT16;
+    }
+    if (strcmp(name, "uint16") == 0) {
+        return NUMENC_UINT16;
+    }
+    PyErr_Format(PyExc_ValueError,
+        "Illegal type: expected 'int16' or 'uint16', got '%s'.", name);
+    return -1;
+}
+
+static PyObject* set_hot_range(
+        PyObject* self, PyObject* args, PyObject* kwargs) {
+    static const char* kwlist[] = {"type", "start", "stop", NULL};
+    const char* name;
+    long start;
+    long stop;
+
+    if (!PyArg_ParseTupleAndKeywords(args, kwargs, "sll",
+            (char** ) kwlist, & name, & start, & stop)) {
+        return NULL;
+    }
+
+    const int type = parse_hot_type(name);
+    if (type < 0) {
+        return NULL;
+    }
+    const long low = (type == NUMENC_INT16) ? INT16_MIN : 0;
+    const long high = (type == NUMENC_INT16) ? INT16_MAX : UINT16_MAX;
+    if (start < low || stop > high + 1 || start > stop) {
+        return PyErr_Format(PyExc_ValueError,
+            "Illegal range: expected %ld <= start <= stop <= %ld for %s, "
+            "got start %ld and stop %ld.", low, high + 1, name, start, stop);
+    }
+
+    if (build_hot_range(type, start, stop) != 0) {
+        return NULL;
+    }
+    Py_RETURN_NONE;
+}
+
+static PyObject* get_hot_range_of(PyObject* self, PyObject* args) {
+    const char* name;
+    if (!PyArg_ParseTuple(args, "s", & name)) {
+        return NULL;
+    }
+
+    const int type = parse_hot_type(name);
+    if (type < 0) {
+        return NULL;
+    }
+    const struct hot_range* range = get_hot_range(type);
+    return Py_BuildValue("(ll)", range->start, range->stop);
+}
+
+static PyMethodDef InternMethods[] = {
+    {
+        "set_hot_range",
+        (PyCFunction)(void(*)(void)) set_hot_range,
+        METH_VARARGS | METH_KEYWORDS,
+        "Intern the keys and the numbers of the values in [start, stop) of "
+        "a 16-bit type ('int16' or 'uint16'); an empty range disables "
+        "the interning"
+    },
+    {
+        "get_hot_range",
+        get_hot_range_of,
+        METH_VARARGS,
+        "Return the range [start, stop) of the interned values of a 16-bit "
+        "type ('int16' or 'uint16') as a tuple"
+    },
+    {
+        NULL,
+        NULL,
+        0,
+        NULL
+    }
+};
+
+int numenc_add_intern_functions(PyObject* module) {
+    for (int i = 0; i < 256; i++) {
+        if (byte_keys[i] == NULL) {
+            const char key = (char) i;
+            byte_keys[i] = PyBytes_FromStringAndSize(& key, 1);
+            int8_numbers[i] = PyLong_FromLong(i - 128);
+            uint8_numbers[i] = PyLong_FromLong(i);
+            if (byte_keys[i] == NULL || int8_numbers[i] == NULL ||
+                    uint8_numbers[i] == NULL) {
+                Py_CLEAR(byte_keys[i]);
+                Py_CLEAR(int8_numbers[i]);
+                Py_CLEAR(uint8_numbers[i]);
+                return -1;
+            }
+        }
+    }
+
+    if ((hot_ranges[0].keys == NULL && build_hot_range(
+            NUMENC_INT16, INT16_HOT_START, INT16_HOT_STOP) != 0) ||
+            (hot_ranges[1].keys == NULL && build_hot_range(
+            NUMENC_UINT16, UINT16_HOT_START, UINT16_HOT_STOP) != 0)) {
+        return -1;
+    }
+
+    return PyModule_AddFunctions(module, InternMethods);
+}
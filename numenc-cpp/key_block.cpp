@@ -0,0 +1,759 @@
+#include "numenc.h"
+
+#include <structmember.h>
+
+// Blocks of sorted keys compressed by front coding, like the data blocks
+// of LevelDB. Every entry stores the length of the prefix it shares with
+// the previous key, the length of the rest and the rest itself:
+//
+//     shared (varuint) | unshared (varuint) | unshared bytes
+//
+// Every restart_interval-th key is a restart point, which is stored whole
+// (shared is 0). The entries are followed by the trailer:
+//
+//     restart offsets | restart interval | key count | restart count
+//
+// where each field is a big-endian uint32. A seek bisects the restart
+// points and then decodes at most restart_interval entries.
+
+#define TRAILER_SIZE 12
+#define BLOCK_LIMIT 0xffffffffu
+
+// A growable byte buffer holding a key or a block under construction
+struct byte_buffer {
+    unsigned char* data;
+    Py_ssize_t size;
+    Py_ssize_t capacity;
+};
+
+// Make sure that the buffer can hold size bytes.
+// Return 0 on success; otherwise set a MemoryError and return -1.
+static int reserve(struct byte_buffer* buffer, Py_ssize_t size) {
+    if (size <= buffer->capacity) {
+        return 0;
+    }
+    Py_ssize_t capacity = buffer->capacity + buffer->capacity / 2 + 64;
+    if (capacity < size) {
+        capacity = size;
+    }
+    unsigned char* data = (unsigned char* ) PyMem_Realloc(
+        buffer->data, (size_t) capacity);
+    if (data == NULL) {
+        PyErr_NoMemory();
+        return -1;
+    }
+    buffer->data = data;
+    buffer->capacity = capacity;
+    return 0;
+}
+
+static int append(struct byte_buffer* buffer, const void* data,
+        Py_ssize_t size) {
+    if (size == 0) {
+        return 0;
+    }
+    if (reserve(buffer, buffer->size + size) != 0) {
+        return -1;
+    }
+    memcpy(buffer->data + buffer->size, data, (size_t) size);
+    buffer->size += size;
+    return 0;
+}
+
+static int append_u32(struct byte_buffer* buffer, Py_ssize_t value) {
+    unsigned char bytes[4];
+    numenc_store_u32((uint32_t) value, bytes);
+    return append(buffer, bytes, 4);
+}
+
+static int compare_keys(const unsigned char* a, Py_ssize_t a_size,
+        const unsigned char* b, Py_ssize_t b_size) {
+    const Py_ssize_t size = (a_size < b_size) ? a_size : b_size;
+    // an empty key may have no data, and memcmp must not get a null pointer
+    if (size > 0) {
+        const int result = memcmp(a, b, (size_t) size);
+        if (result != 0) {
+            return result;
+        }
+    }
+    return (a_size > b_size) - (a_size < b_size);
+}
+
+// The state of the encoder between the keys
+struct block_builder {
+    struct byte_buffer entries;
+    struct byte_buffer restarts;
+    struct byte_buffer previous;
+    Py_ssize_t interval;
+    Py_ssize_t count;
+};
+
+// Append a key to the block.
+// Return 0 on success; otherwise set a Python exception and return -1.
+static int add_key(struct block_builder* builder, const unsigned char* key,
+        Py_ssize_t size) {
+    struct byte_buffer* previous = & builder->previous;
+    if (builder->count > 0 && compare_keys(
+            previous->data, previous->size, key, size) > 0) {
+        PyErr_Format(PyExc_ValueError,
+            "Illegal keys: expected the keys in ascending order, got "
+            "a smaller key at index %zd.", builder->count);
+        return -1;
+    }
+
+    Py_ssize_t shared = 0;
+    if (builder->count % builder->interval == 0) {
+        if (append_u32(& builder->restarts, builder->entries.size) != 0) {
+            return -1;
+        }
+    } else {
+        const Py_ssize_t limit = (previous->size < size) ?
+            previous->size : size;
+        while (shared < limit && previous->data[shared] == key[shared]) {
+            shared++;
+        }
+    }
+
+    unsigned char header[2 * NUMENC_VARINT_MAX_SIZE];
+    int length = numenc_encode_varuint_raw((uint64_t) shared, header);
+    length += numenc_encode_varuint_raw(
+        (uint64_t)(size - shared), header + length);
+    if (append(& builder->entries, header, length) != 0 ||
+            append(& builder->entries, key + shared, size - shared) != 0) {
+        return -1;
+    }
+
+    previous->size = 0;
+    if (append(previous, key, size) != 0) {
+        return -1;
+    }
+    builder->count++;
+
+    if ((size_t) builder->entries.size + (size_t) builder->restarts.size +
+            TRAILER_SIZE > BLOCK_LIMIT) {
+        PyErr_Format(PyExc_ValueError,
+            "Illegal keys: expected a block of at most %lu bytes, got more "
+            "at index %zd.", (unsigned long) BLOCK_LIMIT,
+            builder->count - 1);
+        return -1;
+    }
+    return 0;
+}
+
+// Add the keys of an iterable of bytes-like objects or, if width is
+// positive, the concatenated keys of a bytes-like object.
+// Return 0 on success; otherwise set a Python exception and return -1.
+static int add_keys(struct block_builder* builder, PyObject* keys,
+        Py_ssize_t width) {
+    if (width > 0) {
+        Py_buffer view;
+        if (numenc_get_buffer(keys, & view) != 0) {
+            return -1;
+        }
+        if (view.len % width != 0) {
+            PyErr_Format(PyExc_ValueError,
+                "Illegal input: expected a buffer of keys whose length is "
+                "a multiple of %zd, got %zd.", width, view.len);
+            PyBuffer_Release(& view);
+            return -1;
+        }
+        int status = 0;
+        const unsigned char* data = (const unsigned char* ) view.buf;
+        for (Py_ssize_t i = 0; i < view.len && status == 0; i += width) {
+            status = add_key(builder, data + i, width);
+        }
+        PyBuffer_Release(& view);
+        return status;
+    }
+
+    PyObject* iterator = PyObject_GetIter(keys);
+    if (iterator == NULL) {
+        PyErr_Clear();
+        PyErr_SetString(PyExc_TypeError,
+            "Wrong input: expected an iterable of bytes-like keys.");
+        return -1;
+    }
+    PyObject* item;
+    while ((item = PyIter_Next(iterator)) != NULL) {
+        Py_buffer view;
+        int status = numenc_get_buffer(item, & view);
+        if (status == 0) {
+            status = add_key(builder, (const unsigned char* ) view.buf,
+                view.len);
+            PyBuffer_Release(& view);
+        } else {
+            numenc_annotate_index(builder->count);
+        }
+        Py_DECREF(item);
+        if (status != 0) {
+            Py_DECREF(iterator);
+            return -1;
+        }
+    }
+    Py_DECREF(iterator);
+    return PyErr_Occurred() ? -1 : 0;
+}
+
+static PyObject* encode_block(
+        PyObject* self, PyObject* args, PyObject* kwargs) {
+    static const char* kwlist[] = {"keys", "restart_interval", "width",
+        NULL};
+    PyObject* keys;
+    Py_ssize_t interval = 16;
+    PyObject* width_object = Py_None;
+
+    if (!PyArg_ParseTupleAndKeywords(args, kwargs, "O|nO",
+            (char** ) kwlist, & keys, & interval, & width_object)) {
+        return NULL;
+    }
+
+    if (interval < 1 || (size_t) interval > BLOCK_LIMIT) {
+        return PyErr_Format(PyExc_ValueError,
+            "Illegal restart_interval: expected a positive interval of at "
+            "most %lu keys, got %zd.", (unsigned long) BLOCK_LIMIT,
+            interval);
+    }
+    Py_ssize_t width = 0;
+    if (width_object != Py_None) {
+        width = PyLong_AsSsize_t(width_object);
+        if (width == -1 && PyErr_Occurred()) {
+            return NULL;
+        }
+        if (width <= 0) {
+            return PyErr_Format(PyExc_ValueError,
+                "Illegal width: expected a positive width, got %zd.",
+                width);
+        }
+    }
+
+    struct block_builder builder = {
+        {NULL, 0, 0}, {NULL, 0, 0}, {NULL, 0, 0}, interval, 0
+    };
+    PyObject* result = NULL;
+    if (add_keys(& builder, keys, width) == 0 &&
+            append(& builder.entries, builder.restarts.data,
+                builder.restarts.size) == 0 &&
+            append_u32(& builder.entries, interval) == 0 &&
+            append_u32(& builder.entries, builder.count) == 0 &&
+            append_u32(& builder.entries, builder.restarts.size / 4) == 0) {
+        result = PyBytes_FromStringAndSize(
+            (const char* ) builder.entries.data, builder.entries.size);
+    }
+    PyMem_Free(builder.entries.data);
+    PyMem_Free(builder.restarts.data);
+    PyMem_Free(builder.previous.data);
+    return result;
+}
+
+struct numenc_key_block {
+    PyObject_HEAD
+
+    // the view holds a reference to the exporter of the block
+    Py_buffer view;
+
+    // size of the entries in front of the trailer
+    Py_ssize_t size;
+
+    Py_ssize_t interval;
+    Py_ssize_t count;
+
+    // copied from the trailer so that a change of a mutable exporter
+    // cannot move them out of the entries
+    Py_ssize_t* restarts;
+    Py_ssize_t restart_count;
+};
+
+struct numenc_key_block_iterator {
+    PyObject_HEAD
+
+    struct numenc_key_block* block;
+
+    // offset and index of the next entry to decode
+    Py_ssize_t offset;
+    Py_ssize_t index;
+
+    // the last decoded key; set pending if it is yet to be returned
+    struct byte_buffer key;
+    int pending;
+
+    // exclusive upper bound of the keys, or NULL if unbounded
+    PyObject* stop;
+};
+
+static PyTypeObject* KeyBlockType = NULL;
+static PyTypeObject* KeyBlockIteratorType = NULL;
+
+static int corrupt(Py_ssize_t offset) {
+    PyErr_Format(PyExc_ValueError,
+        "Illegal block: corrupt entry at offset %zd.", offset);
+    return -1;
+}
+
+// Read a varuint of the entries which is at most the size of the entries.
+// Return 0 on success; otherwise return -1 without setting an exception.
+static int read_varuint(const struct numenc_key_block* block,
+        Py_ssize_t* offset, Py_ssize_t* value) {
+    const unsigned char* data = (const unsigned char* ) block->view.buf;
+    if (*offset >= block->size || numenc_varuint_length(data[*offset]) >
+            block->size - *offset) {
+        return -1;
+    }
+    uint64_t result;
+    if (numenc_decode_varuint_raw(data + *offset, & result) != 0 ||
+            result > (uint64_t) block->size) {
+        return -1;
+    }
+    *offset += numenc_varuint_length(data[*offset]);
+    *value = (Py_ssize_t) result;
+    return 0;
+}
+
+// Decode the entry at the offset on top of the previous key.
+// Return the offset of the next entry on success; otherwise set
+// a Python exception and return -1.
+static Py_ssize_t read_entry(const struct numenc_key_block* block,
+        Py_ssize_t offset, struct byte_buffer* key) {
+    const Py_ssize_t start = offset;
+    Py_ssize_t shared;
+    Py_ssize_t unshared;
+    if (read_varuint(block, & offset, & shared) != 0 ||
+            read_varuint(block, & offset, & unshared) != 0 ||
+            shared > key->size || unshared > block->size - offset) {
+        return corrupt(start);
+    }
+    key->size = shared;
+    if (append(key, (const unsigned char* ) block->view.buf + offset,
+            unshared) != 0) {
+        return -1;
+    }
+    return offset + unshared;
+}
+
+// Read the key of a restart point, which is stored whole, without
+// copying it. Return 0 on success; otherwise set a Python exception and
+// return -1.
+static int read_restart(const struct numenc_key_block* block,
+        Py_ssize_t restart, const unsigned char** key, Py_ssize_t* size) {
+    Py_ssize_t offset = block->restarts[restart];
+    Py_ssize_t shared;
+    if (read_varuint(block, & offset, & shared) != 0 ||
+            read_varuint(block, & offset, size) != 0 ||
+            shared != 0 || *size > block->size - offset) {
+        return corrupt(block->restarts[restart]);
+    }
+    *key = (const unsigned char* ) block->view.buf + offset;
+    return 0;
+}
+
+static PyObject* KeyBlock_new(
+        PyTypeObject* type, PyObject* args, PyObject* kwargs) {
+    static const char* kwlist[] = {"data", NULL};
+    PyObject* data;
+
+    if (!PyArg_ParseTupleAndKeywords(args, kwargs, "O",
+            (char** ) kwlist, & data)) {
+        return NULL;
+    }
+
+    struct numenc_key_block* self =
+        (struct numenc_key_block* ) type->tp_alloc(type, 0);
+    if (self == NULL) {
+        return NULL;
+    }
+    self->view.obj = NULL;
+    self->restarts = NULL;
+    if (numenc_get_buffer(data, & self->view) != 0) {
+        Py_DECREF(self);
+        return NULL;
+    }
+
+    const unsigned char* bytes = (const unsigned char* ) self->view.buf;
+    const Py_ssize_t length = self->view.len;
+    if (length < TRAILER_SIZE) {
+        Py_DECREF(self);
+        return PyErr_Format(PyExc_ValueError,
+            "Illegal block: expected at least %d bytes, got %zd.",
+            TRAILER_SIZE, length);
+    }
+    self->interval = numenc_load_u32(bytes + length - 12);
+    self->count = numenc_load_u32(bytes + length - 8);
+    self->restart_count = numenc_load_u32(bytes + length - 4);
+    self->size = length - TRAILER_SIZE - 4 * self->restart_count;
+
+    if (self->interval < 1 || self->size < 0 || self->restart_count !=
+            (self->count + self->interval - 1) / self->interval) {
+        Py_DECREF(self);
+        return PyErr_Format(PyExc_ValueError,
+            "Illegal block: corrupt trailer.");
+    }
+
+    self->restarts = PyMem_New(Py_ssize_t, self->restart_count + 1);
+    if (self->restarts == NULL) {
+        Py_DECREF(self);
+        return PyErr_NoMemory();
+    }
+    for (Py_ssize_t i = 0; i < self->restart_count; i++) {
+        self->restarts[i] = numenc_load_u32(bytes + self->size + 4 * i);
+        // every restart point starts an entry of at least two bytes
+        if ((i == 0) ? self->restarts[i] != 0 :
+                self->restarts[i] <= self->restarts[i - 1] ||
+                self->restarts[i] >= self->size) {
+            Py_DECREF(self);
+            return PyErr_Format(PyExc_ValueError,
+                "Illegal block: corrupt restart offset %zd.", i);
+        }
+    }
+    if (self->count == 0 && self->size != 0) {
+        Py_DECREF(self);
+        return PyErr_Format(PyExc_ValueError,
+            "Illegal block: corrupt trailer.");
+    }
+    return (PyObject* ) self;
+}
+
+static void KeyBlock_dealloc(struct numenc_key_block* self) {
+    PyTypeObject* type = Py_TYPE(self);
+    if (self->view.obj != NULL) {
+        PyBuffer_Release(& self->view);
+    }
+    PyMem_Free(self->restarts);
+    type->tp_free((PyObject* ) self);
+#if PY_VERSION_HEX >= 0x03080000
+    // instances of heap types hold a reference to their type since 3.8
+    Py_DECREF(type);
+#endif
+}
+
+static PyObject* KeyBlock_repr(struct numenc_key_block* self) {
+    return PyUnicode_FromFormat(
+        "<numenc.KeyBlock of %zd keys in %zd bytes>",
+        self->count, self->view.len);
+}
+
+static Py_ssize_t KeyBlock_length(struct numenc_key_block* self) {
+    return self->count;
+}
+
+// Create an iterator positioned at the first key of a restart point.
+static struct numenc_key_block_iterator* new_iterator(
+        struct numenc_key_block* self, Py_ssize_t restart) {
+    struct numenc_key_block_iterator* iterator =
+        (struct numenc_key_block_iterator* )
+        KeyBlockIteratorType->tp_alloc(KeyBlockIteratorType, 0);
+    if (iterator == NULL) {
+        return NULL;
+    }
+    Py_INCREF(self);
+    iterator->block = self;
+    iterator->offset = (restart < self->restart_count) ?
+        self->restarts[restart] : self->size;
+    iterator->index = restart * self->interval;
+    iterator->key.data = NULL;
+    iterator->key.size = 0;
+    iterator->key.capacity = 0;
+    iterator->pending = 0;
+    iterator->stop = NULL;
+    return iterator;
+}
+
+static PyObject* KeyBlock_iter(struct numenc_key_block* self) {
+    return (PyObject* ) new_iterator(self, 0);
+}
+
+// Create an iterator positioned at the first key not less than the probe.
+// Return a new reference on success; otherwise set a Python exception and
+// return NULL.
+static struct numenc_key_block_iterator* seek(
+        struct numenc_key_block* self, const unsigned char* probe,
+        Py_ssize_t probe_size) {
+    // find the last restart point whose key is less than the probe
+    Py_ssize_t low = 0;
+    Py_ssize_t high = self->restart_count - 1;
+    while (low < high) {
+        const Py_ssize_t middle = low + (high - low + 1) / 2;
+        const unsigned char* key;
+        Py_ssize_t size;
+        if (read_restart(self, middle, & key, & size) != 0) {
+            return NULL;
+        }
+        if (compare_keys(key, size, probe, probe_size) < 0) {
+            low = middle;
+        } else {
+            high = middle - 1;
+        }
+    }
+
+    struct numenc_key_block_iterator* iterator = new_iterator(self, low);
+    if (iterator == NULL) {
+        return NULL;
+    }
+    while (iterator->index < self->count) {
+        const Py_ssize_t offset = read_entry(
+            self, iterator->offset, & iterator->key);
+        if (offset < 0) {
+            Py_DECREF(iterator);
+            return NULL;
+        }
+        iterator->offset = offset;
+        iterator->index++;
+        if (compare_keys(iterator->key.data, iterator->key.size, probe,
+                probe_size) >= 0) {
+            iterator->pending = 1;
+            break;
+        }
+    }
+    return iterator;
+}
+
+static PyObject* KeyBlock_seek(struct numenc_key_block* self,
+        PyObject* key) {
+    Py_buffer view;
+    if (numenc_get_buffer(key, & view) != 0) {
+        return NULL;
+    }
+    PyObject* iterator = (PyObject* ) seek(
+        self, (const unsigned char* ) view.buf, view.len);
+    PyBuffer_Release(& view);
+    return iterator;
+}
+
+static PyObject* KeyBlock_irange(struct numenc_key_block* self,
+        PyObject* args, PyObject* kwargs) {
+    static const char* kwlist[] = {"start", "stop", NULL};
+    PyObject* start = Py_None;
+    PyObject* stop = Py_None;
+
+    if (!PyArg_ParseTupleAndKeywords(args, kwargs, "|OO",
+            (char** ) kwlist, & start, & stop)) {
+        return NULL;
+    }
+
+    Py_buffer stop_view;
+    if (stop != Py_None) {
+        if (numenc_get_buffer(stop, & stop_view) != 0) {
+            return NULL;
+        }
+        PyBuffer_Release(& stop_view);
+    }
+
+    struct numenc_key_block_iterator* iterator;
+    if (start == Py_None) {
+        iterator = new_iterator(self, 0);
+    } else {
+        Py_buffer view;
+        if (numenc_get_buffer(start, & view) != 0) {
+            return NULL;
+        }
+        iterator = seek(self, (const unsigned char* ) view.buf, view.len);
+        PyBuffer_Release(& view);
+    }
+    if (iterator != NULL && stop != Py_None) {
+        Py_INCREF(stop);
+        iterator->stop = stop;
+    }
+    return (PyObject* ) iterator;
+}
+
+static int KeyBlock_contains(struct numenc_key_block* self, PyObject* key) {
+    Py_buffer view;
+    if (numenc_get_buffer(key, & view) != 0) {
+        return -1;
+    }
+    struct numenc_key_block_iterator* iterator = seek(
+        self, (const unsigned char* ) view.buf, view.len);
+    int found = -1;
+    if (iterator != NULL) {
+        found = iterator->pending && compare_keys(iterator->key.data,
+            iterator->key.size, (const unsigned char* ) view.buf,
+            view.len) == 0;
+        Py_DECREF(iterator);
+    }
+    PyBuffer_Release(& view);
+    return found;
+}
+
+static PyObject* KeyBlock_sizeof(
+        struct numenc_key_block* self, PyObject* Py_UNUSED(ignored)) {
+    return PyLong_FromSsize_t(Py_TYPE(self)->tp_basicsize +
+        (self->restart_count + 1) * (Py_ssize_t) sizeof(Py_ssize_t));
+}
+
+static PyMethodDef KeyBlockMethods[] = {
+    {
+        "seek",
+        (PyCFunction) KeyBlock_seek,
+        METH_O,
+        "Iterate over the keys starting with the first key not less than "
+        "the given key"
+    },
+    {
+        "irange",
+        (PyCFunction)(void(*)(void)) KeyBlock_irange,
+        METH_VARARGS | METH_KEYWORDS,
+        "Iterate over the keys in [start, stop); a bound of None is "
+        "unbounded"
+    },
+    {
+        "__sizeof__",
+        (PyCFunction) KeyBlock_sizeof,
+        METH_NOARGS,
+        "Size of the block object in memory without the encoded block, "
+        "in bytes"
+    },
+    {
+        NULL,
+        NULL,
+        0,
+        NULL
+    }
+};
+
+static PyMemberDef KeyBlockMembers[] = {
+    {
+        (char* ) "restart_interval",
+        T_PYSSIZET,
+        offsetof(struct numenc_key_block, interval),
+        READONLY,
+        (char* ) "Number of keys between two restart points"
+    },
+    {
+        (char* ) "restart_count",
+        T_PYSSIZET,
+        offsetof(struct numenc_key_block, restart_count),
+        READONLY,
+        (char* ) "Number of restart points"
+    },
+    {
+        NULL,
+        0,
+        0,
+        0,
+        NULL
+    }
+};
+
+static PyType_Slot KeyBlockSlots[] = {
+    {
+        Py_tp_doc,
+        (void* ) "Read-only view on a block of front-coded sorted keys "
+        "produced by encode_block(), e.g., KeyBlock(data)"
+    },
+    {Py_tp_new, (void* ) KeyBlock_new},
+    {Py_tp_dealloc, (void* ) KeyBlock_dealloc},
+    {Py_tp_repr, (void* ) KeyBlock_repr},
+    {Py_tp_iter, (void* ) KeyBlock_iter},
+    {Py_tp_methods, (void* ) KeyBlockMethods},
+    {Py_tp_members, (void* ) KeyBlockMembers},
+    {Py_sq_length, (void* ) KeyBlock_length},
+    {Py_sq_contains, (void* ) KeyBlock_contains},
+    {0, NULL}
+};
+
+static PyType_Spec KeyBlockSpec = {
+    "numenc.KeyBlock",
+    sizeof(struct numenc_key_block),
+    0,
+    Py_TPFLAGS_DEFAULT,
+    KeyBlockSlots
+};
+
+static void KeyBlockIterator_dealloc(
+        struct numenc_key_block_iterator* self) {
+    PyTypeObject* type = Py_TYPE(self);
+    Py_XDECREF(self->block);
+    Py_XDECREF(self->stop);
+    PyMem_Free(self->key.data);
+    type->tp_free((PyObject* ) self);
+#if PY_VERSION_HEX >= 0x03080000
+    // instances of heap types hold a reference to their type since 3.8
+    Py_DECREF(type);
+#endif
+}
+
+static PyObject* KeyBlockIterator_next(
+        struct numenc_key_block_iterator* self) {
+    if (!self->pending) {
+        if (self->index >= self->block->count) {
+            return NULL;
+        }
+        const Py_ssize_t offset = read_entry(
+            self->block, self->offset, & self->key);
+        if (offset < 0) {
+            return NULL;
+        }
+        self->offset = offset;
+        self->index++;
+    }
+    self->pending = 0;
+
+    if (self->stop != NULL) {
+        Py_buffer view;
+        if (numenc_get_buffer(self->stop, & view) != 0) {
+            return NULL;
+        }
+        const int result = compare_keys(self->key.data, self->key.size,
+            (const unsigned char* ) view.buf, view.len);
+        PyBuffer_Release(& view);
+        if (result >= 0) {
+            // exhaust the iterator
+            self->index = self->block->count;
+            return NULL;
+        }
+    }
+    return PyBytes_FromStringAndSize(
+        (const char* ) self->key.data, self->key.size);
+}
+
+static PyType_Slot KeyBlockIteratorSlots[] = {
+    {Py_tp_dealloc, (void* ) KeyBlockIterator_dealloc},
+    {Py_tp_iter, (void* ) PyObject_SelfIter},
+    {Py_tp_iternext, (void* ) KeyBlockIterator_next},
+    {0, NULL}
+};
+
+static PyType_Spec KeyBlockIteratorSpec = {
+    "numenc.KeyBlockIterator",
+    sizeof(struct numenc_key_block_iterator),
+    0,
+    Py_TPFLAGS_DEFAULT,
+    KeyBlockIteratorSlots
+};
+
+static PyMethodDef KeyBlockFunctions[] = {
+    {
+        "encode_block",
+        (PyCFunction)(void(*)(void)) encode_block,
+        METH_VARARGS | METH_KEYWORDS,
+        "Front-code an iterable of sorted bytes-like keys (or, given "
+        "the width, the concatenated keys of a bytes-like object) into "
+        "a block with a restart point every restart_interval keys"
+    },
+    {
+        NULL,
+        NULL,
+        0,
+        NULL
+    }
+};
+
+int numenc_add_key_block_type(PyObject* module) {
+    if (KeyBlockType == NULL) {
+        KeyBlockIteratorType =
+            (PyTypeObject* ) PyType_FromSpec(& KeyBlockIteratorSpec);
+        if (KeyBlockIteratorType == NULL) {
+            return -1;
+        }
+        KeyBlockType = (PyTypeObject* ) PyType_FromSpec(& KeyBlockSpec);
+        if (KeyBlockType == NULL) {
+            return -1;
+        }
+    }
+
+    Py_INCREF(KeyBlockType);
+    if (PyModule_AddObject(module, "KeyBlock",
+            (PyObject* ) KeyBlockType) != 0) {
+        Py_DECREF(KeyBlockType);
+        return -1;
+    }
+    return PyModule_AddFunctions(module, KeyBlockFunctions);
+}
@@ -0,0 +1,676 @@
+#ifndef NUMENC_NUMENC_H
+#define NUMENC_NUMENC_H
+
+#define PY_SSIZE_T_CLEAN
+#include <Python.h>
+
+#include <stdint.h>
+#include <string.h>
+
+// Identifies one of the supported numeric types. The order matches
+// the order of the types in the README and in the method table.
+enum numenc_type {
+    NUMENC_INT8 = 0,
+    NUMENC_UINT8,
+    NUMENC_INT16,
+    NUMENC_UINT16,
+    NUMENC_INT32,
+    NUMENC_UINT32,
+    NUMENC_INT64,
+    NUMENC_UINT64,
+    NUMENC_FLOAT32,
+    NUMENC_FLOAT64,
+    NUMENC_TYPE_COUNT
+};
+
+// Encode a Python number into the sortable bytes at out.
+// Return 0 on success; otherwise set a Python exception and return -1.
+typedef int (*numenc_encode_func)(PyObject* value, unsigned char* out);
+
+// Decode the sortable bytes at in into a new Python number.
+typedef PyObject* (*numenc_decode_func)(const unsigned char* in);
+
+struct numenc_codec {
+    const char* name;
+    Py_ssize_t width;
+    numenc_encode_func encode;
+    numenc_decode_func decode;
+};
+
+extern const struct numenc_codec NUMENC_CODECS[NUMENC_TYPE_COUNT];
+
+// Codecs producing the complement of the keys, so that the keys sort
+// in descending order of the numbers.
+extern const struct numenc_codec NUMENC_DESC_CODECS[NUMENC_TYPE_COUNT];
+
+// Return 1 if the machine runs on little endian and 0 if it runs on
+// big endian.
+static inline int numenc_is_little_endian(void) {
+    const uint16_t number = 0x1;
+    return * (const unsigned char* ) & number == 1;
+}
+
+// Write the complement of count bytes from in to out; in and out may be
+// the same.
+static inline void numenc_complement(
+        const unsigned char* in, unsigned char* out, Py_ssize_t count) {
+    for (Py_ssize_t i = 0; i < count; i++) {
+        out[i] = (unsigned char) ~in[i];
+    }
+}
+
+// The kernels below write and read the sortable representation as
+// big-endian bytes through shifts, so they do not depend on the
+// endianness of the machine.
+
+static inline void numenc_store_u16(uint16_t value, unsigned char* out) {
+    out[0] = (unsigned char)(value >> 8);
+    out[1] = (unsigned char) value;
+}
+
+static inline void numenc_store_u32(uint32_t value, unsigned char* out) {
+    for (int i = 0; i < 4; i++) {
+        out[i] = (unsigned char)(value >> ((3 - i) * 8));
+    }
+}
+
+static inline void numenc_store_u64(uint64_t value, unsigned char* out) {
+    for (int i = 0; i < 8; i++) {
+        out[i] = (unsigned char)(value >> ((7 - i) * 8));
+    }
+}
+
+static inline uint16_t numenc_load_u16(const unsigned char* in) {
+    return (uint16_t)((uint16_t) in[0] << 8 | (uint16_t) in[1]);
+}
+
+static inline uint32_t numenc_load_u32(const unsigned char* in) {
+    uint32_t value = 0;
+    for (int i = 0; i < 4; i++) {
+        value = (value << 8) | in[i];
+    }
+    return value;
+}
+
+static inline uint64_t numenc_load_u64(const unsigned char* in) {
+    uint64_t value = 0;
+    for (int i = 0; i < 8; i++) {
+        value = (value << 8) | in[i];
+    }
+    return value;
+}
+
+static inline void numenc_encode_int8_raw(int8_t value, unsigned char* out) {
+    // flip sign bit
+    out[0] = (unsigned char) value ^ 0x80;
+}
+
+static inline int8_t numenc_decode_int8_raw(const unsigned char* in) {
+    return (int8_t)(in[0] ^ 0x80);
+}
+
+static inline void numenc_encode_uint8_raw(uint8_t value, unsigned char* out) {
+    out[0] = value;
+}
+
+static inline uint8_t numenc_decode_uint8_raw(const unsigned char* in) {
+    return in[0];
+}
+
+static inline void numenc_encode_int16_raw(int16_t value, unsigned char* out) {
+    numenc_store_u16((uint16_t) value ^ 0x8000u, out);
+}
+
+static inline int16_t numenc_decode_int16_raw(const unsigned char* in) {
+    return (int16_t)(numenc_load_u16(in) ^ 0x8000u);
+}
+
+static inline void numenc_encode_uint16_raw(
+        uint16_t value, unsigned char* out) {
+    numenc_store_u16(value, out);
+}
+
+static inline uint16_t numenc_decode_uint16_raw(const unsigned char* in) {
+    return numenc_load_u16(in);
+}
+
+static inline void numenc_encode_int32_raw(int32_t value, unsigned char* out) {
+    numenc_store_u32((uint32_t) value ^ 0x80000000u, out);
+}
+
+static inline int32_t numenc_decode_int32_raw(const unsigned char* in) {
+    return (int32_t)(numenc_load_u32(in) ^ 0x80000000u);
+}
+
+static inline void numenc_encode_uint32_raw(
+        uint32_t value, unsigned char* out) {
+    numenc_store_u32(value, out);
+}
+
+static inline uint32_t numenc_decode_uint32_raw(const unsigned char* in) {
+    return numenc_load_u32(in);
+}
+
+static inline void numenc_encode_int64_raw(int64_t value, unsigned char* out) {
+    numenc_store_u64((uint64_t) value ^ 0x8000000000000000ull, out);
+}
+
+static inline int64_t numenc_decode_int64_raw(const unsigned char* in) {
+    return (int64_t)(numenc_load_u64(in) ^ 0x8000000000000000ull);
+}
+
+static inline void numenc_encode_uint64_raw(
+        uint64_t value, unsigned char* out) {
+    numenc_store_u64(value, out);
+}
+
+static inline uint64_t numenc_decode_uint64_raw(const unsigned char* in) {
+    return numenc_load_u64(in);
+}
+
+static inline void numenc_encode_float32_raw(float value, unsigned char* out) {
+    uint32_t bits;
+    memcpy(& bits, & value, sizeof(bits));
+    if (value >= 0) {
+        // positive number: set sign bit to 1
+        bits |= 0x80000000u;
+    } else {
+        // negative number: flip all bits
+        bits = ~bits;
+    }
+    numenc_store_u32(bits, out);
+}
+
+static inline float numenc_decode_float32_raw(const unsigned char* in) {
+    uint32_t bits = numenc_load_u32(in);
+    if (bits & 0x80000000u) {
+        // sign bit is 1: positive number or zero
+        bits ^= 0x80000000u;
+    } else {
+        // negative number
+        bits = ~bits;
+    }
+    float value;
+    memcpy(& value, & bits, sizeof(value));
+    return value;
+}
+
+static inline void numenc_encode_float64_raw(
+        double value, unsigned char* out) {
+    uint64_t bits;
+    memcpy(& bits, & value, sizeof(bits));
+    if (value >= 0) {
+        // positive number: set sign bit to 1
+        bits |= 0x8000000000000000ull;
+    } else {
+        // negative number: flip all bits
+        bits = ~bits;
+    }
+    numenc_store_u64(bits, out);
+}
+
+static inline double numenc_decode_float64_raw(const unsigned char* in) {
+    uint64_t bits = numenc_load_u64(in);
+    if (bits & 0x8000000000000000ull) {
+        // sign bit is 1: positive number or zero
+        bits ^= 0x8000000000000000ull;
+    } else {
+        // negative number
+        bits = ~bits;
+    }
+    double value;
+    memcpy(& value, & bits, sizeof(value));
+    return value;
+}
+
+// Order-preserving variable-length integers. The first byte of a varint
+// (the header) determines its length, so that the lexicographic order of
+// the varints matches the numeric order of their values. Every value has
+// a single (canonical) encoding of at most NUMENC_VARINT_MAX_SIZE bytes.
+//
+// Unsigned varints follow the scheme of SQLite4: values up to 240 take
+// one byte, values up to 2287 two bytes and values up to 67823 three
+// bytes; larger values are stored as a header 247 + n followed by
+// the n big-endian bytes of the value (n in [3, 8]).
+//
+// Signed varints store the values in [-120, 119] as a single byte
+// 0x80 + value. Larger values are stored as a header 0xf7 + n followed by
+// the n big-endian bytes of value - 120, smaller values as a header
+// 0x08 - n followed by the complement of the n big-endian bytes of
+// -(value + 121) (n in [1, 8]).
+
+#define NUMENC_VARINT_MAX_SIZE 9
+
+// Return the minimal number of bytes needed to store the value.
+static inline int numenc_byte_count(uint64_t value) {
+    int count = 1;
+    while (count < 8 && (value >> (count * 8)) != 0) {
+        count++;
+    }
+    return count;
+}
+
+static inline void numenc_store_be(
+        uint64_t value, int count, unsigned char* out) {
+    for (int i = 0; i < count; i++) {
+        out[i] = (unsigned char)(value >> ((count - 1 - i) * 8));
+    }
+}
+
+static inline uint64_t numenc_load_be(const unsigned char* in, int count) {
+    uint64_t value = 0;
+    for (int i = 0; i < count; i++) {
+        value = (value << 8) | in[i];
+    }
+    return value;
+}
+
+static inline int numenc_varuint_size(uint64_t value) {
+    if (value <= 240) {
+        return 1;
+    }
+    if (value <= 2287) {
+        return 2;
+    }
+    if (value <= 67823) {
+        return 3;
+    }
+    int count = numenc_byte_count(value);
+    return 1 + (count < 3 ? 3 : count);
+}
+
+// Return the length of an unsigned varint given its header.
+static inline int numenc_varuint_length(unsigned char header) {
+    if (header <= 240) {
+        return 1;
+    }
+    if (header <= 248) {
+        return 2;
+    }
+    if (header == 249) {
+        return 3;
+    }
+    return header - 246;
+}
+
+// Encode the value at out and return the length of the varint.
+static inline int numenc_encode_varuint_raw(
+        uint64_t value, unsigned char* out) {
+    if (value <= 240) {
+        out[0] = (unsigned char) value;
+        return 1;
+    }
+    if (value <= 2287) {
+        value -= 240;
+        out[0] = (unsigned char)(value / 256 + 241);
+        out[1] = (unsigned char)(value % 256);
+        return 2;
+    }
+    if (value <= 67823) {
+        value -= 2288;
+        out[0] = 249;
+        out[1] = (unsigned char)(value / 256);
+        out[2] = (unsigned char)(value % 256);
+        return 3;
+    }
+    int count = numenc_byte_count(value);
+    if (count < 3) {
+        count = 3;
+    }
+    out[0] = (unsigned char)(247 + count);
+    numenc_store_be(value, count, out + 1);
+    return 1 + count;
+}
+
+// Decode the varint at in, which must hold at least the number of bytes
+// given by its header. Return 0 on success and -1 if the varint is not
+// canonical.
+static inline int numenc_decode_varuint_raw(
+        const unsigned char* in, uint64_t* value) {
+    const unsigned char header = in[0];
+    int length = numenc_varuint_length(header);
+    if (header <= 240) {
+        *value = header;
+    } else if (header <= 248) {
+        *value = 240 + 256 * (uint64_t)(header - 241) + in[1];
+    } else if (header == 249) {
+        *value = 2288 + 256 * (uint64_t) in[1] + in[2];
+    } else {
+        *value = numenc_load_be(in + 1, length - 1);
+    }
+    return numenc_varuint_size(*value) == length ? 0 : -1;
+}
+
+static inline int numenc_varint_size(int64_t value) {
+    if (value >= -120 && value <= 119) {
+        return 1;
+    }
+    if (value > 0) {
+        return 1 + numenc_byte_count((uint64_t) value - 120);
+    }
+    return 1 + numenc_byte_count((uint64_t)(-(value + 121)));
+}
+
+// Return the length of a signed varint given its header.
+static inline int numenc_varint_length(unsigned char header) {
+    if (header >= 0xf8) {
+        return 1 + header - 0xf7;
+    }
+    if (header <= 0x07) {
+        return 1 + 0x08 - header;
+    }
+    return 1;
+}
+
+// Encode the value at out and return the length of the varint.
+static inline int numenc_encode_varint_raw(int64_t value, unsigned char* out) {
+    if (value >= -120 && value <= 119) {
+        out[0] = (unsigned char)(0x80 + value);
+        return 1;
+    }
+    if (value > 0) {
+        uint64_t payload = (uint64_t) value - 120;
+        int count = numenc_byte_count(payload);
+        out[0] = (unsigned char)(0xf7 + count);
+        numenc_store_be(payload, count, out + 1);
+        return 1 + count;
+    }
+    uint64_t payload = (uint64_t)(-(value + 121));
+    int count = numenc_byte_count(payload);
+    out[0] = (unsigned char)(0x08 - count);
+    numenc_store_be(~payload, count, out + 1);
+    return 1 + count;
+}
+
+// Decode the varint at in, which must hold at least the number of bytes
+// given by its header. Return 0 on success and -1 if the varint is not
+// canonical or out of range.
+static inline int numenc_decode_varint_raw(
+        const unsigned char* in, int64_t* value) {
+    const unsigned char header = in[0];
+    int length = numenc_varint_length(header);
+    if (length == 1) {
+        *value = (int64_t) header - 0x80;
+        return 0;
+    }
+
+    uint64_t payload = numenc_load_be(in + 1, length - 1);
+    if (header >= 0xf8) {
+        if (payload > (uint64_t) INT64_MAX - 120) {
+            return -1;
+        }
+        *value = (int64_t)(payload + 120);
+    } else {
+        uint64_t mask = (length == 9) ?
+            ~(uint64_t) 0 : ((uint64_t) 1 << ((length - 1) * 8)) - 1;
+        payload = ~payload & mask;
+        if (payload > (uint64_t) INT64_MAX - 120) {
+            return -1;
+        }
+        *value = -(int64_t) payload - 121;
+    }
+    return numenc_varint_size(*value) == length ? 0 : -1;
+}
+
+// Shared helpers
+
+// Re-raise the pending exception with the same type, prefixing its
+// message with the index of the item that caused it.
+void numenc_annotate_index(Py_ssize_t index);
+
+// Re-raise the pending exception with the same type, prefixing its
+// message with the index of the field of a composite key that caused it.
+void numenc_annotate_field(Py_ssize_t index);
+
+// Look up the type by its name (e.g., "int32").
+// Return the type on success; otherwise set a ValueError and return -1.
+int numenc_type_from_name(const char* name);
+
+// Determine the type from the format and the item size of a buffer
+// (see PEP 3118). Set swap to 1 if the items are stored in the
+// non-native byte order. Return the type on success; otherwise set
+// a TypeError and return -1.
+int numenc_type_from_format(
+    const char* format, Py_ssize_t itemsize, int* swap);
+
+// Vector kernels encoding (or decoding) the leading numbers (or keys) of
+// a typed buffer like numenc_encode_native (or numenc_decode_native).
+// Return the number of the values converted; the rest is left to
+// the portable scalar loops.
+typedef Py_ssize_t (*numenc_encode_native_kernel)(int type,
+    const unsigned char* in, unsigned char* out, Py_ssize_t count, int swap);
+typedef Py_ssize_t (*numenc_decode_native_kernel)(int type,
+    const unsigned char* in, unsigned char* out, Py_ssize_t count);
+
+// The kernels of an instruction set; the scalar kernels have none.
+struct numenc_simd {
+    const char* name;
+    numenc_encode_native_kernel encode;
+    numenc_decode_native_kernel decode;
+};
+
+// The kernels in use, selected at import by the features of the CPU.
+extern const struct numenc_simd* numenc_simd_kernels;
+
+// Encode count native numbers of the given type from in to out.
+// If swap is set, the numbers are read in the non-native byte order.
+void numenc_encode_native(int type, const unsigned char* in,
+    unsigned char* out, Py_ssize_t count, int swap);
+
+// Decode count keys of the given type from in to native numbers at out.
+void numenc_decode_native(int type, const unsigned char* in,
+    unsigned char* out, Py_ssize_t count);
+
+// Encode like numenc_encode_native without the GIL on up to the given
+// number of threads. Must be called with the GIL held.
+void numenc_encode_native_parallel(int type, const unsigned char* in,
+    unsigned char* out, Py_ssize_t count, int swap, int threads);
+
+// Decode like numenc_decode_native without the GIL on up to the given
+// number of threads. Must be called with the GIL held.
+void numenc_decode_native_parallel(int type, const unsigned char* in,
+    unsigned char* out, Py_ssize_t count, int threads);
+
+// Create a new writable array of count items of the given type and
+// acquire a view on its memory. The output determines the kind of array:
+// "array" for array.array, "ndarray" for a one-dimensional numpy.ndarray,
+// "uint8" for a numpy.ndarray of shape (count, width) and "S" for
+// a numpy.ndarray of fixed-width byte strings.
+// Return the array on success; otherwise set a Python exception and
+// return NULL.
+PyObject* numenc_new_array(
+    int type, Py_ssize_t count, const char* output, Py_buffer* view);
+
+// Acquire a contiguous read-only view on a bytes-like object.
+// Return 0 on success; otherwise set a TypeError and return -1.
+int numenc_get_buffer(PyObject* obj, Py_buffer* view);
+
+// Acquire a contiguous writable view on a bytes-like object.
+// Return 0 on success; otherwise set a TypeError and return -1.
+int numenc_get_writable_buffer(PyObject* obj, Py_buffer* view);
+
+// Resolve the offset at which size bytes are accessed in a buffer of
+// the given length; negative offsets count from the end of the buffer.
+// Return the offset on success; otherwise set a ValueError and return -1.
+Py_ssize_t numenc_resolve_offset(
+    Py_ssize_t offset, Py_ssize_t size, Py_ssize_t length);
+
+// Parse the optional offset argument at the given index of the
+// positional arguments; the offset defaults to 0.
+// Return 0 on success; otherwise set a Python exception and return -1.
+int numenc_parse_offset(PyObject* const* args, Py_ssize_t nargs,
+    Py_ssize_t index, Py_ssize_t* offset);
+
+// Return the interned bytes object of a key of one byte or of a 16-bit
+// key in the hot range (see intern.cpp), or a new bytes object otherwise.
+// Return a new reference on success; otherwise set a Python exception and
+// return NULL.
+PyObject* numenc_key_object(const unsigned char* key, Py_ssize_t width);
+
+// Return the interned int object of an 8-bit number or of a 16-bit number
+// in the hot range of its type, or a new int object otherwise.
+// Return a new reference on success; otherwise set a Python exception and
+// return NULL.
+PyObject* numenc_number_object(int type, long value);
+
+// Conversions shared by the module functions and the codec objects.
+// Each one returns a new reference on success; otherwise it sets
+// a Python exception and returns NULL.
+
+// Convert a number to a new bytes key.
+PyObject* numenc_encode_scalar(
+    const struct numenc_codec* codec, PyObject* value);
+
+// Convert a bytes key back to a number.
+PyObject* numenc_decode_scalar(
+    const struct numenc_codec* codec, PyObject* key);
+
+// Convert an iterable of numbers to concatenated keys.
+PyObject* numenc_encode_many(
+    const struct numenc_codec* codec, PyObject* values);
+
+// Convert concatenated keys of a bytes-like object back to a list
+// of numbers.
+PyObject* numenc_decode_many(
+    const struct numenc_codec* codec, PyObject* keys);
+
+// Write the key of a number into a writable buffer at the offset and
+// return None.
+PyObject* numenc_encode_into(const struct numenc_codec* codec,
+    PyObject* value, PyObject* buffer, Py_ssize_t offset);
+
+// Read a number from the key of a buffer at the offset.
+PyObject* numenc_decode_from(const struct numenc_codec* codec,
+    PyObject* buffer, Py_ssize_t offset);
+
+// Find the insertion point of the probe among count sorted keys of the
+// given width; with right set, after the keys equal to the probe.
+Py_ssize_t numenc_search_raw(const unsigned char* keys, Py_ssize_t count,
+    Py_ssize_t width, const unsigned char* probe, int right);
+
+// Find the insertion points of probe_count probes and write them to out.
+// The probes are searched in sorted order by galloping.
+// Return 0 on success or -1 if out of memory; no Python exception is set.
+int numenc_search_many_raw(const unsigned char* keys, Py_ssize_t count,
+    Py_ssize_t width, const unsigned char* probes, Py_ssize_t probe_count,
+    int right, Py_ssize_t* out);
+
+// Parse the side of an insertion point.
+// Return 0 for "left" and 1 for "right"; otherwise set a ValueError and
+// return -1.
+int numenc_parse_side(const char* side);
+
+// Find the insertion point of the probe key in the sorted concatenated
+// keys of a bytes-like object.
+PyObject* numenc_searchsorted(PyObject* keys, const unsigned char* probe,
+    Py_ssize_t width, int right);
+
+// Find the insertion points of the concatenated probe keys as a list.
+// The search runs without the GIL on up to the given number of threads.
+PyObject* numenc_searchsorted_many(PyObject* keys,
+    const unsigned char* probes, Py_ssize_t probe_count, Py_ssize_t width,
+    int right, int threads);
+
+// Compute the tightest start key and exclusive stop key of a range scan
+// over the keys starting with the prefix (empty if NULL) and followed by
+// the key of a value satisfying the bounds; a bound of None is unbounded.
+// Return a tuple (start, stop) whose stop is None if the scan runs to the
+// end, or None if no value satisfies the bounds.
+PyObject* numenc_key_range(int type, PyObject* low, PyObject* high,
+    int low_inclusive, int high_inclusive, PyObject* prefix);
+
+// Compute the ranges of an iterable of (low, high) or (low, high, prefix)
+// tuples as a list.
+PyObject* numenc_key_ranges(int type, PyObject* bounds, int low_inclusive,
+    int high_inclusive, PyObject* prefix);
+
+// Return the next (direction 1) or the previous (direction -1)
+// representable value of the type.
+PyObject* numenc_step_value(int type, PyObject* value, int direction);
+
+// Sort count concatenated keys of the given width in place.
+// Return 0 on success or -1 if out of memory; no Python exception is set.
+int numenc_sort_keys(unsigned char* keys, Py_ssize_t count, Py_ssize_t width);
+
+// Set order to the stable permutation of count indices that sorts
+// the concatenated keys of the given width.
+// Return 0 on success or -1 if out of memory; no Python exception is set.
+int numenc_argsort_keys(const unsigned char* keys, Py_ssize_t count,
+    Py_ssize_t width, Py_ssize_t* order);
+
+// Default number of items per chunk below which a batch is not split
+// among more threads.
+#define NUMENC_PARALLEL_GRAIN 65536
+
+// A kernel processes the items in [start, stop) of a batch without
+// the GIL. It returns stop on success or the index of the item at which
+// it failed.
+typedef Py_ssize_t (*numenc_kernel)(void* arg, Py_ssize_t start,
+    Py_ssize_t stop);
+
+// Check the number of threads passed by the user.
+// Return 0 on success; otherwise set a ValueError and return -1.
+int numenc_check_threads(int threads);
+
+// Run the kernel over the count items in contiguous chunks of at least
+// grain items on up to the given number of threads; the calling thread
+// processes a chunk as well. The call does not touch the GIL, so the
+// callers usually release it around the call.
+// Return count on success or the smallest index at which a chunk failed.
+Py_ssize_t numenc_run_parallel(numenc_kernel kernel, void* arg,
+    Py_ssize_t count, Py_ssize_t grain, int threads);
+
+// Module parts; each one adds its functions to the module and returns 0
+// on success or -1 with a Python exception set.
+
+// Register the batch functions in the module.
+int numenc_add_batch_functions(PyObject* module);
+
+// Register the typed-buffer functions in the module.
+int numenc_add_array_functions(PyObject* module);
+
+// Register the functions working in place on buffers in the module.
+int numenc_add_inplace_functions(PyObject* module);
+
+// Register the Struct type in the module.
+int numenc_add_struct_type(PyObject* module);
+
+// Register the descending-order functions in the module.
+int numenc_add_desc_functions(PyObject* module);
+
+// Register the varint functions in the module.
+int numenc_add_varint_functions(PyObject* module);
+
+// Register the Codec type and the codec() function in the module.
+int numenc_add_codec_type(PyObject* module);
+
+// Register the FixedPoint type in the module.
+int numenc_add_fixed_point_type(PyObject* module);
+
+// Register the TimeCodec type in the module.
+int numenc_add_time_codec_type(PyObject* module);
+
+// Register the search functions in the module.
+int numenc_add_search_functions(PyObject* module);
+
+// Register the sort functions in the module.
+int numenc_add_sort_functions(PyObject* module);
+
+// Register the SortedKeyArray type in the module.
+int numenc_add_sorted_array_type(PyObject* module);
+
+// Register the external sort functions in the module.
+int numenc_add_external_sort_functions(PyObject* module);
+
+// Select the SIMD kernels and register the functions selecting them in
+// the module.
+int numenc_add_simd_functions(PyObject* module);
+
+// Intern the results of the small-domain types and register the functions
+// configuring the hot range in the module.
+int numenc_add_intern_functions(PyObject* module);
+
+// Register the KeyBlock type and the encode_block function in the module.
+int numenc_add_key_block_type(PyObject* module);
+
+#endif  // NUMENC_NUMENC_H
@@ -0,0 +1,100 @@
+#include "numenc.h"
+
+// The chunks of a batch are processed by threads started for the call
+// with the portable thread API of CPython. The kernels work on raw memory
+// only, so the threads neither need the GIL nor a thread state.
+
+struct chunk {
+    numenc_kernel kernel;
+    void* arg;
+    Py_ssize_t start;
+    Py_ssize_t stop;
+
+    // the value returned by the kernel
+    Py_ssize_t result;
+
+    // set if the chunk runs in a thread of its own; the lock is held
+    // until the thread is done
+    int started;
+    PyThread_type_lock done;
+};
+
+static void run_chunk(void* arg) {
+    struct chunk* chunk = (struct chunk* ) arg;
+    chunk->result = chunk->kernel(chunk->arg, chunk->start, chunk->stop);
+    PyThread_release_lock(chunk->done);
+}
+
+int numenc_check_threads(int threads) {
+    if (threads < 1) {
+        PyErr_Format(PyExc_ValueError,
+            "Illegal threads: expected at least 1 thread, got %d.", threads);
+        return -1;
+    }
+    return 0;
+}
+
+Py_ssize_t numenc_run_parallel(numenc_kernel kernel, void* arg,
+        Py_ssize_t count, Py_ssize_t grain, int threads) {
+    Py_ssize_t chunk_count = (grain > 0) ? count / grain : count;
+    if (chunk_count > threads) {
+        chunk_count = threads;
+    }
+    if (chunk_count <= 1) {
+        return kernel(arg, 0, count);
+    }
+
+    struct chunk* chunks = (struct chunk* ) PyMem_RawMalloc(
+        (size_t) chunk_count * sizeof(struct chunk));
+    if (chunks == NULL) {
+        return kernel(arg, 0, count);
+    }
+
+    for (Py_ssize_t i = 0; i < chunk_count; i++) {
+        struct chunk* chunk = & chunks[i];
+        chunk->kernel = kernel;
+        chunk->arg = arg;
+        chunk->start = count / chunk_count * i + (
+            (i < count % chunk_count) ? i : count % chunk_count);
+        chunk->stop = chunk->start + count / chunk_count + (
+            (i < count % chunk_count) ? 1 : 0);
+        chunk->started = 0;
+        chunk->done = (i > 0) ? PyThread_allocate_lock() : NULL;
+        if (chunk->done != NULL) {
+            PyThread_acquire_lock(chunk->done, WAIT_LOCK);
+            chunk->started = PyThread_start_new_thread(run_chunk, chunk) !=
+                PYTHREAD_INVALID_THREAD_ID;
+            if (!chunk->started) {
+                PyThread_release_lock(chunk->done);
+            }
+        }
+    }
+
+    // the calling thread processes the first chunk and the chunks for
+    // which no thread could be started
+    for (Py_ssize_t i = 0; i < chunk_count; i++) {
+        struct chunk* chunk = & chunks[i];
+        if (!chunk->started) {
+            chunk->result = kernel(arg, chunk->start, chunk->stop);
+        }
+    }
+
+    // report the first failure in the order of the items so that
+    // the result does not depend on the number of threads
+    Py_ssize_t result = count;
+    for (Py_ssize_t i = 0; i < chunk_count; i++) {
+        struct chunk* chunk = & chunks[i];
+        if (chunk->started) {
+            PyThread_acquire_lock(chunk->done, WAIT_LOCK);
+            PyThread_release_lock(chunk->done);
+        }
+        if (chunk->done != NULL) {
+            PyThread_free_lock(chunk->done);
+        }
+        if (chunk->result < chunk->stop && result == count) {
+            result = chunk->result;
+        }
+    }
+    PyMem_RawFree(chunks);
+    return result;
+}
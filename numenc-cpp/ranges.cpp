@@ -0,0 +1,445 @@
+#include "numenc.h"
+
+#include <math.h>
+#include <float.h>
+
+// The bounds of a range scan are computed on the keys read as big-endian
+// unsigned integers of the width of the type. The next and the previous
+// representable values of a number are then the next and the previous
+// keys, except for the key of the negative zero which no number encodes
+// to. The values of a float type span [-inf, inf]. The key of the negative
+// NaN lies below the key of -inf, but the key of the positive NaN is also
+// the key of a positive subnormal (1.1e-308 for float64 and 5.9e-39 for
+// float32), so ranges covering that subnormal cover the NaN as well.
+
+// Position of a bound relative to the values of the type
+enum bound_position {
+    BELOW = -1,
+    INSIDE = 0,
+    ABOVE = 1
+};
+
+static int is_float(int type) {
+    return type == NUMENC_FLOAT32 || type == NUMENC_FLOAT64;
+}
+
+static int bits_of(int type) {
+    return (int) NUMENC_CODECS[type].width * 8;
+}
+
+static uint64_t min_key(int type) {
+    if (type == NUMENC_FLOAT32) {
+        return 0x007fffffu;
+    }
+    if (type == NUMENC_FLOAT64) {
+        return 0x000fffffffffffffull;
+    }
+    return 0;
+}
+
+static uint64_t max_key(int type) {
+    if (type == NUMENC_FLOAT32) {
+        return 0xff800000u;
+    }
+    if (type == NUMENC_FLOAT64) {
+        return 0xfff0000000000000ull;
+    }
+    const int bits = bits_of(type);
+    return (bits == 64) ? UINT64_MAX : (1ull << bits) - 1;
+}
+
+// Move the key to the next (direction 1) or the previous (direction -1)
+// value. Return the position of the moved key.
+static int step(int type, int direction, uint64_t* key) {
+    if (direction > 0 ? *key >= max_key(type) : *key <= min_key(type)) {
+        return direction;
+    }
+    *key += (uint64_t) direction;
+    if (is_float(type) && *key == (1ull << (bits_of(type) - 1)) - 1) {
+        // skip the key of the negative zero
+        *key += (uint64_t) direction;
+    }
+    return INSIDE;
+}
+
+// Resolve the key of a float. Return 0 on success; otherwise set
+// a ValueError and return -1. The value is set to the value of the key and
+// the comparison to the sign of the difference between the value and
+// the number, which is not zero if the number is not representable as
+// a float32.
+static int float_key(int type, double number, uint64_t* key,
+        double* value, int* comparison) {
+    if (isnan(number)) {
+        PyErr_Format(PyExc_ValueError,
+            "Illegal bound: expected a number, got nan.");
+        return -1;
+    }
+
+    unsigned char bytes[8];
+    *value = number;
+    if (type == NUMENC_FLOAT32) {
+        // numbers beyond the finite float32 are rounded to the infinities
+        // first and corrected by the comparison below
+        const float rounded = (number > FLT_MAX) ? INFINITY :
+            (number < -FLT_MAX) ? -INFINITY : (float) number;
+        numenc_encode_float32_raw(rounded, bytes);
+        *value = rounded;
+    } else {
+        numenc_encode_float64_raw(number, bytes);
+    }
+    *key = numenc_load_be(bytes, (int) NUMENC_CODECS[type].width);
+    *comparison = (*value > number) - (*value < number);
+    return 0;
+}
+
+// Resolve the key of an integer. Return 0 on success; otherwise set
+// a Python exception and return -1.
+static int integer_key(int type, PyObject* number, uint64_t* key,
+        int* position) {
+    int overflow;
+    const long long value = PyLong_AsLongLongAndOverflow(
+        number, & overflow);
+    if (value == -1 && PyErr_Occurred()) {
+        return -1;
+    }
+
+    const int bits = bits_of(type);
+    const int is_signed = type == NUMENC_INT8 || type == NUMENC_INT16 ||
+        type == NUMENC_INT32 || type == NUMENC_INT64;
+    *position = INSIDE;
+    if (overflow < 0) {
+        *position = BELOW;
+    } else if (overflow > 0) {
+        // only the upper half of uint64 lies beyond long long
+        const unsigned long long unsigned_value =
+            PyLong_AsUnsignedLongLong(number);
+        if (unsigned_value == (unsigned long long) -1 && PyErr_Occurred()) {
+            if (!PyErr_ExceptionMatches(PyExc_OverflowError)) {
+                return -1;
+            }
+            PyErr_Clear();
+            *position = ABOVE;
+        } else if (is_signed) {
+            *position = ABOVE;
+        } else {
+            *key = unsigned_value;
+        }
+    } else if (is_signed) {
+        const long long half = (bits == 64) ? 0 : 1ll << (bits - 1);
+        if (bits < 64 && (value < -half || value >= half)) {
+            *position = (value < 0) ? BELOW : ABOVE;
+        } else {
+            *key = ((uint64_t) value ^ (1ull << (bits - 1))) &
+                max_key(type);
+        }
+    } else if (value < 0) {
+        *position = BELOW;
+    } else if ((uint64_t) value > max_key(type)) {
+        *position = ABOVE;
+    } else {
+        *key = (uint64_t) value;
+    }
+    return 0;
+}
+
+// Resolve a bound of a predicate to the key of the smallest (for the
+// lower bound) or the largest (for the upper bound) value satisfying it.
+// Return 1 on success, 0 if no value satisfies the bound; otherwise set
+// a Python exception and return -1.
+static int resolve_bound(int type, PyObject* bound, int lower, int inclusive,
+        uint64_t* key) {
+    int position = INSIDE;
+    // the sign of the difference between the value of the key and the bound
+    int comparison = 0;
+
+    if (is_float(type)) {
+        double number = PyFloat_AsDouble(bound);
+        if (number == -1.0 && PyErr_Occurred()) {
+            // integers beyond the finite floats round to the infinities
+            int overflow = 0;
+            if (!PyLong_Check(bound) ||
+                    !PyErr_ExceptionMatches(PyExc_OverflowError)) {
+                return -1;
+            }
+            PyErr_Clear();
+            PyLong_AsLongLongAndOverflow(bound, & overflow);
+            number = overflow * (double) INFINITY;
+        }
+        double value;
+        if (float_key(type, number, key, & value, & comparison) != 0) {
+            return -1;
+        }
+        if (PyLong_Check(bound)) {
+            // the number is the integer rounded, so compare the value of
+            // the key with the integer itself
+            if (isinf(value)) {
+                comparison = (value > 0) ? 1 : -1;
+            } else {
+                PyObject* integral = PyLong_FromDouble(value);
+                if (integral == NULL) {
+                    return -1;
+                }
+                const int greater = PyObject_RichCompareBool(
+                    integral, bound, Py_GT);
+                const int less = (greater == 0) ?
+                    PyObject_RichCompareBool(integral, bound, Py_LT) : 0;
+                Py_DECREF(integral);
+                if (greater < 0 || less < 0) {
+                    return -1;
+                }
+                comparison = greater - less;
+            }
+        }
+    } else if (PyFloat_Check(bound)) {
+        const double number = PyFloat_AS_DOUBLE(bound);
+        if (isnan(number)) {
+            PyErr_Format(PyExc_ValueError,
+                "Illegal bound: expected a number, got nan.");
+            return -1;
+        }
+        if (isinf(number)) {
+            position = (number < 0) ? BELOW : ABOVE;
+        } else {
+            // a fractional bound excludes its integral neighbors on the
+            // other side
+            const double integral = lower ? ceil(number) : floor(number);
+            if (integral != number) {
+                inclusive = 1;
+            }
+            PyObject* integer = PyLong_FromDouble(integral);
+            if (integer == NULL) {
+                return -1;
+            }
+            const int result = integer_key(type, integer, key, & position);
+            Py_DECREF(integer);
+            if (result != 0) {
+                return -1;
+            }
+        }
+    } else {
+        if (!PyIndex_Check(bound)) {
+            PyErr_Format(PyExc_TypeError,
+                "Wrong input: expected a number as the bound, got %s.",
+                Py_TYPE(bound)->tp_name);
+            return -1;
+        }
+        PyObject* integer = PyNumber_Index(bound);
+        if (integer == NULL) {
+            return -1;
+        }
+        const int result = integer_key(type, integer, key, & position);
+        Py_DECREF(integer);
+        if (result != 0) {
+            return -1;
+        }
+    }
+
+    if (position == INSIDE) {
+        // move the key onto the bound or past an exclusive bound
+        if (lower && (comparison < 0 || (comparison == 0 && !inclusive))) {
+            position = step(type, 1, key);
+        } else if (!lower &&
+                (comparison > 0 || (comparison == 0 && !inclusive))) {
+            position = step(type, -1, key);
+        }
+    }
+
+    if (position == BELOW) {
+        *key = min_key(type);
+        return lower;
+    }
+    if (position == ABOVE) {
+        *key = max_key(type);
+        return !lower;
+    }
+    return 1;
+}
+
+// Create the exclusive stop key following all the keys starting with
+// the prefix and the key, i.e., increment their concatenation as a number
+// after dropping the trailing 0xff bytes. Return a new reference to bytes,
+// or to None if the concatenation consists of 0xff bytes only; otherwise
+// set a Python exception and return NULL.
+static PyObject* successor(const unsigned char* prefix,
+        Py_ssize_t prefix_size, const unsigned char* key,
+        Py_ssize_t key_size) {
+    Py_ssize_t size = prefix_size + key_size;
+    while (size > 0 && (size > prefix_size ? key[size - prefix_size - 1] :
+            prefix[size - 1]) == 0xff) {
+        size--;
+    }
+    if (size == 0) {
+        Py_RETURN_NONE;
+    }
+
+    PyObject* result = PyBytes_FromStringAndSize(NULL, size);
+    if (result == NULL) {
+        return NULL;
+    }
+    unsigned char* out = (unsigned char* ) PyBytes_AS_STRING(result);
+    if (size <= prefix_size) {
+        memcpy(out, prefix, (size_t) size);
+    } else {
+        memcpy(out, prefix, (size_t) prefix_size);
+        memcpy(out + prefix_size, key, (size_t)(size - prefix_size));
+    }
+    out[size - 1]++;
+    return result;
+}
+
+// Compute the start and the stop key of a range scan on a prefix of keys.
+// Return a new reference on success; otherwise set a Python exception and
+// return NULL.
+static PyObject* key_range(int type, PyObject* low, PyObject* high,
+        int low_inclusive, int high_inclusive, const Py_buffer* prefix) {
+    const int width = (int) NUMENC_CODECS[type].width;
+    uint64_t low_key = 0;
+    uint64_t high_key = 0;
+
+    if (low != Py_None) {
+        const int result = resolve_bound(type, low, 1, low_inclusive,
+            & low_key);
+        if (result < 0) {
+            return NULL;
+        }
+        if (result == 0) {
+            Py_RETURN_NONE;
+        }
+    }
+    if (high != Py_None) {
+        const int result = resolve_bound(type, high, 0, high_inclusive,
+            & high_key);
+        if (result < 0) {
+            return NULL;
+        }
+        if (result == 0 || (low != Py_None && low_key > high_key)) {
+            Py_RETURN_NONE;
+        }
+    }
+
+    const unsigned char* prefix_bytes = (const unsigned char* ) prefix->buf;
+    PyObject* start = PyBytes_FromStringAndSize(
+        NULL, prefix->len + ((low != Py_None) ? width : 0));
+    if (start == NULL) {
+        return NULL;
+    }
+    unsigned char* out = (unsigned char* ) PyBytes_AS_STRING(start);
+    memcpy(out, prefix_bytes, (size_t) prefix->len);
+    if (low != Py_None) {
+        numenc_store_be(low_key, width, out + prefix->len);
+    }
+
+    unsigned char key[8];
+    numenc_store_be(high_key, width, key);
+    PyObject* stop = successor(prefix_bytes, prefix->len, key,
+        (high != Py_None) ? width : 0);
+    if (stop == NULL) {
+        Py_DECREF(start);
+        return NULL;
+    }
+
+    PyObject* result = PyTuple_Pack(2, start, stop);
+    Py_DECREF(start);
+    Py_DECREF(stop);
+    return result;
+}
+
+// Acquire the view on a prefix, or on an empty prefix if it is NULL.
+// Return 0 on success; otherwise set a TypeError and return -1.
+static int get_prefix(PyObject* prefix, Py_buffer* view) {
+    if (prefix == NULL) {
+        return PyBuffer_FillInfo(view, NULL, (void* ) "", 0, 1, 0);
+    }
+    return numenc_get_buffer(prefix, view);
+}
+
+PyObject* numenc_key_range(int type, PyObject* low, PyObject* high,
+        int low_inclusive, int high_inclusive, PyObject* prefix) {
+    Py_buffer view;
+    if (get_prefix(prefix, & view) != 0) {
+        return NULL;
+    }
+    PyObject* result = key_range(
+        type, low, high, low_inclusive, high_inclusive, & view);
+    PyBuffer_Release(& view);
+    return result;
+}
+
+PyObject* numenc_key_ranges(int type, PyObject* bounds, int low_inclusive,
+        int high_inclusive, PyObject* prefix) {
+    Py_buffer view;
+    if (get_prefix(prefix, & view) != 0) {
+        return NULL;
+    }
+
+    PyObject* iterator = PyObject_GetIter(bounds);
+    if (iterator == NULL) {
+        PyBuffer_Release(& view);
+        PyErr_Clear();
+        return PyErr_Format(PyExc_TypeError,
+            "Wrong input: expected an iterable of bounds.");
+    }
+    PyObject* result = PyList_New(0);
+    if (result == NULL) {
+        Py_DECREF(iterator);
+        PyBuffer_Release(& view);
+        return NULL;
+    }
+
+    PyObject* item;
+    for (Py_ssize_t i = 0; (item = PyIter_Next(iterator)) != NULL; i++) {
+        PyObject* range = NULL;
+        if (!PyTuple_Check(item) || (PyTuple_GET_SIZE(item) != 2 &&
+                PyTuple_GET_SIZE(item) != 3)) {
+            PyErr_Format(PyExc_TypeError,
+                "Wrong input: expected a tuple (low, high) or "
+                "(low, high, prefix), got %s.", Py_TYPE(item)->tp_name);
+        } else if (PyTuple_GET_SIZE(item) == 3) {
+            range = numenc_key_range(type, PyTuple_GET_ITEM(item, 0),
+                PyTuple_GET_ITEM(item, 1), low_inclusive, high_inclusive,
+                PyTuple_GET_ITEM(item, 2));
+        } else {
+            range = key_range(type, PyTuple_GET_ITEM(item, 0),
+                PyTuple_GET_ITEM(item, 1), low_inclusive, high_inclusive,
+                & view);
+        }
+        Py_DECREF(item);
+
+        if (range == NULL || PyList_Append(result, range) != 0) {
+            Py_XDECREF(range);
+            numenc_annotate_index(i);
+            Py_CLEAR(result);
+            break;
+        }
+        Py_DECREF(range);
+    }
+    Py_DECREF(iterator);
+    PyBuffer_Release(& view);
+
+    if (result != NULL && PyErr_Occurred()) {
+        Py_CLEAR(result);
+    }
+    return result;
+}
+
+PyObject* numenc_step_value(int type, PyObject* value, int direction) {
+    const struct numenc_codec* codec = & NUMENC_CODECS[type];
+    unsigned char bytes[8];
+    if (codec->encode(value, bytes) != 0) {
+        return NULL;
+    }
+    if (is_float(type) && isnan(PyFloat_AsDouble(value))) {
+        return PyErr_Format(PyExc_ValueError,
+            "Illegal value: expected a number, got nan.");
+    }
+
+    uint64_t key = numenc_load_be(bytes, (int) codec->width);
+    if (step(type, direction, & key) != INSIDE) {
+        return PyErr_Format(PyExc_ValueError,
+            "Illegal value: expected a number %s the %s %s, got %R.",
+            (direction > 0) ? "below" : "above",
+            (direction > 0) ? "largest" : "smallest", codec->name, value);
+    }
+    numenc_store_be(key, (int) codec->width, bytes);
+    return codec->decode(bytes);
+}
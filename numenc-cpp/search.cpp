@@ -0,0 +1,320 @@
+#include "numenc.h"
+
+// Keys sort in the same order as their numbers, so a packed buffer of
+// sorted fixed-width keys can be searched with memcmp alone and without
+// decoding a single key.
+
+// Probes out of order are sorted first if there are at least this many.
+#define NUMENC_SORT_PROBES_MIN 64
+
+// Return 1 if the key sorts before the insertion point of the probe.
+static inline int is_before(const unsigned char* key,
+        const unsigned char* probe, Py_ssize_t width, int right) {
+    const int cmp = memcmp(key, probe, (size_t) width);
+    return right ? cmp <= 0 : cmp < 0;
+}
+
+// Find the insertion point of the probe among the keys in [lo, hi).
+static Py_ssize_t bisect(const unsigned char* keys, Py_ssize_t width,
+        Py_ssize_t lo, Py_ssize_t hi, const unsigned char* probe, int right) {
+    while (lo < hi) {
+        const Py_ssize_t mid = lo + (hi - lo) / 2;
+        if (is_before(keys + mid * width, probe, width, right)) {
+            lo = mid + 1;
+        } else {
+            hi = mid;
+        }
+    }
+    return lo;
+}
+
+// Find the insertion point of the probe at or after start by probing
+// the keys at exponentially growing distances first, so that the cost
+// depends on the distance to start rather than on the number of keys.
+static Py_ssize_t gallop(const unsigned char* keys, Py_ssize_t count,
+        Py_ssize_t width, Py_ssize_t start, const unsigned char* probe,
+        int right) {
+    Py_ssize_t lo = start;
+    Py_ssize_t step = 1;
+    while (lo < count) {
+        const Py_ssize_t i = (step < count - lo) ? lo + step - 1 : count - 1;
+        if (!is_before(keys + i * width, probe, width, right)) {
+            return bisect(keys, width, lo, i, probe, right);
+        }
+        lo = i + 1;
+        if (step <= PY_SSIZE_T_MAX / 2) {
+            step *= 2;
+        }
+    }
+    return count;
+}
+
+Py_ssize_t numenc_search_raw(const unsigned char* keys, Py_ssize_t count,
+        Py_ssize_t width, const unsigned char* probe, int right) {
+    return bisect(keys, width, 0, count, probe, right);
+}
+
+int numenc_search_many_raw(const unsigned char* keys, Py_ssize_t count,
+        Py_ssize_t width, const unsigned char* probes,
+        Py_ssize_t probe_count, int right, Py_ssize_t* out) {
+    Py_ssize_t unsorted = 0;
+    for (Py_ssize_t i = 1; i < probe_count; i++) {
+        if (memcmp(probes + (i - 1) * width, probes + i * width,
+                (size_t) width) > 0) {
+            unsorted++;
+        }
+    }
+
+    // the insertion points of sorted probes never decrease, so we gallop
+    // from the previous one. Probes out of order are searched in sorted
+    // order, which also keeps the accesses to the keys local.
+    if (unsorted > 0 && probe_count >= NUMENC_SORT_PROBES_MIN) {
+        Py_ssize_t* order = (Py_ssize_t* ) PyMem_RawMalloc(
+            (size_t) probe_count * sizeof(Py_ssize_t));
+        if (order == NULL ||
+                numenc_argsort_keys(probes, probe_count, width, order) != 0) {
+            PyMem_RawFree(order);
+            return -1;
+        }
+
+        Py_ssize_t previous = 0;
+        for (Py_ssize_t i = 0; i < probe_count; i++) {
+            previous = gallop(keys, count, width, previous,
+                probes + order[i] * width, right);
+            out[order[i]] = previous;
+        }
+        PyMem_RawFree(order);
+        return 0;
+    }
+
+    for (Py_ssize_t i = 0; i < probe_count; i++) {
+        const unsigned char* probe = probes + i * width;
+        if (i > 0 && memcmp(probe - width, probe, (size_t) width) <= 0) {
+            out[i] = gallop(keys, count, width, out[i - 1], probe, right);
+        } else {
+            out[i] = bisect(keys, width, 0, count, probe, right);
+        }
+    }
+    return 0;
+}
+
+int numenc_parse_side(const char* side) {
+    if (strcmp(side, "left") == 0) {
+        return 0;
+    }
+    if (strcmp(side, "right") == 0) {
+        return 1;
+    }
+    PyErr_Format(PyExc_ValueError,
+        "Illegal side: expected 'left' or 'right', got '%s'.", side);
+    return -1;
+}
+
+// Acquire a view on the packed keys and check that they are whole.
+// Return 0 on success; otherwise set a Python exception and return -1.
+static int get_keys(PyObject* keys, Py_ssize_t width, Py_buffer* view) {
+    if (numenc_get_buffer(keys, view) != 0) {
+        return -1;
+    }
+    if (view->len % width != 0) {
+        PyErr_Format(PyExc_ValueError,
+            "Illegal input: expected a buffer of keys whose length is "
+            "a multiple of %zd, got %zd.", width, view->len);
+        PyBuffer_Release(view);
+        return -1;
+    }
+    return 0;
+}
+
+PyObject* numenc_searchsorted(PyObject* keys, const unsigned char* probe,
+        Py_ssize_t width, int right) {
+    Py_buffer view;
+    if (get_keys(keys, width, & view) != 0) {
+        return NULL;
+    }
+
+    const Py_ssize_t index = numenc_search_raw(
+        (const unsigned char* ) view.buf, view.len / width, width, probe,
+        right);
+    PyBuffer_Release(& view);
+    return PyLong_FromSsize_t(index);
+}
+
+// Arguments of the kernel searching a chunk of the probes
+struct search {
+    const unsigned char* keys;
+    Py_ssize_t count;
+    Py_ssize_t width;
+    const unsigned char* probes;
+    int right;
+    Py_ssize_t* out;
+};
+
+static Py_ssize_t search_kernel(
+        void* arg, Py_ssize_t start, Py_ssize_t stop) {
+    const struct search* search = (const struct search* ) arg;
+    if (numenc_search_many_raw(search->keys, search->count, search->width,
+            search->probes + start * search->width, stop - start,
+            search->right, search->out + start) != 0) {
+        return start;
+    }
+    return stop;
+}
+
+PyObject* numenc_searchsorted_many(PyObject* keys,
+        const unsigned char* probes, Py_ssize_t probe_count,
+        Py_ssize_t width, int right, int threads) {
+    Py_buffer view;
+    if (get_keys(keys, width, & view) != 0) {
+        return NULL;
+    }
+
+    Py_ssize_t* indices = PyMem_New(Py_ssize_t, probe_count);
+    if (indices == NULL) {
+        PyBuffer_Release(& view);
+        return PyErr_NoMemory();
+    }
+    struct search search = {
+        (const unsigned char* ) view.buf, view.len / width, width, probes,
+        right, indices
+    };
+    Py_ssize_t failed;
+    Py_BEGIN_ALLOW_THREADS
+    failed = numenc_run_parallel(search_kernel, & search, probe_count,
+        NUMENC_PARALLEL_GRAIN, threads);
+    Py_END_ALLOW_THREADS
+    PyBuffer_Release(& view);
+    if (failed < probe_count) {
+        PyMem_Free(indices);
+        return PyErr_NoMemory();
+    }
+
+    PyObject* result = PyList_New(probe_count);
+    if (result == NULL) {
+        PyMem_Free(indices);
+        return NULL;
+    }
+    for (Py_ssize_t i = 0; i < probe_count; i++) {
+        PyObject* item = PyLong_FromSsize_t(indices[i]);
+        if (item == NULL) {
+            Py_DECREF(result);
+            PyMem_Free(indices);
+            return NULL;
+        }
+        PyList_SET_ITEM(result, i, item);
+    }
+    PyMem_Free(indices);
+    return result;
+}
+
+static PyObject* searchsorted(
+        PyObject* self, PyObject* args, PyObject* kwargs) {
+    static const char* kwlist[] = {"keys", "key", "side", NULL};
+    PyObject* keys;
+    PyObject* key;
+    const char* side = "left";
+
+    if (!PyArg_ParseTupleAndKeywords(args, kwargs, "OO|s",
+            (char** ) kwlist, & keys, & key, & side)) {
+        return NULL;
+    }
+
+    const int right = numenc_parse_side(side);
+    if (right < 0) {
+        return NULL;
+    }
+
+    Py_buffer probe;
+    if (numenc_get_buffer(key, & probe) != 0) {
+        return NULL;
+    }
+    if (probe.len == 0) {
+        PyBuffer_Release(& probe);
+        return PyErr_Format(PyExc_ValueError,
+            "Illegal input: expected a non-empty key.");
+    }
+
+    PyObject* result = numenc_searchsorted(
+        keys, (const unsigned char* ) probe.buf, probe.len, right);
+    PyBuffer_Release(& probe);
+    return result;
+}
+
+static PyObject* searchsorted_many(
+        PyObject* self, PyObject* args, PyObject* kwargs) {
+    static const char* kwlist[] = {
+        "keys", "probes", "width", "side", "threads", NULL
+    };
+    PyObject* keys;
+    PyObject* probes;
+    Py_ssize_t width;
+    const char* side = "left";
+    int threads = 1;
+
+    if (!PyArg_ParseTupleAndKeywords(args, kwargs, "OOn|si",
+            (char** ) kwlist, & keys, & probes, & width, & side,
+            & threads)) {
+        return NULL;
+    }
+    if (numenc_check_threads(threads) != 0) {
+        return NULL;
+    }
+
+    if (width <= 0) {
+        return PyErr_Format(PyExc_ValueError,
+            "Illegal width: expected a positive width, got %zd.", width);
+    }
+    const int right = numenc_parse_side(side);
+    if (right < 0) {
+        return NULL;
+    }
+
+    Py_buffer view;
+    if (numenc_get_buffer(probes, & view) != 0) {
+        return NULL;
+    }
+    if (view.len % width != 0) {
+        PyErr_Format(PyExc_ValueError,
+            "Illegal input: expected a buffer of probes whose length is "
+            "a multiple of %zd, got %zd.", width, view.len);
+        PyBuffer_Release(& view);
+        return NULL;
+    }
+
+    PyObject* result = numenc_searchsorted_many(keys,
+        (const unsigned char* ) view.buf, view.len / width, width, right,
+        threads);
+    PyBuffer_Release(& view);
+    return result;
+}
+
+static PyMethodDef SearchMethods[] = {
+    {
+        "searchsorted",
+        (PyCFunction)(void(*)(void)) searchsorted,
+        METH_VARARGS | METH_KEYWORDS,
+        "Find the index at which the key would be inserted into the sorted "
+        "concatenated keys of the same width; side='left' returns the "
+        "first, side='right' the last such index"
+    },
+    {
+        "searchsorted_many",
+        (PyCFunction)(void(*)(void)) searchsorted_many,
+        METH_VARARGS | METH_KEYWORDS,
+        "Find the insertion points of the concatenated probe keys of the "
+        "given width in the sorted concatenated keys; sorted probes are "
+        "searched by galloping from the previous insertion point. Large "
+        "batches of probes are split among up to the given number of "
+        "threads."
+    },
+    {
+        NULL,
+        NULL,
+        0,
+        NULL
+    }
+};
+
+int numenc_add_search_functions(PyObject* module) {
+    return PyModule_AddFunctions(module, SearchMethods);
+}
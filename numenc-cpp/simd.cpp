@@ -0,0 +1,288 @@
+#include "numenc.h"
+
+// The conversions of the typed buffers run on vectors of SSE2 (baseline
+// on x86-64) or AVX2 (if supported by the CPU) instructions. The kernels
+// are selected at import; the values which do not fill a whole vector and
+// the other platforms are left to the portable scalar loops in arrays.cpp.
+
+#if (defined(__x86_64__) || defined(_M_X64)) && !defined(NUMENC_NO_SIMD)
+#define NUMENC_X86_64 1
+#else
+#define NUMENC_X86_64 0
+#endif
+
+static const struct numenc_simd SCALAR_KERNELS = {"scalar", NULL, NULL};
+
+const struct numenc_simd* numenc_simd_kernels = & SCALAR_KERNELS;
+
+#if NUMENC_X86_64
+
+#include <immintrin.h>
+#if defined(_MSC_VER)
+#include <intrin.h>
+#endif
+
+// SSE2
+
+static inline __m128i sse2_bswap16(__m128i v) {
+    return _mm_or_si128(_mm_slli_epi16(v, 8), _mm_srli_epi16(v, 8));
+}
+
+static inline __m128i sse2_bswap32(__m128i v) {
+    return sse2_bswap16(_mm_shufflehi_epi16(
+        _mm_shufflelo_epi16(v, _MM_SHUFFLE(2, 3, 0, 1)),
+        _MM_SHUFFLE(2, 3, 0, 1)));
+}
+
+static inline __m128i sse2_bswap64(__m128i v) {
+    return sse2_bswap16(_mm_shufflehi_epi16(
+        _mm_shufflelo_epi16(v, _MM_SHUFFLE(0, 1, 2, 3)),
+        _MM_SHUFFLE(0, 1, 2, 3)));
+}
+
+#define NUMENC_VEC __m128i
+#define NUMENC_VEC_SIZE 16
+#define NUMENC_SIMD_NAME(name) sse2_##name
+#define NUMENC_SIMD_TARGET
+#define vec_load(p) _mm_loadu_si128((const __m128i* ) (p))
+#define vec_store(p, v) _mm_storeu_si128((__m128i* ) (p), v)
+#define vec_xor _mm_xor_si128
+#define vec_or _mm_or_si128
+#define vec_and _mm_and_si128
+#define vec_ones() _mm_set1_epi32(-1)
+#define vec_set8(x) _mm_set1_epi8((char) (x))
+#define vec_set16(x) _mm_set1_epi16((short) (x))
+#define vec_set32(x) _mm_set1_epi32((int) (x))
+#define vec_set64(x) _mm_set1_epi64x((long long) (x))
+#define vec_srai32 _mm_srai_epi32
+#define vec_shuffle32 _mm_shuffle_epi32
+#define vec_cmpge_f32(v) _mm_castps_si128( \
+    _mm_cmpge_ps(_mm_castsi128_ps(v), _mm_setzero_ps()))
+#define vec_cmpge_f64(v) _mm_castpd_si128( \
+    _mm_cmpge_pd(_mm_castsi128_pd(v), _mm_setzero_pd()))
+#define vec_bswap16 sse2_bswap16
+#define vec_bswap32 sse2_bswap32
+#define vec_bswap64 sse2_bswap64
+
+#include "simd_kernels.h"
+
+#undef NUMENC_VEC
+#undef NUMENC_VEC_SIZE
+#undef NUMENC_SIMD_NAME
+#undef NUMENC_SIMD_TARGET
+#undef vec_load
+#undef vec_store
+#undef vec_xor
+#undef vec_or
+#undef vec_and
+#undef vec_ones
+#undef vec_set8
+#undef vec_set16
+#undef vec_set32
+#undef vec_set64
+#undef vec_srai32
+#undef vec_shuffle32
+#undef vec_cmpge_f32
+#undef vec_cmpge_f64
+#undef vec_bswap16
+#undef vec_bswap32
+#undef vec_bswap64
+
+static const struct numenc_simd SSE2_KERNELS = {
+    "sse2", sse2_encode, sse2_decode
+};
+
+// AVX2
+
+#if defined(__GNUC__) || defined(__clang__)
+#define NUMENC_AVX2_TARGET __attribute__((target("avx2")))
+#else
+#define NUMENC_AVX2_TARGET
+#endif
+
+// The bytes of the elements are reversed within the 128-bit lanes, which
+// suffices since no element crosses a lane.
+NUMENC_AVX2_TARGET
+static inline __m256i avx2_bswap16(__m256i v) {
+    return _mm256_shuffle_epi8(v, _mm256_setr_epi8(
+        1, 0, 3, 2, 5, 4, 7, 6, 9, 8, 11, 10, 13, 12, 15, 14,
+        1, 0, 3, 2, 5, 4, 7, 6, 9, 8, 11, 10, 13, 12, 15, 14));
+}
+
+NUMENC_AVX2_TARGET
+static inline __m256i avx2_bswap32(__m256i v) {
+    return _mm256_shuffle_epi8(v, _mm256_setr_epi8(
+        3, 2, 1, 0, 7, 6, 5, 4, 11, 10, 9, 8, 15, 14, 13, 12,
+        3, 2, 1, 0, 7, 6, 5, 4, 11, 10, 9, 8, 15, 14, 13, 12));
+}
+
+NUMENC_AVX2_TARGET
+static inline __m256i avx2_bswap64(__m256i v) {
+    return _mm256_shuffle_epi8(v, _mm256_setr_epi8(
+        7, 6, 5, 4, 3, 2, 1, 0, 15, 14, 13, 12, 11, 10, 9, 8,
+        7, 6, 5, 4, 3, 2, 1, 0, 15, 14, 13, 12, 11, 10, 9, 8));
+}
+
+#define NUMENC_VEC __m256i
+#define NUMENC_VEC_SIZE 32
+#define NUMENC_SIMD_NAME(name) avx2_##name
+#define NUMENC_SIMD_TARGET NUMENC_AVX2_TARGET
+#define vec_load(p) _mm256_loadu_si256((const __m256i* ) (p))
+#define vec_store(p, v) _mm256_storeu_si256((__m256i* ) (p), v)
+#define vec_xor _mm256_xor_si256
+#define vec_or _mm256_or_si256
+#define vec_and _mm256_and_si256
+#define vec_ones() _mm256_set1_epi32(-1)
+#define vec_set8(x) _mm256_set1_epi8((char) (x))
+#define vec_set16(x) _mm256_set1_epi16((short) (x))
+#define vec_set32(x) _mm256_set1_epi32((int) (x))
+#define vec_set64(x) _mm256_set1_epi64x((long long) (x))
+#define vec_srai32 _mm256_srai_epi32
+#define vec_shuffle32 _mm256_shuffle_epi32
+#define vec_cmpge_f32(v) _mm256_castps_si256(_mm256_cmp_ps( \
+    _mm256_castsi256_ps(v), _mm256_setzero_ps(), _CMP_GE_OQ))
+#define vec_cmpge_f64(v) _mm256_castpd_si256(_mm256_cmp_pd( \
+    _mm256_castsi256_pd(v), _mm256_setzero_pd(), _CMP_GE_OQ))
+#define vec_bswap16 avx2_bswap16
+#define vec_bswap32 avx2_bswap32
+#define vec_bswap64 avx2_bswap64
+
+#include "simd_kernels.h"
+
+#undef NUMENC_VEC
+#undef NUMENC_VEC_SIZE
+#undef NUMENC_SIMD_NAME
+#undef NUMENC_SIMD_TARGET
+#undef vec_load
+#undef vec_store
+#undef vec_xor
+#undef vec_or
+#undef vec_and
+#undef vec_ones
+#undef vec_set8
+#undef vec_set16
+#undef vec_set32
+#undef vec_set64
+#undef vec_srai32
+#undef vec_shuffle32
+#undef vec_cmpge_f32
+#undef vec_cmpge_f64
+#undef vec_bswap16
+#undef vec_bswap32
+#undef vec_bswap64
+
+static const struct numenc_simd AVX2_KERNELS = {
+    "avx2", avx2_encode, avx2_decode
+};
+
+// Return 1 if both the CPU and the operating system support AVX2.
+static int supports_avx2(void) {
+#if defined(_MSC_VER)
+    int info[4];
+    __cpuid(info, 0);
+    if (info[0] < 7) {
+        return 0;
+    }
+    // the CPU supports AVX and the operating system saves its registers
+    __cpuid(info, 1);
+    if ((info[2] & (1 << 27)) == 0 || (info[2] & (1 << 28)) == 0 ||
+            (_xgetbv(0) & 6) != 6) {
+        return 0;
+    }
+    __cpuidex(info, 7, 0);
+    return (info[1] & (1 << 5)) != 0;
+#else
+    __builtin_cpu_init();
+    return __builtin_cpu_supports("avx2") != 0;
+#endif
+}
+
+#endif  // NUMENC_X86_64
+
+// The kernels supported by this CPU, from the slowest to the fastest
+static const struct numenc_simd* supported[3];
+static int supported_count = 0;
+
+static PyObject* simd_kernels(PyObject* self, PyObject* args) {
+    PyObject* result = PyList_New(supported_count);
+    if (result == NULL) {
+        return NULL;
+    }
+    for (int i = 0; i < supported_count; i++) {
+        PyObject* name = PyUnicode_FromString(supported[i]->name);
+        if (name == NULL) {
+            Py_DECREF(result);
+            return NULL;
+        }
+        PyList_SET_ITEM(result, i, name);
+    }
+    return result;
+}
+
+static PyObject* get_simd(PyObject* self, PyObject* args) {
+    return PyUnicode_FromString(numenc_simd_kernels->name);
+}
+
+static PyObject* set_simd(PyObject* self, PyObject* kernels) {
+    if (!PyUnicode_Check(kernels)) {
+        return PyErr_Format(PyExc_TypeError,
+            "Wrong input: expected a str, got %s.",
+            Py_TYPE(kernels)->tp_name);
+    }
+    const char* name = PyUnicode_AsUTF8(kernels);
+    if (name == NULL) {
+        return NULL;
+    }
+    for (int i = 0; i < supported_count; i++) {
+        if (strcmp(name, supported[i]->name) == 0) {
+            numenc_simd_kernels = supported[i];
+            Py_RETURN_NONE;
+        }
+    }
+    return PyErr_Format(PyExc_ValueError,
+        "Illegal kernels: expected one of the kernels supported by "
+        "this CPU (see simd_kernels()), got %R.", kernels);
+}
+
+static PyMethodDef SimdMethods[] = {
+    {
+        "simd_kernels",
+        simd_kernels,
+        METH_NOARGS,
+        "Return the names of the kernels of the typed-buffer conversions "
+        "supported by this CPU, from the slowest ('scalar') to the fastest"
+    },
+    {
+        "get_simd",
+        get_simd,
+        METH_NOARGS,
+        "Return the name of the kernels used by the typed-buffer conversions"
+    },
+    {
+        "set_simd",
+        set_simd,
+        METH_O,
+        "Select the kernels of the typed-buffer conversions by their name; "
+        "the fastest kernels supported by the CPU are selected at import"
+    },
+    {
+        NULL,
+        NULL,
+        0,
+        NULL
+    }
+};
+
+int numenc_add_simd_functions(PyObject* module) {
+    supported_count = 0;
+    supported[supported_count++] = & SCALAR_KERNELS;
+#if NUMENC_X86_64
+    supported[supported_count++] = & SSE2_KERNELS;
+    if (supports_avx2()) {
+        supported[supported_count++] = & AVX2_KERNELS;
+    }
+#endif
+    numenc_simd_kernels = supported[supported_count - 1];
+
+    return PyModule_AddFunctions(module, SimdMethods);
+}
@@ -0,0 +1,143 @@
+// The vector kernels of one instruction set. The file is included by
+// simd.cpp once for every instruction set, which defines beforehand:
+//
+// * NUMENC_VEC, the vector type, and NUMENC_VEC_SIZE, its size in bytes,
+// * NUMENC_SIMD_NAME(name), the prefixed name of a kernel,
+// * NUMENC_SIMD_TARGET, the attribute enabling the instruction set and
+// * the vec_* operations on the vectors.
+//
+// The kernels reproduce the scalar conversions of numenc.h bit by bit:
+// the keys are the big-endian numbers whose sign bit is flipped; a float
+// which is not >= 0 (a negative number or a NaN) is complemented instead.
+
+// Convert the whole vectors of the values with the expression convert of
+// the vector v; done counts the values converted so far.
+#define NUMENC_SIMD_LOOP(width, convert) \
+    for (; done + NUMENC_VEC_SIZE / (width) <= count; \
+            done += NUMENC_VEC_SIZE / (width)) { \
+        NUMENC_VEC v = vec_load(in + done * (width)); \
+        vec_store(out + done * (width), convert); \
+    }
+
+NUMENC_SIMD_TARGET
+static inline NUMENC_VEC NUMENC_SIMD_NAME(encode_float32)(NUMENC_VEC v) {
+    const NUMENC_VEC positive = vec_cmpge_f32(v);
+    return vec_xor(vec_or(v, vec_and(positive, vec_set32(0x80000000u))),
+        vec_xor(positive, vec_ones()));
+}
+
+NUMENC_SIMD_TARGET
+static inline NUMENC_VEC NUMENC_SIMD_NAME(encode_float64)(NUMENC_VEC v) {
+    const NUMENC_VEC positive = vec_cmpge_f64(v);
+    return vec_xor(
+        vec_or(v, vec_and(positive, vec_set64(0x8000000000000000ull))),
+        vec_xor(positive, vec_ones()));
+}
+
+// A key whose first bit is set is a positive number whose sign bit is
+// flipped back; any other key is complemented.
+NUMENC_SIMD_TARGET
+static inline NUMENC_VEC NUMENC_SIMD_NAME(decode_float32)(NUMENC_VEC v) {
+    const NUMENC_VEC positive = vec_srai32(v, 31);
+    return vec_xor(v, vec_or(vec_xor(positive, vec_ones()),
+        vec_set32(0x80000000u)));
+}
+
+NUMENC_SIMD_TARGET
+static inline NUMENC_VEC NUMENC_SIMD_NAME(decode_float64)(NUMENC_VEC v) {
+    // spread the sign of the upper halves over the whole 64-bit lanes
+    const NUMENC_VEC positive = vec_shuffle32(vec_srai32(v, 31),
+        _MM_SHUFFLE(3, 3, 1, 1));
+    return vec_xor(v, vec_or(vec_xor(positive, vec_ones()),
+        vec_set64(0x8000000000000000ull)));
+}
+
+NUMENC_SIMD_TARGET
+static Py_ssize_t NUMENC_SIMD_NAME(encode)(int type, const unsigned char* in,
+        unsigned char* out, Py_ssize_t count, int swap) {
+    Py_ssize_t done = 0;
+    switch (type) {
+        case NUMENC_INT8:
+            NUMENC_SIMD_LOOP(1, vec_xor(v, vec_set8(0x80)))
+            break;
+        case NUMENC_UINT8:
+            NUMENC_SIMD_LOOP(1, v)
+            break;
+        case NUMENC_INT16:
+            NUMENC_SIMD_LOOP(2, vec_bswap16(vec_xor(
+                swap ? vec_bswap16(v) : v, vec_set16(0x8000))))
+            break;
+        case NUMENC_UINT16:
+            NUMENC_SIMD_LOOP(2, swap ? v : vec_bswap16(v))
+            break;
+        case NUMENC_INT32:
+            NUMENC_SIMD_LOOP(4, vec_bswap32(vec_xor(
+                swap ? vec_bswap32(v) : v, vec_set32(0x80000000u))))
+            break;
+        case NUMENC_UINT32:
+            NUMENC_SIMD_LOOP(4, swap ? v : vec_bswap32(v))
+            break;
+        case NUMENC_INT64:
+            NUMENC_SIMD_LOOP(8, vec_bswap64(vec_xor(
+                swap ? vec_bswap64(v) : v,
+                vec_set64(0x8000000000000000ull))))
+            break;
+        case NUMENC_UINT64:
+            NUMENC_SIMD_LOOP(8, swap ? v : vec_bswap64(v))
+            break;
+        case NUMENC_FLOAT32:
+            NUMENC_SIMD_LOOP(4, vec_bswap32(NUMENC_SIMD_NAME(encode_float32)(
+                swap ? vec_bswap32(v) : v)))
+            break;
+        case NUMENC_FLOAT64:
+            NUMENC_SIMD_LOOP(8, vec_bswap64(NUMENC_SIMD_NAME(encode_float64)(
+                swap ? vec_bswap64(v) : v)))
+            break;
+    }
+    return done;
+}
+
+NUMENC_SIMD_TARGET
+static Py_ssize_t NUMENC_SIMD_NAME(decode)(int type, const unsigned char* in,
+        unsigned char* out, Py_ssize_t count) {
+    Py_ssize_t done = 0;
+    switch (type) {
+        case NUMENC_INT8:
+            NUMENC_SIMD_LOOP(1, vec_xor(v, vec_set8(0x80)))
+            break;
+        case NUMENC_UINT8:
+            NUMENC_SIMD_LOOP(1, v)
+            break;
+        case NUMENC_INT16:
+            NUMENC_SIMD_LOOP(2, vec_xor(vec_bswap16(v), vec_set16(0x8000)))
+            break;
+        case NUMENC_UINT16:
+            NUMENC_SIMD_LOOP(2, vec_bswap16(v))
+            break;
+        case NUMENC_INT32:
+            NUMENC_SIMD_LOOP(4, vec_xor(vec_bswap32(v),
+                vec_set32(0x80000000u)))
+            break;
+        case NUMENC_UINT32:
+            NUMENC_SIMD_LOOP(4, vec_bswap32(v))
+            break;
+        case NUMENC_INT64:
+            NUMENC_SIMD_LOOP(8, vec_xor(vec_bswap64(v),
+                vec_set64(0x8000000000000000ull)))
+            break;
+        case NUMENC_UINT64:
+            NUMENC_SIMD_LOOP(8, vec_bswap64(v))
+            break;
+        case NUMENC_FLOAT32:
+            NUMENC_SIMD_LOOP(4, NUMENC_SIMD_NAME(decode_float32)(
+                vec_bswap32(v)))
+            break;
+        case NUMENC_FLOAT64:
+            NUMENC_SIMD_LOOP(8, NUMENC_SIMD_NAME(decode_float64)(
+                vec_bswap64(v)))
+            break;
+    }
+    return done;
+}
+
+#undef NUMENC_SIMD_LOOP
@@ -0,0 +1,580 @@
+#include "numenc.h"
+
+// Keys of up to 8 bytes are loaded as big-endian integers, which sort in
+// the same order as the keys, and sorted by an LSD radix sort. Keys of up
+// to 16 bytes are loaded as pairs of such integers and radix-sorted on
+// the low word first; longer keys are merge-sorted with memcmp. All
+// the sorts are stable.
+
+// Count the digits of all the byte positions of the words in one pass.
+// Return the number of the passes needed and set their shifts; a byte
+// shared by all the words does not change the order and is skipped.
+static int count_digits(const uint64_t* words, Py_ssize_t count, int width,
+        Py_ssize_t offsets[][256], int* shifts) {
+    memset(offsets, 0, (size_t) width * sizeof(offsets[0]));
+    for (Py_ssize_t i = 0; i < count; i++) {
+        const uint64_t word = words[i];
+        for (int k = 0; k < width; k++) {
+            offsets[k][(word >> (8 * k)) & 0xff]++;
+        }
+    }
+
+    int passes = 0;
+    for (int k = 0; k < width; k++) {
+        if (offsets[k][(words[0] >> (8 * k)) & 0xff] == count) {
+            continue;
+        }
+        Py_ssize_t total = 0;
+        for (int digit = 0; digit < 256; digit++) {
+            const Py_ssize_t size = offsets[k][digit];
+            offsets[k][digit] = total;
+            total += size;
+        }
+        shifts[passes] = k;
+        passes++;
+    }
+    return passes;
+}
+
+static int sort_words(unsigned char* keys, Py_ssize_t count, int width) {
+    uint64_t* words = (uint64_t* ) PyMem_RawMalloc(
+        2 * (size_t) count * sizeof(uint64_t));
+    if (words == NULL) {
+        return -1;
+    }
+    uint64_t* in = words;
+    uint64_t* out = words + count;
+
+    for (Py_ssize_t i = 0; i < count; i++) {
+        in[i] = numenc_load_be(keys + i * width, width);
+    }
+
+    Py_ssize_t offsets[8][256];
+    int shifts[8];
+    const int passes = count_digits(in, count, width, offsets, shifts);
+    for (int pass = 0; pass < passes; pass++) {
+        Py_ssize_t* offset = offsets[shifts[pass]];
+        const int shift = 8 * shifts[pass];
+        for (Py_ssize_t i = 0; i < count; i++) {
+            out[offset[(in[i] >> shift) & 0xff]++] = in[i];
+        }
+
+        uint64_t* swap = in;
+        in = out;
+        out = swap;
+    }
+
+    for (Py_ssize_t i = 0; i < count; i++) {
+        numenc_store_be(in[i], width, keys + i * width);
+    }
+    PyMem_RawFree(words);
+    return 0;
+}
+
+// Radix-sort the keys of 9 to 16 bytes as pairs of words: the first
+// 8 bytes form the high word and the rest the low word. Store the sorted
+// keys if sorted is not NULL and the sorting permutation if order is not
+// NULL.
+static int sort_pairs(const unsigned char* keys, Py_ssize_t count,
+        int width, unsigned char* sorted, Py_ssize_t* order) {
+    const int low_width = width - 8;
+    uint64_t* words = (uint64_t* ) PyMem_RawMalloc(
+        4 * (size_t) count * sizeof(uint64_t));
+    Py_ssize_t* buffer = (order == NULL) ? NULL :
+        (Py_ssize_t* ) PyMem_RawMalloc((size_t) count * sizeof(Py_ssize_t));
+    if (words == NULL || (order != NULL && buffer == NULL)) {
+        PyMem_RawFree(words);
+        PyMem_RawFree(buffer);
+        return -1;
+    }
+    uint64_t* in_high = words;
+    uint64_t* in_low = words + count;
+    uint64_t* out_high = words + 2 * count;
+    uint64_t* out_low = words + 3 * count;
+    Py_ssize_t* in_order = order;
+    Py_ssize_t* out_order = buffer;
+
+    for (Py_ssize_t i = 0; i < count; i++) {
+        in_high[i] = numenc_load_be(keys + i * width, 8);
+        in_low[i] = numenc_load_be(keys + i * width + 8, low_width);
+        if (order != NULL) {
+            order[i] = i;
+        }
+    }
+
+    // the passes over the low word precede the passes over the high word
+    Py_ssize_t offsets[16][256];
+    int shifts[16];
+    const int low_passes = count_digits(in_low, count, low_width, offsets,
+        shifts);
+    const int passes = low_passes + count_digits(in_high, count, 8,
+        offsets + low_width, shifts + low_passes);
+    for (int pass = 0; pass < passes; pass++) {
+        const int high = pass >= low_passes;
+        Py_ssize_t* offset =
+            offsets[high ? low_width + shifts[pass] : shifts[pass]];
+        const uint64_t* digits = high ? in_high : in_low;
+        const int shift = 8 * shifts[pass];
+        for (Py_ssize_t i = 0; i < count; i++) {
+            const Py_ssize_t target = offset[(digits[i] >> shift) & 0xff]++;
+            out_high[target] = in_high[i];
+            out_low[target] = in_low[i];
+            if (order != NULL) {
+                out_order[target] = in_order[i];
+            }
+        }
+
+        uint64_t* swap = in_high;
+        in_high = out_high;
+        out_high = swap;
+        swap = in_low;
+        in_low = out_low;
+        out_low = swap;
+        Py_ssize_t* swap_order = in_order;
+        in_order = out_order;
+        out_order = swap_order;
+    }
+
+    if (sorted != NULL) {
+        for (Py_ssize_t i = 0; i < count; i++) {
+            numenc_store_be(in_high[i], 8, sorted + i * width);
+            numenc_store_be(in_low[i], low_width, sorted + i * width + 8);
+        }
+    }
+    if (order != NULL && in_order != order) {
+        memcpy(order, in_order, (size_t) count * sizeof(Py_ssize_t));
+    }
+    PyMem_RawFree(buffer);
+    PyMem_RawFree(words);
+    return 0;
+}
+
+static int merge_sort(unsigned char* keys, Py_ssize_t count,
+        Py_ssize_t width) {
+    unsigned char* buffer = (unsigned char* ) PyMem_RawMalloc(
+        (size_t) count * (size_t) width);
+    if (buffer == NULL) {
+        return -1;
+    }
+    unsigned char* in = keys;
+    unsigned char* out = buffer;
+
+    for (Py_ssize_t run = 1; run < count; run *= 2) {
+        for (Py_ssize_t lo = 0; lo < count; lo += 2 * run) {
+            const Py_ssize_t mid = (run < count - lo) ? lo + run : count;
+            const Py_ssize_t hi =
+                (2 * run < count - lo) ? lo + 2 * run : count;
+            Py_ssize_t a = lo;
+            Py_ssize_t b = mid;
+            unsigned char* target = out + lo * width;
+            while (a < mid && b < hi) {
+                if (memcmp(in + b * width, in + a * width,
+                        (size_t) width) < 0) {
+                    memcpy(target, in + b * width, (size_t) width);
+                    b++;
+                } else {
+                    memcpy(target, in + a * width, (size_t) width);
+                    a++;
+                }
+                target += width;
+            }
+            memcpy(target, in + a * width, (size_t)((mid - a) * width));
+            target += (mid - a) * width;
+            memcpy(target, in + b * width, (size_t)((hi - b) * width));
+        }
+        unsigned char* swap = in;
+        in = out;
+        out = swap;
+    }
+
+    if (in != keys) {
+        memcpy(keys, in, (size_t) count * (size_t) width);
+    }
+    PyMem_RawFree(buffer);
+    return 0;
+}
+
+int numenc_sort_keys(unsigned char* keys, Py_ssize_t count,
+        Py_ssize_t width) {
+    if (count < 2) {
+        return 0;
+    }
+    if (width <= 8) {
+        return sort_words(keys, count, (int) width);
+    }
+    if (width <= 16) {
+        return sort_pairs(keys, count, (int) width, keys, NULL);
+    }
+    return merge_sort(keys, count, width);
+}
+
+// Radix-sort the indices together with the words of their keys.
+static int argsort_words(const unsigned char* keys, Py_ssize_t count,
+        int width, Py_ssize_t* order) {
+    uint64_t* words = (uint64_t* ) PyMem_RawMalloc(
+        2 * (size_t) count * sizeof(uint64_t));
+    Py_ssize_t* buffer = (Py_ssize_t* ) PyMem_RawMalloc(
+        (size_t) count * sizeof(Py_ssize_t));
+    if (words == NULL || buffer == NULL) {
+        PyMem_RawFree(words);
+        PyMem_RawFree(buffer);
+        return -1;
+    }
+    uint64_t* in = words;
+    uint64_t* out = words + count;
+    Py_ssize_t* in_order = order;
+    Py_ssize_t* out_order = buffer;
+
+    for (Py_ssize_t i = 0; i < count; i++) {
+        in[i] = numenc_load_be(keys + i * width, width);
+        order[i] = i;
+    }
+
+    Py_ssize_t offsets[8][256];
+    int shifts[8];
+    const int passes = count_digits(in, count, width, offsets, shifts);
+    for (int pass = 0; pass < passes; pass++) {
+        Py_ssize_t* offset = offsets[shifts[pass]];
+        const int shift = 8 * shifts[pass];
+        for (Py_ssize_t i = 0; i < count; i++) {
+            const Py_ssize_t target = offset[(in[i] >> shift) & 0xff]++;
+            out[target] = in[i];
+            out_order[target] = in_order[i];
+        }
+
+        uint64_t* swap = in;
+        in = out;
+        out = swap;
+        Py_ssize_t* swap_order = in_order;
+        in_order = out_order;
+        out_order = swap_order;
+    }
+
+    if (in_order != order) {
+        memcpy(order, in_order, (size_t) count * sizeof(Py_ssize_t));
+    }
+    PyMem_RawFree(buffer);
+    PyMem_RawFree(words);
+    return 0;
+}
+
+// Sort the indices by their keys with a bottom-up merge sort.
+static int argsort_merge(const unsigned char* keys, Py_ssize_t count,
+        Py_ssize_t width, Py_ssize_t* order) {
+    Py_ssize_t* buffer = (Py_ssize_t* ) PyMem_RawMalloc(
+        (size_t) count * sizeof(Py_ssize_t));
+    if (buffer == NULL) {
+        return -1;
+    }
+    for (Py_ssize_t i = 0; i < count; i++) {
+        order[i] = i;
+    }
+
+    Py_ssize_t* in = order;
+    Py_ssize_t* out = buffer;
+    for (Py_ssize_t run = 1; run < count; run *= 2) {
+        for (Py_ssize_t lo = 0; lo < count; lo += 2 * run) {
+            const Py_ssize_t mid = (run < count - lo) ? lo + run : count;
+            const Py_ssize_t hi =
+                (2 * run < count - lo) ? lo + 2 * run : count;
+            Py_ssize_t a = lo;
+            Py_ssize_t b = mid;
+            Py_ssize_t k = lo;
+            while (a < mid && b < hi) {
+                if (memcmp(keys + in[b] * width, keys + in[a] * width,
+                        (size_t) width) < 0) {
+                    out[k++] = in[b++];
+                } else {
+                    out[k++] = in[a++];
+                }
+            }
+            while (a < mid) {
+                out[k++] = in[a++];
+            }
+            while (b < hi) {
+                out[k++] = in[b++];
+            }
+        }
+        Py_ssize_t* swap = in;
+        in = out;
+        out = swap;
+    }
+
+    if (in != order) {
+        memcpy(order, in, (size_t) count * sizeof(Py_ssize_t));
+    }
+    PyMem_RawFree(buffer);
+    return 0;
+}
+
+int numenc_argsort_keys(const unsigned char* keys, Py_ssize_t count,
+        Py_ssize_t width, Py_ssize_t* order) {
+    if (count < 2) {
+        if (count == 1) {
+            order[0] = 0;
+        }
+        return 0;
+    }
+    if (width <= 8) {
+        return argsort_words(keys, count, (int) width, order);
+    }
+    if (width <= 16) {
+        return sort_pairs(keys, count, (int) width, NULL, order);
+    }
+    return argsort_merge(keys, count, width, order);
+}
+
+// Acquire a view on the packed keys and check that they are whole.
+// Return 0 on success; otherwise set a Python exception and return -1.
+static int get_keys(PyObject* buffer, Py_ssize_t width, int writable,
+        Py_buffer* view) {
+    if (width <= 0) {
+        PyErr_Format(PyExc_ValueError,
+            "Illegal width: expected a positive width, got %zd.", width);
+        return -1;
+    }
+    const int status = writable ?
+        numenc_get_writable_buffer(buffer, view) :
+        numenc_get_buffer(buffer, view);
+    if (status != 0) {
+        return -1;
+    }
+    if (view->len % width != 0) {
+        PyErr_Format(PyExc_ValueError,
+            "Illegal input: expected a buffer of keys whose length is "
+            "a multiple of %zd, got %zd.", width, view->len);
+        PyBuffer_Release(view);
+        return -1;
+    }
+    return 0;
+}
+
+static PyObject* sort_packed(
+        PyObject* self, PyObject* args, PyObject* kwargs) {
+    static const char* kwlist[] = {"buffer", "width", NULL};
+    PyObject* buffer;
+    Py_ssize_t width;
+
+    if (!PyArg_ParseTupleAndKeywords(args, kwargs, "On",
+            (char** ) kwlist, & buffer, & width)) {
+        return NULL;
+    }
+
+    Py_buffer view;
+    if (get_keys(buffer, width, 1, & view) != 0) {
+        return NULL;
+    }
+
+    int status;
+    Py_BEGIN_ALLOW_THREADS
+    status = numenc_sort_keys(
+        (unsigned char* ) view.buf, view.len / width, width);
+    Py_END_ALLOW_THREADS
+    PyBuffer_Release(& view);
+    if (status != 0) {
+        return PyErr_NoMemory();
+    }
+    Py_RETURN_NONE;
+}
+
+static PyObject* argsort_packed(
+        PyObject* self, PyObject* args, PyObject* kwargs) {
+    static const char* kwlist[] = {"buffer", "width", "output", NULL};
+    PyObject* buffer;
+    Py_ssize_t width;
+    const char* output = "array";
+
+    if (!PyArg_ParseTupleAndKeywords(args, kwargs, "On|s",
+            (char** ) kwlist, & buffer, & width, & output)) {
+        return NULL;
+    }
+
+    if (strcmp(output, "array") != 0 && strcmp(output, "ndarray") != 0) {
+        return PyErr_Format(PyExc_ValueError,
+            "Illegal output: expected 'array' or 'ndarray', got '%s'.",
+            output);
+    }
+
+    Py_buffer view;
+    if (get_keys(buffer, width, 0, & view) != 0) {
+        return NULL;
+    }
+    const Py_ssize_t count = view.len / width;
+
+    // the indices are int64, which is a Py_ssize_t on 64-bit platforms;
+    // elsewhere they are widened after the sort.
+    Py_buffer indices;
+    PyObject* result = numenc_new_array(
+        NUMENC_INT64, count, output, & indices);
+    if (result == NULL) {
+        PyBuffer_Release(& view);
+        return NULL;
+    }
+    Py_ssize_t* order = (sizeof(Py_ssize_t) == sizeof(int64_t)) ?
+        (Py_ssize_t* ) indices.buf : PyMem_New(Py_ssize_t, count + 1);
+
+    int status = -1;
+    if (order != NULL) {
+        Py_BEGIN_ALLOW_THREADS
+        status = numenc_argsort_keys(
+            (const unsigned char* ) view.buf, count, width, order);
+        Py_END_ALLOW_THREADS
+    }
+    if (order != NULL && order != (Py_ssize_t* ) indices.buf) {
+        int64_t* out = (int64_t* ) indices.buf;
+        for (Py_ssize_t i = 0; i < count; i++) {
+            out[i] = (int64_t) order[i];
+        }
+        PyMem_Free(order);
+    }
+    PyBuffer_Release(& indices);
+    PyBuffer_Release(& view);
+    if (status != 0) {
+        Py_DECREF(result);
+        return PyErr_NoMemory();
+    }
+    return result;
+}
+
+// The float codecs map the negative zero to the zero and are not
+// bijective for NaNs, so the floats are sorted by a bijective transform
+// of their bits instead: the bits of a negative number (sign bit set,
+// including the negative zero and negative NaNs) are complemented,
+// otherwise the sign bit is set. The negative zero thus sorts right
+// before the zero and the NaNs beyond the infinities of their sign.
+
+// Convert count floats of the given width stored in little or big endian
+// to big-endian sort keys.
+static void float_bits_to_keys(const unsigned char* data,
+        unsigned char* keys, Py_ssize_t count, int width, int little) {
+    const uint64_t sign = 1ull << (8 * width - 1);
+    const uint64_t mask = (width == 8) ? UINT64_MAX : (sign << 1) - 1;
+    for (Py_ssize_t i = 0; i < count; i++) {
+        const unsigned char* item = data + i * width;
+        uint64_t bits = 0;
+        for (int j = 0; j < width; j++) {
+            bits = (bits << 8) | item[little ? width - 1 - j : j];
+        }
+        bits = (bits & sign) ? ~bits & mask : bits | sign;
+        numenc_store_be(bits, width, keys + i * width);
+    }
+}
+
+// Invert float_bits_to_keys.
+static void keys_to_float_bits(const unsigned char* keys,
+        unsigned char* data, Py_ssize_t count, int width, int little) {
+    const uint64_t sign = 1ull << (8 * width - 1);
+    const uint64_t mask = (width == 8) ? UINT64_MAX : (sign << 1) - 1;
+    for (Py_ssize_t i = 0; i < count; i++) {
+        uint64_t bits = numenc_load_be(keys + i * width, width);
+        bits = (bits & sign) ? bits ^ sign : ~bits & mask;
+        unsigned char* item = data + i * width;
+        for (int j = 0; j < width; j++) {
+            item[little ? j : width - 1 - j] =
+                (unsigned char)(bits >> (8 * j));
+        }
+    }
+}
+
+static PyObject* sort_array(PyObject* self, PyObject* values) {
+    if (!PyObject_CheckBuffer(values)) {
+        return PyErr_Format(PyExc_TypeError,
+            "Wrong input: expected an object supporting "
+            "the buffer protocol.");
+    }
+
+    Py_buffer view;
+    if (PyObject_GetBuffer(values, & view,
+            PyBUF_FORMAT | PyBUF_C_CONTIGUOUS | PyBUF_WRITABLE) != 0) {
+        return NULL;
+    }
+
+    int swap;
+    const int type = numenc_type_from_format(
+        view.format, view.itemsize, & swap);
+    if (type < 0) {
+        PyBuffer_Release(& view);
+        return NULL;
+    }
+    const Py_ssize_t count = view.len / view.itemsize;
+    const Py_ssize_t width = view.itemsize;
+
+    int status = -1;
+    Py_BEGIN_ALLOW_THREADS
+    unsigned char* keys = (unsigned char* ) PyMem_RawMalloc(
+        (size_t) view.len + 1);
+    if (keys != NULL) {
+        unsigned char* data = (unsigned char* ) view.buf;
+        const int is_float = type == NUMENC_FLOAT32 ||
+            type == NUMENC_FLOAT64;
+        const int little = numenc_is_little_endian() != swap;
+        if (is_float) {
+            float_bits_to_keys(data, keys, count, (int) width, little);
+        } else {
+            numenc_encode_native(type, data, keys, count, swap);
+        }
+        status = numenc_sort_keys(keys, count, width);
+        if (status == 0 && is_float) {
+            keys_to_float_bits(keys, data, count, (int) width, little);
+        } else if (status == 0) {
+            numenc_decode_native(type, keys, data, count);
+        }
+        if (status == 0 && swap && !is_float) {
+            // store the numbers back in the byte order of the buffer
+            for (Py_ssize_t i = 0; i < count; i++) {
+                unsigned char* item = data + i * width;
+                for (Py_ssize_t j = 0; j < width / 2; j++) {
+                    const unsigned char byte = item[j];
+                    item[j] = item[width - 1 - j];
+                    item[width - 1 - j] = byte;
+                }
+            }
+        }
+        PyMem_RawFree(keys);
+    }
+    Py_END_ALLOW_THREADS
+
+    PyBuffer_Release(& view);
+    if (status != 0) {
+        return PyErr_NoMemory();
+    }
+    Py_RETURN_NONE;
+}
+
+static PyMethodDef SortMethods[] = {
+    {
+        "sort_packed",
+        (PyCFunction)(void(*)(void)) sort_packed,
+        METH_VARARGS | METH_KEYWORDS,
+        "Sort the concatenated keys of the given width in a writable "
+        "buffer in place with a radix sort (keys longer than 16 bytes are "
+        "merge-sorted)"
+    },
+    {
+        "argsort_packed",
+        (PyCFunction)(void(*)(void)) argsort_packed,
+        METH_VARARGS | METH_KEYWORDS,
+        "Return the stable permutation that sorts the concatenated keys of "
+        "the given width as an int64 array.array (output='array') or "
+        "numpy.ndarray (output='ndarray'), computed with a radix sort for "
+        "keys of up to 16 bytes"
+    },
+    {
+        "sort_array",
+        (PyCFunction) sort_array,
+        METH_O,
+        "Sort a writable typed buffer of numbers (e.g., array.array or "
+        "numpy.ndarray) in place with a radix sort; negative zeros sort "
+        "before zeros and NaNs after the infinities of their sign"
+    },
+    {
+        NULL,
+        NULL,
+        0,
+        NULL
+    }
+};
+
+int numenc_add_sort_functions(PyObject* module) {
+    return PyModule_AddFunctions(module, SortMethods);
+}
@@ -0,0 +1,653 @@
+#include "numenc.h"
+
+#include <structmember.h>
+
+// A sorted multiset of fixed-width keys stored back to back in a single
+// buffer. A key costs its width instead of a bytes object and a list slot.
+
+struct numenc_sorted_array {
+    PyObject_HEAD
+
+    Py_ssize_t width;
+
+    // number of keys
+    Py_ssize_t count;
+
+    // number of keys the buffer can hold
+    Py_ssize_t capacity;
+
+    unsigned char* data;
+
+    // number of buffer views exported to the consumers
+    Py_ssize_t exports;
+
+    // incremented on every modification so that the iterators can detect
+    // that the keys changed under them
+    uint64_t version;
+};
+
+struct numenc_sorted_array_iterator {
+    PyObject_HEAD
+
+    struct numenc_sorted_array* array;
+    Py_ssize_t index;
+    Py_ssize_t stop;
+    uint64_t version;
+};
+
+static PyTypeObject* SortedKeyArrayType = NULL;
+static PyTypeObject* SortedKeyArrayIteratorType = NULL;
+
+// Make sure that the array can be modified and can hold count keys.
+// Return 0 on success; otherwise set a Python exception and return -1.
+static int prepare(struct numenc_sorted_array* self, Py_ssize_t count) {
+    if (self->exports > 0) {
+        PyErr_SetString(PyExc_BufferError,
+            "Existing exports of data: object cannot be re-sized");
+        return -1;
+    }
+
+    if (count <= self->capacity) {
+        return 0;
+    }
+
+    Py_ssize_t capacity = self->capacity + self->capacity / 2 + 8;
+    if (capacity < count) {
+        capacity = count;
+    }
+    if (capacity > PY_SSIZE_T_MAX / self->width) {
+        PyErr_NoMemory();
+        return -1;
+    }
+
+    unsigned char* data = (unsigned char* ) PyMem_Realloc(
+        self->data, (size_t)(capacity * self->width));
+    if (data == NULL) {
+        PyErr_NoMemory();
+        return -1;
+    }
+    self->data = data;
+    self->capacity = capacity;
+    return 0;
+}
+
+// Acquire a view on a single key of the width of the array.
+// Return 0 on success; otherwise set a Python exception and return -1.
+static int get_key(const struct numenc_sorted_array* self, PyObject* key,
+        Py_buffer* view) {
+    if (numenc_get_buffer(key, view) != 0) {
+        return -1;
+    }
+    if (view->len != self->width) {
+        PyErr_Format(PyExc_ValueError,
+            "Illegal input: expected bytes of length %zd, got %zd.",
+            self->width, view->len);
+        PyBuffer_Release(view);
+        return -1;
+    }
+    return 0;
+}
+
+// Copy the concatenated keys of a bytes-like object and sort them.
+// Return the copy (to be freed with PyMem_Free) and its number of keys
+// on success; otherwise set a Python exception and return NULL.
+static unsigned char* sorted_copy(const struct numenc_sorted_array* self,
+        PyObject* keys, Py_ssize_t* count) {
+    Py_buffer view;
+    if (numenc_get_buffer(keys, & view) != 0) {
+        return NULL;
+    }
+    if (view.len % self->width != 0) {
+        PyErr_Format(PyExc_ValueError,
+            "Illegal input: expected a buffer whose length is a multiple "
+            "of %zd, got %zd.", self->width, view.len);
+        PyBuffer_Release(& view);
+        return NULL;
+    }
+
+    // allocate at least one byte so that empty batches are not mistaken
+    // for a failure
+    unsigned char* copy = (unsigned char* ) PyMem_Malloc(
+        (size_t) view.len + 1);
+    if (copy == NULL) {
+        PyBuffer_Release(& view);
+        PyErr_NoMemory();
+        return NULL;
+    }
+    memcpy(copy, view.buf, (size_t) view.len);
+    *count = view.len / self->width;
+    PyBuffer_Release(& view);
+
+    if (numenc_sort_keys(copy, *count, self->width) != 0) {
+        PyMem_Free(copy);
+        PyErr_NoMemory();
+        return NULL;
+    }
+    return copy;
+}
+
+static Py_ssize_t search(const struct numenc_sorted_array* self,
+        const unsigned char* probe, int right) {
+    return numenc_search_raw(self->data, self->count, self->width, probe,
+        right);
+}
+
+// Merge count sorted keys into the array, which must have room for them.
+// The existing keys are moved in blocks found by binary search, so that
+// the cost is one pass of memmove over the array plus a search per key.
+static void merge_sorted(struct numenc_sorted_array* self,
+        const unsigned char* keys, Py_ssize_t count) {
+    const Py_ssize_t width = self->width;
+    Py_ssize_t end = self->count;
+    Py_ssize_t target = self->count + count;
+
+    for (Py_ssize_t i = count - 1; i >= 0; i--) {
+        const unsigned char* key = keys + i * width;
+        const Py_ssize_t position = numenc_search_raw(
+            self->data, end, width, key, 1);
+
+        target -= end - position;
+        memmove(self->data + target * width, self->data + position * width,
+            (size_t)((end - position) * width));
+        end = position;
+
+        target--;
+        memcpy(self->data + target * width, key, (size_t) width);
+    }
+    self->count += count;
+}
+
+static PyObject* SortedKeyArray_new(
+        PyTypeObject* type, PyObject* args, PyObject* kwargs) {
+    static const char* kwlist[] = {"width", "keys", NULL};
+    Py_ssize_t width;
+    PyObject* keys = Py_None;
+
+    if (!PyArg_ParseTupleAndKeywords(args, kwargs, "n|O",
+            (char** ) kwlist, & width, & keys)) {
+        return NULL;
+    }
+
+    if (width <= 0) {
+        return PyErr_Format(PyExc_ValueError,
+            "Illegal width: expected a positive width, got %zd.", width);
+    }
+
+    struct numenc_sorted_array* self =
+        (struct numenc_sorted_array* ) type->tp_alloc(type, 0);
+    if (self == NULL) {
+        return NULL;
+    }
+    self->width = width;
+    self->count = 0;
+    self->capacity = 0;
+    self->data = NULL;
+    self->exports = 0;
+    self->version = 0;
+
+    if (keys != Py_None) {
+        Py_ssize_t count;
+        unsigned char* copy = sorted_copy(self, keys, & count);
+        if (copy == NULL) {
+            Py_DECREF(self);
+            return NULL;
+        }
+        self->data = copy;
+        self->count = count;
+        self->capacity = count;
+    }
+    return (PyObject* ) self;
+}
+
+static void SortedKeyArray_dealloc(struct numenc_sorted_array* self) {
+    PyTypeObject* type = Py_TYPE(self);
+    PyMem_Free(self->data);
+    type->tp_free((PyObject* ) self);
+#if PY_VERSION_HEX >= 0x03080000
+    // instances of heap types hold a reference to their type since 3.8
+    Py_DECREF(type);
+#endif
+}
+
+static PyObject* SortedKeyArray_repr(struct numenc_sorted_array* self) {
+    return PyUnicode_FromFormat(
+        "<numenc.SortedKeyArray of %zd keys of %zd bytes>",
+        self->count, self->width);
+}
+
+static Py_ssize_t SortedKeyArray_length(struct numenc_sorted_array* self) {
+    return self->count;
+}
+
+static PyObject* SortedKeyArray_item(
+        struct numenc_sorted_array* self, Py_ssize_t index) {
+    if (index < 0 || index >= self->count) {
+        PyErr_SetString(PyExc_IndexError,
+            "SortedKeyArray index out of range");
+        return NULL;
+    }
+    return PyBytes_FromStringAndSize(
+        (const char* ) self->data + index * self->width, self->width);
+}
+
+static int SortedKeyArray_contains(
+        struct numenc_sorted_array* self, PyObject* key) {
+    Py_buffer view;
+    if (get_key(self, key, & view) != 0) {
+        return -1;
+    }
+    const Py_ssize_t index = search(
+        self, (const unsigned char* ) view.buf, 0);
+    const int found = index < self->count && memcmp(
+        self->data + index * self->width, view.buf,
+        (size_t) self->width) == 0;
+    PyBuffer_Release(& view);
+    return found;
+}
+
+static PyObject* new_iterator(
+        struct numenc_sorted_array* self, Py_ssize_t start, Py_ssize_t stop) {
+    struct numenc_sorted_array_iterator* iterator =
+        (struct numenc_sorted_array_iterator* )
+        SortedKeyArrayIteratorType->tp_alloc(SortedKeyArrayIteratorType, 0);
+    if (iterator == NULL) {
+        return NULL;
+    }
+    Py_INCREF(self);
+    iterator->array = self;
+    iterator->index = start;
+    iterator->stop = stop;
+    iterator->version = self->version;
+    return (PyObject* ) iterator;
+}
+
+static PyObject* SortedKeyArray_iter(struct numenc_sorted_array* self) {
+    return new_iterator(self, 0, self->count);
+}
+
+static PyObject* SortedKeyArray_insert(
+        struct numenc_sorted_array* self, PyObject* key) {
+    Py_buffer view;
+    if (get_key(self, key, & view) != 0) {
+        return NULL;
+    }
+    if (prepare(self, self->count + 1) != 0) {
+        PyBuffer_Release(& view);
+        return NULL;
+    }
+
+    const Py_ssize_t width = self->width;
+    const Py_ssize_t index = search(
+        self, (const unsigned char* ) view.buf, 1);
+    memmove(self->data + (index + 1) * width, self->data + index * width,
+        (size_t)((self->count - index) * width));
+    memcpy(self->data + index * width, view.buf, (size_t) width);
+    self->count++;
+    self->version++;
+    PyBuffer_Release(& view);
+    Py_RETURN_NONE;
+}
+
+static PyObject* SortedKeyArray_insert_many(
+        struct numenc_sorted_array* self, PyObject* keys) {
+    if (self->exports > 0) {
+        return PyErr_Format(PyExc_BufferError,
+            "Existing exports of data: object cannot be re-sized");
+    }
+
+    Py_ssize_t count;
+    unsigned char* batch = sorted_copy(self, keys, & count);
+    if (batch == NULL) {
+        return NULL;
+    }
+    if (count > PY_SSIZE_T_MAX - self->count ||
+            prepare(self, self->count + count) != 0) {
+        PyMem_Free(batch);
+        if (!PyErr_Occurred()) {
+            PyErr_NoMemory();
+        }
+        return NULL;
+    }
+
+    merge_sorted(self, batch, count);
+    self->version++;
+    PyMem_Free(batch);
+    Py_RETURN_NONE;
+}
+
+static PyObject* SortedKeyArray_remove(
+        struct numenc_sorted_array* self, PyObject* key) {
+    Py_buffer view;
+    if (get_key(self, key, & view) != 0) {
+        return NULL;
+    }
+
+    const Py_ssize_t width = self->width;
+    const Py_ssize_t index = search(
+        self, (const unsigned char* ) view.buf, 0);
+    const int found = index < self->count && memcmp(
+        self->data + index * width, view.buf, (size_t) width) == 0;
+    PyBuffer_Release(& view);
+    if (!found) {
+        return PyErr_Format(PyExc_ValueError,
+            "Illegal input: the key is not in the array.");
+    }
+    if (prepare(self, 0) != 0) {
+        return NULL;
+    }
+
+    memmove(self->data + index * width, self->data + (index + 1) * width,
+        (size_t)((self->count - index - 1) * width));
+    self->count--;
+    self->version++;
+    Py_RETURN_NONE;
+}
+
+static PyObject* SortedKeyArray_remove_many(
+        struct numenc_sorted_array* self, PyObject* keys) {
+    if (self->exports > 0) {
+        return PyErr_Format(PyExc_BufferError,
+            "Existing exports of data: object cannot be re-sized");
+    }
+
+    Py_ssize_t count;
+    unsigned char* batch = sorted_copy(self, keys, & count);
+    if (batch == NULL) {
+        return NULL;
+    }
+
+    // every key of the batch removes at most one equal key; the kept keys
+    // are moved in blocks towards the front of the buffer.
+    const Py_ssize_t width = self->width;
+    Py_ssize_t read = 0;
+    Py_ssize_t write = 0;
+    for (Py_ssize_t i = 0; i < count && read < self->count; i++) {
+        const unsigned char* key = batch + i * width;
+        const Py_ssize_t index = read + numenc_search_raw(
+            self->data + read * width, self->count - read, width, key, 0);
+        if (index == self->count ||
+                memcmp(self->data + index * width, key, (size_t) width) != 0) {
+            continue;
+        }
+        memmove(self->data + write * width, self->data + read * width,
+            (size_t)((index - read) * width));
+        write += index - read;
+        read = index + 1;
+    }
+    memmove(self->data + write * width, self->data + read * width,
+        (size_t)((self->count - read) * width));
+    const Py_ssize_t removed = read - write;
+    self->count -= removed;
+    self->version++;
+    PyMem_Free(batch);
+    return PyLong_FromSsize_t(removed);
+}
+
+static PyObject* bisect(
+        struct numenc_sorted_array* self, PyObject* key, int right) {
+    Py_buffer view;
+    if (get_key(self, key, & view) != 0) {
+        return NULL;
+    }
+    const Py_ssize_t index = search(
+        self, (const unsigned char* ) view.buf, right);
+    PyBuffer_Release(& view);
+    return PyLong_FromSsize_t(index);
+}
+
+static PyObject* SortedKeyArray_bisect_left(
+        struct numenc_sorted_array* self, PyObject* key) {
+    return bisect(self, key, 0);
+}
+
+static PyObject* SortedKeyArray_bisect_right(
+        struct numenc_sorted_array* self, PyObject* key) {
+    return bisect(self, key, 1);
+}
+
+// Resolve an optional bound of a range to the index of its first key.
+// Return 0 on success; otherwise set a Python exception and return -1.
+static int resolve_bound(struct numenc_sorted_array* self, PyObject* bound,
+        Py_ssize_t fallback, Py_ssize_t* index) {
+    if (bound == Py_None) {
+        *index = fallback;
+        return 0;
+    }
+    Py_buffer view;
+    if (get_key(self, bound, & view) != 0) {
+        return -1;
+    }
+    *index = search(self, (const unsigned char* ) view.buf, 0);
+    PyBuffer_Release(& view);
+    return 0;
+}
+
+static PyObject* SortedKeyArray_irange(struct numenc_sorted_array* self,
+        PyObject* args, PyObject* kwargs) {
+    static const char* kwlist[] = {"start", "stop", NULL};
+    PyObject* start = Py_None;
+    PyObject* stop = Py_None;
+
+    if (!PyArg_ParseTupleAndKeywords(args, kwargs, "|OO",
+            (char** ) kwlist, & start, & stop)) {
+        return NULL;
+    }
+
+    Py_ssize_t first;
+    Py_ssize_t last;
+    if (resolve_bound(self, start, 0, & first) != 0 ||
+            resolve_bound(self, stop, self->count, & last) != 0) {
+        return NULL;
+    }
+    if (last < first) {
+        last = first;
+    }
+    return new_iterator(self, first, last);
+}
+
+static PyObject* SortedKeyArray_sizeof(
+        struct numenc_sorted_array* self, PyObject* Py_UNUSED(ignored)) {
+    return PyLong_FromSsize_t(
+        Py_TYPE(self)->tp_basicsize + self->capacity * self->width);
+}
+
+static int SortedKeyArray_getbuffer(
+        struct numenc_sorted_array* self, Py_buffer* view, int flags) {
+    static char empty[1] = {0};
+    void* data = (self->data != NULL) ? (void* ) self->data : (void* ) empty;
+    if (PyBuffer_FillInfo(view, (PyObject* ) self, data,
+            self->count * self->width, 1, flags) != 0) {
+        return -1;
+    }
+    self->exports++;
+    return 0;
+}
+
+static void SortedKeyArray_releasebuffer(
+        struct numenc_sorted_array* self, Py_buffer* view) {
+    self->exports--;
+}
+
+static PyMethodDef SortedKeyArrayMethods[] = {
+    {
+        "insert",
+        (PyCFunction) SortedKeyArray_insert,
+        METH_O,
+        "Insert a key after the equal keys"
+    },
+    {
+        "insert_many",
+        (PyCFunction) SortedKeyArray_insert_many,
+        METH_O,
+        "Insert the concatenated keys of a bytes-like object in any order"
+    },
+    {
+        "remove",
+        (PyCFunction) SortedKeyArray_remove,
+        METH_O,
+        "Remove one occurrence of the key; raise a ValueError if there is "
+        "none"
+    },
+    {
+        "remove_many",
+        (PyCFunction) SortedKeyArray_remove_many,
+        METH_O,
+        "Remove one occurrence of each of the concatenated keys of "
+        "a bytes-like object if present and return the number of the "
+        "removed keys"
+    },
+    {
+        "bisect_left",
+        (PyCFunction) SortedKeyArray_bisect_left,
+        METH_O,
+        "Return the index of the first key not less than the given key"
+    },
+    {
+        "bisect_right",
+        (PyCFunction) SortedKeyArray_bisect_right,
+        METH_O,
+        "Return the index of the first key greater than the given key"
+    },
+    {
+        "irange",
+        (PyCFunction)(void(*)(void)) SortedKeyArray_irange,
+        METH_VARARGS | METH_KEYWORDS,
+        "Iterate over the keys in [start, stop); a bound of None is "
+        "unbounded"
+    },
+    {
+        "__sizeof__",
+        (PyCFunction) SortedKeyArray_sizeof,
+        METH_NOARGS,
+        "Size of the array in memory, in bytes"
+    },
+    {
+        NULL,
+        NULL,
+        0,
+        NULL
+    }
+};
+
+static PyMemberDef SortedKeyArrayMembers[] = {
+    {
+        (char* ) "width",
+        T_PYSSIZET,
+        offsetof(struct numenc_sorted_array, width),
+        READONLY,
+        (char* ) "Length of a key in bytes"
+    },
+    {
+        NULL,
+        0,
+        0,
+        0,
+        NULL
+    }
+};
+
+static PyType_Slot SortedKeyArraySlots[] = {
+    {
+        Py_tp_doc,
+        (void* ) "Sorted array of fixed-width keys stored in a single "
+        "contiguous buffer, e.g., SortedKeyArray(8, keys)"
+    },
+    {Py_tp_new, (void* ) SortedKeyArray_new},
+    {Py_tp_dealloc, (void* ) SortedKeyArray_dealloc},
+    {Py_tp_repr, (void* ) SortedKeyArray_repr},
+    {Py_tp_iter, (void* ) SortedKeyArray_iter},
+    {Py_tp_methods, (void* ) SortedKeyArrayMethods},
+    {Py_tp_members, (void* ) SortedKeyArrayMembers},
+    {Py_sq_length, (void* ) SortedKeyArray_length},
+    {Py_sq_item, (void* ) SortedKeyArray_item},
+    {Py_sq_contains, (void* ) SortedKeyArray_contains},
+#if PY_VERSION_HEX >= 0x03090000
+    {Py_bf_getbuffer, (void* ) SortedKeyArray_getbuffer},
+    {Py_bf_releasebuffer, (void* ) SortedKeyArray_releasebuffer},
+#endif
+    {0, NULL}
+};
+
+static PyType_Spec SortedKeyArraySpec = {
+    "numenc.SortedKeyArray",
+    sizeof(struct numenc_sorted_array),
+    0,
+    Py_TPFLAGS_DEFAULT,
+    SortedKeyArraySlots
+};
+
+static void SortedKeyArrayIterator_dealloc(
+        struct numenc_sorted_array_iterator* self) {
+    PyTypeObject* type = Py_TYPE(self);
+    Py_XDECREF(self->array);
+    type->tp_free((PyObject* ) self);
+#if PY_VERSION_HEX >= 0x03080000
+    // instances of heap types hold a reference to their type since 3.8
+    Py_DECREF(type);
+#endif
+}
+
+static PyObject* SortedKeyArrayIterator_next(
+        struct numenc_sorted_array_iterator* self) {
+    struct numenc_sorted_array* array = self->array;
+    if (array->version != self->version) {
+        PyErr_SetString(PyExc_RuntimeError,
+            "The array changed during iteration.");
+        return NULL;
+    }
+    if (self->index >= self->stop) {
+        return NULL;
+    }
+    PyObject* key = PyBytes_FromStringAndSize(
+        (const char* ) array->data + self->index * array->width,
+        array->width);
+    self->index++;
+    return key;
+}
+
+static PyType_Slot SortedKeyArrayIteratorSlots[] = {
+    {Py_tp_dealloc, (void* ) SortedKeyArrayIterator_dealloc},
+    {Py_tp_iter, (void* ) PyObject_SelfIter},
+    {Py_tp_iternext, (void* ) SortedKeyArrayIterator_next},
+    {0, NULL}
+};
+
+static PyType_Spec SortedKeyArrayIteratorSpec = {
+    "numenc.SortedKeyArrayIterator",
+    sizeof(struct numenc_sorted_array_iterator),
+    0,
+    Py_TPFLAGS_DEFAULT,
+    SortedKeyArrayIteratorSlots
+};
+
+int numenc_add_sorted_array_type(PyObject* module) {
+    if (SortedKeyArrayType == NULL) {
+        SortedKeyArrayIteratorType =
+            (PyTypeObject* ) PyType_FromSpec(& SortedKeyArrayIteratorSpec);
+        if (SortedKeyArrayIteratorType == NULL) {
+            return -1;
+        }
+        SortedKeyArrayType =
+            (PyTypeObject* ) PyType_FromSpec(& SortedKeyArraySpec);
+        if (SortedKeyArrayType == NULL) {
+            return -1;
+        }
+#if PY_VERSION_HEX < 0x03090000
+        // the buffer slots of a type spec are only available since 3.9
+        PyBufferProcs* as_buffer =
+            & ((PyHeapTypeObject* ) SortedKeyArrayType)->as_buffer;
+        as_buffer->bf_getbuffer = (getbufferproc) SortedKeyArray_getbuffer;
+        as_buffer->bf_releasebuffer =
+            (releasebufferproc) SortedKeyArray_releasebuffer;
+        SortedKeyArrayType->tp_as_buffer = as_buffer;
+#endif
+    }
+
+    Py_INCREF(SortedKeyArrayType);
+    if (PyModule_AddObject(module, "SortedKeyArray",
+            (PyObject* ) SortedKeyArrayType) != 0) {
+        Py_DECREF(SortedKeyArrayType);
+        return -1;
+    }
+    return 0;
+}
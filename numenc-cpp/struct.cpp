@@ -0,0 +1,1321 @@
+#include "numenc.h"
+
+#include <structmember.h>
+
+enum numenc_field_kind {
+    // a number of a fixed width converted by a codec
+    NUMENC_FIELD_FIXED = 0,
+
+    // an escaped and terminated byte string
+    NUMENC_FIELD_BYTES,
+
+    // an escaped and terminated UTF-8 string
+    NUMENC_FIELD_STR
+};
+
+// A field of a composite key.
+struct numenc_field {
+    int kind;
+    int descending;
+
+    // codec of a fixed-width field, NULL otherwise
+    const struct numenc_codec* codec;
+
+    // offset of the field in the key if all the fields have a fixed width
+    Py_ssize_t offset;
+};
+
+struct numenc_struct {
+    PyObject_HEAD
+
+    // normalized format, e.g., "uint32,str,int64 desc"
+    PyObject* format;
+
+    // length of a key in bytes, or -1 if there are variable-length fields
+    Py_ssize_t size;
+
+    // total width of the fixed-width fields
+    Py_ssize_t fixed_size;
+
+    Py_ssize_t field_count;
+    struct numenc_field* fields;
+};
+
+// Keys up to this size are packed into a buffer on the stack before they
+// are copied into the output.
+#define NUMENC_STRUCT_STACK_SIZE 256
+
+// Variable-length fields are encoded similarly to the tuple layer of
+// FoundationDB: every 0x00 byte of the value is escaped as 0x00 0xff and
+// the value is terminated by 0x00 0x01 so that a value sorts before all
+// the values it prefixes. We use a two-byte terminator instead of a single
+// 0x00 so that the order is still kept when a descending field is
+// complemented.
+#define NUMENC_SEGMENT_ESCAPE 0x00
+#define NUMENC_SEGMENT_ESCAPED_ZERO 0xff
+#define NUMENC_SEGMENT_TERMINATOR 0x01
+
+static int is_space(char c) {
+    return c == ' ' || c == '\t' || c == '\n' || c == '\r';
+}
+
+static int token_equals(const char* start, const char* end, const char* word) {
+    size_t length = strlen(word);
+    return (size_t)(end - start) == length &&
+        strncmp(start, word, length) == 0;
+}
+
+// Parse a single field between start and end, e.g., "int64 desc".
+// Return the normalized name of the field on success; otherwise set
+// a Python exception and return NULL.
+static PyObject* parse_field(struct numenc_field* field, Py_ssize_t index,
+        const char* start, const char* end, const char* format) {
+    // the type can be followed by the order, e.g., "int64 desc"
+    const char* type_end = start;
+    while (type_end < end && !is_space(*type_end)) {
+        type_end++;
+    }
+    const char* order = type_end;
+    while (order < end && is_space(*order)) {
+        order++;
+    }
+
+    field->descending = 0;
+    if (order < end) {
+        if (token_equals(order, end, "desc")) {
+            field->descending = 1;
+        } else if (!token_equals(order, end, "asc")) {
+            return PyErr_Format(PyExc_ValueError,
+                "Illegal format: expected the order 'asc' or 'desc' "
+                "after the type of the field %zd in '%s'.", index, format);
+        }
+    }
+
+    field->codec = NULL;
+    field->offset = 0;
+    const char* name = NULL;
+    if (token_equals(start, type_end, "bytes")) {
+        field->kind = NUMENC_FIELD_BYTES;
+        name = "bytes";
+    } else if (token_equals(start, type_end, "str")) {
+        field->kind = NUMENC_FIELD_STR;
+        name = "str";
+    } else {
+        for (int i = 0; i < NUMENC_TYPE_COUNT; i++) {
+            if (token_equals(start, type_end, NUMENC_CODECS[i].name)) {
+                // descending fields complement their bytes as they are
+                // written, so the key is packed in a single pass.
+                field->kind = NUMENC_FIELD_FIXED;
+                field->codec = field->descending ?
+                    & NUMENC_DESC_CODECS[i] : & NUMENC_CODECS[i];
+                name = NUMENC_CODECS[i].name;
+                break;
+            }
+        }
+    }
+
+    if (name == NULL) {
+        PyObject* type_name = PyUnicode_FromStringAndSize(
+            start, type_end - start);
+        if (type_name != NULL) {
+            PyErr_Format(PyExc_ValueError,
+                "Unsupported type: %U. The supported types are: int8, "
+                "uint8, int16, uint16, int32, uint32, int64, uint64, "
+                "float32, float64, bytes, str.", type_name);
+            Py_DECREF(type_name);
+        }
+        return NULL;
+    }
+
+    return field->descending ?
+        PyUnicode_FromFormat("%s desc", name) : PyUnicode_FromString(name);
+}
+
+// Parse the comma-separated fields and resolve their codecs.
+// Return 0 on success; otherwise set a Python exception and return -1.
+static int parse_format(struct numenc_struct* self, const char* format) {
+    Py_ssize_t field_count = 1;
+    for (const char* c = format; *c != '\0'; c++) {
+        if (*c == ',') {
+            field_count++;
+        }
+    }
+
+    self->fields = PyMem_New(struct numenc_field, field_count);
+    if (self->fields == NULL) {
+        PyErr_NoMemory();
+        return -1;
+    }
+    self->field_count = 0;
+    self->fixed_size = 0;
+
+    PyObject* names = PyList_New(0);
+    if (names == NULL) {
+        return -1;
+    }
+
+    int variable = 0;
+    const char* start = format;
+    for (Py_ssize_t i = 0; i < field_count; i++) {
+        const char* end = start;
+        while (*end != ',' && *end != '\0') {
+            end++;
+        }
+        const char* next = (*end == ',') ? end + 1 : end;
+
+        while (start < end && is_space(*start)) {
+            start++;
+        }
+        while (end > start && is_space(end[-1])) {
+            end--;
+        }
+
+        if (start == end) {
+            Py_DECREF(names);
+            PyErr_Format(PyExc_ValueError,
+                "Illegal format: expected comma-separated types, "
+                "got an empty field at index %zd in '%s'.", i, format);
+            return -1;
+        }
+
+        struct numenc_field* field = & self->fields[i];
+        PyObject* name = parse_field(field, i, start, end, format);
+        if (name == NULL || PyList_Append(names, name) != 0) {
+            Py_XDECREF(name);
+            Py_DECREF(names);
+            return -1;
+        }
+        Py_DECREF(name);
+
+        if (field->kind == NUMENC_FIELD_FIXED) {
+            field->offset = self->fixed_size;
+            self->fixed_size += field->codec->width;
+        } else {
+            variable = 1;
+        }
+        self->field_count++;
+
+        start = next;
+    }
+    self->size = variable ? -1 : self->fixed_size;
+
+    PyObject* separator = PyUnicode_FromString(",");
+    if (separator == NULL) {
+        Py_DECREF(names);
+        return -1;
+    }
+    self->format = PyUnicode_Join(separator, names);
+    Py_DECREF(separator);
+    Py_DECREF(names);
+    return self->format == NULL ? -1 : 0;
+}
+
+static PyObject* Struct_new(
+        PyTypeObject* type, PyObject* args, PyObject* kwargs) {
+    static const char* kwlist[] = {"format", NULL};
+    const char* format;
+
+    if (!PyArg_ParseTupleAndKeywords(args, kwargs, "s:Struct",
+            (char** ) kwlist, & format)) {
+        return NULL;
+    }
+
+    struct numenc_struct* self =
+        (struct numenc_struct* ) type->tp_alloc(type, 0);
+    if (self == NULL) {
+        return NULL;
+    }
+
+    if (parse_format(self, format) != 0) {
+        Py_DECREF(self);
+        return NULL;
+    }
+    return (PyObject* ) self;
+}
+
+static void Struct_dealloc(struct numenc_struct* self) {
+    PyTypeObject* type = Py_TYPE(self);
+    Py_XDECREF(self->format);
+    PyMem_Free(self->fields);
+    type->tp_free((PyObject* ) self);
+#if PY_VERSION_HEX >= 0x03080000
+    // instances of heap types hold a reference to their type since 3.8
+    Py_DECREF(type);
+#endif
+}
+
+static PyObject* Struct_repr(struct numenc_struct* self) {
+    return PyUnicode_FromFormat("numenc.Struct(%R)", self->format);
+}
+
+static PyObject* Struct_get_size(struct numenc_struct* self, void* closure) {
+    if (self->size < 0) {
+        Py_RETURN_NONE;
+    }
+    return PyLong_FromSsize_t(self->size);
+}
+
+// The raw bytes of the value of a variable-length field.
+struct segment {
+    const char* data;
+    Py_ssize_t length;
+    Py_buffer view;
+    int has_view;
+};
+
+// Acquire the raw bytes of the value of a variable-length field.
+// Return 0 on success; otherwise set a Python exception and return -1.
+static int get_segment(const struct numenc_field* field, PyObject* value,
+        struct segment* segment) {
+    segment->has_view = 0;
+    if (field->kind == NUMENC_FIELD_STR) {
+        if (!PyUnicode_Check(value)) {
+            PyErr_SetString(PyExc_TypeError, "Wrong input: expected str.");
+            return -1;
+        }
+        segment->data = PyUnicode_AsUTF8AndSize(value, & segment->length);
+        if (segment->data == NULL) {
+            PyErr_Clear();
+            PyErr_SetString(PyExc_ValueError,
+                "Illegal input: expected str encodable as UTF-8.");
+            return -1;
+        }
+        return 0;
+    }
+
+    if (PyBytes_Check(value)) {
+        segment->data = PyBytes_AS_STRING(value);
+        segment->length = PyBytes_GET_SIZE(value);
+        return 0;
+    }
+    if (numenc_get_buffer(value, & segment->view) != 0) {
+        return -1;
+    }
+    segment->has_view = 1;
+    segment->data = (const char* ) segment->view.buf;
+    segment->length = segment->view.len;
+    return 0;
+}
+
+static void release_segment(struct segment* segment) {
+    if (segment->has_view) {
+        PyBuffer_Release(& segment->view);
+    }
+}
+
+// Return the length of the escaped and terminated segment.
+static Py_ssize_t segment_size(const struct segment* segment) {
+    Py_ssize_t size = segment->length + 2;
+    const char* data = segment->data;
+    const char* end = data + segment->length;
+    while (data < end &&
+            (data = (const char* ) memchr(data, 0, end - data)) != NULL) {
+        size++;
+        data++;
+    }
+    return size;
+}
+
+// Write the escaped and terminated segment to out and return the number
+// of written bytes.
+static Py_ssize_t write_segment(const struct segment* segment,
+        int descending, unsigned char* out) {
+    const char* data = segment->data;
+    const char* end = data + segment->length;
+    Py_ssize_t position = 0;
+
+    while (data < end) {
+        const char* zero = (const char* ) memchr(data, 0, end - data);
+        const char* stop = (zero == NULL) ? end : zero;
+        memcpy(out + position, data, stop - data);
+        position += stop - data;
+        if (zero == NULL) {
+            break;
+        }
+        out[position++] = NUMENC_SEGMENT_ESCAPE;
+        out[position++] = NUMENC_SEGMENT_ESCAPED_ZERO;
+        data = zero + 1;
+    }
+    out[position++] = NUMENC_SEGMENT_ESCAPE;
+    out[position++] = NUMENC_SEGMENT_TERMINATOR;
+
+    if (descending) {
+        numenc_complement(out, out, position);
+    }
+    return position;
+}
+
+// Find the end of the segment at in and set length to the length of
+// its unescaped value. Return the length of the segment including its
+// terminator on success; otherwise set a ValueError and return -1.
+static Py_ssize_t scan_segment(const unsigned char* in,
+        Py_ssize_t available, int descending, Py_ssize_t* length) {
+    const unsigned char mask = descending ? 0xff : 0x00;
+    const unsigned char escape = NUMENC_SEGMENT_ESCAPE ^ mask;
+
+    Py_ssize_t position = 0;
+    *length = 0;
+    while (1) {
+        const unsigned char* found = (const unsigned char* ) memchr(
+            in + position, escape, available - position);
+        if (found == NULL || found - in + 1 >= available) {
+            PyErr_SetString(PyExc_ValueError,
+                "Illegal input: unterminated variable-length field.");
+            return -1;
+        }
+
+        *length += found - in - position;
+        const unsigned char next = found[1] ^ mask;
+        position = found - in + 2;
+        if (next == NUMENC_SEGMENT_TERMINATOR) {
+            return position;
+        }
+        if (next != NUMENC_SEGMENT_ESCAPED_ZERO) {
+            PyErr_SetString(PyExc_ValueError,
+                "Illegal input: invalid escape sequence in "
+                "a variable-length field.");
+            return -1;
+        }
+        (*length)++;
+    }
+}
+
+// Write the unescaped value of the segment of the given size to out.
+static void unescape_segment(const unsigned char* in, Py_ssize_t size,
+        int descending, unsigned char* out) {
+    const unsigned char mask = descending ? 0xff : 0x00;
+    const unsigned char escape = NUMENC_SEGMENT_ESCAPE ^ mask;
+    const Py_ssize_t end = size - 2;
+
+    Py_ssize_t position = 0;
+    Py_ssize_t written = 0;
+    while (position < end) {
+        if (in[position] == escape) {
+            out[written++] = 0x00;
+            position += 2;
+        } else {
+            out[written++] = in[position++] ^ mask;
+        }
+    }
+}
+
+// Decode the variable-length field at in and set size to the number of
+// bytes it spans. Return a new bytes or str object on success; otherwise
+// set a Python exception and return NULL.
+static PyObject* decode_segment(const struct numenc_field* field,
+        const unsigned char* in, Py_ssize_t available, Py_ssize_t* size) {
+    Py_ssize_t length;
+    *size = scan_segment(in, available, field->descending, & length);
+    if (*size < 0) {
+        return NULL;
+    }
+
+    if (field->kind == NUMENC_FIELD_BYTES) {
+        PyObject* output = PyBytes_FromStringAndSize(NULL, length);
+        if (output != NULL) {
+            unescape_segment(in, *size, field->descending,
+                (unsigned char* ) PyBytes_AS_STRING(output));
+        }
+        return output;
+    }
+
+    PyObject* output;
+    if (!field->descending && length == *size - 2) {
+        // an ascending value without escapes can be decoded in place
+        output = PyUnicode_DecodeUTF8((const char* ) in, length, "strict");
+    } else {
+        unsigned char* buffer = (unsigned char* ) PyMem_Malloc(
+            length > 0 ? length : 1);
+        if (buffer == NULL) {
+            return PyErr_NoMemory();
+        }
+        unescape_segment(in, *size, field->descending, buffer);
+        output = PyUnicode_DecodeUTF8(
+            (const char* ) buffer, length, "strict");
+        PyMem_Free(buffer);
+    }
+
+    if (output == NULL && PyErr_ExceptionMatches(PyExc_UnicodeDecodeError)) {
+        PyErr_Clear();
+        PyErr_SetString(PyExc_ValueError,
+            "Illegal input: invalid UTF-8 in a str field.");
+    }
+    return output;
+}
+
+static int check_value_count(
+        const struct numenc_struct* self, Py_ssize_t count) {
+    if (count != self->field_count) {
+        PyErr_Format(PyExc_ValueError,
+            "Illegal input: expected %zd values, got %zd.",
+            self->field_count, count);
+        return -1;
+    }
+    return 0;
+}
+
+// Return the length of the key of the values on success; otherwise set
+// a Python exception and return -1.
+static Py_ssize_t key_size(const struct numenc_struct* self,
+        PyObject* const* values) {
+    if (self->size >= 0) {
+        return self->size;
+    }
+
+    Py_ssize_t size = self->fixed_size;
+    for (Py_ssize_t i = 0; i < self->field_count; i++) {
+        const struct numenc_field* field = & self->fields[i];
+        if (field->kind == NUMENC_FIELD_FIXED) {
+            continue;
+        }
+
+        struct segment segment;
+        if (get_segment(field, values[i], & segment) != 0) {
+            numenc_annotate_field(i);
+            return -1;
+        }
+        size += segment_size(& segment);
+        release_segment(& segment);
+    }
+    return size;
+}
+
+// Encode the values of the fields as a key to out which holds capacity
+// bytes. Return the length of the key on success; otherwise set a Python
+// exception and return -1.
+static Py_ssize_t encode_key(const struct numenc_struct* self,
+        PyObject* const* values, unsigned char* out, Py_ssize_t capacity) {
+    Py_ssize_t position = 0;
+    for (Py_ssize_t i = 0; i < self->field_count; i++) {
+        const struct numenc_field* field = & self->fields[i];
+
+        if (field->kind == NUMENC_FIELD_FIXED) {
+            if (field->codec->encode(values[i], out + position) != 0) {
+                numenc_annotate_field(i);
+                return -1;
+            }
+            position += field->codec->width;
+            continue;
+        }
+
+        struct segment segment;
+        if (get_segment(field, values[i], & segment) != 0) {
+            numenc_annotate_field(i);
+            return -1;
+        }
+
+        // converting the numbers might run arbitrary code which could
+        // have resized a mutable value (e.g., a bytearray) since the key
+        // was measured.
+        if (segment_size(& segment) > capacity - position) {
+            release_segment(& segment);
+            PyErr_SetString(PyExc_RuntimeError,
+                "The input changed size during packing.");
+            return -1;
+        }
+        position += write_segment(
+            & segment, field->descending, out + position);
+        release_segment(& segment);
+    }
+    return position;
+}
+
+// Encode the values as a key into a new bytes object.
+static PyObject* pack_key(const struct numenc_struct* self,
+        PyObject* const* values, Py_ssize_t count) {
+    if (check_value_count(self, count) != 0) {
+        return NULL;
+    }
+
+    Py_ssize_t size = key_size(self, values);
+    if (size < 0) {
+        return NULL;
+    }
+
+    PyObject* output = PyBytes_FromStringAndSize(NULL, size);
+    if (output == NULL) {
+        return NULL;
+    }
+
+    Py_ssize_t written = encode_key(self, values,
+        (unsigned char* ) PyBytes_AS_STRING(output), size);
+    if (written != size) {
+        if (written >= 0) {
+            PyErr_SetString(PyExc_RuntimeError,
+                "The input changed size during packing.");
+        }
+        Py_DECREF(output);
+        return NULL;
+    }
+    return output;
+}
+
+// Return the values of a row as a new tuple.
+static PyObject* row_values(PyObject* row) {
+    if (PyTuple_CheckExact(row)) {
+        Py_INCREF(row);
+        return row;
+    }
+
+    // we copy other sequences into a tuple since the conversion of
+    // the values might run arbitrary code which could mutate them.
+    PyObject* values = PySequence_Tuple(row);
+    if (values == NULL) {
+        PyErr_Clear();
+        PyErr_SetString(PyExc_TypeError,
+            "Wrong input: expected a sequence of values.");
+    }
+    return values;
+}
+
+// Decode the first field_count fields of the key at in and set consumed
+// to the number of decoded bytes. Return a new tuple on success;
+// otherwise set a Python exception and return NULL.
+static PyObject* decode_key(const struct numenc_struct* self,
+        const unsigned char* in, Py_ssize_t available,
+        Py_ssize_t field_count, Py_ssize_t* consumed) {
+    PyObject* output = PyTuple_New(field_count);
+    if (output == NULL) {
+        return NULL;
+    }
+
+    Py_ssize_t position = 0;
+    for (Py_ssize_t i = 0; i < field_count; i++) {
+        const struct numenc_field* field = & self->fields[i];
+        PyObject* item;
+
+        if (field->kind == NUMENC_FIELD_FIXED) {
+            const Py_ssize_t width = field->codec->width;
+            if (available - position < width) {
+                item = PyErr_Format(PyExc_ValueError,
+                    "Illegal input: expected %zd more bytes, got %zd.",
+                    width, available - position);
+            } else {
+                item = field->codec->decode(in + position);
+                position += width;
+            }
+        } else {
+            Py_ssize_t size;
+            item = decode_segment(
+                field, in + position, available - position, & size);
+            position += size;
+        }
+
+        if (item == NULL) {
+            numenc_annotate_field(i);
+            Py_DECREF(output);
+            return NULL;
+        }
+        PyTuple_SET_ITEM(output, i, item);
+    }
+
+    *consumed = position;
+    return output;
+}
+
+// Decode the key of a fixed-width schema at in.
+static PyObject* decode_fixed_key(const struct numenc_struct* self,
+        const unsigned char* in) {
+    PyObject* output = PyTuple_New(self->field_count);
+    if (output == NULL) {
+        return NULL;
+    }
+
+    for (Py_ssize_t i = 0; i < self->field_count; i++) {
+        const struct numenc_field* field = & self->fields[i];
+        PyObject* item = field->codec->decode(in + field->offset);
+        if (item == NULL) {
+            Py_DECREF(output);
+            return NULL;
+        }
+        PyTuple_SET_ITEM(output, i, item);
+    }
+    return output;
+}
+
+static PyObject* Struct_pack(struct numenc_struct* self,
+        PyObject* const* args, Py_ssize_t nargs) {
+    return pack_key(self, args, nargs);
+}
+
+static PyObject* Struct_unpack(struct numenc_struct* self, PyObject* key) {
+    Py_buffer view;
+    if (numenc_get_buffer(key, & view) != 0) {
+        return NULL;
+    }
+
+    const unsigned char* in = (const unsigned char* ) view.buf;
+    PyObject* output;
+    if (self->size >= 0) {
+        if (view.len != self->size) {
+            PyErr_Format(PyExc_ValueError,
+                "Illegal input: expected bytes of length %zd, got %zd.",
+                self->size, view.len);
+            PyBuffer_Release(& view);
+            return NULL;
+        }
+        output = decode_fixed_key(self, in);
+    } else {
+        Py_ssize_t consumed;
+        output = decode_key(
+            self, in, view.len, self->field_count, & consumed);
+        if (output != NULL && consumed != view.len) {
+            PyErr_Format(PyExc_ValueError,
+                "Illegal input: expected bytes of length %zd, got %zd.",
+                consumed, view.len);
+            Py_CLEAR(output);
+        }
+    }
+
+    PyBuffer_Release(& view);
+    return output;
+}
+
+static PyObject* Struct_pack_into(struct numenc_struct* self,
+        PyObject* const* args, Py_ssize_t nargs) {
+    if (nargs < 2) {
+        return PyErr_Format(PyExc_TypeError,
+            "pack_into() takes at least 2 arguments (%zd given)", nargs);
+    }
+
+    Py_ssize_t offset = PyNumber_AsSsize_t(args[1], PyExc_OverflowError);
+    if (offset == -1 && PyErr_Occurred()) {
+        return NULL;
+    }
+
+    PyObject* const* values = args + 2;
+    if (check_value_count(self, nargs - 2) != 0) {
+        return NULL;
+    }
+    Py_ssize_t size = key_size(self, values);
+    if (size < 0) {
+        return NULL;
+    }
+
+    // we pack the key aside first so that the buffer is left untouched
+    // if any of the values is invalid.
+    unsigned char stack[NUMENC_STRUCT_STACK_SIZE];
+    unsigned char* key = stack;
+    if (size > NUMENC_STRUCT_STACK_SIZE) {
+        key = (unsigned char* ) PyMem_Malloc(size);
+        if (key == NULL) {
+            return PyErr_NoMemory();
+        }
+    }
+
+    PyObject* output = NULL;
+    Py_ssize_t written = encode_key(self, values, key, size);
+    if (written >= 0 && written != size) {
+        PyErr_SetString(PyExc_RuntimeError,
+            "The input changed size during packing.");
+    } else if (written == size) {
+        Py_buffer view;
+        if (numenc_get_writable_buffer(args[0], & view) == 0) {
+            offset = numenc_resolve_offset(offset, size, view.len);
+            if (offset >= 0) {
+                memcpy((unsigned char* ) view.buf + offset, key, size);
+                Py_INCREF(Py_None);
+                output = Py_None;
+            }
+            PyBuffer_Release(& view);
+        }
+    }
+
+    if (key != stack) {
+        PyMem_Free(key);
+    }
+    return output;
+}
+
+static PyObject* Struct_unpack_from(struct numenc_struct* self,
+        PyObject* const* args, Py_ssize_t nargs) {
+    if (nargs < 1 || nargs > 2) {
+        return PyErr_Format(PyExc_TypeError,
+            "unpack_from() takes 1 or 2 arguments (%zd given)", nargs);
+    }
+
+    Py_ssize_t offset;
+    if (numenc_parse_offset(args, nargs, 1, & offset) != 0) {
+        return NULL;
+    }
+
+    Py_buffer view;
+    if (numenc_get_buffer(args[0], & view) != 0) {
+        return NULL;
+    }
+
+    // the length of a variable key is only known once it has been read
+    offset = numenc_resolve_offset(
+        offset, self->size >= 0 ? self->size : 0, view.len);
+    if (offset < 0) {
+        PyBuffer_Release(& view);
+        return NULL;
+    }
+
+    const unsigned char* in = (const unsigned char* ) view.buf + offset;
+    PyObject* output;
+    if (self->size >= 0) {
+        output = decode_fixed_key(self, in);
+    } else {
+        Py_ssize_t consumed;
+        output = decode_key(self, in, view.len - offset, self->field_count,
+            & consumed);
+    }
+    PyBuffer_Release(& view);
+    return output;
+}
+
+static PyObject* Struct_unpack_prefix(struct numenc_struct* self,
+        PyObject* args, PyObject* kwargs) {
+    static const char* kwlist[] = {"buffer", "fields", "offset", NULL};
+    PyObject* buffer;
+    PyObject* fields = Py_None;
+    Py_ssize_t offset = 0;
+
+    if (!PyArg_ParseTupleAndKeywords(args, kwargs, "O|On:unpack_prefix",
+            (char** ) kwlist, & buffer, & fields, & offset)) {
+        return NULL;
+    }
+
+    Py_ssize_t field_count = self->field_count;
+    if (fields != Py_None) {
+        field_count = PyNumber_AsSsize_t(fields, PyExc_OverflowError);
+        if (field_count == -1 && PyErr_Occurred()) {
+            return NULL;
+        }
+        if (field_count < 0 || field_count > self->field_count) {
+            return PyErr_Format(PyExc_ValueError,
+                "Illegal input: expected the number of fields "
+                "in [0, %zd], got %zd.", self->field_count, field_count);
+        }
+    }
+
+    Py_buffer view;
+    if (numenc_get_buffer(buffer, & view) != 0) {
+        return NULL;
+    }
+
+    offset = numenc_resolve_offset(offset, 0, view.len);
+    if (offset < 0) {
+        PyBuffer_Release(& view);
+        return NULL;
+    }
+
+    Py_ssize_t consumed;
+    PyObject* values = decode_key(self,
+        (const unsigned char* ) view.buf + offset, view.len - offset,
+        field_count, & consumed);
+    PyBuffer_Release(& view);
+    if (values == NULL) {
+        return NULL;
+    }
+    return Py_BuildValue("(Nn)", values, offset + consumed);
+}
+
+// A bytes object to which the packed keys are appended.
+struct key_writer {
+    PyObject* output;
+    Py_ssize_t length;
+    Py_ssize_t capacity;
+};
+
+static int writer_init(struct key_writer* writer, Py_ssize_t count,
+        Py_ssize_t key_size) {
+    if (count > PY_SSIZE_T_MAX / key_size) {
+        PyErr_NoMemory();
+        return -1;
+    }
+    writer->length = 0;
+    writer->capacity = count * key_size;
+    writer->output = PyBytes_FromStringAndSize(NULL, writer->capacity);
+    return writer->output == NULL ? -1 : 0;
+}
+
+// Make room for size more bytes and return a pointer to them.
+// Return NULL with a Python exception set on failure.
+static unsigned char* writer_reserve(struct key_writer* writer,
+        Py_ssize_t size) {
+    if (writer->capacity - writer->length < size) {
+        Py_ssize_t capacity = writer->capacity;
+        while (capacity - writer->length < size) {
+            if (capacity > PY_SSIZE_T_MAX / 2) {
+                PyErr_NoMemory();
+                return NULL;
+            }
+            capacity = (capacity < 64) ? 64 : capacity * 2;
+        }
+        if (_PyBytes_Resize(& writer->output, capacity) != 0) {
+            return NULL;
+        }
+        writer->capacity = capacity;
+    }
+    return (unsigned char* ) PyBytes_AS_STRING(writer->output) +
+        writer->length;
+}
+
+// Append the key of the values.
+// Return 0 on success; otherwise set a Python exception and return -1.
+static int writer_append(struct key_writer* writer,
+        const struct numenc_struct* self, PyObject* const* values,
+        Py_ssize_t count) {
+    if (check_value_count(self, count) != 0) {
+        return -1;
+    }
+    Py_ssize_t size = key_size(self, values);
+    if (size < 0) {
+        return -1;
+    }
+    unsigned char* out = writer_reserve(writer, size);
+    if (out == NULL) {
+        return -1;
+    }
+    Py_ssize_t written = encode_key(self, values, out, size);
+    if (written < 0) {
+        return -1;
+    }
+    writer->length += written;
+    return 0;
+}
+
+// Shrink the output to the appended keys and return it.
+static PyObject* writer_finish(struct key_writer* writer) {
+    if (writer->length != writer->capacity &&
+            _PyBytes_Resize(& writer->output, writer->length) != 0) {
+        return NULL;
+    }
+    return writer->output;
+}
+
+// Return the expected length of a key to preallocate the output.
+static Py_ssize_t expected_key_size(const struct numenc_struct* self) {
+    if (self->size >= 0) {
+        return self->size > 0 ? self->size : 1;
+    }
+    // we assume short values of the variable-length fields
+    return self->fixed_size + 16;
+}
+
+// Pack the rows of a list or a tuple into consecutive keys.
+static PyObject* pack_rows(struct numenc_struct* self, PyObject* rows) {
+    const Py_ssize_t count = PySequence_Fast_GET_SIZE(rows);
+
+    struct key_writer writer;
+    if (writer_init(& writer, count, expected_key_size(self)) != 0) {
+        return NULL;
+    }
+
+    for (Py_ssize_t i = 0; i < count; i++) {
+        // packing a row might run arbitrary code which could in turn
+        // mutate the list, so we re-check its size every time.
+        if (PySequence_Fast_GET_SIZE(rows) != count) {
+            Py_DECREF(writer.output);
+            PyErr_SetString(PyExc_RuntimeError,
+                "The input changed size during iteration.");
+            return NULL;
+        }
+        PyObject* values = row_values(PySequence_Fast_GET_ITEM(rows, i));
+        int result = -1;
+        if (values != NULL) {
+            result = writer_append(& writer, self,
+                & PyTuple_GET_ITEM(values, 0), PyTuple_GET_SIZE(values));
+            Py_DECREF(values);
+        }
+        if (result != 0) {
+            numenc_annotate_index(i);
+            Py_DECREF(writer.output);
+            return NULL;
+        }
+    }
+    return writer_finish(& writer);
+}
+
+// Pack the columns of a fixed-width schema column by column so that
+// the inner loop always calls the same codec.
+static PyObject* pack_fixed_columns(struct numenc_struct* self,
+        PyObject* tuples, Py_ssize_t count) {
+    if (self->size > 0 && count > PY_SSIZE_T_MAX / self->size) {
+        return PyErr_NoMemory();
+    }
+
+    PyObject* output = PyBytes_FromStringAndSize(NULL, count * self->size);
+    if (output == NULL) {
+        return NULL;
+    }
+    unsigned char* out = (unsigned char* ) PyBytes_AS_STRING(output);
+
+    for (Py_ssize_t j = 0; j < self->field_count; j++) {
+        const struct numenc_field* field = & self->fields[j];
+        PyObject* column = PyTuple_GET_ITEM(tuples, j);
+
+        for (Py_ssize_t i = 0; i < count; i++) {
+            if (field->codec->encode(PyTuple_GET_ITEM(column, i),
+                    out + i * self->size + field->offset) != 0) {
+                numenc_annotate_field(j);
+                numenc_annotate_index(i);
+                Py_DECREF(output);
+                return NULL;
+            }
+        }
+    }
+    return output;
+}
+
+// Pack the columns of a schema with variable-length fields row by row
+// since the offsets of the fields differ from key to key.
+static PyObject* pack_variable_columns(struct numenc_struct* self,
+        PyObject* tuples, Py_ssize_t count) {
+    PyObject** values = PyMem_New(PyObject*, self->field_count);
+    if (values == NULL) {
+        return PyErr_NoMemory();
+    }
+
+    struct key_writer writer;
+    if (writer_init(& writer, count, expected_key_size(self)) != 0) {
+        PyMem_Free(values);
+        return NULL;
+    }
+
+    for (Py_ssize_t i = 0; i < count; i++) {
+        for (Py_ssize_t j = 0; j < self->field_count; j++) {
+            values[j] = PyTuple_GET_ITEM(PyTuple_GET_ITEM(tuples, j), i);
+        }
+        if (writer_append(& writer, self, values, self->field_count) != 0) {
+            numenc_annotate_index(i);
+            Py_DECREF(writer.output);
+            PyMem_Free(values);
+            return NULL;
+        }
+    }
+
+    PyMem_Free(values);
+    return writer_finish(& writer);
+}
+
+// Pack the columns, one sequence of values per field, into consecutive
+// keys. The columns are expected as a tuple.
+static PyObject* pack_columns(struct numenc_struct* self, PyObject* columns) {
+    if (PyTuple_GET_SIZE(columns) != self->field_count) {
+        return PyErr_Format(PyExc_ValueError,
+            "Illegal input: expected %zd columns, got %zd.",
+            self->field_count, PyTuple_GET_SIZE(columns));
+    }
+
+    // we copy the columns into tuples since the conversion of the values
+    // might run arbitrary code which could mutate them.
+    PyObject* tuples = PyTuple_New(self->field_count);
+    if (tuples == NULL) {
+        return NULL;
+    }
+
+    Py_ssize_t count = 0;
+    for (Py_ssize_t j = 0; j < self->field_count; j++) {
+        PyObject* column = PySequence_Tuple(PyTuple_GET_ITEM(columns, j));
+        if (column == NULL) {
+            PyErr_Clear();
+            Py_DECREF(tuples);
+            return PyErr_Format(PyExc_TypeError,
+                "Wrong input: expected the column %zd to be an iterable "
+                "of values.", j);
+        }
+        PyTuple_SET_ITEM(tuples, j, column);
+
+        if (j == 0) {
+            count = PyTuple_GET_SIZE(column);
+        } else if (PyTuple_GET_SIZE(column) != count) {
+            Py_DECREF(tuples);
+            return PyErr_Format(PyExc_ValueError,
+                "Illegal input: expected columns of equal length, "
+                "got %zd values in the column 0 and %zd in the column %zd.",
+                count, PyTuple_GET_SIZE(column), j);
+        }
+    }
+
+    PyObject* output = (self->size >= 0) ?
+        pack_fixed_columns(self, tuples, count) :
+        pack_variable_columns(self, tuples, count);
+    Py_DECREF(tuples);
+    return output;
+}
+
+static PyObject* Struct_pack_many(struct numenc_struct* self,
+        PyObject* args, PyObject* kwargs) {
+    static const char* kwlist[] = {"values", "columns", NULL};
+    PyObject* values;
+    int columns = 0;
+
+    if (!PyArg_ParseTupleAndKeywords(args, kwargs, "O|p:pack_many",
+            (char** ) kwlist, & values, & columns)) {
+        return NULL;
+    }
+
+    if (columns) {
+        PyObject* tuple = PySequence_Tuple(values);
+        if (tuple == NULL) {
+            PyErr_Clear();
+            return PyErr_Format(PyExc_TypeError,
+                "Wrong input: expected an iterable of columns.");
+        }
+        PyObject* output = pack_columns(self, tuple);
+        Py_DECREF(tuple);
+        return output;
+    }
+
+    PyObject* rows = PySequence_Fast(values,
+        "Wrong input: expected an iterable of rows.");
+    if (rows == NULL) {
+        return NULL;
+    }
+    PyObject* output = pack_rows(self, rows);
+    Py_DECREF(rows);
+    return output;
+}
+
+// Unpack the consecutive keys of a fixed-width schema.
+static PyObject* unpack_fixed_many(struct numenc_struct* self,
+        const Py_buffer* view, int columns) {
+    if (view->len % self->size != 0) {
+        return PyErr_Format(PyExc_ValueError,
+            "Illegal input: expected a buffer whose length is a multiple "
+            "of %zd, got %zd.", self->size, view->len);
+    }
+
+    const Py_ssize_t count = view->len / self->size;
+    const unsigned char* in = (const unsigned char* ) view->buf;
+    PyObject* output;
+
+    if (columns) {
+        output = PyTuple_New(self->field_count);
+        for (Py_ssize_t j = 0; output != NULL && j < self->field_count;
+                j++) {
+            const struct numenc_field* field = & self->fields[j];
+            PyObject* column = PyList_New(count);
+            if (column == NULL) {
+                Py_CLEAR(output);
+                break;
+            }
+            PyTuple_SET_ITEM(output, j, column);
+
+            for (Py_ssize_t i = 0; i < count; i++) {
+                PyObject* item = field->codec->decode(
+                    in + i * self->size + field->offset);
+                if (item == NULL) {
+                    Py_CLEAR(output);
+                    break;
+                }
+                PyList_SET_ITEM(column, i, item);
+            }
+        }
+    } else {
+        output = PyList_New(count);
+        for (Py_ssize_t i = 0; output != NULL && i < count; i++) {
+            PyObject* row = decode_fixed_key(self, in + i * self->size);
+            if (row == NULL) {
+                Py_CLEAR(output);
+                break;
+            }
+            PyList_SET_ITEM(output, i, row);
+        }
+    }
+    return output;
+}
+
+// Unpack the consecutive keys of a schema with variable-length fields.
+// The keys are parsed one after another since their lengths differ.
+static PyObject* unpack_variable_many(struct numenc_struct* self,
+        const Py_buffer* view, int columns) {
+    const unsigned char* in = (const unsigned char* ) view->buf;
+
+    PyObject* output = columns ?
+        PyTuple_New(self->field_count) : PyList_New(0);
+    if (output == NULL) {
+        return NULL;
+    }
+    for (Py_ssize_t j = 0; columns && j < self->field_count; j++) {
+        PyObject* column = PyList_New(0);
+        if (column == NULL) {
+            Py_DECREF(output);
+            return NULL;
+        }
+        PyTuple_SET_ITEM(output, j, column);
+    }
+
+    Py_ssize_t position = 0;
+    for (Py_ssize_t i = 0; position < view->len; i++) {
+        Py_ssize_t consumed;
+        PyObject* row = decode_key(self, in + position,
+            view->len - position, self->field_count, & consumed);
+        if (row == NULL) {
+            numenc_annotate_index(i);
+            Py_DECREF(output);
+            return NULL;
+        }
+        position += consumed;
+
+        int result = 0;
+        if (columns) {
+            for (Py_ssize_t j = 0; result == 0 && j < self->field_count;
+                    j++) {
+                result = PyList_Append(PyTuple_GET_ITEM(output, j),
+                    PyTuple_GET_ITEM(row, j));
+            }
+        } else {
+            result = PyList_Append(output, row);
+        }
+        Py_DECREF(row);
+        if (result != 0) {
+            Py_DECREF(output);
+            return NULL;
+        }
+    }
+    return output;
+}
+
+static PyObject* Struct_unpack_many(struct numenc_struct* self,
+        PyObject* args, PyObject* kwargs) {
+    static const char* kwlist[] = {"keys", "columns", NULL};
+    PyObject* keys;
+    int columns = 0;
+
+    if (!PyArg_ParseTupleAndKeywords(args, kwargs, "O|p:unpack_many",
+            (char** ) kwlist, & keys, & columns)) {
+        return NULL;
+    }
+
+    Py_buffer view;
+    if (numenc_get_buffer(keys, & view) != 0) {
+        return NULL;
+    }
+
+    PyObject* output = (self->size >= 0) ?
+        unpack_fixed_many(self, & view, columns) :
+        unpack_variable_many(self, & view, columns);
+    PyBuffer_Release(& view);
+    return output;
+}
+
+static PyMethodDef StructMethods[] = {
+    {
+        "pack",
+        (PyCFunction)(void(*)(void)) Struct_pack,
+        METH_FASTCALL,
+        "Convert the values of the fields to a single sortable key"
+    },
+    {
+        "unpack",
+        (PyCFunction) Struct_unpack,
+        METH_O,
+        "Convert a sortable key back to a tuple of the values of the fields"
+    },
+    {
+        "pack_into",
+        (PyCFunction)(void(*)(void)) Struct_pack_into,
+        METH_FASTCALL,
+        "Write the values of the fields as a sortable key into a writable "
+        "buffer at the given offset"
+    },
+    {
+        "unpack_from",
+        (PyCFunction)(void(*)(void)) Struct_unpack_from,
+        METH_FASTCALL,
+        "Read a tuple of the values of the fields from the sortable key "
+        "of a buffer at the given offset"
+    },
+    {
+        "unpack_prefix",
+        (PyCFunction)(void(*)(void)) Struct_unpack_prefix,
+        METH_VARARGS | METH_KEYWORDS,
+        "Read the values of the leading fields (all by default) from "
+        "the sortable key of a buffer at the given offset; return them "
+        "together with the offset following the last read field"
+    },
+    {
+        "pack_many",
+        (PyCFunction)(void(*)(void)) Struct_pack_many,
+        METH_VARARGS | METH_KEYWORDS,
+        "Convert an iterable of rows (or of columns if columns is set) to "
+        "concatenated sortable keys"
+    },
+    {
+        "unpack_many",
+        (PyCFunction)(void(*)(void)) Struct_unpack_many,
+        METH_VARARGS | METH_KEYWORDS,
+        "Convert concatenated sortable keys back to a list of tuples "
+        "(or to a tuple of columns if columns is set)"
+    },
+    {
+        NULL,
+        NULL,
+        0,
+        NULL
+    }
+};
+
+static PyMemberDef StructMembers[] = {
+    {
+        (char* ) "format",
+        T_OBJECT,
+        offsetof(struct numenc_struct, format),
+        READONLY,
+        (char* ) "Comma-separated types of the fields"
+    },
+    {
+        NULL,
+        0,
+        0,
+        0,
+        NULL
+    }
+};
+
+static PyGetSetDef StructGetSet[] = {
+    {
+        (char* ) "size",
+        (getter) Struct_get_size,
+        NULL,
+        (char* ) "Length of a key in bytes, or None if the keys have "
+        "variable-length fields",
+        NULL
+    },
+    {
+        NULL,
+        NULL,
+        NULL,
+        NULL,
+        NULL
+    }
+};
+
+static PyType_Slot StructSlots[] = {
+    {
+        Py_tp_doc,
+        (void* ) "Compiled schema of a composite sortable key, "
+        "e.g., Struct('uint32,str,int64 desc')"
+    },
+    {Py_tp_new, (void* ) Struct_new},
+    {Py_tp_dealloc, (void* ) Struct_dealloc},
+    {Py_tp_repr, (void* ) Struct_repr},
+    {Py_tp_methods, (void* ) StructMethods},
+    {Py_tp_members, (void* ) StructMembers},
+    {Py_tp_getset, (void* ) StructGetSet},
+    {0, NULL}
+};
+
+static PyType_Spec StructSpec = {
+    "numenc.Struct",
+    sizeof(struct numenc_struct),
+    0,
+    Py_TPFLAGS_DEFAULT,
+    StructSlots
+};
+
+int numenc_add_struct_type(PyObject* module) {
+    PyObject* type = PyType_FromSpec(& StructSpec);
+    if (type == NULL) {
+        return -1;
+    }
+    if (PyModule_AddObject(module, "Struct", type) != 0) {
+        Py_DECREF(type);
+        return -1;
+    }
+    return 0;
+}
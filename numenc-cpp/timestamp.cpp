@@ -0,0 +1,964 @@
+#include "numenc.h"
+
+#include <datetime.h>
+#include <structmember.h>
+
+// Times are stored as the signed 64-bit number of units since the epoch
+// 1970-01-01T00:00:00 (or, for durations, as the number of units) and
+// encoded like the other signed 64-bit integers. The calendar arithmetic
+// is done in C so that no Python arithmetic runs per value.
+
+enum time_type {
+    TIME_DATETIME = 0,
+    TIME_DATE,
+    TIME_TIMEDELTA
+};
+
+static const char* const TIME_TYPE_NAMES[] = {
+    "datetime", "date", "timedelta"
+};
+
+enum time_unit {
+    UNIT_DAY = 0,
+    UNIT_HOUR,
+    UNIT_MINUTE,
+    UNIT_SECOND,
+    UNIT_MILLISECOND,
+    UNIT_MICROSECOND,
+    UNIT_NANOSECOND,
+    UNIT_COUNT
+};
+
+// Names of the units as in numpy.datetime64
+static const char* const UNIT_NAMES[UNIT_COUNT] = {
+    "D", "h", "m", "s", "ms", "us", "ns"
+};
+
+// Length of the units in nanoseconds
+static const int64_t UNIT_NANOSECONDS[UNIT_COUNT] = {
+    86400000000000LL, 3600000000000LL, 60000000000LL, 1000000000LL,
+    1000000LL, 1000LL, 1LL
+};
+
+#define SECONDS_PER_DAY 86400
+#define MICROSECONDS_PER_SECOND 1000000
+
+// numpy represents the missing times (NaT) as the smallest int64
+#define NUMENC_NAT INT64_MIN
+
+// Days since the epoch of the first and of the last supported date
+// (0001-01-01 and 9999-12-31)
+#define MIN_DAYS (-719162LL)
+#define MAX_DAYS 2932896LL
+
+// Largest number of days of a timedelta
+#define MAX_DELTA_DAYS 999999999LL
+
+struct numenc_time_codec {
+    PyObject_HEAD
+
+    int type;
+    int unit;
+
+    // name of the type, e.g., "datetime"
+    PyObject* type_name;
+
+    // name of the unit, e.g., "us"
+    PyObject* unit_name;
+
+    Py_ssize_t width;
+};
+
+// A time split into days since the epoch (or days of a duration),
+// seconds of the day in [0, 86400) and microseconds in [0, 10^6).
+struct split_time {
+    int64_t days;
+    int64_t seconds;
+    int64_t microseconds;
+};
+
+static int64_t floor_div(int64_t a, int64_t b) {
+    int64_t quotient = a / b;
+    if ((a % b != 0) && ((a < 0) != (b < 0))) {
+        quotient--;
+    }
+    return quotient;
+}
+
+static int64_t floor_mod(int64_t a, int64_t b) {
+    return a - floor_div(a, b) * b;
+}
+
+// Compute value * factor + addend with 0 <= addend < factor.
+// Return 0 on success or -1 on overflow.
+static int mul_add(int64_t value, int64_t factor, int64_t addend,
+        int64_t* result) {
+    if (value > (INT64_MAX - addend) / factor || value < INT64_MIN / factor) {
+        return -1;
+    }
+    *result = value * factor + addend;
+    return 0;
+}
+
+// Days since the epoch of a date of the proleptic Gregorian calendar
+// (see http://howardhinnant.github.io/date_algorithms.html)
+static int64_t days_from_civil(int64_t year, int month, int day) {
+    year -= (month <= 2);
+    const int64_t era = (year >= 0 ? year : year - 399) / 400;
+    const int64_t year_of_era = year - era * 400;
+    const int64_t day_of_year =
+        (153 * (month + (month > 2 ? -3 : 9)) + 2) / 5 + day - 1;
+    const int64_t day_of_era = year_of_era * 365 + year_of_era / 4 -
+        year_of_era / 100 + day_of_year;
+    return era * 146097 + day_of_era - 719468;
+}
+
+// Date of the proleptic Gregorian calendar from the days since the epoch
+static void civil_from_days(int64_t days, int* year, int* month, int* day) {
+    days += 719468;
+    const int64_t era = (days >= 0 ? days : days - 146096) / 146097;
+    const int64_t day_of_era = days - era * 146097;
+    const int64_t year_of_era = (day_of_era - day_of_era / 1460 +
+        day_of_era / 36524 - day_of_era / 146096) / 365;
+    const int64_t day_of_year = day_of_era -
+        (365 * year_of_era + year_of_era / 4 - year_of_era / 100);
+    const int64_t shifted_month = (5 * day_of_year + 2) / 153;
+
+    *day = (int)(day_of_year - (153 * shifted_month + 2) / 5 + 1);
+    *month = (int)(shifted_month < 10 ? shifted_month + 3 : shifted_month - 9);
+    *year = (int)(year_of_era + era * 400 + (*month <= 2));
+}
+
+// Carry the seconds and the microseconds over into the days so that they
+// fall into their ranges.
+static void normalize(struct split_time* time) {
+    time->seconds += floor_div(time->microseconds, MICROSECONDS_PER_SECOND);
+    time->microseconds = floor_mod(
+        time->microseconds, MICROSECONDS_PER_SECOND);
+    time->days += floor_div(time->seconds, SECONDS_PER_DAY);
+    time->seconds = floor_mod(time->seconds, SECONDS_PER_DAY);
+}
+
+// Convert a split time to a number of units, truncating toward the past.
+// Return 0 on success or -1 on overflow.
+static int join_time(const struct split_time* time, int unit,
+        int64_t* value) {
+    int64_t seconds;
+    switch (unit) {
+        case UNIT_DAY:
+            *value = time->days;
+            return 0;
+        case UNIT_HOUR:
+            return mul_add(time->days, 24, time->seconds / 3600, value);
+        case UNIT_MINUTE:
+            return mul_add(time->days, 1440, time->seconds / 60, value);
+        default:
+            break;
+    }
+
+    if (mul_add(time->days, SECONDS_PER_DAY, time->seconds, & seconds) != 0) {
+        return -1;
+    }
+    switch (unit) {
+        case UNIT_SECOND:
+            *value = seconds;
+            return 0;
+        case UNIT_MILLISECOND:
+            return mul_add(seconds, 1000, time->microseconds / 1000, value);
+        case UNIT_MICROSECOND:
+            return mul_add(
+                seconds, MICROSECONDS_PER_SECOND, time->microseconds, value);
+        default: {
+            int64_t microseconds;
+            if (mul_add(seconds, MICROSECONDS_PER_SECOND,
+                    time->microseconds, & microseconds) != 0) {
+                return -1;
+            }
+            return mul_add(microseconds, 1000, 0, value);
+        }
+    }
+}
+
+// Split a number of units into days, seconds and microseconds, truncating
+// the nanoseconds toward the past.
+static void split_value(int64_t value, int unit, struct split_time* time) {
+    time->seconds = 0;
+    time->microseconds = 0;
+    switch (unit) {
+        case UNIT_DAY:
+            time->days = value;
+            return;
+        case UNIT_HOUR:
+            time->days = floor_div(value, 24);
+            time->seconds = floor_mod(value, 24) * 3600;
+            return;
+        case UNIT_MINUTE:
+            time->days = floor_div(value, 1440);
+            time->seconds = floor_mod(value, 1440) * 60;
+            return;
+        case UNIT_SECOND:
+            time->days = floor_div(value, SECONDS_PER_DAY);
+            time->seconds = floor_mod(value, SECONDS_PER_DAY);
+            return;
+        case UNIT_MILLISECOND:
+            time->days = 0;
+            time->seconds = floor_div(value, 1000);
+            time->microseconds = floor_mod(value, 1000) * 1000;
+            break;
+        case UNIT_MICROSECOND:
+            time->days = 0;
+            time->seconds = floor_div(value, MICROSECONDS_PER_SECOND);
+            time->microseconds = floor_mod(value, MICROSECONDS_PER_SECOND);
+            break;
+        default: {
+            const int64_t microseconds = floor_div(value, 1000);
+            time->days = 0;
+            time->seconds = floor_div(microseconds, MICROSECONDS_PER_SECOND);
+            time->microseconds = floor_mod(
+                microseconds, MICROSECONDS_PER_SECOND);
+            break;
+        }
+    }
+    normalize(time);
+}
+
+// Convert a number of units from one unit to another, truncating toward
+// the past. NaT is kept as it is.
+// Return 0 on success or -1 on overflow.
+static int convert_unit(int64_t value, int from, int to, int64_t* result) {
+    if (value == NUMENC_NAT || from == to) {
+        *result = value;
+        return 0;
+    }
+    if (UNIT_NANOSECONDS[from] > UNIT_NANOSECONDS[to]) {
+        return mul_add(
+            value, UNIT_NANOSECONDS[from] / UNIT_NANOSECONDS[to], 0, result);
+    }
+    *result = floor_div(value, UNIT_NANOSECONDS[to] / UNIT_NANOSECONDS[from]);
+    return 0;
+}
+
+static int unit_from_name(const char* name, Py_ssize_t length) {
+    for (int i = 0; i < UNIT_COUNT; i++) {
+        if ((Py_ssize_t) strlen(UNIT_NAMES[i]) == length &&
+                strncmp(UNIT_NAMES[i], name, length) == 0) {
+            return i;
+        }
+    }
+    return -1;
+}
+
+// Split the value of the type of the codec.
+// Return 0 on success; otherwise set a Python exception and return -1.
+static int split_input(const struct numenc_time_codec* self,
+        PyObject* value, struct split_time* time) {
+    if (self->type == TIME_TIMEDELTA) {
+        if (!PyDelta_Check(value)) {
+            PyErr_SetString(PyExc_TypeError,
+                "Wrong input: expected timedelta.");
+            return -1;
+        }
+        time->days = PyDateTime_DELTA_GET_DAYS(value);
+        time->seconds = PyDateTime_DELTA_GET_SECONDS(value);
+        time->microseconds = PyDateTime_DELTA_GET_MICROSECONDS(value);
+        return 0;
+    }
+
+    if (self->type == TIME_DATE) {
+        // datetime is a subclass of date, but we do not want to drop
+        // the time of the day silently.
+        if (!PyDate_Check(value) || PyDateTime_Check(value)) {
+            PyErr_SetString(PyExc_TypeError, "Wrong input: expected date.");
+            return -1;
+        }
+        time->days = days_from_civil(PyDateTime_GET_YEAR(value),
+            PyDateTime_GET_MONTH(value), PyDateTime_GET_DAY(value));
+        time->seconds = 0;
+        time->microseconds = 0;
+        return 0;
+    }
+
+    if (!PyDateTime_Check(value)) {
+        PyErr_SetString(PyExc_TypeError, "Wrong input: expected datetime.");
+        return -1;
+    }
+    time->days = days_from_civil(PyDateTime_GET_YEAR(value),
+        PyDateTime_GET_MONTH(value), PyDateTime_GET_DAY(value));
+    time->seconds = PyDateTime_DATE_GET_HOUR(value) * 3600 +
+        PyDateTime_DATE_GET_MINUTE(value) * 60 +
+        PyDateTime_DATE_GET_SECOND(value);
+    time->microseconds = PyDateTime_DATE_GET_MICROSECOND(value);
+
+    // aware datetimes are converted to UTC; naive ones are taken as UTC.
+    if (((_PyDateTime_BaseTZInfo* ) value)->hastzinfo) {
+        PyObject* offset = PyObject_CallMethod(value, "utcoffset", NULL);
+        if (offset == NULL) {
+            return -1;
+        }
+        if (PyDelta_Check(offset)) {
+            time->days -= PyDateTime_DELTA_GET_DAYS(offset);
+            time->seconds -= PyDateTime_DELTA_GET_SECONDS(offset);
+            time->microseconds -= PyDateTime_DELTA_GET_MICROSECONDS(offset);
+            normalize(time);
+        }
+        Py_DECREF(offset);
+    }
+    return 0;
+}
+
+// Convert the value to the number of units.
+// Return 0 on success; otherwise set a Python exception and return -1.
+static int to_units(const struct numenc_time_codec* self, PyObject* value,
+        int64_t* units) {
+    struct split_time time;
+    if (split_input(self, value, & time) != 0) {
+        return -1;
+    }
+    if (join_time(& time, self->unit, units) != 0) {
+        PyErr_Format(PyExc_ValueError,
+            "Illegal input: expected a %U in the range of int64 at "
+            "the unit '%U', got %R.", self->type_name, self->unit_name, value);
+        return -1;
+    }
+    return 0;
+}
+
+// Convert the number of units to a new object of the type of the codec.
+static PyObject* from_units(const struct numenc_time_codec* self,
+        int64_t units) {
+    struct split_time time;
+    split_value(units, self->unit, & time);
+
+    if (self->type == TIME_TIMEDELTA) {
+        if (time.days < -MAX_DELTA_DAYS || time.days > MAX_DELTA_DAYS) {
+            return PyErr_Format(PyExc_ValueError,
+                "Illegal input: expected a key in the range of timedelta, "
+                "got %lld %U.", (long long) units, self->unit_name);
+        }
+        return PyDelta_FromDSU(
+            (int) time.days, (int) time.seconds, (int) time.microseconds);
+    }
+
+    if (time.days < MIN_DAYS || time.days > MAX_DAYS) {
+        return PyErr_Format(PyExc_ValueError,
+            "Illegal input: expected a key in the range of %U, "
+            "got %lld %U.", self->type_name, (long long) units,
+            self->unit_name);
+    }
+
+    int year;
+    int month;
+    int day;
+    civil_from_days(time.days, & year, & month, & day);
+    if (self->type == TIME_DATE) {
+        return PyDate_FromDate(year, month, day);
+    }
+    return PyDateTime_FromDateAndTime(year, month, day,
+        (int)(time.seconds / 3600), (int)(time.seconds / 60 % 60),
+        (int)(time.seconds % 60), (int) time.microseconds);
+}
+
+static int encode(const struct numenc_time_codec* self, PyObject* value,
+        unsigned char* out) {
+    int64_t units;
+    if (to_units(self, value, & units) != 0) {
+        return -1;
+    }
+    numenc_encode_int64_raw(units, out);
+    return 0;
+}
+
+static PyObject* decode(const struct numenc_time_codec* self,
+        const unsigned char* in) {
+    return from_units(self, numenc_decode_int64_raw(in));
+}
+
+static PyObject* TimeCodec_new(
+        PyTypeObject* type, PyObject* args, PyObject* kwargs) {
+    static const char* kwlist[] = {"type", "unit", NULL};
+    const char* type_name;
+    const char* unit_name = NULL;
+
+    if (!PyArg_ParseTupleAndKeywords(args, kwargs, "s|z:TimeCodec",
+            (char** ) kwlist, & type_name, & unit_name)) {
+        return NULL;
+    }
+
+    int time_type = -1;
+    for (int i = 0; i < 3; i++) {
+        if (strcmp(type_name, TIME_TYPE_NAMES[i]) == 0) {
+            time_type = i;
+        }
+    }
+    if (time_type < 0) {
+        return PyErr_Format(PyExc_ValueError,
+            "Illegal type: expected 'datetime', 'date' or 'timedelta', "
+            "got '%s'.", type_name);
+    }
+
+    if (unit_name == NULL) {
+        unit_name = (time_type == TIME_DATE) ? "D" : "us";
+    }
+    int unit = unit_from_name(unit_name, (Py_ssize_t) strlen(unit_name));
+    if (unit < 0) {
+        return PyErr_Format(PyExc_ValueError,
+            "Illegal unit: expected 'D', 'h', 'm', 's', 'ms', 'us' or 'ns', "
+            "got '%s'.", unit_name);
+    }
+
+    struct numenc_time_codec* self =
+        (struct numenc_time_codec* ) type->tp_alloc(type, 0);
+    if (self == NULL) {
+        return NULL;
+    }
+    self->type = time_type;
+    self->unit = unit;
+    self->width = 8;
+    self->type_name = PyUnicode_InternFromString(TIME_TYPE_NAMES[time_type]);
+    self->unit_name = PyUnicode_InternFromString(UNIT_NAMES[unit]);
+    if (self->type_name == NULL || self->unit_name == NULL) {
+        Py_DECREF(self);
+        return NULL;
+    }
+    return (PyObject* ) self;
+}
+
+static void TimeCodec_dealloc(struct numenc_time_codec* self) {
+    PyTypeObject* type = Py_TYPE(self);
+    Py_XDECREF(self->type_name);
+    Py_XDECREF(self->unit_name);
+    type->tp_free((PyObject* ) self);
+#if PY_VERSION_HEX >= 0x03080000
+    // instances of heap types hold a reference to their type since 3.8
+    Py_DECREF(type);
+#endif
+}
+
+static PyObject* TimeCodec_repr(struct numenc_time_codec* self) {
+    return PyUnicode_FromFormat("numenc.TimeCodec(%R, unit=%R)",
+        self->type_name, self->unit_name);
+}
+
+static PyObject* TimeCodec_encode(
+        struct numenc_time_codec* self, PyObject* value) {
+    unsigned char buffer[8];
+    if (encode(self, value, buffer) != 0) {
+        return NULL;
+    }
+    return PyBytes_FromStringAndSize((const char* ) buffer, 8);
+}
+
+static PyObject* TimeCodec_decode(
+        struct numenc_time_codec* self, PyObject* key) {
+    if (!PyBytes_Check(key)) {
+        return PyErr_Format(PyExc_TypeError,
+            "Wrong input: expected bytes.");
+    }
+
+    Py_ssize_t count = PyBytes_GET_SIZE(key);
+    if (count != 8) {
+        return PyErr_Format(PyExc_ValueError,
+            "Illegal input: expected bytes of length 8, got %zd.", count);
+    }
+    return decode(self, (const unsigned char* ) PyBytes_AS_STRING(key));
+}
+
+static PyObject* TimeCodec_encode_many(
+        struct numenc_time_codec* self, PyObject* values) {
+    PyObject* sequence = PySequence_Fast(values,
+        "Wrong input: expected an iterable of times.");
+    if (sequence == NULL) {
+        return NULL;
+    }
+
+    const Py_ssize_t count = PySequence_Fast_GET_SIZE(sequence);
+    if (count > PY_SSIZE_T_MAX / 8) {
+        Py_DECREF(sequence);
+        return PyErr_NoMemory();
+    }
+    PyObject* output = PyBytes_FromStringAndSize(NULL, count * 8);
+    if (output == NULL) {
+        Py_DECREF(sequence);
+        return NULL;
+    }
+    unsigned char* out = (unsigned char* ) PyBytes_AS_STRING(output);
+
+    for (Py_ssize_t i = 0; i < count; i++) {
+        // the item might run arbitrary code on conversion (e.g., in
+        // utcoffset()) which could in turn mutate the list, so we re-check
+        // its size every time.
+        if (PySequence_Fast_GET_SIZE(sequence) != count) {
+            PyErr_SetString(PyExc_RuntimeError,
+                "The input changed size during iteration.");
+            Py_DECREF(sequence);
+            Py_DECREF(output);
+            return NULL;
+        }
+        PyObject* item = PySequence_Fast_GET_ITEM(sequence, i);
+        Py_INCREF(item);
+        int result = encode(self, item, out + i * 8);
+        Py_DECREF(item);
+        if (result != 0) {
+            numenc_annotate_index(i);
+            Py_DECREF(sequence);
+            Py_DECREF(output);
+            return NULL;
+        }
+    }
+
+    Py_DECREF(sequence);
+    return output;
+}
+
+static PyObject* TimeCodec_decode_many(
+        struct numenc_time_codec* self, PyObject* keys) {
+    Py_buffer view;
+    if (numenc_get_buffer(keys, & view) != 0) {
+        return NULL;
+    }
+
+    if (view.len % 8 != 0) {
+        PyErr_Format(PyExc_ValueError,
+            "Illegal input: expected a buffer whose length is a multiple "
+            "of 8, got %zd.", view.len);
+        PyBuffer_Release(& view);
+        return NULL;
+    }
+
+    const Py_ssize_t count = view.len / 8;
+    const unsigned char* in = (const unsigned char* ) view.buf;
+
+    PyObject* output = PyList_New(count);
+    for (Py_ssize_t i = 0; output != NULL && i < count; i++) {
+        PyObject* item = decode(self, in + i * 8);
+        if (item == NULL) {
+            numenc_annotate_index(i);
+            Py_CLEAR(output);
+            break;
+        }
+        PyList_SET_ITEM(output, i, item);
+    }
+
+    PyBuffer_Release(& view);
+    return output;
+}
+
+static PyObject* TimeCodec_encode_into(struct numenc_time_codec* self,
+        PyObject* const* args, Py_ssize_t nargs) {
+    if (nargs < 2 || nargs > 3) {
+        return PyErr_Format(PyExc_TypeError,
+            "encode_into() takes 2 or 3 arguments (%zd given)", nargs);
+    }
+
+    Py_ssize_t offset;
+    if (numenc_parse_offset(args, nargs, 2, & offset) != 0) {
+        return NULL;
+    }
+
+    // we encode the key aside first so that the buffer is left untouched
+    // if the value is invalid.
+    unsigned char key[8];
+    if (encode(self, args[0], key) != 0) {
+        return NULL;
+    }
+
+    Py_buffer view;
+    if (numenc_get_writable_buffer(args[1], & view) != 0) {
+        return NULL;
+    }
+    offset = numenc_resolve_offset(offset, 8, view.len);
+    if (offset >= 0) {
+        memcpy((unsigned char* ) view.buf + offset, key, 8);
+    }
+    PyBuffer_Release(& view);
+
+    if (offset < 0) {
+        return NULL;
+    }
+    Py_RETURN_NONE;
+}
+
+static PyObject* TimeCodec_decode_from(struct numenc_time_codec* self,
+        PyObject* const* args, Py_ssize_t nargs) {
+    if (nargs < 1 || nargs > 2) {
+        return PyErr_Format(PyExc_TypeError,
+            "decode_from() takes 1 or 2 arguments (%zd given)", nargs);
+    }
+
+    Py_ssize_t offset;
+    if (numenc_parse_offset(args, nargs, 1, & offset) != 0) {
+        return NULL;
+    }
+
+    Py_buffer view;
+    if (numenc_get_buffer(args[0], & view) != 0) {
+        return NULL;
+    }
+
+    offset = numenc_resolve_offset(offset, 8, view.len);
+    PyObject* output = NULL;
+    if (offset >= 0) {
+        output = decode(self, (const unsigned char* ) view.buf + offset);
+    }
+    PyBuffer_Release(& view);
+    return output;
+}
+
+// Determine the unit of a numpy datetime64 or timedelta64 array from its
+// dtype string, e.g., "<M8[ns]".
+// Return the unit on success; otherwise set a Python exception and
+// return -1.
+static int array_unit(const struct numenc_time_codec* self, PyObject* dtype) {
+    const char kind = (self->type == TIME_TIMEDELTA) ? 'm' : 'M';
+
+    Py_ssize_t length;
+    const char* name = PyUnicode_AsUTF8AndSize(dtype, & length);
+    if (name == NULL) {
+        return -1;
+    }
+
+    int unit = -1;
+    if (length > 5 && name[1] == kind && name[2] == '8' && name[3] == '[' &&
+            name[length - 1] == ']') {
+        unit = unit_from_name(name + 4, length - 5);
+    }
+    if (unit < 0) {
+        PyErr_Format(PyExc_TypeError,
+            "Wrong input: expected a numpy array of the dtype %s64 with "
+            "one of the units D, h, m, s, ms, us or ns, got %R.",
+            (self->type == TIME_TIMEDELTA) ? "timedelta" : "datetime",
+            dtype);
+    }
+    return unit;
+}
+
+static int64_t load_int64(const unsigned char* in, int swap) {
+    unsigned char bytes[8];
+    for (int i = 0; i < 8; i++) {
+        bytes[i] = swap ? in[7 - i] : in[i];
+    }
+    int64_t value;
+    memcpy(& value, bytes, 8);
+    return value;
+}
+
+// Arguments of the kernel converting the units of an array
+struct unit_conversion {
+    const unsigned char* in;
+    unsigned char* out;
+    int swap;
+    int from;
+    int to;
+};
+
+static Py_ssize_t convert_kernel(
+        void* arg, Py_ssize_t start, Py_ssize_t stop) {
+    const struct unit_conversion* conversion =
+        (const struct unit_conversion* ) arg;
+    for (Py_ssize_t i = start; i < stop; i++) {
+        const int64_t value = load_int64(
+            conversion->in + i * 8, conversion->swap);
+        int64_t units;
+        if (convert_unit(value, conversion->from, conversion->to, & units) !=
+                0) {
+            return i;
+        }
+        numenc_encode_int64_raw(units, conversion->out + i * 8);
+    }
+    return stop;
+}
+
+static PyObject* TimeCodec_encode_array(struct numenc_time_codec* self,
+        PyObject* args, PyObject* kwargs) {
+    static const char* kwlist[] = {"values", "threads", NULL};
+    PyObject* values;
+    int threads = 1;
+
+    if (!PyArg_ParseTupleAndKeywords(args, kwargs, "O|i",
+            (char** ) kwlist, & values, & threads)) {
+        return NULL;
+    }
+    if (numenc_check_threads(threads) != 0) {
+        return NULL;
+    }
+
+    const char* dtype_name =
+        (self->type == TIME_TIMEDELTA) ? "timedelta64" : "datetime64";
+
+    PyObject* dtype = PyObject_GetAttrString(values, "dtype");
+    PyObject* dtype_str = NULL;
+    if (dtype != NULL) {
+        dtype_str = PyObject_GetAttrString(dtype, "str");
+        Py_DECREF(dtype);
+    }
+    if (dtype_str == NULL || !PyUnicode_Check(dtype_str)) {
+        Py_XDECREF(dtype_str);
+        PyErr_Clear();
+        return PyErr_Format(PyExc_TypeError,
+            "Wrong input: expected a numpy array of %s.", dtype_name);
+    }
+
+    int unit = array_unit(self, dtype_str);
+    if (unit < 0) {
+        Py_DECREF(dtype_str);
+        return NULL;
+    }
+
+    // numpy does not export datetime64 through the buffer protocol, so we
+    // read the array through an int64 view in the same byte order.
+    PyObject* integers = PyObject_CallMethod(values, "view", "s",
+        PyUnicode_AsUTF8(dtype_str)[0] == '>' ? ">i8" : "<i8");
+    Py_DECREF(dtype_str);
+    if (integers == NULL) {
+        return NULL;
+    }
+
+    Py_buffer input;
+    int result = PyObject_GetBuffer(integers, & input,
+        PyBUF_FORMAT | PyBUF_C_CONTIGUOUS);
+    Py_DECREF(integers);
+    if (result != 0) {
+        return NULL;
+    }
+
+    int swap;
+    if (numenc_type_from_format(input.format, input.itemsize, & swap) !=
+            NUMENC_INT64) {
+        PyBuffer_Release(& input);
+        return PyErr_Format(PyExc_TypeError,
+            "Wrong input: expected a numpy array of %s.", dtype_name);
+    }
+
+    const Py_ssize_t count = input.len / 8;
+    PyObject* output = PyBytes_FromStringAndSize(NULL, input.len);
+    if (output == NULL) {
+        PyBuffer_Release(& input);
+        return NULL;
+    }
+    const unsigned char* in = (const unsigned char* ) input.buf;
+    unsigned char* out = (unsigned char* ) PyBytes_AS_STRING(output);
+
+    if (unit == self->unit) {
+        numenc_encode_native_parallel(
+            NUMENC_INT64, in, out, count, swap, threads);
+    } else {
+        struct unit_conversion conversion = {
+            in, out, swap, unit, self->unit
+        };
+        Py_ssize_t failed;
+        Py_BEGIN_ALLOW_THREADS
+        failed = numenc_run_parallel(convert_kernel, & conversion, count,
+            NUMENC_PARALLEL_GRAIN, threads);
+        Py_END_ALLOW_THREADS
+        if (failed < count) {
+            PyErr_Format(PyExc_ValueError,
+                "at index %zd: Illegal input: expected a %s in the range "
+                "of int64 at the unit '%U', got %lld %s.", failed,
+                dtype_name, self->unit_name,
+                (long long) load_int64(in + failed * 8, swap),
+                UNIT_NAMES[unit]);
+            Py_DECREF(output);
+            PyBuffer_Release(& input);
+            return NULL;
+        }
+    }
+
+    PyBuffer_Release(& input);
+    return output;
+}
+
+static PyObject* TimeCodec_decode_array(struct numenc_time_codec* self,
+        PyObject* args, PyObject* kwargs) {
+    static const char* kwlist[] = {"keys", "threads", NULL};
+    PyObject* keys;
+    int threads = 1;
+
+    if (!PyArg_ParseTupleAndKeywords(args, kwargs, "O|i",
+            (char** ) kwlist, & keys, & threads)) {
+        return NULL;
+    }
+    if (numenc_check_threads(threads) != 0) {
+        return NULL;
+    }
+
+    Py_buffer input;
+    if (numenc_get_buffer(keys, & input) != 0) {
+        return NULL;
+    }
+
+    if (input.len % 8 != 0) {
+        PyErr_Format(PyExc_ValueError,
+            "Illegal input: expected a buffer whose length is a multiple "
+            "of 8, got %zd.", input.len);
+        PyBuffer_Release(& input);
+        return NULL;
+    }
+    const Py_ssize_t count = input.len / 8;
+
+    PyObject* numpy = PyImport_ImportModule("numpy");
+    if (numpy == NULL) {
+        PyBuffer_Release(& input);
+        return NULL;
+    }
+    PyObject* output = PyObject_CallMethod(numpy, "empty", "(n)N", count,
+        PyUnicode_FromFormat("%c8[%U]",
+            (self->type == TIME_TIMEDELTA) ? 'm' : 'M', self->unit_name));
+    Py_DECREF(numpy);
+    if (output == NULL) {
+        PyBuffer_Release(& input);
+        return NULL;
+    }
+
+    PyObject* integers = PyObject_CallMethod(output, "view", "s", "int64");
+    Py_buffer view;
+    if (integers == NULL ||
+            PyObject_GetBuffer(integers, & view, PyBUF_WRITABLE) != 0) {
+        Py_XDECREF(integers);
+        Py_DECREF(output);
+        PyBuffer_Release(& input);
+        return NULL;
+    }
+
+    numenc_decode_native_parallel(NUMENC_INT64,
+        (const unsigned char* ) input.buf, (unsigned char* ) view.buf, count,
+        threads);
+
+    PyBuffer_Release(& view);
+    Py_DECREF(integers);
+    PyBuffer_Release(& input);
+    return output;
+}
+
+static PyMethodDef TimeCodecMethods[] = {
+    {
+        "encode",
+        (PyCFunction) TimeCodec_encode,
+        METH_O,
+        "Convert a time to sortable bytes"
+    },
+    {
+        "decode",
+        (PyCFunction) TimeCodec_decode,
+        METH_O,
+        "Convert sortable bytes back to a time"
+    },
+    {
+        "encode_many",
+        (PyCFunction) TimeCodec_encode_many,
+        METH_O,
+        "Convert an iterable of times to concatenated sortable bytes"
+    },
+    {
+        "decode_many",
+        (PyCFunction) TimeCodec_decode_many,
+        METH_O,
+        "Convert concatenated sortable bytes back to a list of times"
+    },
+    {
+        "encode_into",
+        (PyCFunction)(void(*)(void)) TimeCodec_encode_into,
+        METH_FASTCALL,
+        "Write a time as sortable bytes into a writable buffer "
+        "at the given offset"
+    },
+    {
+        "decode_from",
+        (PyCFunction)(void(*)(void)) TimeCodec_decode_from,
+        METH_FASTCALL,
+        "Read a time from the sortable bytes of a buffer "
+        "at the given offset"
+    },
+    {
+        "encode_array",
+        (PyCFunction)(void(*)(void)) TimeCodec_encode_array,
+        METH_VARARGS | METH_KEYWORDS,
+        "Convert a numpy array of datetime64 (or timedelta64) of any unit "
+        "to concatenated sortable bytes at the unit of the codec on up to "
+        "the given number of threads"
+    },
+    {
+        "decode_array",
+        (PyCFunction)(void(*)(void)) TimeCodec_decode_array,
+        METH_VARARGS | METH_KEYWORDS,
+        "Convert concatenated sortable bytes back to a numpy array of "
+        "datetime64 (or timedelta64) at the unit of the codec on up to "
+        "the given number of threads"
+    },
+    {
+        NULL,
+        NULL,
+        0,
+        NULL
+    }
+};
+
+static PyMemberDef TimeCodecMembers[] = {
+    {
+        (char* ) "type",
+        T_OBJECT,
+        offsetof(struct numenc_time_codec, type_name),
+        READONLY,
+        (char* ) "Type of the times, 'datetime', 'date' or 'timedelta'"
+    },
+    {
+        (char* ) "unit",
+        T_OBJECT,
+        offsetof(struct numenc_time_codec, unit_name),
+        READONLY,
+        (char* ) "Resolution of the keys as a numpy unit, e.g., 'us'"
+    },
+    {
+        (char* ) "width",
+        T_PYSSIZET,
+        offsetof(struct numenc_time_codec, width),
+        READONLY,
+        (char* ) "Length of a key in bytes"
+    },
+    {
+        NULL,
+        0,
+        0,
+        0,
+        NULL
+    }
+};
+
+static PyType_Slot TimeCodecSlots[] = {
+    {
+        Py_tp_doc,
+        (void* ) "Codec of datetimes, dates or timedeltas stored as int64 "
+        "counts of a unit since the epoch, e.g., TimeCodec('datetime', "
+        "unit='us')"
+    },
+    {Py_tp_new, (void* ) TimeCodec_new},
+    {Py_tp_dealloc, (void* ) TimeCodec_dealloc},
+    {Py_tp_repr, (void* ) TimeCodec_repr},
+    {Py_tp_methods, (void* ) TimeCodecMethods},
+    {Py_tp_members, (void* ) TimeCodecMembers},
+    {0, NULL}
+};
+
+static PyType_Spec TimeCodecSpec = {
+    "numenc.TimeCodec",
+    sizeof(struct numenc_time_codec),
+    0,
+    Py_TPFLAGS_DEFAULT,
+    TimeCodecSlots
+};
+
+int numenc_add_time_codec_type(PyObject* module) {
+    PyDateTime_IMPORT;
+    if (PyDateTimeAPI == NULL) {
+        return -1;
+    }
+
+    PyObject* type = PyType_FromSpec(& TimeCodecSpec);
+    if (type == NULL) {
+        return -1;
+    }
+    if (PyModule_AddObject(module, "TimeCodec", type) != 0) {
+        Py_DECREF(type);
+        return -1;
+    }
+    return 0;
+}
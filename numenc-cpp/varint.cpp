@@ -0,0 +1,307 @@
+#include "numenc.h"
+
+// Encode a Python integer as a varint at out.
+// Return the length of the varint on success; otherwise set a Python
+// exception and return -1.
+typedef int (*varint_encode_func)(PyObject* value, unsigned char* out);
+
+// Decode the varint at in, which holds at least the number of bytes given
+// by its header, into a new Python integer.
+// Return NULL with a Python exception set if the varint is not canonical.
+typedef PyObject* (*varint_decode_func)(const unsigned char* in);
+
+struct varint_codec {
+    varint_encode_func encode;
+    varint_decode_func decode;
+    int (*length)(unsigned char header);
+};
+
+static int encode_varint(PyObject* value, unsigned char* out) {
+    long long input = PyLong_AsLongLong(value);
+    if (input == -1 && PyErr_Occurred()) {
+        PyErr_Clear();
+        PyErr_SetString(PyExc_TypeError,
+            "Wrong input: expected signed 64-bit integer.");
+        return -1;
+    }
+    return numenc_encode_varint_raw((int64_t) input, out);
+}
+
+static int encode_varuint(PyObject* value, unsigned char* out) {
+    unsigned long long input = PyLong_AsUnsignedLongLong(value);
+    if (input == (unsigned long long) -1 && PyErr_Occurred()) {
+        PyErr_Clear();
+        PyErr_SetString(PyExc_TypeError,
+            "Wrong input: expected unsigned 64-bit integer.");
+        return -1;
+    }
+    return numenc_encode_varuint_raw((uint64_t) input, out);
+}
+
+static PyObject* decode_varint(const unsigned char* in) {
+    int64_t value;
+    if (numenc_decode_varint_raw(in, & value) != 0) {
+        return PyErr_Format(PyExc_ValueError,
+            "Illegal input: non-canonical or out-of-range varint.");
+    }
+    return PyLong_FromLongLong(value);
+}
+
+static PyObject* decode_varuint(const unsigned char* in) {
+    uint64_t value;
+    if (numenc_decode_varuint_raw(in, & value) != 0) {
+        return PyErr_Format(PyExc_ValueError,
+            "Illegal input: non-canonical varint.");
+    }
+    return PyLong_FromUnsignedLongLong(value);
+}
+
+static const struct varint_codec VARINT = {
+    encode_varint, decode_varint, numenc_varint_length
+};
+
+static const struct varint_codec VARUINT = {
+    encode_varuint, decode_varuint, numenc_varuint_length
+};
+
+static PyObject* encode_scalar(
+        const struct varint_codec* codec, PyObject* value) {
+    unsigned char buffer[NUMENC_VARINT_MAX_SIZE];
+    int length = codec->encode(value, buffer);
+    if (length < 0) {
+        return NULL;
+    }
+    return PyBytes_FromStringAndSize((const char* ) buffer, length);
+}
+
+static PyObject* decode_scalar(
+        const struct varint_codec* codec, PyObject* key) {
+    if (!PyBytes_Check(key)) {
+        return PyErr_Format(PyExc_TypeError,
+            "Wrong input: expected bytes.");
+    }
+
+    Py_ssize_t count = PyBytes_GET_SIZE(key);
+    const unsigned char* in = (const unsigned char* ) PyBytes_AS_STRING(key);
+    if (count == 0) {
+        return PyErr_Format(PyExc_ValueError,
+            "Illegal input: expected a non-empty varint.");
+    }
+
+    Py_ssize_t length = codec->length(in[0]);
+    if (count != length) {
+        return PyErr_Format(PyExc_ValueError,
+            "Illegal input: expected bytes of length %zd, got %zd.",
+            length, count);
+    }
+    return codec->decode(in);
+}
+
+static PyObject* size(const struct varint_codec* codec, PyObject* value) {
+    unsigned char buffer[NUMENC_VARINT_MAX_SIZE];
+    int length = codec->encode(value, buffer);
+    if (length < 0) {
+        return NULL;
+    }
+    return PyLong_FromLong(length);
+}
+
+static PyObject* encode_many(
+        const struct varint_codec* codec, PyObject* values) {
+    PyObject* sequence = PySequence_Fast(values,
+        "Wrong input: expected an iterable of numbers.");
+    if (sequence == NULL) {
+        return NULL;
+    }
+
+    // we allocate for the longest varints and shrink the output at the end.
+    const Py_ssize_t count = PySequence_Fast_GET_SIZE(sequence);
+    if (count > PY_SSIZE_T_MAX / NUMENC_VARINT_MAX_SIZE) {
+        Py_DECREF(sequence);
+        return PyErr_NoMemory();
+    }
+    PyObject* output = PyBytes_FromStringAndSize(
+        NULL, count * NUMENC_VARINT_MAX_SIZE);
+    if (output == NULL) {
+        Py_DECREF(sequence);
+        return NULL;
+    }
+    unsigned char* out = (unsigned char* ) PyBytes_AS_STRING(output);
+
+    Py_ssize_t position = 0;
+    for (Py_ssize_t i = 0; i < count; i++) {
+        // the item might run arbitrary code on conversion which could
+        // in turn mutate the list, so we re-check its size every time.
+        if (PySequence_Fast_GET_SIZE(sequence) != count) {
+            PyErr_SetString(PyExc_RuntimeError,
+                "The input changed size during iteration.");
+            Py_DECREF(sequence);
+            Py_DECREF(output);
+            return NULL;
+        }
+        PyObject* item = PySequence_Fast_GET_ITEM(sequence, i);
+        Py_INCREF(item);
+        int length = codec->encode(item, out + position);
+        Py_DECREF(item);
+        if (length < 0) {
+            numenc_annotate_index(i);
+            Py_DECREF(sequence);
+            Py_DECREF(output);
+            return NULL;
+        }
+        position += length;
+    }
+    Py_DECREF(sequence);
+
+    if (_PyBytes_Resize(& output, position) != 0) {
+        return NULL;
+    }
+    return output;
+}
+
+static PyObject* decode_many(
+        const struct varint_codec* codec, PyObject* keys) {
+    Py_buffer view;
+    if (numenc_get_buffer(keys, & view) != 0) {
+        return NULL;
+    }
+
+    PyObject* output = PyList_New(0);
+    if (output == NULL) {
+        PyBuffer_Release(& view);
+        return NULL;
+    }
+
+    const unsigned char* in = (const unsigned char* ) view.buf;
+    Py_ssize_t position = 0;
+    while (position < view.len) {
+        Py_ssize_t length = codec->length(in[position]);
+        if (view.len - position < length) {
+            PyErr_Format(PyExc_ValueError,
+                "Illegal input: truncated varint at offset %zd.", position);
+            Py_DECREF(output);
+            PyBuffer_Release(& view);
+            return NULL;
+        }
+
+        PyObject* item = codec->decode(in + position);
+        if (item == NULL) {
+            numenc_annotate_index(PyList_GET_SIZE(output));
+            Py_DECREF(output);
+            PyBuffer_Release(& view);
+            return NULL;
+        }
+        int result = PyList_Append(output, item);
+        Py_DECREF(item);
+        if (result != 0) {
+            Py_DECREF(output);
+            PyBuffer_Release(& view);
+            return NULL;
+        }
+        position += length;
+    }
+
+    PyBuffer_Release(& view);
+    return output;
+}
+
+#define NUMENC_VARINT_FUNCTIONS(type, codec) \
+    static PyObject* from_##type(PyObject* self, PyObject* value) { \
+        return encode_scalar(& codec, value); \
+    } \
+    static PyObject* to_##type(PyObject* self, PyObject* key) { \
+        return decode_scalar(& codec, key); \
+    } \
+    static PyObject* from_##type##_many(PyObject* self, PyObject* values) { \
+        return encode_many(& codec, values); \
+    } \
+    static PyObject* to_##type##_many(PyObject* self, PyObject* keys) { \
+        return decode_many(& codec, keys); \
+    } \
+    static PyObject* type##_size(PyObject* self, PyObject* value) { \
+        return size(& codec, value); \
+    }
+
+NUMENC_VARINT_FUNCTIONS(varint, VARINT)
+NUMENC_VARINT_FUNCTIONS(varuint, VARUINT)
+
+static PyMethodDef VarintMethods[] = {
+    {
+        "from_varint",
+        from_varint,
+        METH_O,
+        "Convert a signed 64-bit integer to sortable bytes "
+        "of variable length"
+    },
+    {
+        "to_varint",
+        to_varint,
+        METH_O,
+        "Convert variable-length bytes back to a signed 64-bit integer"
+    },
+    {
+        "from_varint_many",
+        from_varint_many,
+        METH_O,
+        "Convert an iterable of signed 64-bit integers to "
+        "concatenated variable-length sortable bytes"
+    },
+    {
+        "to_varint_many",
+        to_varint_many,
+        METH_O,
+        "Convert concatenated variable-length sortable bytes back to "
+        "a list of signed 64-bit integers"
+    },
+    {
+        "varint_size",
+        varint_size,
+        METH_O,
+        "Return the number of bytes of a signed 64-bit integer "
+        "as a varint"
+    },
+    {
+        "from_varuint",
+        from_varuint,
+        METH_O,
+        "Convert an unsigned 64-bit integer to sortable bytes "
+        "of variable length"
+    },
+    {
+        "to_varuint",
+        to_varuint,
+        METH_O,
+        "Convert variable-length bytes back to an unsigned 64-bit integer"
+    },
+    {
+        "from_varuint_many",
+        from_varuint_many,
+        METH_O,
+        "Convert an iterable of unsigned 64-bit integers to "
+        "concatenated variable-length sortable bytes"
+    },
+    {
+        "to_varuint_many",
+        to_varuint_many,
+        METH_O,
+        "Convert concatenated variable-length sortable bytes back to "
+        "a list of unsigned 64-bit integers"
+    },
+    {
+        "varuint_size",
+        varuint_size,
+        METH_O,
+        "Return the number of bytes of an unsigned 64-bit integer "
+        "as a varint"
+    },
+    {
+        NULL,
+        NULL,
+        0,
+        NULL
+    }
+};
+
+int numenc_add_varint_functions(PyObject* module) {
+    return PyModule_AddFunctions(module, VarintMethods);
+}
@@ -1,3 +1,12 @@
+import datetime
+import decimal
+import os
+from typing import Any, Iterable, Iterator, List, Optional, Sequence, Tuple, Union
+
+BytesLike = Union[bytes, bytearray, memoryview]
+WritableBytesLike = Union[bytearray, memoryview]
+PathLike = Union[str, bytes, os.PathLike]
+
 def from_int8(value: int) -> bytes: ...
 def to_int8(value: bytes) -> int: ...
 def from_uint8(value: int) -> bytes: ...
@@ -22,3 +31,210 @@ def from_float32(value: float) -> bytes: ...
 def to_float32(value: bytes) -> float: ...
 def from_float64(value: float) -> bytes: ...
 def to_float64(value: bytes) -> float: ...
+
+def from_int8_many(values: Iterable[int]) -> bytes: ...
+def from_uint8_many(values: Iterable[int]) -> bytes: ...
+def from_int16_many(values: Iterable[int]) -> bytes: ...
+def from_uint16_many(values: Iterable[int]) -> bytes: ...
+def from_int32_many(values: Iterable[int]) -> bytes: ...
+def from_uint32_many(values: Iterable[int]) -> bytes: ...
+def from_int64_many(values: Iterable[int]) -> bytes: ...
+def from_uint64_many(values: Iterable[int]) -> bytes: ...
+def from_float32_many(values: Iterable[float]) -> bytes: ...
+def from_float64_many(values: Iterable[float]) -> bytes: ...
+
+def to_int8_many(keys: BytesLike) -> List[int]: ...
+def to_uint8_many(keys: BytesLike) -> List[int]: ...
+def to_int16_many(keys: BytesLike) -> List[int]: ...
+def to_uint16_many(keys: BytesLike) -> List[int]: ...
+def to_int32_many(keys: BytesLike) -> List[int]: ...
+def to_uint32_many(keys: BytesLike) -> List[int]: ...
+def to_int64_many(keys: BytesLike) -> List[int]: ...
+def to_uint64_many(keys: BytesLike) -> List[int]: ...
+def to_float32_many(keys: BytesLike) -> List[float]: ...
+def to_float64_many(keys: BytesLike) -> List[float]: ...
+
+def encode_array(values: Any, output: str = 'bytes', threads: int = 1) -> Any: ...
+def decode_array(keys: Any, type: str, output: str = 'array', threads: int = 1) -> Any: ...
+
+def simd_kernels() -> List[str]: ...
+def get_simd() -> str: ...
+def set_simd(kernels: str) -> None: ...
+
+def set_hot_range(type: str, start: int, stop: int) -> None: ...
+def get_hot_range(type: str) -> Tuple[int, int]: ...
+
+def from_int8_into(value: int, buffer: WritableBytesLike, offset: int = 0) -> None: ...
+def to_int8_from(buffer: BytesLike, offset: int = 0) -> int: ...
+def from_uint8_into(value: int, buffer: WritableBytesLike, offset: int = 0) -> None: ...
+def to_uint8_from(buffer: BytesLike, offset: int = 0) -> int: ...
+def from_int16_into(value: int, buffer: WritableBytesLike, offset: int = 0) -> None: ...
+def to_int16_from(buffer: BytesLike, offset: int = 0) -> int: ...
+def from_uint16_into(value: int, buffer: WritableBytesLike, offset: int = 0) -> None: ...
+def to_uint16_from(buffer: BytesLike, offset: int = 0) -> int: ...
+def from_int32_into(value: int, buffer: WritableBytesLike, offset: int = 0) -> None: ...
+def to_int32_from(buffer: BytesLike, offset: int = 0) -> int: ...
+def from_uint32_into(value: int, buffer: WritableBytesLike, offset: int = 0) -> None: ...
+def to_uint32_from(buffer: BytesLike, offset: int = 0) -> int: ...
+def from_int64_into(value: int, buffer: WritableBytesLike, offset: int = 0) -> None: ...
+def to_int64_from(buffer: BytesLike, offset: int = 0) -> int: ...
+def from_uint64_into(value: int, buffer: WritableBytesLike, offset: int = 0) -> None: ...
+def to_uint64_from(buffer: BytesLike, offset: int = 0) -> int: ...
+def from_float32_into(value: float, buffer: WritableBytesLike, offset: int = 0) -> None: ...
+def to_float32_from(buffer: BytesLike, offset: int = 0) -> float: ...
+def from_float64_into(value: float, buffer: WritableBytesLike, offset: int = 0) -> None: ...
+def to_float64_from(buffer: BytesLike, offset: int = 0) -> float: ...
+
+def from_int8_desc(value: int) -> bytes: ...
+def to_int8_desc(value: bytes) -> int: ...
+def from_uint8_desc(value: int) -> bytes: ...
+def to_uint8_desc(value: bytes) -> int: ...
+def from_int16_desc(value: int) -> bytes: ...
+def to_int16_desc(value: bytes) -> int: ...
+def from_uint16_desc(value: int) -> bytes: ...
+def to_uint16_desc(value: bytes) -> int: ...
+def from_int32_desc(value: int) -> bytes: ...
+def to_int32_desc(value: bytes) -> int: ...
+def from_uint32_desc(value: int) -> bytes: ...
+def to_uint32_desc(value: bytes) -> int: ...
+def from_int64_desc(value: int) -> bytes: ...
+def to_int64_desc(value: bytes) -> int: ...
+def from_uint64_desc(value: int) -> bytes: ...
+def to_uint64_desc(value: bytes) -> int: ...
+def from_float32_desc(value: float) -> bytes: ...
+def to_float32_desc(value: bytes) -> float: ...
+def from_float64_desc(value: float) -> bytes: ...
+def to_float64_desc(value: bytes) -> float: ...
+
+def from_int8_desc_many(values: Iterable[int]) -> bytes: ...
+def from_uint8_desc_many(values: Iterable[int]) -> bytes: ...
+def from_int16_desc_many(values: Iterable[int]) -> bytes: ...
+def from_uint16_desc_many(values: Iterable[int]) -> bytes: ...
+def from_int32_desc_many(values: Iterable[int]) -> bytes: ...
+def from_uint32_desc_many(values: Iterable[int]) -> bytes: ...
+def from_int64_desc_many(values: Iterable[int]) -> bytes: ...
+def from_uint64_desc_many(values: Iterable[int]) -> bytes: ...
+def from_float32_desc_many(values: Iterable[float]) -> bytes: ...
+def from_float64_desc_many(values: Iterable[float]) -> bytes: ...
+
+def to_int8_desc_many(keys: BytesLike) -> List[int]: ...
+def to_uint8_desc_many(keys: BytesLike) -> List[int]: ...
+def to_int16_desc_many(keys: BytesLike) -> List[int]: ...
+def to_uint16_desc_many(keys: BytesLike) -> List[int]: ...
+def to_int32_desc_many(keys: BytesLike) -> List[int]: ...
+def to_uint32_desc_many(keys: BytesLike) -> List[int]: ...
+def to_int64_desc_many(keys: BytesLike) -> List[int]: ...
+def to_uint64_desc_many(keys: BytesLike) -> List[int]: ...
+def to_float32_desc_many(keys: BytesLike) -> List[float]: ...
+def to_float64_desc_many(keys: BytesLike) -> List[float]: ...
+
+def from_varint(value: int) -> bytes: ...
+def to_varint(key: bytes) -> int: ...
+def from_varint_many(values: Iterable[int]) -> bytes: ...
+def to_varint_many(keys: BytesLike) -> List[int]: ...
+def varint_size(value: int) -> int: ...
+def from_varuint(value: int) -> bytes: ...
+def to_varuint(key: bytes) -> int: ...
+def from_varuint_many(values: Iterable[int]) -> bytes: ...
+def to_varuint_many(keys: BytesLike) -> List[int]: ...
+def varuint_size(value: int) -> int: ...
+
+class Struct:
+    format: str
+    size: Optional[int]
+
+    def __init__(self, format: str) -> None: ...
+    def pack(self, *values: Any) -> bytes: ...
+    def unpack(self, key: BytesLike) -> Tuple[Any, ...]: ...
+    def pack_into(self, buffer: WritableBytesLike, offset: int, *values: Any) -> None: ...
+    def unpack_from(self, buffer: BytesLike, offset: int = 0) -> Tuple[Any, ...]: ...
+    def unpack_prefix(self, buffer: BytesLike, fields: Optional[int] = None, offset: int = 0) -> Tuple[Tuple[Any, ...], int]: ...
+    def pack_many(self, values: Iterable[Sequence[Any]], columns: bool = False) -> bytes: ...
+    def unpack_many(self, keys: BytesLike, columns: bool = False) -> Any: ...
+
+class Codec:
+    name: str
+    width: int
+
+    def encode(self, value: Any) -> bytes: ...
+    def decode(self, key: bytes) -> Any: ...
+    def encode_many(self, values: Iterable[Any]) -> bytes: ...
+    def decode_many(self, keys: BytesLike) -> List[Any]: ...
+    def encode_into(self, value: Any, buffer: WritableBytesLike, offset: int = 0) -> None: ...
+    def decode_from(self, buffer: BytesLike, offset: int = 0) -> Any: ...
+    def searchsorted(self, keys: BytesLike, value: Any, side: str = 'left') -> int: ...
+    def searchsorted_many(self, keys: BytesLike, values: Iterable[Any], side: str = 'left', threads: int = 1) -> List[int]: ...
+    def key_range(self, low: Optional[Any] = None, high: Optional[Any] = None, low_inclusive: bool = True, high_inclusive: bool = False, prefix: BytesLike = b'') -> Optional[Tuple[bytes, Optional[bytes]]]: ...
+    def key_ranges(self, bounds: Iterable[Tuple[Any, ...]], low_inclusive: bool = True, high_inclusive: bool = False, prefix: BytesLike = b'') -> List[Optional[Tuple[bytes, Optional[bytes]]]]: ...
+    def next_value(self, value: Any) -> Any: ...
+    def previous_value(self, value: Any) -> Any: ...
+
+def codec(type: str) -> Codec: ...
+
+def searchsorted(keys: BytesLike, key: BytesLike, side: str = 'left') -> int: ...
+def searchsorted_many(keys: BytesLike, probes: BytesLike, width: int, side: str = 'left', threads: int = 1) -> List[int]: ...
+
+def sort_packed(buffer: WritableBytesLike, width: int) -> None: ...
+def argsort_packed(buffer: BytesLike, width: int, output: str = 'array') -> Any: ...
+def sort_array(values: Any) -> None: ...
+
+class SortedKeyArray:
+    width: int
+
+    def __init__(self, width: int, keys: Optional[BytesLike] = None) -> None: ...
+    def __len__(self) -> int: ...
+    def __getitem__(self, index: int) -> bytes: ...
+    def __contains__(self, key: object) -> bool: ...
+    def __iter__(self) -> Iterator[bytes]: ...
+    def __buffer__(self, flags: int) -> memoryview: ...
+    def insert(self, key: BytesLike) -> None: ...
+    def insert_many(self, keys: BytesLike) -> None: ...
+    def remove(self, key: BytesLike) -> None: ...
+    def remove_many(self, keys: BytesLike) -> int: ...
+    def bisect_left(self, key: BytesLike) -> int: ...
+    def bisect_right(self, key: BytesLike) -> int: ...
+    def irange(self, start: Optional[BytesLike] = None, stop: Optional[BytesLike] = None) -> Iterator[bytes]: ...
+
+def encode_block(keys: Union[Iterable[BytesLike], BytesLike], restart_interval: int = 16, width: Optional[int] = None) -> bytes: ...
+
+class KeyBlock:
+    restart_interval: int
+    restart_count: int
+
+    def __init__(self, data: BytesLike) -> None: ...
+    def __len__(self) -> int: ...
+    def __contains__(self, key: object) -> bool: ...
+    def __iter__(self) -> Iterator[bytes]: ...
+    def seek(self, key: BytesLike) -> Iterator[bytes]: ...
+    def irange(self, start: Optional[BytesLike] = None, stop: Optional[BytesLike] = None) -> Iterator[bytes]: ...
+
+def sort_file(input: PathLike, output: PathLike, width: int, memory: int = 67108864, tmp_dir: Optional[PathLike] = None, workers: int = 1) -> int: ...
+
+class FixedPoint:
+    scale: int
+    width: int
+
+    def __init__(self, scale: int, width: int = 8) -> None: ...
+    def encode(self, value: Union[decimal.Decimal, int, str]) -> bytes: ...
+    def decode(self, key: bytes) -> decimal.Decimal: ...
+    def encode_many(self, values: Iterable[Union[decimal.Decimal, int, str]]) -> bytes: ...
+    def decode_many(self, keys: BytesLike) -> List[decimal.Decimal]: ...
+    def encode_into(self, value: Union[decimal.Decimal, int, str], buffer: WritableBytesLike, offset: int = 0) -> None: ...
+    def decode_from(self, buffer: BytesLike, offset: int = 0) -> decimal.Decimal: ...
+
+Time = Union[datetime.datetime, datetime.date, datetime.timedelta]
+
+class TimeCodec:
+    type: str
+    unit: str
+    width: int
+
+    def __init__(self, type: str, unit: Optional[str] = None) -> None: ...
+    def encode(self, value: Time) -> bytes: ...
+    def decode(self, key: bytes) -> Time: ...
+    def encode_many(self, values: Iterable[Time]) -> bytes: ...
+    def decode_many(self, keys: BytesLike) -> List[Time]: ...
+    def encode_into(self, value: Time, buffer: WritableBytesLike, offset: int = 0) -> None: ...
+    def decode_from(self, buffer: BytesLike, offset: int = 0) -> Time: ...
+    def encode_array(self, values: Any, threads: int = 1) -> bytes: ...
+    def decode_array(self, keys: BytesLike, threads: int = 1) -> Any: ...
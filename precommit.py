@@ -141,35 +141,36 @@ def main() -> int:
     if overwrite:
         subprocess.check_call([
             "yapf", "--in-place", "--style=style.yapf", "--recursive", "tests",
-            "numenc", "setup.py", "precommit.py", "bin/pynumenc"
+            "benchmarks", "numenc", "setup.py", "precommit.py", "bin/pynumenc"
         ], cwd=repo_root.as_posix())
     else:
         subprocess.check_call([
             "yapf", "--diff", "--style=style.yapf", "--recursive", "tests",
-            "numenc", "setup.py", "precommit.py", "bin/pynumenc"
+            "benchmarks", "numenc", "setup.py", "precommit.py", "bin/pynumenc"
         ], cwd=repo_root.as_posix())
 
     print("Mypy'ing...")
-    subprocess.check_call(["mypy", "tests", "bin/pynumenc"],
+    subprocess.check_call(["mypy", "tests", "benchmarks", "bin/pynumenc"],
                           cwd=repo_root.as_posix())
 
     print("Isort'ing...")
     if overwrite:
         subprocess.check_call([
-            "isort", "--recursive", "tests",
+            "isort", "--recursive", "tests", "benchmarks",
             "bin/pynumenc"], cwd=repo_root.as_posix())
     else:
         subprocess.check_call([
-            "isort", "--check-only", "--recursive", "tests",
+            "isort", "--check-only", "--recursive", "tests", "benchmarks",
             "bin/pynumenc"], cwd=repo_root.as_posix())
 
     print("Pylint'ing...")
     subprocess.check_call(
-        ["pylint", "--rcfile=pylint.rc", "tests", "bin/pynumenc"],
+        ["pylint", "--rcfile=pylint.rc", "tests", "benchmarks",
+         "bin/pynumenc"],
         cwd=repo_root.as_posix())
 
     print("Pydocstyle'ing...")
-    subprocess.check_call(["pydocstyle", "bin/pynumenc"],
+    subprocess.check_call(["pydocstyle", "benchmarks", "bin/pynumenc"],
                           cwd=repo_root.as_posix())
     # yapf: enable
 
@@ -29,12 +29,13 @@ setup(
         'Development Status :: 5 - Production/Stable',
         'Intended Audience :: End Users/Desktop',
         'License :: OSI Approved :: MIT License',
-        'Programming Language :: Python :: 3.5',
-        'Programming Language :: Python :: 3.6'
+        'Programming Language :: Python :: 3.7',
+        'Programming Language :: Python :: 3.8'
     ],
     license='License :: OSI Approved :: MIT License',
     keywords='C++ encode decode bytes encoding decoding sorted',
-    packages=find_packages(exclude=['docs', 'tests']),
+    packages=find_packages(exclude=['benchmarks', 'docs', 'tests']),
+    python_requires='>=3.7',
     install_requires=[],
     extras_require={
         'dev': [
@@ -50,7 +51,21 @@ setup(
         ]
     },
     ext_modules=[
-        Extension('numenc', sources=['numenc-cpp/encoder_decoder.cpp'])
+        Extension(
+            'numenc',
+            sources=[
+                'numenc-cpp/encoder_decoder.cpp', 'numenc-cpp/codec.cpp',
+                'numenc-cpp/batch.cpp', 'numenc-cpp/arrays.cpp',
+                'numenc-cpp/inplace.cpp', 'numenc-cpp/struct.cpp',
+                'numenc-cpp/codec_object.cpp', 'numenc-cpp/varint.cpp',
+                'numenc-cpp/desc.cpp', 'numenc-cpp/decimal.cpp',
+                'numenc-cpp/timestamp.cpp', 'numenc-cpp/search.cpp',
+                'numenc-cpp/sort.cpp', 'numenc-cpp/sorted_array.cpp',
+                'numenc-cpp/extsort.cpp', 'numenc-cpp/parallel.cpp',
+                'numenc-cpp/simd.cpp', 'numenc-cpp/intern.cpp',
+                'numenc-cpp/key_block.cpp', 'numenc-cpp/ranges.cpp'
+            ],
+            depends=['numenc-cpp/numenc.h', 'numenc-cpp/simd_kernels.h'])
     ],
     scripts=['bin/pynumenc'],
     py_modules=['pynumenc_meta'],
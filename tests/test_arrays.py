@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+# pylint: disable=missing-docstring
+import array
+import unittest
+from typing import List
+
+import hypothesis
+import hypothesis.strategies
+import numenc
+
+try:
+    import numpy
+except ImportError:
+    numpy = None  # type: ignore
+
+# yapf: disable
+TYPECODES = {
+    'b': 'int8',
+    'B': 'uint8',
+    'h': 'int16',
+    'H': 'uint16',
+    'i': 'int32',
+    'I': 'uint32',
+    'q': 'int64',
+    'Q': 'uint64',
+    'f': 'float32',
+    'd': 'float64',
+}
+# yapf: enable
+
+
+class TestArrays(unittest.TestCase):
+    def test_encode_matches_batch(self):
+        for typecode, tajp in TYPECODES.items():
+            values = array.array(typecode, [0, 1, 2, 3, 100, 127])
+            from_many = getattr(numenc, 'from_{}_many'.format(tajp))
+
+            self.assertEqual(
+                from_many(values), numenc.encode_array(values), msg=tajp)
+
+    def test_round_trip(self):
+        for typecode, tajp in TYPECODES.items():
+            values = array.array(typecode, [0, 1, 2, 3, 100, 127])
+            decoded = numenc.decode_array(numenc.encode_array(values), tajp)
+
+            self.assertEqual(values, decoded, msg=tajp)
+            self.assertEqual(values.itemsize, decoded.itemsize, msg=tajp)
+
+    @hypothesis.given(
+        hypothesis.strategies.lists(
+            hypothesis.strategies.integers(
+                min_value=-2**63, max_value=2**63 - 1)))
+    def test_int64_automatic(self, values: List[int]):
+        arr = array.array('q', values)
+        keys = numenc.encode_array(arr)
+
+        self.assertEqual(numenc.from_int64_many(values), keys)
+        self.assertEqual(arr, numenc.decode_array(keys, 'int64'))
+
+    def test_multidimensional(self):
+        values = array.array('i', range(6))
+        view = memoryview(values).cast('B').cast('i', shape=[2, 3])
+
+        self.assertEqual(
+            numenc.from_int32_many(range(6)), numenc.encode_array(view))
+
+    def test_encode_exceptions(self):
+        for weird_val in ["some string", [1, 2, 3], 232]:
+            with self.assertRaises(TypeError) as ctx:
+                numenc.encode_array(weird_val)
+
+            self.assertEqual(
+                "Wrong input: expected an object supporting the buffer "
+                "protocol.", str(ctx.exception))
+
+        with self.assertRaises(TypeError) as ctx:
+            numenc.encode_array(memoryview(b'abcd').cast('c'))
+        self.assertEqual(
+            "Wrong input: unsupported buffer format c with item size 1.",
+            str(ctx.exception))
+
+        with self.assertRaises(ValueError) as ctx:
+            numenc.encode_array(array.array('q'), output='list')
+        self.assertEqual(
+            "Illegal output: expected 'bytes', 'uint8' or 'S', got 'list'.",
+            str(ctx.exception))
+
+    def test_decode_exceptions(self):
+        with self.assertRaises(ValueError) as ctx:
+            numenc.decode_array(b'', 'int128')
+        self.assertTrue(
+            str(ctx.exception).startswith("Unsupported type: int128."))
+
+        with self.assertRaises(ValueError) as ctx:
+            numenc.decode_array(b'\x00\x00\x00', 'int16')
+        self.assertEqual(
+            "Illegal input: expected a buffer whose length is a multiple "
+            "of 2, got 3.", str(ctx.exception))
+
+        with self.assertRaises(ValueError) as ctx:
+            numenc.decode_array(b'', 'int16', output='bytes')
+        self.assertEqual(
+            "Illegal output: expected 'array' or 'ndarray', got 'bytes'.",
+            str(ctx.exception))
+
+
+@unittest.skipIf(numpy is None, "numpy is not installed")
+class TestNumpyArrays(unittest.TestCase):
+    def test_round_trip(self):
+        for tajp in TYPECODES.values():
+            values = numpy.arange(0, 120, dtype=tajp)
+            if not tajp.startswith('uint'):
+                values -= 60
+
+            keys = numenc.encode_array(values)
+
+            decoded = numenc.decode_array(keys, tajp, output='ndarray')
+            self.assertEqual(numpy.dtype(tajp), decoded.dtype)
+            self.assertTrue(numpy.array_equal(values, decoded), msg=tajp)
+
+    def test_uint8_output(self):
+        values = numpy.array([-2, 1, 1024], dtype=numpy.int32)
+        keys = numenc.encode_array(values, output='uint8')
+
+        self.assertEqual((3, 4), keys.shape)
+        self.assertEqual(numpy.uint8, keys.dtype)
+        self.assertEqual(
+            numenc.from_int32_many(values.tolist()), keys.tobytes())
+
+        decoded = numenc.decode_array(keys, 'int32', output='ndarray')
+        self.assertTrue(numpy.array_equal(values, decoded))
+
+    def test_bytes_output_sorts(self):
+        values = numpy.array([3.5, -1.0, 0.0, -7.25, 1e10])
+        keys = numenc.encode_array(values, output='S')
+
+        self.assertEqual(numpy.dtype('S8'), keys.dtype)
+        self.assertTrue(
+            numpy.array_equal(numpy.argsort(values), numpy.argsort(keys)))
+
+    def test_non_native_byte_order(self):
+        values = numpy.array([-5, 0, 5], dtype='>i8')
+        self.assertEqual(
+            numenc.from_int64_many([-5, 0, 5]), numenc.encode_array(values))
+
+        values = numpy.array([-1.5, 0.0, 2.25], dtype='<f8').byteswap()
+        values = values.view(values.dtype.newbyteorder())
+        self.assertEqual(
+            numenc.from_float64_many([-1.5, 0.0, 2.25]),
+            numenc.encode_array(values))
+
+
+if __name__ == '__main__':
+    unittest.main()
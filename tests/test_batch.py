@@ -0,0 +1,177 @@
+#!/usr/bin/env python3
+# pylint: disable=missing-docstring
+import array
+import mmap
+import unittest
+from typing import List
+
+import hypothesis
+import hypothesis.strategies
+import numenc
+
+# yapf: disable
+INT_RANGES = {
+    'int8': (-2**7, 2**7 - 1),
+    'uint8': (0, 2**8 - 1),
+    'int16': (-2**15, 2**15 - 1),
+    'uint16': (0, 2**16 - 1),
+    'int32': (-2**31, 2**31 - 1),
+    'uint32': (0, 2**32 - 1),
+    'int64': (-2**63, 2**63 - 1),
+    'uint64': (0, 2**64 - 1),
+}
+# yapf: enable
+
+FLOAT_TYPES = ['float32', 'float64']
+
+
+class TestEncodeMany(unittest.TestCase):
+    def test_matches_scalar_for_integers(self):
+        for tajp, (min_value, max_value) in INT_RANGES.items():
+            values = [min_value, min_value + 1, 0, 1, max_value - 1, max_value]
+            from_many = getattr(numenc, 'from_{}_many'.format(tajp))
+            from_scalar = getattr(numenc, 'from_{}'.format(tajp))
+
+            expected = b''.join(from_scalar(value) for value in values)
+            self.assertEqual(expected, from_many(values), msg=tajp)
+
+    def test_matches_scalar_for_floats(self):
+        values = [float('-inf'), -2.5, -0.0, 0.0, 1, 3.75, float('inf')]
+        for tajp in FLOAT_TYPES:
+            from_many = getattr(numenc, 'from_{}_many'.format(tajp))
+            from_scalar = getattr(numenc, 'from_{}'.format(tajp))
+
+            expected = b''.join(from_scalar(value) for value in values)
+            self.assertEqual(expected, from_many(values), msg=tajp)
+
+    @hypothesis.given(
+        hypothesis.strategies.lists(
+            hypothesis.strategies.integers(
+                min_value=-2**63, max_value=2**63 - 1)))
+    def test_int64_automatic(self, values: List[int]):
+        expected = b''.join(numenc.from_int64(value) for value in values)
+        self.assertEqual(expected, numenc.from_int64_many(values))
+        self.assertEqual(expected, numenc.from_int64_many(tuple(values)))
+        self.assertEqual(expected,
+                         numenc.from_int64_many(value for value in values))
+
+    def test_iterables(self):
+        expected = b''.join(numenc.from_uint16(value) for value in range(1000))
+
+        self.assertEqual(expected, numenc.from_uint16_many(range(1000)))
+        self.assertEqual(expected, numenc.from_uint16_many(iter(range(1000))))
+        self.assertEqual(expected,
+                         numenc.from_uint16_many(x for x in range(1000)))
+        self.assertEqual(b'', numenc.from_uint16_many([]))
+        self.assertEqual(b'', numenc.from_uint16_many(iter([])))
+
+    def test_wrong_length_hint(self):
+        class Lying:
+            def __iter__(self):
+                return iter(range(100))
+
+            def __length_hint__(self):
+                return 3
+
+        self.assertEqual(b''.join(numenc.from_int32(i) for i in range(100)),
+                         numenc.from_int32_many(Lying()))
+
+    def test_not_iterable(self):
+        for weird_val in [1, 2.3, None]:
+            with self.assertRaises(TypeError) as ctx:
+                numenc.from_int64_many(weird_val)
+
+            self.assertEqual("Wrong input: expected an iterable of numbers.",
+                             str(ctx.exception))
+
+    def test_errors_report_index(self):
+        with self.assertRaises(ValueError) as ctx:
+            numenc.from_int8_many([1, 2, 300])
+        self.assertEqual(
+            "at index 2: expected 8-bit signed integer "
+            "(range [-128, 127]), got 300.", str(ctx.exception))
+
+        with self.assertRaises(TypeError) as ctx:
+            numenc.from_uint64_many(x for x in [0, 1, -1])
+        self.assertEqual(
+            "at index 2: Wrong input: expected unsigned 64-bit integer.",
+            str(ctx.exception))
+
+        with self.assertRaises(TypeError) as ctx:
+            numenc.from_float64_many((0.0, 'some string'))
+        self.assertEqual("at index 1: Wrong input: expected 64-bit float.",
+                         str(ctx.exception))
+
+    def test_iterator_error_propagates(self):
+        def failing():
+            yield 1
+            raise KeyError('oops')
+
+        with self.assertRaises(KeyError):
+            numenc.from_int64_many(failing())
+
+
+class TestDecodeMany(unittest.TestCase):
+    def test_round_trip_integers(self):
+        for tajp, (min_value, max_value) in INT_RANGES.items():
+            values = [min_value, min_value + 1, 0, 1, max_value - 1, max_value]
+            from_many = getattr(numenc, 'from_{}_many'.format(tajp))
+            to_many = getattr(numenc, 'to_{}_many'.format(tajp))
+
+            self.assertEqual(values, to_many(from_many(values)), msg=tajp)
+
+    def test_round_trip_floats(self):
+        values = [float('-inf'), -2.5, 0.0, 1.0, 3.75, float('inf')]
+        for tajp in FLOAT_TYPES:
+            from_many = getattr(numenc, 'from_{}_many'.format(tajp))
+            to_many = getattr(numenc, 'to_{}_many'.format(tajp))
+
+            self.assertEqual(values, to_many(from_many(values)), msg=tajp)
+
+    @hypothesis.given(
+        hypothesis.strategies.lists(
+            hypothesis.strategies.floats(allow_nan=False)))
+    def test_float64_automatic(self, values: List[float]):
+        keys = numenc.from_float64_many(values)
+        self.assertEqual(
+            [numenc.to_float64(keys[i:i + 8]) for i in range(0, len(keys), 8)],
+            numenc.to_float64_many(keys))
+
+    def test_buffer_types(self):
+        values = list(range(-500, 500, 7))
+        keys = numenc.from_int32_many(values)
+
+        self.assertEqual(values, numenc.to_int32_many(keys))
+        self.assertEqual(values, numenc.to_int32_many(bytearray(keys)))
+        self.assertEqual(values, numenc.to_int32_many(memoryview(keys)))
+        self.assertEqual(values[1:3],
+                         numenc.to_int32_many(memoryview(keys)[4:12]))
+        self.assertEqual(values, numenc.to_int32_many(array.array('B', keys)))
+
+        with mmap.mmap(-1, len(keys)) as mapped:
+            mapped.write(keys)
+            self.assertEqual(values, numenc.to_int32_many(mapped))
+
+        self.assertEqual([], numenc.to_int32_many(b''))
+
+    def test_decode_exceptions(self):
+        type_err_triggers = ["some string", [b'\x00'], 232, None]
+        for weird_val in type_err_triggers:
+            with self.assertRaises(TypeError) as ctx:
+                numenc.to_int16_many(weird_val)
+
+            self.assertEqual("Wrong input: expected a bytes-like object.",
+                             str(ctx.exception))
+
+        for weird_val in [b'\x01', b'\x01\x02\x03']:
+            with self.assertRaises(ValueError) as ctx:
+                numenc.to_int16_many(weird_val)
+
+            self.assertEqual(
+                "Illegal input: expected a buffer whose length is a "
+                "multiple of 2, got {}.".format(len(weird_val)),
+                str(ctx.exception))
+
+
+if __name__ == '__main__':
+    unittest.main()
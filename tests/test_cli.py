@@ -0,0 +1,381 @@
+#!/usr/bin/env python3
+# pylint: disable=missing-docstring
+import array
+import os
+import pathlib
+import subprocess
+import sys
+import tempfile
+import unittest
+from typing import List, Tuple
+
+import numenc
+
+try:
+    import numpy
+except ImportError:
+    numpy = None  # type: ignore
+
+REPO_ROOT = pathlib.Path(__file__).resolve().parent.parent
+
+
+def run(args: List[str], stdin: bytes = b'') -> Tuple[int, bytes, str]:
+    """Run pynumenc and return its exit code, stdout and stderr."""
+    env = os.environ.copy()
+    env['PYTHONPATH'] = os.pathsep.join(
+        [str(REPO_ROOT), env.get('PYTHONPATH', '')])
+    proc = subprocess.run(
+        [sys.executable, str(REPO_ROOT / 'bin' / 'pynumenc')] + args,
+        input=stdin,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+        env=env,
+        check=False)
+    return proc.returncode, proc.stdout, proc.stderr.decode()
+
+
+class TestSingleValue(unittest.TestCase):
+    def test_conversions(self):
+        self.assertEqual((0, b'2d\n', ''), run(['from_uint8', '45']))
+        self.assertEqual((0, b'0.0\n', ''), run(['to_float32', '80000000']))
+
+    def test_missing_value(self):
+        code, _, stderr = run(['from_uint8'])
+        self.assertEqual(2, code)
+        self.assertIn("the value is required unless --stream is given", stderr)
+
+
+class TestStream(unittest.TestCase):
+    def test_decimal_and_hex(self):
+        code, stdout, _ = run(['--stream', 'from_int16'], b'1\n-2\n300\n')
+        self.assertEqual(0, code)
+        self.assertEqual(b'8001\n7ffe\n812c\n', stdout)
+
+        self.assertEqual((0, b'1\n-2\n300\n', ''),
+                         run(['--stream', 'to_int16'], stdout))
+
+    def test_raw(self):
+        values = array.array('d', [1.5, -2.0, float('inf')])
+        keys = numenc.from_float64_many(values)
+
+        self.assertEqual((0, keys, ''),
+                         run([
+                             '--stream', 'from_float64', '--input-format',
+                             'raw', '--output-format', 'raw'
+                         ], values.tobytes()))
+        self.assertEqual((0, values.tobytes(), ''),
+                         run([
+                             '--stream', 'to_float64', '--input-format', 'raw',
+                             '--output-format', 'raw'
+                         ], keys))
+        self.assertEqual(
+            (0, b'1.5\n-2.0\ninf\n', ''),
+            run(['--stream', 'to_float64', '--input-format', 'raw'], keys))
+
+    def test_many_chunks(self):
+        values = list(range(-100000, 100000, 3))
+        stdin = ''.join('{}\n'.format(value) for value in values).encode()
+
+        code, stdout, _ = run(['--stream', 'from_int32'], stdin)
+        self.assertEqual(0, code)
+        self.assertEqual(
+            numenc.from_int32_many(values), bytes.fromhex(stdout.decode()))
+
+    def test_errors(self):
+        stdin = b'1\nx\n\n70000\n5\n'
+
+        self.assertEqual(
+            (1, b'8001\n', "line 2: expected an integer, got 'x'\n"),
+            run(['--stream', 'from_int16'], stdin))
+
+        self.assertEqual(
+            (1, b'8001\n8005\n', "line 2: expected an integer, got 'x'\n"
+             "line 4: Wrong input: expected signed 16-bit integer.\n"),
+            run(['--stream', 'from_int16', '--errors', 'warn'], stdin))
+
+        self.assertEqual((0, b'8001\n8005\n', ''),
+                         run(['--stream', 'from_int16', '--errors', 'ignore'],
+                             stdin))
+
+        self.assertEqual((1, b'1\n', "line 2: expected a key of 2 bytes, got "
+                          "3 bytes\nline 3: expected a hexadecimal number, "
+                          "got 'zz'\n"),
+                         run(['--stream', 'to_int16', '--errors', 'warn'],
+                             b'8001\n800000\nzz\n'))
+
+        # whitespace within the lines does not join the keys across lines
+        self.assertEqual((1, b'', "line 1: expected a key of 2 bytes, got 1 "
+                          "bytes\nline 2: expected a key of 2 bytes, got 1 "
+                          "bytes\n"),
+                         run(['--stream', 'to_uint16', '--errors', 'warn'],
+                             b' ab \n cd \n'))
+        self.assertEqual((1, b'', "line 1: expected a key of 4 bytes, got 3 "
+                          "bytes\n"),
+                         run(['--stream', 'to_int32'], b'00 11 22\n'))
+
+        self.assertEqual((1, b'1\n', "record 1: expected 2 bytes, got 1 "
+                          "bytes at the end of the input\n"),
+                         run(['--stream', 'to_int16', '--input-format', 'raw'],
+                             b'\x80\x01\x80'))
+
+        code, _, stderr = run(
+            ['--stream', 'to_int16', '--input-format', 'decimal'])
+        self.assertEqual(1, code)
+        self.assertIn("Expected the keys in the format hex or raw", stderr)
+
+
+class TestTranscode(unittest.TestCase):
+    @unittest.skipIf(numpy is None, "numpy is not installed")
+    def test_npy(self):
+        values = numpy.arange(-150000, 150000, dtype=numpy.int64) * 7919
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            tmp = pathlib.Path(tmp_dir)
+            numpy.save(str(tmp / 'values.npy'), values)
+
+            code, _, stderr = run([
+                'transcode', 'from_int64',
+                str(tmp / 'values.npy'),
+                str(tmp / 'keys.bin')
+            ])
+            self.assertEqual(0, code)
+            self.assertRegex(
+                stderr, r'^Transcoded 2\.4 MB into 2\.4 MB in .* '
+                r'MB/s\)\n$')
+            self.assertEqual(
+                numenc.encode_array(values), (tmp / 'keys.bin').read_bytes())
+
+            code, _, _ = run([
+                'transcode', 'to_int64',
+                str(tmp / 'keys.bin'),
+                str(tmp / 'decoded.npy')
+            ])
+            self.assertEqual(0, code)
+            numpy.testing.assert_array_equal(
+                values, numpy.load(str(tmp / 'decoded.npy')))
+
+            numpy.save(str(tmp / 'big_endian.npy'), values.astype('>i8'))
+            code, _, _ = run([
+                'transcode', 'from_int64',
+                str(tmp / 'big_endian.npy'),
+                str(tmp / 'keys2.bin')
+            ])
+            self.assertEqual(0, code)
+            self.assertEqual((tmp / 'keys.bin').read_bytes(),
+                             (tmp / 'keys2.bin').read_bytes())
+
+            code, _, stderr = run([
+                'transcode', 'from_int32',
+                str(tmp / 'values.npy'),
+                str(tmp / 'keys.bin')
+            ])
+            self.assertEqual(1, code)
+            self.assertIn(
+                "Expected a one-dimensional array of int32, got an "
+                "array of int64", stderr)
+
+    def test_csv(self):
+        values = [0.5, -2.0, float('inf'), 1e-300]
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            tmp = pathlib.Path(tmp_dir)
+            (tmp / 'keys.bin').write_bytes(numenc.from_float64_many(values))
+
+            code, _, _ = run([
+                'transcode', 'to_float64',
+                str(tmp / 'keys.bin'),
+                str(tmp / 'values.csv')
+            ])
+            self.assertEqual(0, code)
+            self.assertEqual(b'0.5\n-2.0\ninf\n1e-300\n',
+                             (tmp / 'values.csv').read_bytes())
+
+            code, _, _ = run([
+                'transcode', 'from_float64', '--format', 'csv',
+                str(tmp / 'values.csv'),
+                str(tmp / 'keys.txt')
+            ])
+            self.assertEqual(0, code)
+            self.assertEqual((tmp / 'keys.bin').read_bytes(),
+                             (tmp / 'keys.txt').read_bytes())
+
+    def test_errors(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            tmp = pathlib.Path(tmp_dir)
+            (tmp / 'keys.bin').write_bytes(b'\x80\x00\x01')
+            (tmp / 'values.csv').write_bytes(b'1\nx\n3\n')
+
+            self.assertEqual(
+                (1, b'', "Expected a file of 2-byte keys, got 3 bytes in "
+                 "{}\n".format(tmp / 'keys.bin')),
+                run([
+                    'transcode', 'to_int16',
+                    str(tmp / 'keys.bin'),
+                    str(tmp / 'values.csv')
+                ]))
+
+            self.assertEqual((1, b'', "line 2: expected an integer, got "
+                              "'x'\n"),
+                             run([
+                                 'transcode', 'from_int16',
+                                 str(tmp / 'values.csv'),
+                                 str(tmp / 'keys.bin')
+                             ]))
+
+            code, _, _ = run([
+                'transcode', 'from_int16', '--errors', 'ignore',
+                str(tmp / 'values.csv'),
+                str(tmp / 'keys.bin')
+            ])
+            self.assertEqual(0, code)
+            self.assertEqual(
+                numenc.from_int16_many([1, 3]), (tmp / 'keys.bin').read_bytes())
+
+            code, _, stderr = run([
+                'transcode', 'to_int16',
+                str(tmp / 'keys.bin'),
+                str(tmp / 'values.txt')
+            ])
+            self.assertEqual(1, code)
+            self.assertIn("please specify --format", stderr)
+
+
+class TestJobs(unittest.TestCase):
+    # several chunks of the stream mode
+    VALUES = list(range(-1200000, 1200000, 3))
+
+    def test_identical_to_single_job(self):
+        stdin = ''.join('{}\n'.format(value) for value in self.VALUES).encode()
+        expected = run(['--stream', 'from_int32'], stdin)
+        self.assertEqual(0, expected[0])
+        self.assertEqual((0, expected[1], ''),
+                         run(['--stream', 'from_int32', '--jobs', '3'], stdin))
+
+        self.assertEqual((0, stdin, ''),
+                         run(['--stream', 'to_int32', '--jobs', '2'],
+                             expected[1]))
+
+    def test_raw(self):
+        keys = numenc.from_int64_many(self.VALUES)
+        values = array.array('q', self.VALUES).tobytes()
+        self.assertEqual((0, values, ''),
+                         run([
+                             '--stream', 'to_int64', '--input-format', 'raw',
+                             '--output-format', 'raw', '--jobs', '4'
+                         ], keys))
+
+        self.assertEqual(
+            (1, values, "record {}: expected 8 bytes, got 3 "
+             "bytes at the end of the input\n".format(len(self.VALUES))),
+            run([
+                '--stream', 'to_int64', '--input-format', 'raw',
+                '--output-format', 'raw', '--jobs', '4'
+            ], keys + b'\x80\x00\x00'))
+
+    def test_errors_in_order(self):
+        lines = ['{}'.format(value) for value in self.VALUES]
+        invalid = [10, len(lines) // 2, len(lines) - 1]
+        for index in invalid:
+            lines[index] = 'x{}'.format(index)
+        stdin = ''.join(line + '\n' for line in lines).encode()
+
+        reports = ''.join("line {}: expected an integer, got 'x{}'\n".format(
+            index + 1, index) for index in invalid)
+        for errors in ['warn', 'ignore']:
+            expected = run(['--stream', 'from_int32', '--errors', errors],
+                           stdin)
+            self.assertEqual(reports if errors == 'warn' else '', expected[2])
+            self.assertEqual(
+                expected,
+                run([
+                    '--stream', 'from_int32', '--errors', errors, '--jobs', '3'
+                ], stdin))
+
+        expected = run(['--stream', 'from_int32'], stdin)
+        self.assertEqual((1, "line 11: expected an integer, got 'x10'\n"),
+                         expected[::2])
+        self.assertEqual(expected,
+                         run(['--stream', 'from_int32', '--jobs', '3'], stdin))
+
+        lines[10] = '10'
+        stdin = ''.join(line + '\n' for line in lines).encode()
+        expected = run(['--stream', 'from_int32'], stdin)
+        self.assertEqual(1, expected[0])
+        self.assertEqual(expected,
+                         run(['--stream', 'from_int32', '--jobs', '3'], stdin))
+
+    def test_stats(self):
+        stdin = ''.join('{}\n'.format(value) for value in self.VALUES).encode()
+        code, _, stderr = run(
+            ['--stream', 'from_int32', '--jobs', '2', '--stats'], stdin)
+        self.assertEqual(0, code)
+        self.assertRegex(
+            stderr, r'^(worker \d \(pid \d+\): \d+ chunks, [0-9.]+ MB in '
+            r'[0-9.]+ s \([0-9.]+ MB/s\)\n)+'
+            r'total: 6\.1 MB in [0-9.]+ s wall time \([0-9.]+ MB/s\) with 2 '
+            r'jobs\n$')
+
+    @unittest.skipIf(numpy is None, "numpy is not installed")
+    def test_stats_npy(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            tmp = pathlib.Path(tmp_dir)
+            numpy.save(
+                str(tmp / 'values.npy'),
+                numpy.array(self.VALUES, dtype=numpy.int64))
+
+            code, _, stderr = run([
+                'transcode', 'from_int64', '--jobs', '2', '--stats',
+                str(tmp / 'values.npy'),
+                str(tmp / 'keys.bin')
+            ])
+            self.assertEqual(0, code)
+            self.assertRegex(
+                stderr, r'^2 threads \(pid \d+\): \d+ chunks, 6\.4 MB in '
+                r'[0-9.]+ s \([0-9.]+ MB/s\)\n'
+                r'total: 6\.4 MB in [0-9.]+ s wall time \([0-9.]+ MB/s\) '
+                r'with 2 jobs\nTranscoded ')
+
+            code, _, stderr = run([
+                'transcode', 'to_int64', '--jobs', '1', '--stats',
+                str(tmp / 'keys.bin'),
+                str(tmp / 'decoded.npy')
+            ])
+            self.assertEqual(0, code)
+            self.assertRegex(
+                stderr, r'^1 thread \(pid \d+\): \d+ chunks, 6\.4 MB in '
+                r'[0-9.]+ s \([0-9.]+ MB/s\)\n'
+                r'total: 6\.4 MB in [0-9.]+ s wall time \([0-9.]+ MB/s\) '
+                r'with 1 job\n')
+
+    def test_transcode(self):
+        values = [value / 8 for value in self.VALUES]
+        keys = numenc.from_float64_many(values)
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            tmp = pathlib.Path(tmp_dir)
+            (tmp / 'keys.bin').write_bytes(keys)
+
+            for jobs in ['1', '3']:
+                code, _, _ = run([
+                    'transcode', 'to_float64', '--jobs', jobs,
+                    str(tmp / 'keys.bin'),
+                    str(tmp / 'values.csv')
+                ])
+                self.assertEqual(0, code)
+                self.assertEqual(
+                    ''.join('{!r}\n'.format(value) for value in values),
+                    (tmp / 'values.csv').read_text())
+
+                code, _, _ = run([
+                    'transcode', 'from_float64', '--jobs', jobs,
+                    str(tmp / 'values.csv'),
+                    str(tmp / 'decoded.bin')
+                ])
+                self.assertEqual(0, code)
+                self.assertEqual(keys, (tmp / 'decoded.bin').read_bytes())
+
+    def test_invalid_jobs(self):
+        code, _, stderr = run(['--stream', 'from_int8', '--jobs', '0'])
+        self.assertEqual(2, code)
+        self.assertIn("--jobs must be at least 1, got 0", stderr)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+# pylint: disable=missing-docstring
+import unittest
+
+import numenc
+
+# yapf: disable
+VALUES = {
+    'int8': [-2**7, -1, 0, 2**7 - 1],
+    'uint8': [0, 1, 2**8 - 1],
+    'int16': [-2**15, -1, 0, 2**15 - 1],
+    'uint16': [0, 1, 2**16 - 1],
+    'int32': [-2**31, -1, 0, 2**31 - 1],
+    'uint32': [0, 1, 2**32 - 1],
+    'int64': [-2**63, -1, 0, 2**63 - 1],
+    'uint64': [0, 1, 2**64 - 1],
+    'float32': [float('-inf'), -1.5, 0.0, 2.25, float('inf')],
+    'float64': [float('-inf'), -1.5, 0.0, 2.25, float('inf')],
+}
+# yapf: enable
+
+
+class TestCodec(unittest.TestCase):
+    def test_matches_functions(self):
+        for tajp, values in VALUES.items():
+            codec = numenc.codec(tajp)
+            from_scalar = getattr(numenc, 'from_{}'.format(tajp))
+
+            self.assertEqual(tajp, codec.name)
+            self.assertEqual(len(from_scalar(values[0])), codec.width)
+
+            keys = getattr(numenc, 'from_{}_many'.format(tajp))(values)
+            self.assertEqual(keys, codec.encode_many(values), msg=tajp)
+            self.assertEqual(values, codec.decode_many(keys), msg=tajp)
+
+            for value in values:
+                key = codec.encode(value)
+                self.assertEqual(from_scalar(value), key, msg=tajp)
+                self.assertEqual(value, codec.decode(key), msg=tajp)
+
+                page = bytearray(codec.width + 2)
+                self.assertIsNone(codec.encode_into(value, page, 1))
+                self.assertEqual(value, codec.decode_from(page, 1))
+
+    def test_shared(self):
+        self.assertIs(numenc.codec('float64'), numenc.codec('float64'))
+        self.assertIsInstance(numenc.codec('uint8'), numenc.Codec)
+        self.assertEqual("numenc.codec('uint8')", repr(numenc.codec('uint8')))
+
+    def test_exceptions(self):
+        with self.assertRaises(ValueError) as ctx:
+            numenc.codec('int128')
+        self.assertTrue(
+            str(ctx.exception).startswith("Unsupported type: int128."))
+
+        with self.assertRaises(TypeError) as ctx:
+            numenc.codec(32)
+        self.assertEqual("Wrong input: expected the name of a type as str.",
+                         str(ctx.exception))
+
+        with self.assertRaises(TypeError):
+            numenc.Codec()
+
+        codec = numenc.codec('uint8')
+        with self.assertRaises(ValueError) as ctx:
+            codec.encode(256)
+        self.assertEqual(
+            "expected 8-bit unsigned integer (range [0, 255]), got 256.",
+            str(ctx.exception))
+
+        with self.assertRaises(TypeError) as ctx:
+            codec.encode_into(1)
+        self.assertEqual("encode_into() takes 2 or 3 arguments (1 given)",
+                         str(ctx.exception))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+# pylint: disable=missing-docstring
+import unittest
+from typing import List
+
+import hypothesis
+import hypothesis.strategies
+import numenc
+
+# yapf: disable
+VALUES = {
+    'int8': [-2**7, -1, 0, 2**7 - 1],
+    'uint8': [0, 1, 2**8 - 1],
+    'int16': [-2**15, -1, 0, 2**15 - 1],
+    'uint16': [0, 1, 2**16 - 1],
+    'int32': [-2**31, -1, 0, 2**31 - 1],
+    'uint32': [0, 1, 2**32 - 1],
+    'int64': [-2**63, -1, 0, 2**63 - 1],
+    'uint64': [0, 1, 2**64 - 1],
+    'float32': [float('-inf'), -1.5, 0.0, 2.25, float('inf')],
+    'float64': [float('-inf'), -1.5, 0.0, 2.25, float('inf')],
+}
+# yapf: enable
+
+
+def complement(key: bytes) -> bytes:
+    return bytes(255 - byte for byte in key)
+
+
+class TestDesc(unittest.TestCase):
+    def test_complement_of_ascending(self):
+        for tajp, values in VALUES.items():
+            from_asc = getattr(numenc, 'from_{}'.format(tajp))
+            from_desc = getattr(numenc, 'from_{}_desc'.format(tajp))
+            to_desc = getattr(numenc, 'to_{}_desc'.format(tajp))
+
+            for value in values:
+                key = from_desc(value)
+                self.assertEqual(complement(from_asc(value)), key, msg=tajp)
+                self.assertEqual(value, to_desc(key), msg=tajp)
+
+    def test_many(self):
+        for tajp, values in VALUES.items():
+            from_many = getattr(numenc, 'from_{}_desc_many'.format(tajp))
+            to_many = getattr(numenc, 'to_{}_desc_many'.format(tajp))
+            from_desc = getattr(numenc, 'from_{}_desc'.format(tajp))
+
+            keys = from_many(values)
+            self.assertEqual(b''.join(from_desc(value) for value in values),
+                             keys)
+            self.assertEqual(values, to_many(keys), msg=tajp)
+            self.assertEqual(values, to_many(memoryview(keys)), msg=tajp)
+
+    @hypothesis.given(
+        hypothesis.strategies.lists(
+            hypothesis.strategies.integers(
+                min_value=-2**63, max_value=2**63 - 1)))
+    def test_order_int64_automatic(self, values: List[int]):
+        keys = [numenc.from_int64_desc(value) for value in values]
+
+        self.assertEqual(
+            sorted(values, reverse=True),
+            [numenc.to_int64_desc(key) for key in sorted(keys)])
+
+    def test_struct(self):
+        schema = numenc.Struct('uint32, int64 desc, float64 asc')
+        self.assertEqual('uint32,int64 desc,float64', schema.format)
+
+        key = schema.pack(7, 5, 0.5)
+        self.assertEqual(
+            numenc.from_uint32(7) + numenc.from_int64_desc(5) +
+            numenc.from_float64(0.5), key)
+        self.assertEqual((7, 5, 0.5), schema.unpack(key))
+
+        rows = [(1, 5, 0.5), (1, 10, 0.5), (0, -3, 1.0), (1, 10, 0.25)]
+        keys = schema.pack_many(rows)
+        self.assertEqual(rows, schema.unpack_many(keys))
+
+        ordered = [
+            schema.unpack(key) for key in sorted(
+                schema.pack(*row) for row in rows)
+        ]
+        self.assertEqual([(0, -3, 1.0), (1, 10, 0.25), (1, 10, 0.5),
+                          (1, 5, 0.5)], ordered)
+
+    def test_exceptions(self):
+        with self.assertRaises(ValueError) as ctx:
+            numenc.from_uint8_desc(256)
+        self.assertEqual(
+            "expected 8-bit unsigned integer (range [0, 255]), got 256.",
+            str(ctx.exception))
+
+        with self.assertRaises(ValueError) as ctx:
+            numenc.to_int32_desc(b'\x00')
+        self.assertEqual("Illegal input: expected bytes of length 4, got 1.",
+                         str(ctx.exception))
+
+        with self.assertRaises(ValueError) as ctx:
+            numenc.Struct('int64 descending')
+        self.assertEqual(
+            "Illegal format: expected the order 'asc' or 'desc' after the "
+            "type of the field 0 in 'int64 descending'.", str(ctx.exception))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+# pylint: disable=missing-docstring
+import os
+import pathlib
+import tempfile
+import unittest
+from typing import List
+
+import hypothesis
+import hypothesis.strategies
+import numenc
+
+
+def sorted_keys(data: bytes, width: int) -> bytes:
+    """Sort the concatenated keys with Python's sorted()."""
+    return b''.join(
+        sorted(data[i:i + width] for i in range(0, len(data), width)))
+
+
+class TestSortFile(unittest.TestCase):
+    def setUp(self):
+        # pylint: disable=consider-using-with
+        self.directory = tempfile.TemporaryDirectory()
+        self.input = os.path.join(self.directory.name, 'input.bin')
+        self.output = os.path.join(self.directory.name, 'output.bin')
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def write(self, data: bytes) -> None:
+        with open(self.input, 'wb') as fid:
+            fid.write(data)
+
+    def read(self) -> bytes:
+        with open(self.output, 'rb') as fid:
+            return fid.read()
+
+    def test_in_memory(self):
+        self.write(numenc.from_int64_many([3, -1, 2, 0]))
+        self.assertEqual(4, numenc.sort_file(self.input, self.output, 8))
+        self.assertEqual([-1, 0, 2, 3], numenc.to_int64_many(self.read()))
+        self.assertEqual(['input.bin', 'output.bin'],
+                         sorted(os.listdir(self.directory.name)))
+
+    def test_spilled_runs(self):
+        data = os.urandom(8 * 10000)
+        self.write(data)
+
+        # a budget of 1000 bytes holds 41 keys of 8 bytes per run
+        for workers in [1, 3]:
+            self.assertEqual(
+                10000,
+                numenc.sort_file(
+                    self.input,
+                    self.output,
+                    8,
+                    memory=1000,
+                    tmp_dir=self.directory.name,
+                    workers=workers))
+            self.assertEqual(sorted_keys(data, 8), self.read())
+            self.assertEqual(['input.bin', 'output.bin'],
+                             sorted(os.listdir(self.directory.name)))
+
+    @hypothesis.given(
+        hypothesis.strategies.lists(
+            hypothesis.strategies.tuples(
+                hypothesis.strategies.integers(-(2**31), 2**31 - 1),
+                hypothesis.strategies.floats(allow_nan=False))),
+        hypothesis.strategies.integers(1, 4))
+    def test_composite_keys(self, values: List[tuple], workers: int):
+        schema = numenc.Struct('int32,float64')
+        assert schema.size is not None
+        self.write(schema.pack_many(values))
+
+        numenc.sort_file(
+            self.input,
+            self.output,
+            schema.size,
+            memory=workers * 100,
+            workers=workers)
+        self.assertEqual(
+            sorted((value, numenc.from_float64(number))
+                   for value, number in values),
+            [(value, numenc.from_float64(number))
+             for value, number in schema.unpack_many(self.read())])
+
+    def test_in_place_and_path_like(self):
+        data = os.urandom(3 * 1000)
+        self.write(data)
+        numenc.sort_file(
+            pathlib.Path(self.input), pathlib.Path(self.input), 3, memory=500)
+        with open(self.input, 'rb') as fid:
+            self.assertEqual(sorted_keys(data, 3), fid.read())
+
+    def test_empty(self):
+        self.write(b'')
+        self.assertEqual(0, numenc.sort_file(self.input, self.output, 8))
+        self.assertEqual(b'', self.read())
+
+    def test_long_keys(self):
+        data = os.urandom(20 * 1000)
+        self.write(data)
+        numenc.sort_file(self.input, self.output, 20, memory=2000)
+        self.assertEqual(sorted_keys(data, 20), self.read())
+
+    def test_exceptions(self):
+        self.write(b'123')
+        with self.assertRaisesRegex(
+                ValueError,
+                r'^Illegal input: expected a file whose size is a multiple '
+                r'of 2, got a trailing partial key\.$'):
+            numenc.sort_file(self.input, self.output, 2)
+        self.assertFalse(os.path.exists(self.output))
+
+        with self.assertRaisesRegex(
+                ValueError,
+                r'^Illegal width: expected a positive width, got 0\.$'):
+            numenc.sort_file(self.input, self.output, 0)
+
+        with self.assertRaisesRegex(
+                ValueError,
+                r'^Illegal workers: expected at least 1 worker, got 0\.$'):
+            numenc.sort_file(self.input, self.output, 1, workers=0)
+
+        with self.assertRaisesRegex(
+                ValueError,
+                r'^Illegal memory: expected at least 48 bytes for 2 workers '
+                r'and keys of 8 bytes, got 47\.$'):
+            numenc.sort_file(self.input, self.output, 8, memory=47, workers=2)
+
+        with self.assertRaises(FileNotFoundError):
+            numenc.sort_file(
+                os.path.join(self.directory.name, 'missing.bin'), self.output,
+                1)
+
+        with self.assertRaises(FileNotFoundError):
+            numenc.sort_file(
+                self.input,
+                self.output,
+                1,
+                memory=17,
+                tmp_dir=os.path.join(self.directory.name, 'missing'))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+# pylint: disable=missing-docstring
+import decimal
+import unittest
+from typing import List
+
+import hypothesis
+import hypothesis.strategies
+import numenc
+
+
+def decimals(scale: int, width: int):
+    """Generate the decimals representable by FixedPoint(scale, width)."""
+    bits = width * 8
+    return hypothesis.strategies.integers(
+        min_value=-2**(bits - 1), max_value=2**
+        (bits - 1) - 1).map(lambda value: decimal.Decimal(value).scaleb(-scale))
+
+
+class TestFixedPoint(unittest.TestCase):
+    def test_attributes(self):
+        codec = numenc.FixedPoint(3, width=16)
+
+        self.assertEqual(3, codec.scale)
+        self.assertEqual(16, codec.width)
+        self.assertEqual("numenc.FixedPoint(3, width=16)", repr(codec))
+        self.assertEqual(8, numenc.FixedPoint(0).width)
+
+    def test_matches_int64(self):
+        codec = numenc.FixedPoint(2)
+
+        # yapf: disable
+        for value, unscaled in [
+                (decimal.Decimal('12.34'), 1234),
+                (decimal.Decimal('-0.5'), -50),
+                (decimal.Decimal('-0'), 0),
+                (decimal.Decimal('1.2E+3'), 120000),
+                (decimal.Decimal('1.000'), 100),
+                (7, 700),
+                (' -3.1 ', -310),
+                ('92233720368547758.07', 2**63 - 1),
+                ('-92233720368547758.08', -2**63)]:
+            # yapf: enable
+            key = codec.encode(value)
+            self.assertEqual(numenc.from_int64(unscaled), key, msg=value)
+            self.assertEqual(
+                decimal.Decimal(unscaled).scaleb(-2), codec.decode(key))
+
+    def test_big_integers(self):
+        codec = numenc.FixedPoint(0, width=16)
+
+        for value in [-2**127, -2**64, -1, 0, 2**63, 2**127 - 1]:
+            key = codec.encode(value)
+            self.assertEqual((value + 2**127).to_bytes(16, 'big'), key)
+            self.assertEqual(value, codec.decode(key))
+
+    def test_exact_decoding(self):
+        codec = numenc.FixedPoint(3)
+
+        decoded = codec.decode(codec.encode(decimal.Decimal('1.5')))
+        self.assertEqual(decimal.Decimal('1.500'), decoded)
+        self.assertEqual((0, (1, 5, 0, 0), -3), decoded.as_tuple())
+
+    @hypothesis.given(hypothesis.strategies.lists(decimals(scale=4, width=8)))
+    def test_order_automatic(self, values: List[decimal.Decimal]):
+        codec = numenc.FixedPoint(4)
+        keys = [codec.encode(value) for value in values]
+
+        self.assertEqual(
+            sorted(values), [codec.decode(key) for key in sorted(keys)])
+
+    @hypothesis.given(hypothesis.strategies.lists(decimals(scale=30, width=16)))
+    def test_many_automatic(self, values: List[decimal.Decimal]):
+        codec = numenc.FixedPoint(30, width=16)
+        keys = codec.encode_many(values)
+
+        self.assertEqual(b''.join(codec.encode(value) for value in values),
+                         keys)
+        self.assertEqual(values, codec.decode_many(keys))
+        self.assertEqual(
+            sorted(values), [
+                codec.decode(key)
+                for key in sorted(keys[i:i + 16]
+                                  for i in range(0, len(keys), 16))
+            ])
+
+    def test_into_and_from(self):
+        codec = numenc.FixedPoint(1)
+        page = bytearray(b'\xaa' * 12)
+
+        self.assertIsNone(codec.encode_into('-2.5', page, 2))
+        self.assertEqual(b'\xaa' * 2 + numenc.from_int64(-25) + b'\xaa' * 2,
+                         page)
+        self.assertEqual(decimal.Decimal('-2.5'), codec.decode_from(page, 2))
+
+        with self.assertRaises(ValueError):
+            codec.encode_into('0.25', page, 2)
+        self.assertEqual(decimal.Decimal('-2.5'), codec.decode_from(page, -10))
+
+    def test_exceptions(self):
+        codec = numenc.FixedPoint(2)
+
+        with self.assertRaises(TypeError) as ctx:
+            codec.encode(1.5)
+        self.assertEqual("Wrong input: expected a Decimal, int or str.",
+                         str(ctx.exception))
+
+        with self.assertRaises(ValueError) as ctx:
+            codec.encode(decimal.Decimal('0.001'))
+        self.assertEqual(
+            "Illegal input: expected a number with at most 2 fractional "
+            "digits, got Decimal('0.001').", str(ctx.exception))
+
+        for value in [decimal.Decimal('NaN'), '-Infinity']:
+            with self.assertRaises(ValueError) as ctx:
+                codec.encode(value)
+            self.assertEqual(
+                "Illegal input: expected a finite number, got {!r}.".format(
+                    value), str(ctx.exception))
+
+        for value in ['92233720368547758.08', 10**17, 2**100]:
+            with self.assertRaises(ValueError) as ctx:
+                codec.encode(value)
+            self.assertEqual(
+                "Illegal input: expected a number in the range of a 64-bit "
+                "fixed-point number of scale 2, got {!r}.".format(value),
+                str(ctx.exception))
+
+        for value in ['', '1.2.3', '1e', '0x10', '1_000']:
+            with self.assertRaises(ValueError) as ctx:
+                codec.encode(value)
+            self.assertEqual(
+                "Illegal input: expected a decimal number, got {!r}.".format(
+                    value), str(ctx.exception))
+
+        with self.assertRaises(ValueError) as ctx:
+            codec.encode_many([1, 'x'])
+        self.assertEqual(
+            "at index 1: Illegal input: expected a decimal number, got 'x'.",
+            str(ctx.exception))
+
+        with self.assertRaises(ValueError) as ctx:
+            codec.decode(b'\x00' * 16)
+        self.assertEqual("Illegal input: expected bytes of length 8, got 16.",
+                         str(ctx.exception))
+
+        with self.assertRaises(ValueError) as ctx:
+            numenc.FixedPoint(19)
+        self.assertEqual(
+            "Illegal scale: expected a scale in [0, 18] for the width 8, "
+            "got 19.", str(ctx.exception))
+
+        with self.assertRaises(ValueError) as ctx:
+            numenc.FixedPoint(2, width=4)
+        self.assertEqual("Illegal width: expected 8 or 16, got 4.",
+                         str(ctx.exception))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+# pylint: disable=missing-docstring
+import array
+import mmap
+import unittest
+
+import hypothesis
+import hypothesis.strategies
+import numenc
+
+# yapf: disable
+VALUES = {
+    'int8': [-2**7, -1, 0, 2**7 - 1],
+    'uint8': [0, 1, 2**8 - 1],
+    'int16': [-2**15, -1, 0, 2**15 - 1],
+    'uint16': [0, 1, 2**16 - 1],
+    'int32': [-2**31, -1, 0, 2**31 - 1],
+    'uint32': [0, 1, 2**32 - 1],
+    'int64': [-2**63, -1, 0, 2**63 - 1],
+    'uint64': [0, 1, 2**64 - 1],
+    'float32': [float('-inf'), -1.5, 0.0, 2.25, float('inf')],
+    'float64': [float('-inf'), -1.5, 0.0, 2.25, float('inf')],
+}
+# yapf: enable
+
+
+class TestInplace(unittest.TestCase):
+    def test_round_trip(self):
+        for tajp, values in VALUES.items():
+            from_scalar = getattr(numenc, 'from_{}'.format(tajp))
+            from_into = getattr(numenc, 'from_{}_into'.format(tajp))
+            to_from = getattr(numenc, 'to_{}_from'.format(tajp))
+
+            for value in values:
+                key = from_scalar(value)
+                page = bytearray(b'\xaa' * (len(key) + 6))
+
+                self.assertIsNone(from_into(value, page, 3))
+                self.assertEqual(b'\xaa' * 3 + key + b'\xaa' * 3, page)
+                self.assertEqual(value, to_from(page, 3), msg=tajp)
+                self.assertEqual(value, to_from(bytes(page), -3 - len(key)))
+
+    @hypothesis.given(
+        hypothesis.strategies.lists(
+            hypothesis.strategies.integers(
+                min_value=-2**63, max_value=2**63 - 1)))
+    def test_page_int64_automatic(self, values):
+        page = bytearray(8 * len(values))
+        for i, value in enumerate(values):
+            numenc.from_int64_into(value, page, 8 * i)
+
+        self.assertEqual(numenc.from_int64_many(values), page)
+        self.assertEqual(
+            values,
+            [numenc.to_int64_from(page, 8 * i) for i in range(len(values))])
+
+    def test_default_offset(self):
+        page = bytearray(4)
+        numenc.from_float32_into(-1.0, page)
+
+        self.assertEqual(numenc.from_float32(-1.0), page)
+        self.assertEqual(-1.0, numenc.to_float32_from(page))
+
+    def test_buffer_types(self):
+        with mmap.mmap(-1, 16) as mapped:
+            numenc.from_uint32_into(1234, mapped, 4)
+            self.assertEqual(1234, numenc.to_uint32_from(mapped, 4))
+
+        arr = array.array('B', bytes(8))
+        numenc.from_int16_into(-3, memoryview(arr)[2:], 2)
+        self.assertEqual(-3, numenc.to_int16_from(arr, 4))
+
+    def test_encode_exceptions(self):
+        for weird_val in [b'\x00' * 8, "some string", 232, None]:
+            with self.assertRaises(TypeError) as ctx:
+                numenc.from_int64_into(1, weird_val, 0)
+
+            self.assertEqual(
+                "Wrong input: expected a writable bytes-like object.",
+                str(ctx.exception))
+
+        page = bytearray(8)
+        with self.assertRaises(ValueError) as ctx:
+            numenc.from_int32_into(1, page, 5)
+        self.assertEqual(
+            "Illegal offset: expected a buffer of at least 9 bytes to "
+            "access 4 bytes at offset 5, got 8.", str(ctx.exception))
+
+        with self.assertRaises(ValueError) as ctx:
+            numenc.from_int32_into(1, page, -9)
+        self.assertEqual(
+            "Illegal offset: -9 is out of range for a buffer of 8 bytes.",
+            str(ctx.exception))
+
+        with self.assertRaises(ValueError) as ctx:
+            numenc.from_uint8_into(256, page, 0)
+        self.assertEqual(
+            "expected 8-bit unsigned integer (range [0, 255]), got 256.",
+            str(ctx.exception))
+
+        with self.assertRaises(TypeError) as ctx:
+            numenc.from_float64_into("some string", page, 0)
+        self.assertEqual("Wrong input: expected 64-bit float.",
+                         str(ctx.exception))
+
+        self.assertEqual(bytearray(8), page)
+
+    def test_decode_exceptions(self):
+        for weird_val in ["some string", 232, None]:
+            with self.assertRaises(TypeError) as ctx:
+                numenc.to_int64_from(weird_val, 0)
+
+            self.assertEqual("Wrong input: expected a bytes-like object.",
+                             str(ctx.exception))
+
+        with self.assertRaises(ValueError) as ctx:
+            numenc.to_uint64_from(b'\x00' * 10, 3)
+        self.assertEqual(
+            "Illegal offset: expected a buffer of at least 11 bytes to "
+            "access 8 bytes at offset 3, got 10.", str(ctx.exception))
+
+
+if __name__ == '__main__':
+    unittest.main()
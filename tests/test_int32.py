@@ -64,6 +64,20 @@ class TestEncodingInt32(unittest.TestCase):
             if i > 0:
                 self.assertLess(expected[i - 1], expected[i])
 
+    def test_decode_bytes_like(self):
+        key = numenc.from_int32(-333332)
+        for value in [
+                memoryview(key),
+                bytearray(key),
+                memoryview(b'\x00' + key)[1:]
+        ]:
+            self.assertEqual(-333332, numenc.to_int32(value))
+
+        with self.assertRaises(ValueError) as ctx:
+            numenc.to_int32(memoryview(key)[1:])
+        self.assertEqual("Illegal input: expected bytes of length 4, got 3.",
+                         str(ctx.exception))
+
     def test_encode_exceptions(self):
         type_err_triggers = [
             "some string", 2.344, ('1', '2'), [], {}, b'\x01\x02',
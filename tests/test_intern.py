@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+# pylint: disable=missing-docstring
+import struct
+import unittest
+
+import numenc
+
+
+class TestEightBit(unittest.TestCase):
+    def test_interned(self):
+        for value in range(-128, 128):
+            self.assertIs(numenc.from_int8(value), numenc.from_int8(value))
+            key = numenc.from_int8(value)
+            self.assertIs(numenc.to_int8(key), numenc.to_int8(bytes(key)))
+
+        for value in range(256):
+            self.assertIs(numenc.from_uint8(value), numenc.from_uint8(value))
+            self.assertIs(
+                numenc.from_uint8_desc(value), numenc.from_uint8_desc(value))
+
+    def test_values(self):
+        for value in range(-128, 128):
+            key = numenc.from_int8(value)
+            self.assertEqual(struct.pack('>B', value + 128), key)
+            self.assertEqual(value, numenc.to_int8(key))
+            self.assertEqual(value,
+                             numenc.to_int8_desc(numenc.from_int8_desc(value)))
+
+        self.assertEqual(
+            list(range(256)),
+            numenc.to_uint8_many(numenc.from_uint8_many(range(256))))
+        self.assertEqual(-128, numenc.codec('int8').decode(b'\x00'))
+
+
+class TestHotRange(unittest.TestCase):
+    def tearDown(self):
+        numenc.set_hot_range('int16', -1024, 1024)
+        numenc.set_hot_range('uint16', 0, 2048)
+
+    def test_defaults(self):
+        self.assertEqual((-1024, 1024), numenc.get_hot_range('int16'))
+        self.assertEqual((0, 2048), numenc.get_hot_range('uint16'))
+
+    def test_interned(self):
+        self.assertIs(numenc.from_int16(-1024), numenc.from_int16(-1024))
+        self.assertIs(numenc.from_int16(1023), numenc.from_int16(1023))
+        self.assertIs(
+            numenc.to_int16(b'\x7c\x00'), numenc.to_int16(b'\x7c\x00'))
+        self.assertIs(numenc.from_uint16(2047), numenc.from_uint16(2047))
+        self.assertIs(
+            numenc.codec('uint16').encode(100), numenc.from_uint16(100))
+
+        self.assertIsNot(numenc.from_int16(1024), numenc.from_int16(1024))
+        self.assertIsNot(numenc.from_uint16(2048), numenc.from_uint16(2048))
+
+    def test_configure(self):
+        numenc.set_hot_range('int16', 30000, 32768)
+        self.assertEqual((30000, 32768), numenc.get_hot_range('int16'))
+        self.assertIs(numenc.from_int16(32767), numenc.from_int16(32767))
+        self.assertIs(
+            numenc.to_int16(b'\xff\xff'), numenc.to_int16(b'\xff\xff'))
+        self.assertIsNot(numenc.from_int16(0), numenc.from_int16(0))
+
+        numenc.set_hot_range(type='uint16', start=0, stop=0)
+        self.assertEqual((0, 0), numenc.get_hot_range('uint16'))
+        self.assertIsNot(numenc.from_uint16(1), numenc.from_uint16(1))
+
+    def test_values_with_any_range(self):
+        values = list(range(-32768, 32768))
+        expected = b''.join(
+            struct.pack('>H', value + 32768) for value in values)
+        for start, stop in [(-32768, 32768), (0, 0), (-5, 7)]:
+            numenc.set_hot_range('int16', start, stop)
+            numenc.set_hot_range('uint16', max(start, 0), max(stop, 0))
+            self.assertEqual(
+                expected, b''.join(
+                    numenc.from_int16(value) for value in values))
+            self.assertEqual(values, [
+                numenc.to_int16(expected[i:i + 2])
+                for i in range(0, len(expected), 2)
+            ])
+            self.assertEqual(values, numenc.to_int16_many(expected))
+            self.assertEqual([value + 32768 for value in values],
+                             numenc.to_uint16_many(expected))
+            self.assertEqual(
+                numenc.to_int16_desc(numenc.from_int16_desc(-3)), -3)
+
+    def test_exceptions(self):
+        with self.assertRaisesRegex(
+                ValueError, r"^Illegal type: expected 'int16' or 'uint16', "
+                r"got 'int32'\.$"):
+            numenc.set_hot_range('int32', 0, 10)
+
+        with self.assertRaisesRegex(
+                ValueError,
+                r'^Illegal range: expected 0 <= start <= stop <= 65536 for '
+                r'uint16, got start -1 and stop 10\.$'):
+            numenc.set_hot_range('uint16', -1, 10)
+
+        with self.assertRaisesRegex(
+                ValueError,
+                r'^Illegal range: expected -32768 <= start <= stop <= 32768 '
+                r'for int16, got start 5 and stop 4\.$'):
+            numenc.set_hot_range('int16', 5, 4)
+
+        with self.assertRaisesRegex(
+                ValueError, r"^Illegal type: expected 'int16' or 'uint16', "
+                r"got 'int8'\.$"):
+            numenc.get_hot_range('int8')
+
+        # the previous range stays in effect
+        self.assertEqual((-1024, 1024), numenc.get_hot_range('int16'))
+
+
+if __name__ == '__main__':
+    unittest.main()
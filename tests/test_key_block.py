@@ -0,0 +1,204 @@
+#!/usr/bin/env python3
+# pylint: disable=missing-docstring
+import bisect
+import struct
+import unittest
+from typing import List
+
+import hypothesis
+import hypothesis.strategies
+import numenc
+
+SORTED_KEYS = hypothesis.strategies.lists(
+    hypothesis.strategies.binary(max_size=12)).map(sorted)
+
+INTERVALS = hypothesis.strategies.integers(min_value=1, max_value=20)
+
+
+class TestEncodeBlock(unittest.TestCase):
+    def test_format(self):
+        block = numenc.encode_block([b'abc', b'abd', b'b'], restart_interval=2)
+        self.assertEqual(
+            b'\x00\x03abc'  # restart point
+            b'\x02\x01d'  # shares 'ab' with the previous key
+            b'\x00\x01b'  # restart point
+            b'\x00\x00\x00\x00\x00\x00\x00\x08'  # restart offsets
+            b'\x00\x00\x00\x02\x00\x00\x00\x03\x00\x00\x00\x02',
+            block)
+
+        self.assertEqual(b'\x00\x00\x00\x10' + b'\x00' * 8,
+                         numenc.encode_block([]))
+
+    def test_width(self):
+        keys = numenc.from_int32_many([-3, 0, 0, 7, 100000])
+        self.assertEqual(
+            numenc.encode_block([keys[i:i + 4] for i in range(0, 20, 4)]),
+            numenc.encode_block(keys, width=4))
+        self.assertEqual(
+            numenc.encode_block(
+                [memoryview(keys)[i:i + 4] for i in range(0, 20, 4)],
+                restart_interval=3), numenc.encode_block(bytearray(keys), 3, 4))
+
+    def test_compression(self):
+        keys = numenc.from_int64_many(range(10**12, 10**12 + 10000))
+        block = numenc.encode_block(keys, width=8)
+        self.assertLess(len(block), len(keys) / 2)
+
+    def test_exceptions(self):
+        with self.assertRaisesRegex(
+                ValueError,
+                r'^Illegal keys: expected the keys in ascending order, got a '
+                r'smaller key at index 2\.$'):
+            numenc.encode_block([b'a', b'b', b'a'])
+
+        with self.assertRaisesRegex(
+                ValueError,
+                r'^Illegal restart_interval: expected a positive interval of '
+                r'at most 4294967295 keys, got 0\.$'):
+            numenc.encode_block([b'a'], restart_interval=0)
+
+        with self.assertRaisesRegex(
+                ValueError,
+                r'^Illegal width: expected a positive width, got 0\.$'):
+            numenc.encode_block(b'', width=0)
+
+        with self.assertRaisesRegex(
+                ValueError,
+                r'^Illegal input: expected a buffer of keys whose length is a '
+                r'multiple of 4, got 6\.$'):
+            numenc.encode_block(b'abcdef', width=4)
+
+        with self.assertRaisesRegex(
+                TypeError,
+                r'^Wrong input: expected an iterable of bytes-like keys\.$'):
+            numenc.encode_block(3)  # type: ignore
+
+        with self.assertRaisesRegex(
+                TypeError, r'^at index 1: Wrong input: expected a bytes-like '
+                r'object\.$'):
+            numenc.encode_block([b'a', 'b'])  # type: ignore
+
+
+class TestKeyBlock(unittest.TestCase):
+    def test_basics(self):
+        keys = [b'', b'a', b'ab', b'abc', b'b', b'ba']
+        block = numenc.KeyBlock(numenc.encode_block(keys, restart_interval=4))
+
+        self.assertEqual(6, len(block))
+        self.assertEqual(4, block.restart_interval)
+        self.assertEqual(2, block.restart_count)
+        self.assertRegex(
+            repr(block), r'^<numenc\.KeyBlock of 6 keys in \d+ bytes>$')
+        self.assertEqual(keys, list(block))
+        self.assertIn(b'ab', block)
+        self.assertIn(b'', block)
+        self.assertNotIn(b'aa', block)
+        self.assertNotIn(b'c', block)
+        self.assertEqual([b'ab', b'abc', b'b', b'ba'], list(block.seek(b'aa')))
+        self.assertEqual([], list(block.seek(b'c')))
+        self.assertEqual([b'a', b'ab'], list(block.irange(b'a', b'abc')))
+        self.assertEqual([b'', b'a'], list(block.irange(stop=b'ab')))
+        self.assertEqual([b'b', b'ba'], list(block.irange(start=b'b')))
+
+        empty = numenc.KeyBlock(numenc.encode_block([]))
+        self.assertEqual([], list(empty))
+        self.assertEqual([], list(empty.seek(b'a')))
+        self.assertNotIn(b'', empty)
+
+    def test_lazy_iteration(self):
+        block = numenc.KeyBlock(
+            numenc.encode_block(
+                numenc.from_uint32_many(range(1000)),
+                restart_interval=8,
+                width=4))
+        iterator = block.seek(numenc.from_uint32(500))
+        self.assertEqual(numenc.from_uint32(500), next(iterator))
+        self.assertEqual(numenc.from_uint32(501), next(iterator))
+        self.assertIs(iter(iterator), iterator)
+
+    def test_keeps_the_buffer(self):
+        data = bytearray(numenc.encode_block([b'a', b'b']))
+        block = numenc.KeyBlock(data)
+        with self.assertRaises(BufferError):
+            data.append(0)
+        iterator = iter(block)
+        del block
+        self.assertEqual([b'a', b'b'], list(iterator))
+
+    @hypothesis.given(SORTED_KEYS, INTERVALS, hypothesis.strategies.data())
+    def test_against_bisect(self, keys: List[bytes], interval: int, data):
+        data_bytes = numenc.encode_block(keys, restart_interval=interval)
+        block = numenc.KeyBlock(memoryview(data_bytes))
+        self.assertEqual(keys, list(block))
+        self.assertEqual(len(keys), len(block))
+
+        probes = data.draw(
+            hypothesis.strategies.lists(
+                hypothesis.strategies.binary(max_size=12)
+                | (hypothesis.strategies.sampled_from(keys)
+                   if keys else hypothesis.strategies.just(b''))))
+        for probe in probes:
+            self.assertEqual(keys[bisect.bisect_left(keys, probe):],
+                             list(block.seek(probe)))
+            self.assertEqual(probe in keys, probe in block)
+
+        for start, stop in zip(probes, probes[1:]):
+            self.assertEqual(
+                keys[bisect.bisect_left(keys, start):max(
+                    bisect.
+                    bisect_left(keys, start), bisect.bisect_left(keys, stop))],
+                list(block.irange(start, stop)))
+
+    def test_exceptions(self):
+        with self.assertRaisesRegex(
+                ValueError,
+                r'^Illegal block: expected at least 12 bytes, got 3\.$'):
+            numenc.KeyBlock(b'abc')
+
+        with self.assertRaisesRegex(ValueError,
+                                    r'^Illegal block: corrupt trailer\.$'):
+            numenc.KeyBlock(struct.pack('>III', 0, 0, 0))
+
+        with self.assertRaisesRegex(ValueError,
+                                    r'^Illegal block: corrupt trailer\.$'):
+            numenc.KeyBlock(struct.pack('>III', 16, 1, 1))
+
+        with self.assertRaisesRegex(
+                ValueError, r'^Illegal block: corrupt restart offset 1\.$'):
+            numenc.KeyBlock(
+                numenc.encode_block([b'a', b'b'], restart_interval=1)[:-20] +
+                struct.pack('>IIIII', 0, 0, 1, 2, 2))
+
+        with self.assertRaises(TypeError):
+            numenc.KeyBlock('abc')  # type: ignore
+
+    def test_corrupt_entries(self):
+        # the unshared length points past the entries
+        block = numenc.KeyBlock(b'\x00\x05ab' +
+                                struct.pack('>IIII', 0, 16, 1, 1))
+        with self.assertRaisesRegex(
+                ValueError, r'^Illegal block: corrupt entry at offset 0\.$'):
+            list(block)
+
+        # the shared length exceeds the previous key
+        block = numenc.KeyBlock(b'\x00\x01a\x03\x01b' +
+                                struct.pack('>IIII', 0, 16, 2, 1))
+        with self.assertRaisesRegex(
+                ValueError, r'^Illegal block: corrupt entry at offset 3\.$'):
+            list(block)
+
+        # every corrupted byte of the entries is rejected or decoded safely
+        data = numenc.encode_block(
+            numenc.from_int64_many(range(0, 3000, 7)), 4, 8)
+        for position in range(0, len(data) - 12 - 4 * 108):
+            for value in [0x00, 0x7f, 0xff]:
+                corrupted = bytearray(data)
+                corrupted[position] = value
+                try:
+                    list(numenc.KeyBlock(corrupted).seek(b'\x80'))
+                except ValueError:
+                    pass
+
+
+if __name__ == '__main__':
+    unittest.main()
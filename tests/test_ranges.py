@@ -0,0 +1,322 @@
+#!/usr/bin/env python3
+# pylint: disable=missing-docstring
+import math
+import struct
+import unittest
+from typing import List, Optional
+
+import hypothesis
+import hypothesis.strategies
+import numenc
+
+BOUNDS = hypothesis.strategies.one_of(
+    hypothesis.strategies.none(),
+    hypothesis.strategies.integers(min_value=-2**70, max_value=2**70),
+    hypothesis.strategies.floats(allow_nan=False))
+
+FLOAT_BOUNDS = hypothesis.strategies.one_of(
+    hypothesis.strategies.none(), hypothesis.strategies.floats(allow_nan=False))
+
+
+def scan(keys: List[bytes], start: bytes, stop: Optional[bytes]) -> List[bytes]:
+    """Select the sorted keys in [start, stop) like a key-value store."""
+    return [
+        key for key in keys if start <= key and (stop is None or key < stop)
+    ]
+
+
+def nextafter(value: float, direction: float) -> float:
+    """Compute the next float64 towards the direction like math.nextafter,
+    which is only available since Python 3.9."""
+    if value == direction:
+        return direction
+    if value == 0.0:
+        return math.copysign(5e-324, direction)
+    bits = struct.unpack('>q', struct.pack('>d', value))[0]
+    bits += 1 if (value < direction) == (value > 0.0) else -1
+    return struct.unpack('>d', struct.pack('>q', bits))[0]
+
+
+def satisfies(value, low, high, low_inclusive: bool,
+              high_inclusive: bool) -> bool:
+    """Evaluate the predicate on a number."""
+    if low is not None and (value < low if low_inclusive else value <= low):
+        return False
+    if high is not None and (value > high if high_inclusive else value >= high):
+        return False
+    return True
+
+
+class TestKeyRange(unittest.TestCase):
+    def check(self,
+              name: str,
+              values: List,
+              low,
+              high,
+              low_inclusive: bool,
+              high_inclusive: bool,
+              prefix: bytes = b''):
+        """Check that a scan over composite keys selects exactly the keys
+        of the values satisfying the predicate."""
+        codec = numenc.codec(name)
+        keys = sorted(
+            set(prefix + codec.encode(value) + suffix for value in values
+                for suffix in [b'', b'\x00', b'\xff\xff']))
+        expected = [
+            key for key in keys if satisfies(
+                codec.decode(key[len(prefix):len(prefix) + codec.width]), low,
+                high, low_inclusive, high_inclusive)
+        ]
+
+        result = codec.key_range(low, high, low_inclusive, high_inclusive,
+                                 prefix)
+        if result is None:
+            self.assertEqual([], expected)
+            return
+
+        start, stop = result
+        self.assertTrue(start.startswith(prefix))
+        self.assertEqual(expected, scan(keys, start, stop))
+
+    def test_exhaustive_8_bit(self):
+        candidates = [
+            None, -1000, -129, -128, -127, -1, -0.5, 0, 0.5, 1, 126, 127, 128,
+            255, 256, 2**64, -math.inf, math.inf
+        ]
+        for name, values in [('int8', range(-128, 128)), ('uint8', range(256))]:
+            for prefix in [b'', b'\x01', b'\xff', b'\x01\xff']:
+                for low in candidates:
+                    for high in candidates:
+                        for low_inclusive in [True, False]:
+                            for high_inclusive in [True, False]:
+                                self.check(name, list(values), low, high,
+                                           low_inclusive, high_inclusive,
+                                           prefix)
+
+    @hypothesis.given(
+        hypothesis.strategies.sampled_from(
+            ['int16', 'uint16', 'int32', 'uint32', 'int64', 'uint64']),
+        hypothesis.strategies.lists(
+            hypothesis.strategies.integers(
+                min_value=-2**63, max_value=2**64 - 1)), BOUNDS, BOUNDS,
+        hypothesis.strategies.booleans(), hypothesis.strategies.booleans(),
+        hypothesis.strategies.binary(max_size=3))
+    def test_integers(self, name: str, values: List[int], low, high,
+                      low_inclusive: bool, high_inclusive: bool, prefix: bytes):
+        bits = 8 * numenc.codec(name).width
+        if name.startswith('u'):
+            min_value, max_value = 0, 2**bits - 1
+        else:
+            min_value, max_value = -2**(bits - 1), 2**(bits - 1) - 1
+
+        values = [min(max(value, min_value), max_value) for value in values]
+        values += [min_value, max_value]
+        for bound in [low, high]:
+            if isinstance(bound, int) and min_value <= bound <= max_value:
+                values += [
+                    value for value in [bound - 1, bound, bound + 1]
+                    if min_value <= value <= max_value
+                ]
+        self.check(name, values, low, high, low_inclusive, high_inclusive,
+                   prefix)
+
+    @hypothesis.given(
+        hypothesis.strategies.sampled_from(['float32', 'float64']),
+        hypothesis.strategies.lists(
+            hypothesis.strategies.floats(allow_nan=False)), FLOAT_BOUNDS,
+        FLOAT_BOUNDS, hypothesis.strategies.booleans(),
+        hypothesis.strategies.booleans(),
+        hypothesis.strategies.binary(max_size=3))
+    def test_floats(self, name: str, values: List[float], low, high,
+                    low_inclusive: bool, high_inclusive: bool, prefix: bytes):
+        codec = numenc.codec(name)
+        values = [codec.decode(codec.encode(value)) for value in values]
+        values += [-math.inf, math.inf, 0.0]
+        for bound in [low, high]:
+            if bound is not None:
+                value = codec.decode(codec.encode(bound))
+                values.append(value)
+                if -math.inf < value:
+                    values.append(codec.previous_value(value))
+                if value < math.inf:
+                    values.append(codec.next_value(value))
+        self.check(name, values, low, high, low_inclusive, high_inclusive,
+                   prefix)
+
+    def test_tightest(self):
+        codec = numenc.codec('int32')
+        self.assertEqual((codec.encode(3), codec.encode(10)),
+                         codec.key_range(2, 9, False, True))
+        self.assertEqual((codec.encode(3), codec.encode(9)),
+                         codec.key_range(2.5, 8.5, True, True))
+        self.assertEqual((b'', None), codec.key_range())
+        self.assertEqual((b'\x05', b'\x06'), codec.key_range(prefix=b'\x05'))
+        self.assertEqual((b'\x05' + codec.encode(-2**31), b'\x06'),
+                         codec.key_range(-math.inf, math.inf, prefix=b'\x05'))
+        self.assertEqual((b'\xff' + codec.encode(7), None),
+                         codec.key_range(7, prefix=bytearray(b'\xff')))
+        self.assertIsNone(codec.key_range(5, 5))
+        self.assertIsNone(codec.key_range(2**31 - 1, low_inclusive=False))
+        self.assertIsNone(codec.key_range(high=-2**31))
+        self.assertIsNone(codec.key_range(2**40))
+
+        codec = numenc.codec('float64')
+        # the stop drops the trailing 0xff bytes of the largest finite key
+        self.assertEqual((codec.encode(5e-324), b'\xff\xf0'),
+                         codec.key_range(0.0, math.inf, low_inclusive=False))
+        self.assertEqual(codec.key_range(-0.0), codec.key_range(0.0))
+        # the infinities lie beyond any integer
+        self.assertEqual(
+            codec.key_range(-math.inf, math.inf, False, False),
+            codec.key_range(-10**400, 10**400))
+        # the stop excludes the keys of NaNs beyond the infinity
+        self.assertEqual(
+            struct.pack('>Q', 0xfff0000000000001),
+            codec.key_range(high=math.inf, high_inclusive=True)[1])
+
+        codec = numenc.codec('float32')
+        # 0.1 is not representable as a float32 and rounds up
+        self.assertIsNone(codec.key_range(0.1, 0.1, True, True))
+        self.assertEqual(codec.encode(0.1), codec.key_range(0.1)[0])
+        self.assertEqual(
+            codec.encode(0.1),
+            codec.key_range(high=0.1, high_inclusive=True)[1])
+        self.assertEqual(codec.encode(math.inf), codec.key_range(1e39)[0])
+
+    def test_integer_bounds_beyond_float_precision(self):
+        for name in ['float32', 'float64']:
+            codec = numenc.codec(name)
+            for bound in [2**53 + 1, -(2**53 + 1), 2**24 + 1]:
+                values = [-math.inf, math.inf]
+                value = codec.decode(codec.encode(float(bound)))
+                if math.isfinite(value):
+                    values += [
+                        codec.previous_value(value), value,
+                        codec.next_value(value)
+                    ]
+                for low_inclusive in [True, False]:
+                    for high_inclusive in [True, False]:
+                        self.check(name, values, bound, None, low_inclusive,
+                                   high_inclusive)
+                        self.check(name, values, None, bound, low_inclusive,
+                                   high_inclusive)
+
+        codec = numenc.codec('float64')
+        self.assertEqual(
+            codec.encode(2.0**53 + 2),
+            codec.key_range(2**53 + 1, None)[0])
+        self.assertEqual(
+            codec.encode(2.0**53 + 2),
+            codec.key_range(None, 2**53 + 1, high_inclusive=False)[1])
+
+    def test_key_ranges(self):
+        codec = numenc.codec('uint16')
+        bounds = [(1, 5), (3, 3), (None, 10, b'\x07'), (65535, None)]
+        self.assertEqual([
+            codec.key_range(1, 5, prefix=b'\x01'),
+            None,
+            codec.key_range(None, 10, prefix=b'\x07'),
+            codec.key_range(65535, None, prefix=b'\x01'),
+        ], codec.key_ranges(iter(bounds), prefix=b'\x01'))
+
+        self.assertEqual([codec.key_range(1, 5, False, True)],
+                         codec.key_ranges([(1, 5)],
+                                          low_inclusive=False,
+                                          high_inclusive=True))
+        self.assertEqual([], codec.key_ranges([]))
+
+    def test_exceptions(self):
+        codec = numenc.codec('float64')
+        with self.assertRaisesRegex(
+                ValueError, r'^Illegal bound: expected a number, got nan\.$'):
+            codec.key_range(math.nan)
+
+        with self.assertRaisesRegex(
+                ValueError, r'^Illegal bound: expected a number, got nan\.$'):
+            numenc.codec('int8').key_range(high=math.nan)
+
+        with self.assertRaisesRegex(
+                TypeError, r'^Wrong input: expected a number as the bound, '
+                r'got str\.$'):
+            numenc.codec('int8').key_range('1')
+
+        with self.assertRaisesRegex(
+                TypeError,
+                r'^at index 1: Wrong input: expected a tuple \(low, high\) '
+                r'or \(low, high, prefix\), got list\.$'):
+            codec.key_ranges([(1, 2), [3, 4]])
+
+        with self.assertRaisesRegex(
+                ValueError,
+                r'^at index 0: Illegal bound: expected a number, got nan\.$'):
+            codec.key_ranges([(math.nan, 2)])
+
+        with self.assertRaisesRegex(
+                TypeError, r'^Wrong input: expected an iterable of bounds\.$'):
+            codec.key_ranges(3)
+
+        with self.assertRaisesRegex(
+                TypeError, r'^Wrong input: expected a bytes-like object\.$'):
+            codec.key_range(1, prefix='a')
+
+
+class TestNextValue(unittest.TestCase):
+    def test_integers(self):
+        codec = numenc.codec('int16')
+        self.assertEqual(-32767, codec.next_value(-32768))
+        self.assertEqual(32766, codec.previous_value(32767))
+        self.assertEqual(2**64 - 1,
+                         numenc.codec('uint64').next_value(2**64 - 2))
+
+    def test_floats(self):
+        codec = numenc.codec('float64')
+        self.assertEqual(5e-324, codec.next_value(0.0))
+        self.assertEqual(5e-324, codec.next_value(-0.0))
+        self.assertEqual(-5e-324, codec.previous_value(0.0))
+        # the negative zero is the same number as the zero
+        self.assertEqual(0.0, codec.next_value(-5e-324))
+        self.assertEqual(0.0, codec.previous_value(5e-324))
+        self.assertEqual(-1.7976931348623157e+308, codec.next_value(-math.inf))
+        self.assertEqual(math.inf, codec.next_value(1.7976931348623157e+308))
+        self.assertEqual(nextafter(1.0, 2.0), codec.next_value(1.0))
+
+        codec = numenc.codec('float32')
+        self.assertEqual(
+            struct.unpack('>f', struct.pack('>I', 0x3f800001))[0],
+            codec.next_value(1.0))
+        self.assertEqual(
+            struct.unpack('>f', struct.pack('>I', 0x7f7fffff))[0],
+            codec.previous_value(math.inf))
+
+    @hypothesis.given(
+        hypothesis.strategies.floats(allow_nan=False, allow_infinity=False))
+    def test_against_nextafter(self, value: float):
+        codec = numenc.codec('float64')
+        self.assertEqual(
+            nextafter(value, math.inf) or 0.0, codec.next_value(value))
+        self.assertEqual(
+            nextafter(value, -math.inf) or 0.0, codec.previous_value(value))
+
+    def test_exceptions(self):
+        with self.assertRaisesRegex(
+                ValueError,
+                r'^Illegal value: expected a number below the largest int8, '
+                r'got 127\.$'):
+            numenc.codec('int8').next_value(127)
+
+        with self.assertRaisesRegex(
+                ValueError,
+                r'^Illegal value: expected a number above the smallest '
+                r'float32, got -inf\.$'):
+            numenc.codec('float32').previous_value(-math.inf)
+
+        with self.assertRaisesRegex(
+                ValueError, r'^Illegal value: expected a number, got nan\.$'):
+            numenc.codec('float64').next_value(math.nan)
+
+        with self.assertRaises(ValueError):
+            numenc.codec('uint8').next_value(256)
+
+
+if __name__ == '__main__':
+    unittest.main()
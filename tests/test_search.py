@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+# pylint: disable=missing-docstring
+import bisect
+import mmap
+import tempfile
+import unittest
+from typing import List
+
+import hypothesis
+import hypothesis.strategies
+import numenc
+
+
+class TestSearchsorted(unittest.TestCase):
+    def test_matches_bisect(self):
+        values = [-5, -5, 0, 3, 3, 3, 7, 100]
+        keys = numenc.from_int16_many(values)
+        codec = numenc.codec('int16')
+
+        for probe in range(-10, 110):
+            key = numenc.from_int16(probe)
+            self.assertEqual(
+                bisect.bisect_left(values, probe), numenc.searchsorted(
+                    keys, key))
+            self.assertEqual(
+                bisect.bisect_right(values, probe),
+                numenc.searchsorted(keys, key, side='right'))
+            self.assertEqual(
+                bisect.bisect_left(values, probe),
+                codec.searchsorted(keys, probe))
+            self.assertEqual(
+                bisect.bisect_right(values, probe),
+                codec.searchsorted(keys, probe, side='right'))
+
+    def test_empty(self):
+        self.assertEqual(0, numenc.searchsorted(b'', b'\x80\x00'))
+        self.assertEqual([0, 0],
+                         numenc.searchsorted_many(b'', b'\x00\x01', width=1))
+        self.assertEqual([],
+                         numenc.codec('int8').searchsorted_many(b'\x80', []))
+
+    def test_zero_copy(self):
+        values = list(range(0, 3000, 3))
+        keys = numenc.from_uint32_many(values)
+
+        with tempfile.TemporaryFile() as fid:
+            fid.write(keys)
+            fid.flush()
+            with mmap.mmap(fid.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                self.assertEqual(
+                    334, numenc.searchsorted(mapped, numenc.from_uint32(1000)))
+                self.assertEqual([0, 334, 1000],
+                                 numenc.codec('uint32').searchsorted_many(
+                                     mapped, [0, 1000, 5000]))
+
+        view = memoryview(keys)[400:800]
+        self.assertEqual(50, numenc.searchsorted(view, numenc.from_uint32(450)))
+
+    @hypothesis.given(
+        hypothesis.strategies.lists(
+            hypothesis.strategies.floats(allow_nan=False)),
+        hypothesis.strategies.lists(
+            hypothesis.strategies.floats(allow_nan=False)),
+        hypothesis.strategies.booleans(),
+        hypothesis.strategies.sampled_from(['left', 'right']))
+    def test_many_automatic(self, values: List[float], probes: List[float],
+                            sort_probes: bool, side: str):
+        values.sort()
+        if sort_probes:
+            probes.sort()
+        keys = numenc.from_float64_many(values)
+        codec = numenc.codec('float64')
+
+        # compare the keys since -0.0 and 0.0 have different keys
+        key_list = [keys[i:i + 8] for i in range(0, len(keys), 8)]
+        search = bisect.bisect_left if side == 'left' else bisect.bisect_right
+        expected = [
+            search(key_list, numenc.from_float64(probe)) for probe in probes
+        ]
+
+        self.assertEqual(expected,
+                         codec.searchsorted_many(keys, probes, side=side))
+        self.assertEqual(
+            expected,
+            numenc.searchsorted_many(
+                keys, numenc.from_float64_many(probes), width=8, side=side))
+
+    def test_many_unsorted(self):
+        values = list(range(0, 1000, 2))
+        keys = numenc.from_int64_many(values)
+        probes = [(i * 7919) % 1100 - 50 for i in range(500)]
+
+        self.assertEqual(
+            [bisect.bisect_left(values, probe) for probe in probes],
+            numenc.codec('int64').searchsorted_many(keys, probes))
+
+    def test_exceptions(self):
+        codec = numenc.codec('int16')
+
+        with self.assertRaises(ValueError) as ctx:
+            numenc.searchsorted(b'\x00\x01\x02', b'\x00\x01')
+        self.assertEqual(
+            "Illegal input: expected a buffer of keys whose length is a "
+            "multiple of 2, got 3.", str(ctx.exception))
+
+        with self.assertRaises(ValueError) as ctx:
+            numenc.searchsorted(b'\x00', b'')
+        self.assertEqual("Illegal input: expected a non-empty key.",
+                         str(ctx.exception))
+
+        with self.assertRaises(ValueError) as ctx:
+            codec.searchsorted(b'', 1, side='middle')
+        self.assertEqual(
+            "Illegal side: expected 'left' or 'right', got 'middle'.",
+            str(ctx.exception))
+
+        with self.assertRaises(ValueError) as ctx:
+            numenc.searchsorted_many(b'', b'\x00\x01\x02', width=2)
+        self.assertEqual(
+            "Illegal input: expected a buffer of probes whose length is a "
+            "multiple of 2, got 3.", str(ctx.exception))
+
+        with self.assertRaises(ValueError) as ctx:
+            numenc.searchsorted_many(b'', b'', width=0)
+        self.assertEqual("Illegal width: expected a positive width, got 0.",
+                         str(ctx.exception))
+
+        with self.assertRaises(TypeError) as ctx:
+            codec.searchsorted_many(b'', [1, 'x'])
+        self.assertEqual(
+            "at index 1: Wrong input: expected signed 16-bit integer.",
+            str(ctx.exception))
+
+        with self.assertRaises(TypeError):
+            numenc.searchsorted([1, 2], b'\x00')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+# pylint: disable=missing-docstring
+import array
+import os
+import struct
+import unittest
+
+import numenc
+
+try:
+    import numpy
+except ImportError:
+    numpy = None  # type: ignore
+
+TYPES = [('b', 'int8'), ('B', 'uint8'), ('h', 'int16'), ('H', 'uint16'),
+         ('i', 'int32'), ('I', 'uint32'), ('q', 'int64'), ('Q', 'uint64'),
+         ('f', 'float32'), ('d', 'float64')]
+
+# bit patterns of the floats whose keys are easy to get wrong: zeros of
+# both signs, infinities, quiet and signaling NaNs of both signs with
+# payloads, and the smallest and the largest subnormals
+SPECIAL_FLOAT32 = [
+    0x00000000, 0x80000000, 0x7f800000, 0xff800000, 0x7fc00000, 0xffc00000,
+    0x7f800001, 0xff800001, 0x7fffffff, 0xffffffff, 0x00000001, 0x80000001,
+    0x007fffff, 0x807fffff
+]
+
+SPECIAL_FLOAT64 = [
+    0x0000000000000000, 0x8000000000000000, 0x7ff0000000000000,
+    0xfff0000000000000, 0x7ff8000000000000, 0xfff8000000000000,
+    0x7ff0000000000001, 0xfff0000000000001, 0x7fffffffffffffff,
+    0xffffffffffffffff, 0x0000000000000001, 0x8000000000000001,
+    0x000fffffffffffff, 0x800fffffffffffff
+]
+
+
+def random_values(typecode: str, size: int) -> array.array:
+    """Create an array of random bit patterns, special floats first."""
+    values = array.array(typecode)
+    values.frombytes(os.urandom(values.itemsize * size))
+    if typecode == 'f':
+        special = struct.pack('<{}I'.format(len(SPECIAL_FLOAT32)),
+                              *SPECIAL_FLOAT32)
+    elif typecode == 'd':
+        special = struct.pack('<{}Q'.format(len(SPECIAL_FLOAT64)),
+                              *SPECIAL_FLOAT64)
+    else:
+        special = b''
+
+    if struct.pack('=H', 1) != struct.pack('<H', 1):
+        # the patterns are given in little endian
+        special = b''
+
+    data = bytearray(values.tobytes())
+    data[:len(special)] = special[:len(data)]
+    return array.array(typecode, bytes(data))
+
+
+class TestSelection(unittest.TestCase):
+    def tearDown(self):
+        numenc.set_simd(numenc.simd_kernels()[-1])
+
+    def test_fastest_selected_at_import(self):
+        kernels = numenc.simd_kernels()
+        self.assertEqual('scalar', kernels[0])
+        self.assertEqual(kernels[-1], numenc.get_simd())
+        for name in kernels:
+            self.assertIn(name, ['scalar', 'sse2', 'avx2'])
+
+    def test_set(self):
+        numenc.set_simd('scalar')
+        self.assertEqual('scalar', numenc.get_simd())
+
+    def test_exceptions(self):
+        with self.assertRaisesRegex(
+                ValueError,
+                r"^Illegal kernels: expected one of the kernels supported by "
+                r"this CPU \(see simd_kernels\(\)\), got 'avx1024'\.$"):
+            numenc.set_simd('avx1024')
+
+        with self.assertRaisesRegex(
+                TypeError, r'^Wrong input: expected a str, got int\.$'):
+            numenc.set_simd(2)  # type: ignore
+
+
+class TestBitIdentical(unittest.TestCase):
+    def tearDown(self):
+        numenc.set_simd(numenc.simd_kernels()[-1])
+
+    def convert_all(self, convert):
+        """Convert with every kernel and check the results against scalar."""
+        results = []
+        for name in numenc.simd_kernels():
+            numenc.set_simd(name)
+            results.append(convert())
+        for name, result in zip(numenc.simd_kernels(), results):
+            self.assertEqual(results[0], result, name)
+
+    def test_arrays(self):
+        # the sizes around the vector lengths leave values to the scalar loop
+        for typecode, tajp in TYPES:
+            for size in list(range(70)) + [1003]:
+                values = random_values(typecode, size)
+                keys = values.tobytes()
+                self.convert_all(lambda: numenc.encode_array(values))
+                self.convert_all(
+                    lambda: numenc.decode_array(keys, tajp).tobytes())
+
+    def test_against_scalar_functions(self):
+        values = array.array('d', [
+            -float('inf'), -1e300, -1.5, -5e-324, -0.0, 0.0, 5e-324, 2.5, 1e300,
+            float('inf')
+        ] * 3)
+        self.assertEqual(
+            numenc.from_float64_many(values), numenc.encode_array(values))
+
+        values = array.array('q', range(-100, 100, 3))
+        self.assertEqual(
+            numenc.from_int64_many(values), numenc.encode_array(values))
+
+    def test_unaligned(self):
+        values = random_values('q', 101)
+        data = b'\x00' + values.tobytes()
+        self.convert_all(
+            lambda: numenc.decode_array(memoryview(data)[1:], 'int64').tobytes(
+            ))
+
+    @unittest.skipIf(numpy is None, "numpy is not installed")
+    def test_non_native_byte_order(self):
+        for typecode, _ in TYPES:
+            values = numpy.frombuffer(
+                random_values(typecode, 1003).tobytes(),
+                dtype=numpy.dtype(typecode).newbyteorder())
+            self.convert_all(lambda: numenc.encode_array(values))
+
+    @unittest.skipIf(numpy is None, "numpy is not installed")
+    def test_sort_array(self):
+        values = numpy.random.randn(1003).astype('>f4')
+        expected = numpy.sort(values)
+        for name in numenc.simd_kernels():
+            numenc.set_simd(name)
+            copy = values.copy()
+            numenc.sort_array(copy)
+            numpy.testing.assert_array_equal(expected, copy)
+
+
+if __name__ == '__main__':
+    unittest.main()
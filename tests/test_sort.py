@@ -0,0 +1,202 @@
+#!/usr/bin/env python3
+# pylint: disable=missing-docstring
+import array
+import math
+import struct
+import unittest
+from typing import List
+
+import hypothesis
+import hypothesis.strategies
+
+import numenc
+
+try:
+    import numpy as np
+except ImportError:
+    np = None  # type: ignore
+
+
+def split(keys: bytes, width: int) -> List[bytes]:
+    """Split the concatenated keys."""
+    return [keys[i:i + width] for i in range(0, len(keys), width)]
+
+
+def float_bits(value: float) -> int:
+    """Return the bit pattern of a float64."""
+    return struct.unpack('>Q', struct.pack('>d', value))[0]
+
+
+def float_bits_key(bits: int) -> int:
+    """Map the bit pattern of a float64 to its rank in the sort."""
+    sign = 1 << 63
+    return (~bits & (2 * sign - 1)) if bits & sign else bits | sign
+
+
+@hypothesis.strategies.composite
+def packed_keys(draw, widths=hypothesis.strategies.integers(1, 20)):
+    """Generate concatenated keys together with their width."""
+    width = draw(widths)
+    keys = draw(
+        hypothesis.strategies.lists(
+            hypothesis.strategies.binary(min_size=width, max_size=width)))
+    return b''.join(keys), width
+
+
+class TestSortPacked(unittest.TestCase):
+    @hypothesis.given(packed_keys())
+    def test_against_sorted(self, packed):
+        keys, width = packed
+        buffer = bytearray(keys)
+        numenc.sort_packed(buffer, width)
+        self.assertEqual(b''.join(sorted(split(keys, width))), buffer)
+
+    def test_constant_bytes(self):
+        keys = numenc.from_int64_many([5, 1, 5, 3, 1])
+        buffer = bytearray(keys)
+        numenc.sort_packed(memoryview(buffer), 8)
+        self.assertEqual([1, 1, 3, 5, 5], numenc.to_int64_many(buffer))
+
+    def test_composite_keys(self):
+        schema = numenc.Struct('uint16,int64')
+        values = [(tenant, timestamp) for timestamp in [7, -2**40, 0, 2**62]
+                  for tenant in [3, 0, 65535]]
+        buffer = bytearray(schema.pack_many(values))
+        numenc.sort_packed(buffer, 10)
+        self.assertEqual(sorted(values), schema.unpack_many(buffer))
+
+    @unittest.skipIf(np is None, "numpy is not installed")
+    def test_numpy(self):
+        values = np.random.randint(-2**40, 2**40, size=1000)
+        keys = numenc.encode_array(values, output='S')
+        numenc.sort_packed(keys, 8)
+        self.assertEqual(
+            np.sort(values).tolist(), numenc.to_int64_many(keys.tobytes()))
+
+    def test_exceptions(self):
+        with self.assertRaisesRegex(
+                ValueError,
+                r'^Illegal width: expected a positive width, got 0\.$'):
+            numenc.sort_packed(bytearray(4), 0)
+
+        with self.assertRaisesRegex(
+                ValueError,
+                r'^Illegal input: expected a buffer of keys whose length is '
+                r'a multiple of 3, got 4\.$'):
+            numenc.sort_packed(bytearray(4), 3)
+
+        with self.assertRaises(TypeError):
+            numenc.sort_packed(b'\x00\x01', 1)
+
+
+class TestArgsortPacked(unittest.TestCase):
+    @hypothesis.given(packed_keys())
+    def test_against_sorted(self, packed):
+        keys, width = packed
+        items = split(keys, width)
+        order = numenc.argsort_packed(keys, width)
+        self.assertIsInstance(order, array.array)
+        self.assertEqual('q', order.typecode)
+        self.assertEqual(
+            sorted(range(len(items)), key=items.__getitem__), list(order))
+
+    def test_stable(self):
+        keys = numenc.from_int16_many([2, 1, 2, 1, 2])
+        self.assertEqual([1, 3, 0, 2, 4], list(numenc.argsort_packed(keys, 2)))
+
+        keys = b'a' * 10 + b'b' * 10 + b'a' * 10
+        self.assertEqual([0, 2, 1], list(numenc.argsort_packed(keys, 10)))
+
+    @unittest.skipIf(np is None, "numpy is not installed")
+    def test_ndarray(self):
+        values = np.random.randint(-100, 100, size=1000).astype(np.int32)
+        order = numenc.argsort_packed(
+            numenc.encode_array(values), 4, output='ndarray')
+        self.assertEqual(np.int64, order.dtype)
+        np.testing.assert_array_equal(np.argsort(values, kind='stable'), order)
+
+    def test_exceptions(self):
+        with self.assertRaisesRegex(
+                ValueError, r"^Illegal output: expected 'array' or 'ndarray', "
+                r"got 'list'\.$"):
+            numenc.argsort_packed(b'', 1, output='list')
+
+        with self.assertRaisesRegex(
+                ValueError,
+                r'^Illegal input: expected a buffer of keys whose length is '
+                r'a multiple of 2, got 3\.$'):
+            numenc.argsort_packed(b'abc', 2)
+
+
+class TestSortArray(unittest.TestCase):
+    @unittest.skipIf(np is None, "numpy is not installed")
+    def test_numpy_types(self):
+        for dtype in [
+                '<i1', '<u1', '<i2', '>u2', '<i4', '>i4', '<u4', '<i8', '>u8',
+                '<f4', '>f4', '<f8', '>f8'
+        ]:
+            values = (np.random.randn(1000) * 100).astype(dtype)
+            expected = np.sort(values)
+            numenc.sort_array(values)
+            np.testing.assert_array_equal(expected, values)
+            self.assertEqual(np.dtype(dtype), values.dtype)
+
+    @hypothesis.given(
+        hypothesis.strategies.lists(
+            hypothesis.strategies.floats(allow_nan=True)))
+    def test_floats(self, values: List[float]):
+        buffer = array.array('d', values)
+        numenc.sort_array(buffer)
+        # the sort permutes the bit patterns: negative NaNs first, then
+        # the numbers with the negative zero before the zero, then NaNs
+        self.assertEqual(
+            sorted((float_bits(value) for value in values), key=float_bits_key),
+            [float_bits(value) for value in buffer])
+
+    def test_nan_and_negative_zero(self):
+        nan = struct.unpack('>d', struct.pack('>Q', 0x7ff8000000000001))[0]
+        negative_nan = -float('nan')
+        for typecode in 'fd':
+            buffer = array.array(typecode,
+                                 [3.0, nan, -0.0, 1.0, -1.0, 0.0, negative_nan])
+            numenc.sort_array(buffer)
+            self.assertTrue(math.isnan(buffer[0]))
+            self.assertEqual(-1.0, math.copysign(1.0, buffer[0]))
+            self.assertEqual([-1.0, -0.0, 0.0, 1.0, 3.0], buffer[1:6].tolist())
+            self.assertEqual(
+                [-1.0, -1.0, 1.0, 1.0, 1.0],
+                [math.copysign(1.0, value) for value in buffer[1:6]])
+            self.assertTrue(math.isnan(buffer[6]))
+            self.assertEqual(1.0, math.copysign(1.0, buffer[6]))
+
+        buffer = array.array('d', [nan, 1.0])
+        numenc.sort_array(buffer)
+        self.assertEqual(
+            struct.pack('>Q', 0x7ff8000000000001), struct.pack('>d', buffer[1]))
+
+    @unittest.skipIf(np is None, "numpy is not installed")
+    def test_numpy_nan(self):
+        for dtype in ['<f4', '>f4', '<f8', '>f8']:
+            values = np.array([2.0, np.nan, -0.0, -3.0, 0.0], dtype=dtype)
+            numenc.sort_array(values)
+            np.testing.assert_array_equal([-3.0, -0.0, 0.0, 2.0, np.nan],
+                                          values)
+            self.assertEqual([True, True, False, False, False],
+                             np.signbit(values).tolist())
+
+    def test_exceptions(self):
+        with self.assertRaisesRegex(
+                TypeError, r'^Wrong input: expected an object supporting '
+                r'the buffer protocol\.$'):
+            numenc.sort_array([3, 1, 2])
+
+        with self.assertRaises(BufferError):
+            numenc.sort_array(b'\x03\x01')
+
+        with self.assertRaisesRegex(TypeError,
+                                    r'^Wrong input: unsupported buffer format'):
+            numenc.sort_array(array.array('u', 'ba'))
+
+
+if __name__ == '__main__':
+    unittest.main()
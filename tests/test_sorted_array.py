@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+# pylint: disable=missing-docstring
+import bisect
+import sys
+import unittest
+from typing import List
+
+import hypothesis
+import hypothesis.strategies
+import numenc
+
+
+def keys_of(width: int):
+    """Generate lists of keys of the given width."""
+    return hypothesis.strategies.lists(
+        hypothesis.strategies.binary(min_size=width, max_size=width))
+
+
+class TestSortedKeyArray(unittest.TestCase):
+    def test_basics(self):
+        array = numenc.SortedKeyArray(2, numenc.from_int16_many([300, -2, 1,
+                                                                 1]))
+
+        self.assertEqual(2, array.width)
+        self.assertEqual(4, len(array))
+        self.assertEqual("<numenc.SortedKeyArray of 4 keys of 2 bytes>",
+                         repr(array))
+        self.assertEqual([-2, 1, 1, 300],
+                         [numenc.to_int16(key) for key in array])
+        self.assertEqual(numenc.from_int16(300), array[-1])
+        self.assertIn(numenc.from_int16(1), array)
+        self.assertNotIn(numenc.from_int16(2), array)
+        self.assertEqual(1, array.bisect_left(numenc.from_int16(1)))
+        self.assertEqual(3, array.bisect_right(numenc.from_int16(1)))
+        self.assertEqual(0, len(numenc.SortedKeyArray(8)))
+
+    @hypothesis.given(keys_of(3), keys_of(3), hypothesis.strategies.data())
+    def test_against_list(self, initial: List[bytes], inserted: List[bytes],
+                          data):
+        array = numenc.SortedKeyArray(3, b''.join(initial))
+        expected = sorted(initial)
+        self.assertEqual(expected, list(array))
+
+        array.insert_many(b''.join(inserted))
+        expected = sorted(expected + inserted)
+        self.assertEqual(expected, list(array))
+        self.assertEqual(b''.join(expected), bytes(array))
+
+        removed = data.draw(
+            hypothesis.strategies.lists(
+                hypothesis.strategies.sampled_from(expected)
+                if expected else hypothesis.strategies.just(b'abc')))
+        count = 0
+        for key in removed:
+            if key in expected:
+                expected.remove(key)
+                count += 1
+        self.assertEqual(count, array.remove_many(b''.join(removed)))
+        self.assertEqual(expected, list(array))
+
+    @hypothesis.given(
+        hypothesis.strategies.lists(hypothesis.strategies.integers(-50, 50)),
+        hypothesis.strategies.integers(-60, 60),
+        hypothesis.strategies.integers(-60, 60))
+    def test_irange(self, values: List[int], start: int, stop: int):
+        array = numenc.SortedKeyArray(8, numenc.from_int64_many(values))
+
+        self.assertEqual(
+            sorted(value for value in values if start <= value < stop), [
+                numenc.to_int64(key) for key in array.irange(
+                    numenc.from_int64(start), numenc.from_int64(stop))
+            ])
+        self.assertEqual(
+            sorted(value for value in values if value >= start), [
+                numenc.to_int64(key)
+                for key in array.irange(start=numenc.from_int64(start))
+            ])
+
+    def test_single_insert_and_remove(self):
+        array = numenc.SortedKeyArray(1)
+        expected = []  # type: List[bytes]
+        for value in [5, 3, 9, 3, 0, 255]:
+            key = numenc.from_uint8(value)
+            array.insert(key)
+            bisect.insort(expected, key)
+        self.assertEqual(expected, list(array))
+
+        array.remove(numenc.from_uint8(3))
+        expected.remove(numenc.from_uint8(3))
+        self.assertEqual(expected, list(array))
+
+    def test_buffer_protocol(self):
+        array = numenc.SortedKeyArray(4, numenc.from_uint32_many([3, 1, 2]))
+
+        view = memoryview(array)
+        self.assertTrue(view.readonly)
+        self.assertEqual(numenc.from_uint32_many([1, 2, 3]), view.tobytes())
+        self.assertEqual([1, 2, 3], numenc.to_uint32_many(array))
+
+        with self.assertRaises(BufferError):
+            array.insert(numenc.from_uint32(4))
+        with self.assertRaises(BufferError):
+            array.remove_many(numenc.from_uint32(1))
+
+        view.release()
+        array.insert(numenc.from_uint32(4))
+        self.assertEqual(4, len(array))
+
+    def test_memory(self):
+        array = numenc.SortedKeyArray(8, numenc.from_int64_many(range(1000)))
+        self.assertLess(sys.getsizeof(array), 8 * 1000 + 200)
+
+    def test_exceptions(self):
+        array = numenc.SortedKeyArray(2, b'\x00\x01')
+
+        with self.assertRaises(ValueError) as ctx:
+            numenc.SortedKeyArray(0)
+        self.assertEqual("Illegal width: expected a positive width, got 0.",
+                         str(ctx.exception))
+
+        with self.assertRaises(ValueError) as ctx:
+            array.insert_many(b'\x00\x01\x02')
+        self.assertEqual(
+            "Illegal input: expected a buffer whose length is a multiple of "
+            "2, got 3.", str(ctx.exception))
+
+        with self.assertRaises(ValueError) as ctx:
+            array.insert(b'\x00')
+        self.assertEqual("Illegal input: expected bytes of length 2, got 1.",
+                         str(ctx.exception))
+
+        with self.assertRaises(ValueError) as ctx:
+            array.remove(b'\x00\x02')
+        self.assertEqual("Illegal input: the key is not in the array.",
+                         str(ctx.exception))
+
+        with self.assertRaises(IndexError):
+            _ = array[1]
+
+        with self.assertRaises(TypeError):
+            array.insert(1)
+
+        iterator = iter(array)
+        array.insert(b'\x00\x00')
+        with self.assertRaises(RuntimeError) as ctx:
+            next(iterator)
+        self.assertEqual("The array changed during iteration.",
+                         str(ctx.exception))
+
+
+if __name__ == '__main__':
+    unittest.main()
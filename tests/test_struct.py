@@ -0,0 +1,268 @@
+#!/usr/bin/env python3
+# pylint: disable=missing-docstring
+import unittest
+from typing import List, Tuple
+
+import hypothesis
+import hypothesis.strategies
+import numenc
+
+ROWS = hypothesis.strategies.lists(
+    hypothesis.strategies.tuples(
+        hypothesis.strategies.integers(min_value=0, max_value=2**32 - 1),
+        hypothesis.strategies.integers(min_value=-2**63, max_value=2**63 - 1),
+        hypothesis.strategies.floats(allow_nan=False)))
+
+VARIABLE_ROWS = hypothesis.strategies.lists(
+    hypothesis.strategies.tuples(
+        hypothesis.strategies.text(), hypothesis.strategies.binary(),
+        hypothesis.strategies.integers(min_value=-2**31, max_value=2**31 - 1)))
+
+
+class Descending:
+    """Invert the order of the wrapped bytes."""
+
+    def __init__(self, value: bytes) -> None:
+        self.value = value
+
+    def __lt__(self, other: 'Descending') -> bool:
+        return other.value < self.value
+
+    def __eq__(self, other: object) -> bool:
+        return isinstance(other, Descending) and self.value == other.value
+
+
+class TestStruct(unittest.TestCase):
+    def test_attributes(self):
+        schema = numenc.Struct(' uint32, int64 ,float64')
+
+        self.assertEqual('uint32,int64,float64', schema.format)
+        self.assertEqual(20, schema.size)
+        self.assertEqual("numenc.Struct('uint32,int64,float64')", repr(schema))
+
+    def test_pack_matches_scalar(self):
+        schema = numenc.Struct('int8,uint16,float32')
+        key = schema.pack(-3, 1000, 2.5)
+
+        self.assertEqual(
+            numenc.from_int8(-3) + numenc.from_uint16(1000) +
+            numenc.from_float32(2.5), key)
+        self.assertEqual((-3, 1000, 2.5), schema.unpack(key))
+        self.assertEqual((-3, 1000, 2.5), schema.unpack(bytearray(key)))
+
+    @hypothesis.given(ROWS)
+    def test_order_automatic(self, rows: List[Tuple[int, int, float]]):
+        schema = numenc.Struct('uint32,int64,float64')
+        keys = [schema.pack(*row) for row in rows]
+
+        self.assertEqual(
+            sorted(rows), [schema.unpack(key) for key in sorted(keys)])
+
+    @hypothesis.given(ROWS)
+    def test_many_automatic(self, rows: List[Tuple[int, int, float]]):
+        schema = numenc.Struct('uint32,int64,float64')
+        keys = schema.pack_many(rows)
+
+        self.assertEqual(b''.join(schema.pack(*row) for row in rows), keys)
+        self.assertEqual(rows, schema.unpack_many(keys))
+
+        columns = tuple(list(column) for column in zip(*rows)) \
+            if rows else ([], [], [])
+        self.assertEqual(keys, schema.pack_many(columns, columns=True))
+        self.assertEqual(columns, schema.unpack_many(keys, columns=True))
+
+    def test_pack_many_iterables(self):
+        schema = numenc.Struct('int16,uint8')
+        rows = [(1, 2), [3, 4], range(5, 7)]
+
+        keys = schema.pack_many(iter(rows))
+        self.assertEqual([(1, 2), (3, 4), (5, 6)], schema.unpack_many(keys))
+        self.assertEqual(
+            keys,
+            schema.pack_many((range(1, 7, 2), iter([2, 4, 6])), columns=True))
+
+    def test_into_and_from(self):
+        schema = numenc.Struct('uint32,float64')
+        page = bytearray(b'\xaa' * 16)
+
+        self.assertIsNone(schema.pack_into(page, 2, 1200, -0.5))
+        self.assertEqual(b'\xaa' * 2 + schema.pack(1200, -0.5) + b'\xaa' * 2,
+                         page)
+        self.assertEqual((1200, -0.5), schema.unpack_from(page, 2))
+        self.assertEqual((1200, -0.5), schema.unpack_from(bytes(page), -14))
+
+    def test_format_exceptions(self):
+        for weird_format in ['', 'int32,,int8', 'int32,']:
+            with self.assertRaises(ValueError) as ctx:
+                numenc.Struct(weird_format)
+            self.assertTrue(
+                str(ctx.exception).startswith(
+                    "Illegal format: expected comma-separated types"))
+
+        with self.assertRaises(ValueError) as ctx:
+            numenc.Struct('int32,int128')
+        self.assertTrue(
+            str(ctx.exception).startswith("Unsupported type: int128."))
+
+    def test_pack_exceptions(self):
+        schema = numenc.Struct('uint8,int64')
+
+        with self.assertRaises(ValueError) as ctx:
+            schema.pack(1)
+        self.assertEqual("Illegal input: expected 2 values, got 1.",
+                         str(ctx.exception))
+
+        with self.assertRaises(TypeError) as ctx:
+            schema.pack(1, "some string")
+        self.assertEqual(
+            "at field 1: Wrong input: expected signed 64-bit integer.",
+            str(ctx.exception))
+
+        with self.assertRaises(ValueError) as ctx:
+            schema.pack_many([(1, 2), (256, 2)])
+        self.assertEqual(
+            "at index 1: at field 0: expected 8-bit unsigned integer "
+            "(range [0, 255]), got 256.", str(ctx.exception))
+
+        with self.assertRaises(ValueError) as ctx:
+            schema.pack_many([[1, 2], [3, 4, 5]], columns=True)
+        self.assertEqual(
+            "Illegal input: expected columns of equal length, got 2 values "
+            "in the column 0 and 3 in the column 1.", str(ctx.exception))
+
+        with self.assertRaises(TypeError) as ctx:
+            schema.pack_many(3)
+        self.assertEqual("Wrong input: expected an iterable of rows.",
+                         str(ctx.exception))
+
+        page = bytearray(9)
+        with self.assertRaises(TypeError):
+            schema.pack_into(page, 0, 1, None)
+        with self.assertRaises(ValueError):
+            schema.pack_into(page, 1, 1, 2)
+        self.assertEqual(bytearray(9), page)
+
+    def test_unpack_exceptions(self):
+        schema = numenc.Struct('uint8,int64')
+
+        with self.assertRaises(ValueError) as ctx:
+            schema.unpack(b'\x00' * 8)
+        self.assertEqual("Illegal input: expected bytes of length 9, got 8.",
+                         str(ctx.exception))
+
+        with self.assertRaises(ValueError) as ctx:
+            schema.unpack_many(b'\x00' * 10)
+        self.assertEqual(
+            "Illegal input: expected a buffer whose length is a multiple "
+            "of 9, got 10.", str(ctx.exception))
+
+        with self.assertRaises(TypeError) as ctx:
+            schema.unpack(None)
+        self.assertEqual("Wrong input: expected a bytes-like object.",
+                         str(ctx.exception))
+
+    def test_variable_attributes(self):
+        schema = numenc.Struct('uint8, str, bytes desc')
+
+        self.assertEqual('uint8,str,bytes desc', schema.format)
+        self.assertIsNone(schema.size)
+
+    def test_variable_escapes(self):
+        schema = numenc.Struct('bytes,bytes desc')
+
+        self.assertEqual(b'a\x00\xffb\x00\x01' + b'\xff\xfe',
+                         schema.pack(b'a\x00b', b''))
+        self.assertEqual(b'\x00\x01' + b'\x9e\xff\x00\xff\xfe',
+                         schema.pack(b'', b'a\x00'))
+        self.assertEqual((b'a\x00b', b''),
+                         schema.unpack(schema.pack(b'a\x00b', b'')))
+        self.assertEqual((b'', b'a\x00'),
+                         schema.unpack(schema.pack(bytearray(), b'a\x00')))
+
+    @hypothesis.given(VARIABLE_ROWS)
+    def test_variable_order_automatic(self, rows: List[Tuple[str, bytes, int]]):
+        schema = numenc.Struct('str,bytes desc,int32')
+        keys = [schema.pack(*row) for row in rows]
+
+        self.assertEqual(
+            sorted(
+                rows,
+                key=lambda row: (row[0].encode(), Descending(row[1]), row[2])),
+            [schema.unpack(key) for key in sorted(keys)])
+
+    @hypothesis.given(VARIABLE_ROWS)
+    def test_variable_many_automatic(self, rows: List[Tuple[str, bytes, int]]):
+        schema = numenc.Struct('str desc,bytes,int32')
+        keys = schema.pack_many(rows)
+
+        self.assertEqual(b''.join(schema.pack(*row) for row in rows), keys)
+        self.assertEqual(rows, schema.unpack_many(keys))
+
+        columns = tuple(list(column) for column in zip(*rows)) \
+            if rows else ([], [], [])
+        self.assertEqual(keys, schema.pack_many(columns, columns=True))
+        self.assertEqual(columns, schema.unpack_many(keys, columns=True))
+
+    def test_unpack_prefix(self):
+        schema = numenc.Struct('uint16,str,float64')
+        keys = schema.pack_many([(1, 'abc', 0.5), (2, '', -1.0)])
+
+        self.assertEqual(((1, 'abc'), 7), schema.unpack_prefix(keys, 2))
+        self.assertEqual(((), 0), schema.unpack_prefix(keys, fields=0))
+        self.assertEqual(((1, 'abc', 0.5), 15), schema.unpack_prefix(keys))
+        self.assertEqual(((2, '', -1.0), 27),
+                         schema.unpack_prefix(keys, offset=15))
+        self.assertEqual((2, '', -1.0), schema.unpack_from(keys, 15))
+
+        with self.assertRaises(ValueError) as ctx:
+            schema.unpack_prefix(keys, 4)
+        self.assertEqual(
+            "Illegal input: expected the number of fields in [0, 3], got 4.",
+            str(ctx.exception))
+
+    def test_variable_exceptions(self):
+        schema = numenc.Struct('str,int8')
+
+        with self.assertRaises(TypeError) as ctx:
+            schema.pack(b'abc', 1)
+        self.assertEqual("at field 0: Wrong input: expected str.",
+                         str(ctx.exception))
+
+        with self.assertRaises(ValueError) as ctx:
+            schema.unpack(b'abc')
+        self.assertEqual(
+            "at field 0: Illegal input: unterminated variable-length field.",
+            str(ctx.exception))
+
+        with self.assertRaises(ValueError) as ctx:
+            schema.unpack(b'a\x00\x02\x80')
+        self.assertEqual(
+            "at field 0: Illegal input: invalid escape sequence in "
+            "a variable-length field.", str(ctx.exception))
+
+        with self.assertRaises(ValueError) as ctx:
+            schema.unpack(b'\xff\x00\x01\x80')
+        self.assertEqual(
+            "at field 0: Illegal input: invalid UTF-8 in a str field.",
+            str(ctx.exception))
+
+        with self.assertRaises(ValueError) as ctx:
+            schema.unpack(b'a\x00\x01')
+        self.assertEqual(
+            "at field 1: Illegal input: expected 1 more bytes, got 0.",
+            str(ctx.exception))
+
+        with self.assertRaises(ValueError) as ctx:
+            schema.unpack(b'a\x00\x01\x80\x00')
+        self.assertEqual("Illegal input: expected bytes of length 4, got 5.",
+                         str(ctx.exception))
+
+        with self.assertRaises(ValueError) as ctx:
+            schema.unpack_many(schema.pack('a', 1) + b'a')
+        self.assertEqual(
+            "at index 1: at field 0: Illegal input: unterminated "
+            "variable-length field.", str(ctx.exception))
+
+
+if __name__ == '__main__':
+    unittest.main()
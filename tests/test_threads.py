@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+# pylint: disable=missing-docstring
+import array
+import os
+import unittest
+from typing import List
+
+import numenc
+
+try:
+    import numpy
+except ImportError:
+    numpy = None  # type: ignore
+
+# large enough to be split among several threads
+SIZE = 300007
+
+THREADS = [2, 3, 8]
+
+
+def random_array(typecode: str, size: int = SIZE) -> array.array:
+    """Create an array.array of random numbers without NaNs."""
+    values = array.array(typecode)
+    values.frombytes(os.urandom(values.itemsize * size))
+    if typecode in 'fd':
+        numbers = [0.0 if value != value else value
+                   for value in values]  # type: List[float]
+        return array.array(typecode, numbers)
+    return values
+
+
+class TestArrays(unittest.TestCase):
+    def test_identical_to_single_thread(self):
+        for typecode, tajp in [('b', 'int8'), ('H', 'uint16'), ('i', 'int32'),
+                               ('q', 'int64'), ('f', 'float32'), ('d',
+                                                                  'float64')]:
+            values = random_array(typecode)
+            keys = numenc.encode_array(values)
+            for threads in THREADS:
+                self.assertEqual(keys,
+                                 numenc.encode_array(values, threads=threads))
+                self.assertEqual(
+                    numenc.decode_array(keys, tajp),
+                    numenc.decode_array(keys, tajp, threads=threads))
+
+    def test_small_input(self):
+        values = array.array('h', [3, -1, 2])
+        self.assertEqual(
+            numenc.encode_array(values), numenc.encode_array(
+                values, threads=16))
+        self.assertEqual(b'', numenc.encode_array(array.array('h'), threads=4))
+
+    @unittest.skipIf(numpy is None, "numpy is not installed")
+    def test_numpy(self):
+        values = numpy.arange(-SIZE, SIZE, dtype='>i8')
+        expected = numenc.encode_array(values, output='S')
+        self.assertEqual(
+            expected.tobytes(),
+            numenc.encode_array(values, output='S', threads=4).tobytes())
+
+        keys = expected.tobytes()
+        numpy.testing.assert_array_equal(
+            values,
+            numenc.decode_array(keys, 'int64', output='ndarray', threads=4))
+
+    def test_exceptions(self):
+        with self.assertRaisesRegex(
+                ValueError,
+                r'^Illegal threads: expected at least 1 thread, got 0\.$'):
+            numenc.encode_array(array.array('q', [1]), threads=0)
+
+        with self.assertRaisesRegex(
+                ValueError,
+                r'^Illegal threads: expected at least 1 thread, got -1\.$'):
+            numenc.decode_array(b'', 'int64', threads=-1)
+
+
+class TestSearchsortedMany(unittest.TestCase):
+    def test_identical_to_single_thread(self):
+        keys = bytearray(numenc.encode_array(random_array('i')))
+        numenc.sort_packed(keys, 4)
+        probes = numenc.encode_array(random_array('i'))
+
+        for side in ['left', 'right']:
+            expected = numenc.searchsorted_many(keys, probes, 4, side=side)
+            for threads in THREADS:
+                self.assertEqual(
+                    expected,
+                    numenc.searchsorted_many(
+                        keys, probes, 4, side=side, threads=threads))
+
+    def test_codec(self):
+        codec = numenc.codec('int32')
+        keys = bytearray(numenc.encode_array(random_array('i')))
+        numenc.sort_packed(keys, 4)
+        values = random_array('i').tolist()
+
+        expected = codec.searchsorted_many(keys, values)
+        for threads in THREADS:
+            self.assertEqual(
+                expected, codec.searchsorted_many(
+                    keys, values, threads=threads))
+
+        with self.assertRaisesRegex(
+                ValueError,
+                r'^Illegal threads: expected at least 1 thread, got 0\.$'):
+            codec.searchsorted_many(keys, values, threads=0)
+
+    def test_exceptions(self):
+        with self.assertRaisesRegex(
+                ValueError,
+                r'^Illegal threads: expected at least 1 thread, got 0\.$'):
+            numenc.searchsorted_many(b'', b'', 1, threads=0)
+
+
+@unittest.skipIf(numpy is None, "numpy is not installed")
+class TestTimeCodec(unittest.TestCase):
+    def test_identical_to_single_thread(self):
+        codec = numenc.TimeCodec('datetime', 'us')
+        for dtype in ['M8[us]', 'M8[s]', '>M8[ms]']:
+            values = numpy.arange(-SIZE, SIZE).astype(dtype)
+            keys = codec.encode_array(values)
+            for threads in THREADS:
+                self.assertEqual(keys,
+                                 codec.encode_array(values, threads=threads))
+                numpy.testing.assert_array_equal(
+                    codec.decode_array(keys),
+                    codec.decode_array(keys, threads=threads))
+
+    def test_first_error_reported(self):
+        codec = numenc.TimeCodec('timedelta', 'ns')
+        values = numpy.zeros(SIZE, dtype='m8[D]')
+        values[SIZE // 2] = 10**9
+        values[SIZE - 1] = 10**9
+
+        for threads in [1] + THREADS:
+            with self.assertRaisesRegex(
+                    ValueError,
+                    r'^at index {}: Illegal input: expected a timedelta64 in '
+                    r"the range of int64 at the unit 'ns', got 1000000000 D"
+                    r'\.$'.format(SIZE // 2)):
+                codec.encode_array(values, threads=threads)
+
+    def test_exceptions(self):
+        with self.assertRaisesRegex(
+                ValueError,
+                r'^Illegal threads: expected at least 1 thread, got 0\.$'):
+            numenc.TimeCodec('datetime').decode_array(b'', threads=0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,240 @@
+#!/usr/bin/env python3
+# pylint: disable=missing-docstring
+import datetime
+import unittest
+from typing import List
+
+import hypothesis
+import hypothesis.strategies
+
+import numenc
+
+try:
+    import numpy as np
+except ImportError:
+    np = None  # type: ignore
+
+EPOCH = datetime.datetime(1970, 1, 1)
+MICROSECOND = datetime.timedelta(microseconds=1)
+
+
+class TestTimeCodec(unittest.TestCase):
+    def test_attributes(self):
+        codec = numenc.TimeCodec('timedelta', unit='ns')
+
+        self.assertEqual('timedelta', codec.type)
+        self.assertEqual('ns', codec.unit)
+        self.assertEqual(8, codec.width)
+        self.assertEqual("numenc.TimeCodec('timedelta', unit='ns')",
+                         repr(codec))
+        self.assertEqual('D', numenc.TimeCodec('date').unit)
+        self.assertEqual('us', numenc.TimeCodec('datetime').unit)
+
+    def test_matches_int64(self):
+        value = datetime.datetime(2020, 1, 2, 3, 4, 5, 678901)
+
+        # yapf: disable
+        for unit, expected in [
+                ('D', 18263),
+                ('h', 18263 * 24 + 3),
+                ('m', (18263 * 24 + 3) * 60 + 4),
+                ('s', ((18263 * 24 + 3) * 60 + 4) * 60 + 5),
+                ('ms', (((18263 * 24 + 3) * 60 + 4) * 60 + 5) * 1000 + 678),
+                ('us', (value - EPOCH) // MICROSECOND),
+                ('ns', (value - EPOCH) // MICROSECOND * 1000)]:
+            # yapf: enable
+            codec = numenc.TimeCodec('datetime', unit=unit)
+            self.assertEqual(
+                numenc.from_int64(expected), codec.encode(value), msg=unit)
+
+        self.assertEqual(
+            value,
+            numenc.TimeCodec('datetime').decode(
+                numenc.TimeCodec('datetime').encode(value)))
+
+    def test_truncates_toward_the_past(self):
+        codec = numenc.TimeCodec('datetime', unit='s')
+
+        key = codec.encode(datetime.datetime(1969, 12, 31, 23, 59, 59, 1))
+        self.assertEqual(numenc.from_int64(-1), key)
+        self.assertEqual(
+            datetime.datetime(1969, 12, 31, 23, 59, 59), codec.decode(key))
+
+    def test_aware_datetimes(self):
+        codec = numenc.TimeCodec('datetime')
+        zone = datetime.timezone(datetime.timedelta(hours=-5, minutes=-30))
+
+        aware = datetime.datetime(2000, 12, 31, 20, 0, tzinfo=zone)
+        self.assertEqual(
+            codec.encode(datetime.datetime(2001, 1, 1, 1, 30)),
+            codec.encode(aware))
+        self.assertIsNone(codec.decode(codec.encode(aware)).tzinfo)
+
+    def test_dates(self):
+        codec = numenc.TimeCodec('date')
+
+        for value in [
+                datetime.date(1, 1, 1),
+                datetime.date(1969, 12, 31),
+                datetime.date(1970, 1, 1),
+                datetime.date(2000, 2, 29),
+                datetime.date(9999, 12, 31)
+        ]:
+            key = codec.encode(value)
+            self.assertEqual(
+                numenc.from_int64((value - EPOCH.date()).days), key)
+            self.assertEqual(value, codec.decode(key))
+
+        self.assertEqual(
+            datetime.date(2020, 1, 1),
+            numenc.TimeCodec('date', unit='h').decode(
+                numenc.TimeCodec('date', unit='h').encode(
+                    datetime.date(2020, 1, 1))))
+
+    def test_timedeltas(self):
+        codec = numenc.TimeCodec('timedelta', unit='ns')
+
+        for value in [
+                datetime.timedelta(days=-1, microseconds=3),
+                datetime.timedelta(0),
+                datetime.timedelta(
+                    days=106751, seconds=85636, microseconds=854775)
+        ]:
+            key = codec.encode(value)
+            self.assertEqual(
+                numenc.from_int64(value // MICROSECOND * 1000), key)
+            self.assertEqual(value, codec.decode(key))
+
+    @hypothesis.given(
+        hypothesis.strategies.lists(hypothesis.strategies.datetimes()))
+    def test_order_automatic(self, values: List[datetime.datetime]):
+        codec = numenc.TimeCodec('datetime')
+        keys = [codec.encode(value) for value in values]
+
+        self.assertEqual(
+            sorted(values), [codec.decode(key) for key in sorted(keys)])
+
+    @hypothesis.given(
+        hypothesis.strategies.lists(
+            hypothesis.strategies.timedeltas(
+                min_value=datetime.timedelta(days=-10**8),
+                max_value=datetime.timedelta(days=10**8))))
+    def test_many_automatic(self, values: List[datetime.timedelta]):
+        codec = numenc.TimeCodec('timedelta')
+        keys = codec.encode_many(values)
+
+        self.assertEqual(b''.join(codec.encode(value) for value in values),
+                         keys)
+        self.assertEqual(values, codec.decode_many(keys))
+
+    def test_into_and_from(self):
+        codec = numenc.TimeCodec('date')
+        page = bytearray(b'\xaa' * 12)
+        value = datetime.date(1970, 1, 3)
+
+        self.assertIsNone(codec.encode_into(value, page, 2))
+        self.assertEqual(b'\xaa' * 2 + numenc.from_int64(2) + b'\xaa' * 2, page)
+        self.assertEqual(value, codec.decode_from(page, -10))
+
+    @unittest.skipIf(np is None, "numpy is not installed")
+    def test_arrays(self):
+        values = np.array(
+            ['1969-12-31T23:59:59.999999999', 'NaT', '2262-04-11'],
+            dtype='datetime64[ns]')
+
+        for unit in ['D', 'h', 'm', 's', 'ms', 'us', 'ns']:
+            codec = numenc.TimeCodec('datetime', unit=unit)
+            expected = values.astype('datetime64[{}]'.format(unit))
+            # numpy rounds toward zero when converting to a coarser unit
+            expected[0] = np.datetime64('1969-12-31T23:59:59.999999999',
+                                        'ns').astype(
+                                            'datetime64[{}]'.format(unit))
+            keys = codec.encode_array(values)
+
+            self.assertEqual(
+                b''.join(
+                    numenc.from_int64(int(value)) for value in np.floor_divide(
+                        values.view('int64'),
+                        np.timedelta64(1, unit) // np.timedelta64(1, 'ns'),
+                        where=~np.isnat(values),
+                        out=values.view('int64').copy())),
+                keys,
+                msg=unit)
+
+            decoded = codec.decode_array(keys)
+            self.assertEqual(
+                np.dtype('datetime64[{}]'.format(unit)), decoded.dtype)
+            self.assertTrue(np.isnat(decoded[1]))
+
+        codec = numenc.TimeCodec('datetime', unit='ns')
+        self.assertEqual(
+            codec.encode_array(values),
+            codec.encode_array(values.astype('>M8[ns]')))
+        np.testing.assert_array_equal(
+            values, codec.decode_array(codec.encode_array(values)))
+
+        days = np.array(['2020-01-01', '1960-06-30'], dtype='datetime64[D]')
+        self.assertEqual(
+            numenc.TimeCodec('date').encode_many(days.tolist()),
+            numenc.TimeCodec('date').encode_array(days))
+
+        durations = np.array([-3, 5], dtype='timedelta64[ms]')
+        codec = numenc.TimeCodec('timedelta', unit='ms')
+        np.testing.assert_array_equal(
+            durations, codec.decode_array(codec.encode_array(durations)))
+
+    @unittest.skipIf(np is None, "numpy is not installed")
+    def test_array_exceptions(self):
+        codec = numenc.TimeCodec('datetime')
+
+        with self.assertRaises(TypeError):
+            codec.encode_array(np.array([1, 2]))
+
+        with self.assertRaises(TypeError):
+            codec.encode_array(np.array([1, 2], dtype='timedelta64[s]'))
+
+        with self.assertRaises(ValueError) as ctx:
+            numenc.TimeCodec(
+                'datetime', unit='ns').encode_array(
+                    np.array(['2020-01-01', '9000-01-01'],
+                             dtype='datetime64[D]'))
+        self.assertTrue(str(ctx.exception).startswith("at index 1: "))
+
+    def test_exceptions(self):
+        codec = numenc.TimeCodec('datetime')
+
+        with self.assertRaises(TypeError) as ctx:
+            codec.encode(datetime.date(2020, 1, 1))
+        self.assertEqual("Wrong input: expected datetime.", str(ctx.exception))
+
+        with self.assertRaises(TypeError) as ctx:
+            numenc.TimeCodec('date').encode(datetime.datetime(2020, 1, 1))
+        self.assertEqual("Wrong input: expected date.", str(ctx.exception))
+
+        with self.assertRaises(TypeError) as ctx:
+            codec.encode_many([EPOCH, 1])
+        self.assertEqual("at index 1: Wrong input: expected datetime.",
+                         str(ctx.exception))
+
+        with self.assertRaises(ValueError):
+            numenc.TimeCodec(
+                'datetime', unit='ns').encode(datetime.datetime(2300, 1, 1))
+
+        with self.assertRaises(ValueError):
+            codec.decode(numenc.from_int64(2**62))
+
+        with self.assertRaises(ValueError) as ctx:
+            numenc.TimeCodec('time')
+        self.assertEqual(
+            "Illegal type: expected 'datetime', 'date' or 'timedelta', "
+            "got 'time'.", str(ctx.exception))
+
+        with self.assertRaises(ValueError) as ctx:
+            numenc.TimeCodec('datetime', unit='ps')
+        self.assertEqual(
+            "Illegal unit: expected 'D', 'h', 'm', 's', 'ms', 'us' or 'ns', "
+            "got 'ps'.", str(ctx.exception))
+
+
+if __name__ == '__main__':
+    unittest.main()
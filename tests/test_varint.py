@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+# pylint: disable=missing-docstring
+import unittest
+from typing import List
+
+import hypothesis
+import hypothesis.strategies
+import numenc
+
+# yapf: disable
+# boundaries between the lengths of the varints
+SIGNED_EDGES = [
+    -2**63, -2**63 + 1, -2**56 - 121, -2**56 - 120, -65536 - 121,
+    -65535 - 121, -256 - 121, -255 - 121, -122, -121, -120, -1, 0, 1, 119,
+    120, 121, 255 + 120, 256 + 120, 65535 + 120, 65536 + 120, 2**63 - 1
+]
+
+UNSIGNED_EDGES = [
+    0, 1, 240, 241, 2287, 2288, 67823, 67824, 2**24 - 1, 2**24, 2**32 - 1,
+    2**32, 2**56 - 1, 2**56, 2**64 - 1
+]
+# yapf: enable
+
+SIGNED = hypothesis.strategies.integers(min_value=-2**63, max_value=2**63 - 1)
+UNSIGNED = hypothesis.strategies.integers(min_value=0, max_value=2**64 - 1)
+
+
+class TestVarint(unittest.TestCase):
+    def test_edges(self):
+        for values, tajp in [(SIGNED_EDGES, 'varint'),
+                             (UNSIGNED_EDGES, 'varuint')]:
+            from_var = getattr(numenc, 'from_{}'.format(tajp))
+            to_var = getattr(numenc, 'to_{}'.format(tajp))
+            var_size = getattr(numenc, '{}_size'.format(tajp))
+
+            keys = [from_var(value) for value in values]
+            self.assertEqual(values, [to_var(key) for key in keys])
+            self.assertEqual(sorted(keys), keys, msg=tajp)
+            self.assertEqual([len(key) for key in keys],
+                             [var_size(value) for value in values])
+
+    def test_lengths(self):
+        self.assertEqual(b'\x80', numenc.from_varint(0))
+        self.assertEqual(1, len(numenc.from_varint(-120)))
+        self.assertEqual(2, len(numenc.from_varint(-121)))
+        self.assertEqual(9, len(numenc.from_varint(-2**63)))
+        self.assertEqual(9, len(numenc.from_varint(2**63 - 1)))
+
+        self.assertEqual(b'\xf0', numenc.from_varuint(240))
+        self.assertEqual(b'\xf1\x01', numenc.from_varuint(241))
+        self.assertEqual(9, len(numenc.from_varuint(2**64 - 1)))
+
+    @hypothesis.given(hypothesis.strategies.lists(SIGNED))
+    def test_varint_automatic(self, values: List[int]):
+        keys = [numenc.from_varint(value) for value in values]
+
+        self.assertEqual(
+            sorted(values), [numenc.to_varint(key) for key in sorted(keys)])
+
+        concatenated = numenc.from_varint_many(values)
+        self.assertEqual(b''.join(keys), concatenated)
+        self.assertEqual(values, numenc.to_varint_many(concatenated))
+
+    @hypothesis.given(hypothesis.strategies.lists(UNSIGNED))
+    def test_varuint_automatic(self, values: List[int]):
+        keys = [numenc.from_varuint(value) for value in values]
+
+        self.assertEqual(
+            sorted(values), [numenc.to_varuint(key) for key in sorted(keys)])
+
+        concatenated = numenc.from_varuint_many(iter(values))
+        self.assertEqual(b''.join(keys), concatenated)
+        self.assertEqual(values, numenc.to_varuint_many(
+            bytearray(concatenated)))
+
+    def test_encode_exceptions(self):
+        with self.assertRaises(TypeError) as ctx:
+            numenc.from_varint(2**63)
+        self.assertEqual("Wrong input: expected signed 64-bit integer.",
+                         str(ctx.exception))
+
+        with self.assertRaises(TypeError) as ctx:
+            numenc.from_varuint(-1)
+        self.assertEqual("Wrong input: expected unsigned 64-bit integer.",
+                         str(ctx.exception))
+
+        with self.assertRaises(TypeError) as ctx:
+            numenc.from_varint_many([1, "some string"])
+        self.assertEqual(
+            "at index 1: Wrong input: expected signed 64-bit integer.",
+            str(ctx.exception))
+
+    def test_decode_exceptions(self):
+        with self.assertRaises(TypeError) as ctx:
+            numenc.to_varint(bytearray(b'\x80'))
+        self.assertEqual("Wrong input: expected bytes.", str(ctx.exception))
+
+        with self.assertRaises(ValueError) as ctx:
+            numenc.to_varint(b'')
+        self.assertEqual("Illegal input: expected a non-empty varint.",
+                         str(ctx.exception))
+
+        with self.assertRaises(ValueError) as ctx:
+            numenc.to_varint(b'\xf9\x00')
+        self.assertEqual("Illegal input: expected bytes of length 3, got 2.",
+                         str(ctx.exception))
+
+        # non-canonical: 120 fits in a one-byte payload
+        with self.assertRaises(ValueError) as ctx:
+            numenc.to_varint(b'\xf9\x00\x00')
+        self.assertEqual("Illegal input: non-canonical or out-of-range varint.",
+                         str(ctx.exception))
+
+        # out of range: larger than 2**63 - 1
+        with self.assertRaises(ValueError):
+            numenc.to_varint(b'\xff' * 9)
+
+        with self.assertRaises(ValueError) as ctx:
+            numenc.to_varuint(b'\xf1\x00')
+        self.assertEqual("Illegal input: non-canonical varint.",
+                         str(ctx.exception))
+
+        with self.assertRaises(ValueError) as ctx:
+            numenc.to_varuint_many(b'\x01\xfa\x00')
+        self.assertEqual("Illegal input: truncated varint at offset 1.",
+                         str(ctx.exception))
+
+
+if __name__ == '__main__':
+    unittest.main()